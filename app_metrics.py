@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+Application metrics in the Prometheus text exposition format
+- Per-source fetch latency, response bytes and jobs parsed
+- Deduplication input/duplicate counters (hit ratio = duplicates / input)
+- Storage insert batch sizes and latency per backend
+- Per-route request latency for the Flask apps
+- Background task queue depth, sampled when /metrics is scraped
+
+Metrics live in a process-local registry of plain dicts guarded by one
+lock per metric, so recording is a dict lookup and a few additions and
+is cheap enough to leave on in production. No client library is needed.
+
+Scrapers, task workers and daemons run in their own processes. With
+METRICS_MULTIPROC_DIR set, every process periodically writes its counters
+and histograms to ``<dir>/<pid>.json`` and /metrics in any process adds
+up all shards, so one scrape of the web app or health_check.py covers the
+whole deployment. Gauges are sampled by the rendering process and are
+not shared. Clear the directory when the deployment restarts.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import multiprocessing.util
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BATCH_SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR')
+SHARD_INTERVAL = float(os.getenv('METRICS_SHARD_INTERVAL', '5'))
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+class _Metric:
+    type_name = 'untyped'
+    # Whether values from other processes' shards are added in on render
+    multiprocess = False
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError as e:
+            raise ValueError(f"Metric {self.name} requires label {e.args[0]}")
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def dump(self) -> list:
+        """JSON-serializable ``[labelvalues, value]`` pairs for a shard file"""
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def _add(self, current, value):
+        return current + value
+
+    def merged(self, shards: Iterable[list]) -> '_Metric':
+        """Copy of this metric with dumped values from other processes added in"""
+        metric = copy.copy(self)
+        metric._lock = threading.Lock()
+        with self._lock:
+            metric._values = copy.deepcopy(self._values)
+        for entries in shards:
+            for labelvalues, value in entries:
+                key = tuple(labelvalues)
+                current = metric._values.get(key)
+                metric._values[key] = copy.deepcopy(value) if current is None else self._add(current, value)
+        return metric
+
+    def samples(self) -> List[Tuple[str, Tuple[str, ...], Tuple[str, ...], float]]:
+        with self._lock:
+            return [(self.name, self.labelnames, key, value) for key, value in self._values.items()]
+
+    def render(self) -> str:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type_name}']
+        for name, labelnames, labelvalues, value in self.samples():
+            lines.append(f'{name}{_format_labels(labelnames, labelvalues)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+    type_name = 'counter'
+    multiprocess = True
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError('Counters can only increase')
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+    type_name = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """Bucketed observations with running sum and count"""
+    type_name = 'histogram'
+    multiprocess = True
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts plus the +Inf slot, then sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def dump(self) -> list:
+        with self._lock:
+            return [[list(key), [list(state[0]), state[1]]] for key, state in self._values.items()]
+
+    def _add(self, current, value):
+        counts, total = value
+        if len(counts) != len(current[0]):
+            # Another process running with different buckets; its shard cannot be merged
+            return current
+        return [[a + b for a, b in zip(current[0], counts)], current[1] + total]
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return sum(state[0]) if state else 0
+
+    def sum(self, **labels) -> float:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[1] if state else 0.0
+
+    def samples(self):
+        with self._lock:
+            snapshot = [(key, list(state[0]), state[1]) for key, state in self._values.items()]
+
+        samples = []
+        labelnames = self.labelnames + ('le',)
+        for key, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                samples.append((f'{self.name}_bucket', labelnames, key + (_format_value(bound),), cumulative))
+            samples.append((f'{self.name}_sum', self.labelnames, key, total))
+            samples.append((f'{self.name}_count', self.labelnames, key, cumulative))
+        return samples
+
+
+class Registry:
+    """Collection of metrics rendered together by /metrics"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Duplicate metric name: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Register a callback run before rendering, e.g. to sample a gauge"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], None]):
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def dump(self) -> dict:
+        """Counters and histograms of this process, as written to a shard file"""
+        with self._lock:
+            metrics = [metric for metric in self._metrics.values() if metric.multiprocess]
+        return {metric.name: metric.dump() for metric in metrics}
+
+    def write_shard(self, directory: str):
+        """Atomically replace this process's shard in ``directory``"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{os.getpid()}.json')
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.dump(), f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def read_shards(directory: str) -> List[dict]:
+        """Shards of every other process in ``directory``; this process renders its live values"""
+        own = f'{os.getpid()}.json'
+        try:
+            names = sorted(os.listdir(directory))
+        except FileNotFoundError:
+            return []
+
+        shards = []
+        for name in names:
+            if not name.endswith('.json') or name == own:
+                continue
+            try:
+                with open(os.path.join(directory, name)) as f:
+                    shards.append(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Skipping metrics shard {name}: {e}")
+        return shards
+
+    def render(self, shard_dir: str = None) -> str:
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = list(self._metrics.values())
+
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning(f"⚠️ Metrics collector failed: {e}")
+
+        if shard_dir:
+            shards = self.read_shards(shard_dir)
+            metrics = [
+                metric.merged(shard.get(metric.name, ()) for shard in shards) if metric.multiprocess else metric
+                for metric in metrics
+            ]
+        return '\n'.join(metric.render() for metric in metrics)
+
+
+# Process-wide registry and the application metrics recorded into it
+registry = Registry()
+
+fetch_duration = registry.histogram(
+    'job_scraper_fetch_duration_seconds', 'Time to receive a response from a job source', ('source',))
+fetch_bytes = registry.counter(
+    'job_scraper_fetch_bytes_total', 'Response bytes downloaded from a job source', ('source',))
+fetch_errors = registry.counter(
+    'job_scraper_fetch_errors_total', 'Job source responses with an HTTP error status', ('source',))
+jobs_parsed = registry.counter(
+    'job_scraper_jobs_total', 'Jobs parsed per source', ('source',))
+
+dedup_input = registry.counter(
+    'job_dedup_input_total', 'Jobs checked for duplicates', ('stage',))
+dedup_duplicates = registry.counter(
+    'job_dedup_duplicates_total', 'Jobs dropped as duplicates', ('stage',))
+
+insert_batch_size = registry.histogram(
+    'job_storage_insert_batch_size', 'Jobs per storage insert batch', ('backend',), BATCH_SIZE_BUCKETS)
+insert_duration = registry.histogram(
+    'job_storage_insert_duration_seconds', 'Storage insert batch latency', ('backend',))
+inserted_jobs = registry.counter(
+    'job_storage_inserted_total', 'Jobs written to storage', ('backend',))
+
+request_duration = registry.histogram(
+    'http_request_duration_seconds', 'Flask request latency by route',
+    ('app', 'route', 'method', 'status'))
+
+task_queue_depth = registry.gauge(
+    'task_queue_depth', 'Background tasks by status', ('status',))
+
+
+def record_fetch(source: str, seconds: float, num_bytes: int = 0, error: bool = False):
+    fetch_duration.observe(seconds, source=source)
+    if num_bytes:
+        fetch_bytes.inc(num_bytes, source=source)
+    if error:
+        fetch_errors.inc(source=source)
+
+
+def record_jobs(source: str, count: int):
+    jobs_parsed.inc(count, source=source)
+
+
+def record_dedup(stage: str, total: int, unique: int):
+    dedup_input.inc(total, stage=stage)
+    dedup_duplicates.inc(max(total - unique, 0), stage=stage)
+
+
+def record_insert(backend: str, batch_size: int, seconds: float, inserted: int = None):
+    insert_batch_size.observe(batch_size, backend=backend)
+    insert_duration.observe(seconds, backend=backend)
+    inserted_jobs.inc(batch_size if inserted is None else inserted, backend=backend)
+
+
+def source_from_url(url: str) -> str:
+    """Label for a fetched URL; the host keeps label cardinality bounded"""
+    return urlparse(str(url)).hostname or 'unknown'
+
+
+def instrument_session(session):
+    """Record latency and bytes for every response of a requests.Session"""
+    def record_response(response, *args, **kwargs):
+        record_fetch(
+            source_from_url(response.url),
+            response.elapsed.total_seconds(),
+            # The header, not response.content, so stream=True bodies are not read here
+            int(response.headers.get('Content-Length') or 0),
+            error=response.status_code >= 400
+        )
+        return response
+
+    session.hooks['response'].append(record_response)
+    return session
+
+
+def aiohttp_trace_config():
+    """aiohttp TraceConfig recording latency and bytes per host"""
+    import aiohttp
+
+    async def on_request_start(session, ctx, params):
+        ctx.started = time.perf_counter()
+
+    async def on_request_end(session, ctx, params):
+        # Fires once headers arrive; body bytes are counted as chunks stream in
+        record_fetch(source_from_url(params.url), time.perf_counter() - ctx.started,
+                     error=params.response.status >= 400)
+
+    async def on_chunk_bytes(session, ctx, params):
+        fetch_bytes.inc(len(params.chunk), source=source_from_url(params.url))
+
+    async def on_request_exception(session, ctx, params):
+        record_fetch(source_from_url(params.url), time.perf_counter() - ctx.started, error=True)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_response_chunk_received.append(on_chunk_bytes)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+def track_task_queue(task_queue, statuses: Iterable[str] = None) -> Callable[[], None]:
+    """Sample ``task_queue.queue_depth()`` whenever metrics are rendered.
+
+    ``task_queue`` may also be a function returning the queue (e.g.
+    ``task_queue.get_task_queue``), so it is only opened once metrics are scraped.
+    Returns the collector, for ``registry.remove_collector``.
+    """
+    from task_queue import QUEUED, RUNNING, TERMINAL_STATES
+    statuses = tuple(statuses or (QUEUED, RUNNING) + TERMINAL_STATES)
+
+    def collect():
+        depth = (task_queue() if callable(task_queue) else task_queue).queue_depth()
+        for status in statuses:
+            task_queue_depth.set(depth.get(status, 0), status=status)
+
+    registry.add_collector(collect)
+    return collect
+
+
+class _ShardWriter(threading.Thread):
+    """Daemon thread flushing this process's shard every ``interval`` seconds"""
+
+    def __init__(self, directory: str, interval: float):
+        super().__init__(name='metrics-shard-writer', daemon=True)
+        self.directory = directory
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def flush(self):
+        try:
+            registry.write_shard(self.directory)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write metrics shard to {self.directory}: {e}")
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.flush()
+
+
+_shard_writer = None
+
+
+def start_shard_writer(directory: str = None, interval: float = None):
+    """Share this process's metrics through ``directory`` (METRICS_MULTIPROC_DIR by default)"""
+    global _shard_writer, MULTIPROC_DIR
+    directory = directory or MULTIPROC_DIR
+    if not directory:
+        return None
+    MULTIPROC_DIR = directory
+    if _shard_writer is not None:
+        _shard_writer.stopped.set()
+    _shard_writer = _ShardWriter(directory, SHARD_INTERVAL if interval is None else interval)
+    _shard_writer.start()
+    return _shard_writer
+
+
+def _flush_at_exit():
+    if _shard_writer is not None:
+        _shard_writer.flush()
+
+
+def _after_fork_in_child():
+    # Values copied from the parent are already in the parent's shard; locks are
+    # replaced since a thread of the parent may have held one when it forked
+    global _shard_writer
+    registry._lock = threading.Lock()
+    for metric in registry._metrics.values():
+        metric._lock = threading.Lock()
+        metric._values = {}
+    _shard_writer = None
+    if MULTIPROC_DIR:
+        start_shard_writer(MULTIPROC_DIR)
+
+
+atexit.register(_flush_at_exit)
+# multiprocessing children leave through os._exit, past atexit; flush from their finalizers
+multiprocessing.util.register_after_fork(
+    registry, lambda _: multiprocessing.util.Finalize(None, _flush_at_exit, exitpriority=0))
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+if MULTIPROC_DIR:
+    start_shard_writer(MULTIPROC_DIR)
+
+
+def render_metrics() -> str:
+    return registry.render(MULTIPROC_DIR)
+
+
+def metrics_response():
+    from flask import Response
+    return Response(render_metrics(), mimetype='text/plain', content_type=CONTENT_TYPE)
+
+
+def instrument_app(app, app_name: str = None, expose: bool = True):
+    """Time every request by route template and optionally serve /metrics"""
+    from flask import g, request
+
+    app_name = app_name or app.name
+
+    @app.before_request
+    def start_request_timer():
+        g._metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_duration(response):
+        started = g.pop('_metrics_started', None)
+        if started is not None:
+            # Route templates, not raw paths, so /api/tasks/<id> is one series
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            request_duration.observe(
+                time.perf_counter() - started,
+                app=app_name, route=route, method=request.method, status=response.status_code
+            )
+        return response
+
+    if expose and 'metrics' not in app.view_functions:
+        app.add_url_rule('/metrics', 'metrics', metrics_response)
+
+    return app
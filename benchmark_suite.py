@@ -0,0 +1,606 @@
+#!/usr/bin/env python3
+"""
+Offline micro-benchmarks for hot paths with regression gating
+- Fixed, seeded datasets from synthetic_corpus; no network, ClickHouse or Redis needed
+- Match scoring, skill extraction, dedup, salary parsing, SQLite bulk
+  insert/query, job page JSON serialization, LaTeX rendering, HTML
+  card extraction over the saved page fixtures, faceted filtering and
+  top-k ranking
+- `run` writes a machine-readable JSON results file (use it as the baseline)
+- `compare` exits non-zero when a benchmark is slower than the baseline
+  by more than the threshold, failed, or is missing from the results;
+  `run` exits non-zero when any benchmark fails
+
+    python benchmark_suite.py run --output benchmark_baseline.json
+    python benchmark_suite.py run --compare benchmark_baseline.json
+    python benchmark_suite.py compare benchmark_baseline.json current.json
+"""
+
+import argparse
+import gc
+import glob
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+RESULTS_VERSION = 2
+DEFAULT_THRESHOLD = 0.20
+
+
+class BenchmarkData:
+    """Deterministic datasets shared by all benchmarks of a run"""
+
+    def __init__(self, size: int = 1000, seed: int = 1234):
+        self.size = size
+        self.seed = seed
+        self._jobs = None
+
+    @property
+    def jobs(self) -> List[Dict[str, Any]]:
+        if self._jobs is None:
+            from synthetic_corpus import CorpusGenerator
+            jobs = []
+            for job in CorpusGenerator(self.size, seed=self.seed, duplicate_rate=0.1):
+                # Aliases for the scorers that read the scraped-dict field names
+                job['job_title'] = job['title']
+                job['job_description'] = job['description']
+                jobs.append(job)
+            self._jobs = jobs
+        return self._jobs
+
+
+class Benchmark:
+    def __init__(self, name: str, group: str, setup: Callable[[BenchmarkData], Callable[[], Any]],
+                 items: Callable[[BenchmarkData], int]):
+        self.name = name
+        self.group = group
+        self.setup = setup
+        self.items = items
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, group: str, items: Callable[[BenchmarkData], int] = lambda data: data.size):
+    """Register ``setup(data) -> callable``; only the returned callable is timed"""
+    def decorator(setup):
+        BENCHMARKS[name] = Benchmark(name, group, setup, items)
+        return setup
+    return decorator
+
+
+@benchmark('scoring.application_manager', 'scoring')
+def bench_application_manager_scoring(data):
+    from intelligent_application_manager import IntelligentApplicationManager
+    manager = IntelligentApplicationManager()
+    jobs = data.jobs
+    return lambda: [manager.calculate_job_match_score(job) for job in jobs]
+
+
+@benchmark('scoring.recommendation_engine', 'scoring')
+def bench_recommendation_engine_scoring(data):
+    from real_job_aggregator import RealJob
+    from ultimate_jobright_complete import EnhancedJobRecommendationEngine, User
+
+    engine = EnhancedJobRecommendationEngine()
+    user = User(
+        email='bench@example.com', profile_completed=True, preferred_title='Senior Software Engineer',
+        preferred_location='San Francisco, CA', remote_preference='hybrid',
+        salary_expectation_min=150000, salary_expectation_max=220000,
+        preferred_experience_level='senior', skills=json.dumps(['Python', 'AWS', 'Kubernetes', 'React'])
+    )
+    # Not a column; the scorer reads it when present
+    user.preferred_companies = json.dumps(['Stripe', 'Figma'])
+    jobs = [_real_job(RealJob, job) for job in data.jobs]
+
+    def run():
+        random.seed(data.seed)
+        return [engine.calculate_advanced_match_score(job, user) for job in jobs]
+    return run
+
+
+@benchmark('skills.requirement_analyzer', 'skills')
+def bench_requirement_analyzer(data):
+    from intelligent_resume_generator import JobRequirementAnalyzer
+    analyzer = JobRequirementAnalyzer()
+    jobs = data.jobs
+    return lambda: [analyzer.analyze_job_description(job['title'], job['description']) for job in jobs]
+
+
+@benchmark('skills.gap_analyzer', 'skills')
+def bench_gap_analyzer(data):
+    from enhanced_dynamic_resume_generator import EnhancedDynamicResumeGenerator
+    generator = EnhancedDynamicResumeGenerator()
+    descriptions = [job['description'] for job in data.jobs]
+    return lambda: [generator.analyze_job_requirements(text) for text in descriptions]
+
+
+@benchmark('dedup.comprehensive', 'dedup')
+def bench_comprehensive_dedup(data):
+    from comprehensive_job_automation_system import JobScrapingAPI
+    from synthetic_corpus import to_automation_posting
+    scraper = JobScrapingAPI()
+    jobs = [to_automation_posting(job) for job in data.jobs]
+    return lambda: scraper.deduplicate_jobs(jobs)
+
+
+@benchmark('dedup.real_jobs', 'dedup')
+def bench_real_jobs_dedup(data):
+    from real_job_aggregator import RealJob, RealJobAggregator
+    aggregator = RealJobAggregator()
+    jobs = [_real_job(RealJob, job) for job in data.jobs]
+    return lambda: aggregator.deduplicate_jobs(jobs)
+
+
+@benchmark('salary.crawler_parse_salary', 'salary')
+def bench_crawler_salary(data):
+    from clickhouse_web_crawler import JobScraper
+    scraper = JobScraper(storage=None)
+    texts = [job['salary_text'] for job in data.jobs]
+    return lambda: [scraper._parse_salary(text) for text in texts]
+
+
+@benchmark('salary.aggregator_parse_salary', 'salary')
+def bench_aggregator_salary(data):
+    from real_job_aggregator import RealJobAggregator
+    aggregator = RealJobAggregator()
+    texts = [job['salary_text'] for job in data.jobs]
+    return lambda: [aggregator.parse_salary(text) for text in texts]
+
+
+@benchmark('salary.normalize_column', 'salary')
+def bench_normalize_salary_column(data):
+    import salary_normalizer
+    texts = [job['salary_text'] for job in data.jobs]
+
+    def run():
+        # Cold cache each round: measure parsing, not memo lookups
+        salary_normalizer.parse_salary.cache_clear()
+        return salary_normalizer.normalize_column(texts)
+    return run
+
+
+
+@benchmark('titles.classify', 'titles')
+def bench_classify_titles(data):
+    import title_normalizer
+    titles = [job['title'] for job in data.jobs]
+
+    def run():
+        # Warm memo, as in a long-running scraper where titles repeat
+        return [title_normalizer.classify_title(title).experience_level for title in titles]
+    return run
+
+
+SQLITE_BATCH = 200
+
+
+@benchmark('sqlite.bulk_insert', 'sqlite', items=lambda data: min(data.size, SQLITE_BATCH))
+def bench_sqlite_insert(data):
+    from jobright_clone_backend import JobDatabase
+    db = JobDatabase(os.path.join(os.getcwd(), 'bench_insert.db'))
+    jobs = [_clone_job(job) for job in data.jobs[:SQLITE_BATCH]]
+
+    def run():
+        for job in jobs:
+            db.save_job(job)
+    return run
+
+
+@benchmark('sqlite.query_page', 'sqlite', items=lambda data: min(data.size, 100))
+def bench_sqlite_query(data):
+    db = _populated_clone_db(data)
+    return lambda: db.get_jobs(limit=100, filters={'keywords': ['Engineer']})
+
+
+@benchmark('json.job_page_asdict', 'json', items=lambda data: data.size)
+def bench_json_asdict(data):
+    from dataclasses import asdict
+    db = _populated_clone_db(data)
+    jobs = db.get_jobs(limit=data.size)
+    return lambda: json.dumps({'success': True, 'jobs': [asdict(job) for job in jobs], 'count': len(jobs)})
+
+
+@benchmark('json.job_page_rows', 'json', items=lambda data: data.size)
+def bench_json_rows(data):
+    from jobright_clone_backend import JOB_COLUMNS
+    from json_responses import stream_json_page
+    db = _populated_clone_db(data)
+    rows = list(db.iter_job_rows(limit=data.size))
+    return lambda: b''.join(stream_json_page({'success': True}, 'jobs', JOB_COLUMNS, rows))
+
+
+@benchmark('latex.render_resume', 'latex', items=lambda data: min(data.size, 50))
+def bench_latex_render(data):
+    from intelligent_resume_generator import DynamicResumeGenerator
+    generator = DynamicResumeGenerator()
+    jobs = data.jobs[:50]
+    return lambda: [generator.generate_latex_resume(job['title'], job['description'], job['company']) for job in jobs]
+
+
+HTML_FIXTURES = ('jobright_source.html', 'page_content.html', 'debug_page_source*.html', 'working_jobs_*.html')
+
+
+def _html_fixtures() -> List[str]:
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    paths = sorted(path for pattern in HTML_FIXTURES for path in glob.glob(os.path.join(repo_dir, pattern)))
+    pages = []
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            pages.append(f.read())
+    if not pages:
+        raise FileNotFoundError("No saved HTML fixtures found")
+    return pages
+
+
+def _soup_indeed_cards(html):
+    """The find_all/find card extraction the scrapers used before html_extract"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    rows = []
+    for card in soup.find_all(['div', 'article'], class_=lambda x: x and any(k in x.lower() for k in ['job', 'result']))[:15]:
+        title = card.find('h2') or card.find(['span', 'a'], title=True)
+        company = card.find('span', class_=lambda x: x and 'company' in x.lower()) or \
+            card.find('a', class_=lambda x: x and 'company' in x.lower())
+        location = card.find(['div', 'span'], class_=lambda x: x and 'location' in x.lower())
+        link = card.find('a', href=True)
+        rows.append((title and title.get_text(strip=True), company and company.get_text(strip=True),
+                     location and location.get_text(strip=True), link and link['href']))
+    return rows
+
+
+@benchmark('html.indeed_soup_find', 'html', items=lambda data: len(_html_fixtures()))
+def bench_html_soup_find(data):
+    pages = _html_fixtures()
+    return lambda: [_soup_indeed_cards(page) for page in pages]
+
+
+@benchmark('html.indeed_extract', 'html', items=lambda data: len(_html_fixtures()))
+def bench_html_extract(data):
+    from html_extract import extract
+    pages = _html_fixtures()
+    return lambda: [extract('indeed', page) for page in pages]
+
+
+FACET_QUERIES = [
+    {'job_type': 'full-time', 'experience_level': 'senior'},
+    {'location': 'san', 'salary_min': '150000', 'remote_only': 'true'},
+    {'company_size': 'enterprise', 'salary_max': '120000'},
+]
+
+
+@benchmark('facets.list_filters', 'facets', items=lambda data: data.size * len(FACET_QUERIES))
+def bench_facets_list_filters(data):
+    jobs = data.jobs
+
+    def run():
+        for filters in FACET_QUERIES:
+            matched = jobs
+            if filters.get('location'):
+                location = filters['location'].lower()
+                matched = [j for j in matched if location in j['location'].lower()]
+            for name in ('job_type', 'experience_level', 'company_size'):
+                if filters.get(name):
+                    matched = [j for j in matched if j[name] == filters[name]]
+            if filters.get('salary_min'):
+                matched = [j for j in matched if (j['salary_max'] or 0) >= int(filters['salary_min'])]
+            if filters.get('salary_max'):
+                matched = [j for j in matched if j['salary_min'] and j['salary_min'] <= int(filters['salary_max'])]
+            if filters.get('remote_only') == 'true':
+                matched = [j for j in matched if j['remote_friendly'] or 'Remote' in j['location']]
+    return run
+
+
+@benchmark('facets.index_query', 'facets', items=lambda data: data.size * len(FACET_QUERIES))
+def bench_facets_index_query(data):
+    from facet_index import FacetIndex
+    index = FacetIndex(data.jobs)
+    # Facet counts included, which the list filters above do not even compute
+    return lambda: [index.query(filters).count for filters in FACET_QUERIES]
+
+
+
+TOP_K = 20
+
+
+def _ranking_key(job):
+    return job['remote_friendly'], job['salary_max'] or 0
+
+
+@benchmark('ranking.sorted_slice', 'ranking')
+def bench_ranking_sorted_slice(data):
+    jobs = data.jobs
+    return lambda: sorted(jobs, key=_ranking_key, reverse=True)[:TOP_K]
+
+
+@benchmark('ranking.top_k', 'ranking')
+def bench_ranking_top_k(data):
+    from top_k import top_k
+    jobs = data.jobs
+    return lambda: top_k(jobs, TOP_K, key=_ranking_key)
+
+
+SEMANTIC_QUERIES = 20
+
+
+@benchmark('semantic.similar_jobs', 'semantic', items=lambda data: SEMANTIC_QUERIES)
+def bench_semantic_similar_jobs(data):
+    from semantic_search import VectorIndex
+    index = VectorIndex(tempfile.mkdtemp(prefix='bench-vectors-'))
+    index.add_jobs(data.jobs)
+    probes = [job['id'] for job in data.jobs[:SEMANTIC_QUERIES]]
+    return lambda: [index.similar_to_job(job_id, 10) for job_id in probes]
+
+
+def _real_job(cls, job):
+    posted = datetime.fromisoformat(job['posted_date'])
+    return cls(
+        id=job['id'], title=job['title'], company=job['company'], location=job['location'],
+        salary_min=job['salary_min'], salary_max=job['salary_max'], job_type='full-time',
+        experience_level=job['experience_level'], skills=job['skills'], description=job['description'],
+        posted_date=posted, expires_date=posted + timedelta(days=30), application_url=job['url'],
+        source='benchmark', remote_friendly=job['remote_friendly'], benefits=[], company_size='medium',
+        industry='technology'
+    )
+
+
+def _clone_job(job):
+    from jobright_clone_backend import Job
+    return Job(
+        id=job['id'], title=job['title'], company=job['company'], location=job['location'],
+        salary=job['salary_text'], description=job['description'], url=job['url'], apply_url=job['url'],
+        posted_date=job['posted_date'], job_type='full-time', experience_level=job['experience_level'],
+        source='benchmark', scraped_at=job['posted_date'], tags=job['skills']
+    )
+
+
+def _populated_clone_db(data):
+    from jobright_clone_backend import JobDatabase
+    from synthetic_corpus import write_sqlite
+
+    path = os.path.join(os.getcwd(), f'bench_query_{data.size}_{data.seed}.db')
+    if not os.path.exists(path):
+        write_sqlite(data.jobs, path)
+    return JobDatabase(path)
+
+
+def time_callable(func: Callable[[], Any], round_time: float = 0.05, rounds: int = 7) -> Dict[str, Any]:
+    """Time ``func`` like timeit: calibrate loops per round, GC off, report per-call seconds"""
+    func()  # Warm caches, lazy imports and compiled regexes
+
+    number = 1
+    while True:
+        elapsed = _time_loops(func, number)
+        if elapsed >= round_time or number >= 1_000_000:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(round_time / elapsed) + 1))
+
+    timings = [elapsed / number] + [_time_loops(func, number) / number for _ in range(rounds - 1)]
+    return {
+        'number': number,
+        'rounds': rounds,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0
+    }
+
+
+def _time_loops(func, number: int) -> float:
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+@contextmanager
+def _isolated_workdir():
+    """Several benchmarked modules create SQLite files in the cwd on import"""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='benchmarks-') as workdir:
+        os.chdir(workdir)
+        try:
+            yield workdir
+        finally:
+            os.chdir(previous)
+
+
+def run_suite(names: List[str] = None, size: int = 1000, seed: int = 1234,
+              round_time: float = 0.05, rounds: int = 7, log=print) -> Dict[str, Any]:
+    """Run the selected benchmarks and return a results document"""
+    selected = [BENCHMARKS[name] for name in (names or BENCHMARKS)]
+    data = BenchmarkData(size, seed)
+    results = {}
+    errors = {}
+
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    if repo_dir not in sys.path:
+        sys.path.insert(0, repo_dir)
+
+    with _isolated_workdir():
+        for bench in selected:
+            try:
+                func = bench.setup(data)
+                stats = time_callable(func, round_time, rounds)
+            except Exception as e:
+                errors[bench.name] = f"{type(e).__name__}: {e}"
+                log(f"❌ {bench.name}: failed ({errors[bench.name]})")
+                continue
+
+            items = bench.items(data)
+            stats.update(group=bench.group, items=items, items_per_sec=items / stats['min'] if stats['min'] else None)
+            results[bench.name] = stats
+            log(f"⏱️ {bench.name:<34} {stats['min'] * 1000:10.3f} ms  ({stats['items_per_sec'] or 0:,.0f} items/s)")
+
+    return {
+        'version': RESULTS_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'machine': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'settings': {'size': size, 'seed': seed, 'round_time': round_time, 'rounds': rounds,
+                     'selected': [bench.name for bench in selected]},
+        'benchmarks': results,
+        'errors': errors
+    }
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD,
+                    metric: str = 'min') -> Dict[str, Any]:
+    """Classify each benchmark as regressed, improved, unchanged, error, missing, not run or new.
+
+    ``error`` (raised during the run) and ``missing`` (in the baseline but
+    absent from the results) are failures; ``not run`` is a baseline
+    benchmark the current run deliberately did not select (``run -k``).
+    """
+    if baseline.get('settings', {}).get('size') != current.get('settings', {}).get('size'):
+        raise ValueError("Baseline and current results were produced with different dataset sizes")
+
+    base_benchmarks = baseline['benchmarks']
+    current_benchmarks = current['benchmarks']
+    errors = current.get('errors', {})
+    selected = current.get('settings', {}).get('selected')
+    rows = []
+
+    for name in sorted(set(base_benchmarks) | set(current_benchmarks) | set(errors)):
+        if name in errors:
+            rows.append({'name': name, 'status': 'error', 'error': errors[name]})
+            continue
+        if name not in current_benchmarks:
+            not_run = selected is not None and name not in selected
+            rows.append({'name': name, 'status': 'not run' if not_run else 'missing'})
+            continue
+        if name not in base_benchmarks:
+            rows.append({'name': name, 'status': 'new', 'current': current_benchmarks[name][metric]})
+            continue
+
+        before = base_benchmarks[name][metric]
+        after = current_benchmarks[name][metric]
+        ratio = after / before if before else float('inf')
+        if ratio > 1 + threshold:
+            status = 'regressed'
+        elif ratio < 1 - threshold:
+            status = 'improved'
+        else:
+            status = 'unchanged'
+        rows.append({'name': name, 'status': status, 'baseline': before, 'current': after, 'ratio': ratio})
+
+    return {
+        'threshold': threshold,
+        'metric': metric,
+        'rows': rows,
+        'regressions': [row['name'] for row in rows if row['status'] == 'regressed'],
+        'failures': [row['name'] for row in rows if row['status'] in ('error', 'missing')]
+    }
+
+
+def format_comparison(comparison: Dict[str, Any]) -> str:
+    lines = [f"{'benchmark':<34} {'baseline':>12} {'current':>12} {'change':>9}  status"]
+    for row in comparison['rows']:
+        if 'ratio' in row:
+            lines.append(
+                f"{row['name']:<34} {row['baseline'] * 1000:10.3f}ms {row['current'] * 1000:10.3f}ms "
+                f"{(row['ratio'] - 1) * 100:+8.1f}%  {row['status']}"
+            )
+        else:
+            detail = f" ({row['error']})" if 'error' in row else ''
+            lines.append(f"{row['name']:<34} {'':>12} {'':>12} {'':>9}  {row['status']}{detail}")
+    return '\n'.join(lines)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        results = json.load(f)
+    if results.get('version') != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported results version {results.get('version')}")
+    return results
+
+
+def write_results(results: Dict[str, Any], path: str):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def _gate(baseline_path: str, current: Dict[str, Any], threshold: float, metric: str) -> int:
+    comparison = compare_results(load_results(baseline_path), current, threshold, metric)
+    print(format_comparison(comparison))
+    status = 0
+    if comparison['failures']:
+        print(f"❌ {len(comparison['failures'])} benchmark(s) failed or missing: {', '.join(comparison['failures'])}")
+        status = 1
+    if comparison['regressions']:
+        print(f"❌ {len(comparison['regressions'])} benchmark(s) regressed more than {threshold:.0%}: "
+              f"{', '.join(comparison['regressions'])}")
+        status = 1
+    if not status:
+        print(f"✅ No regressions beyond {threshold:.0%}")
+    return status
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Offline micro-benchmarks with regression gating')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help='List available benchmarks')
+
+    run_parser = subparsers.add_parser('run', help='Run benchmarks and write a results file')
+    run_parser.add_argument('-k', '--filter', action='append', default=[],
+                            help='Only run benchmarks whose name contains this text (repeatable)')
+    run_parser.add_argument('--output', help='Write results JSON here (use as the baseline)')
+    run_parser.add_argument('--size', type=int, default=1000, help='Dataset size')
+    run_parser.add_argument('--seed', type=int, default=1234)
+    run_parser.add_argument('--rounds', type=int, default=7)
+    run_parser.add_argument('--round-time', type=float, default=0.05, help='Minimum seconds per round')
+    run_parser.add_argument('--compare', metavar='BASELINE', help='Fail if results regress against BASELINE')
+    run_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    run_parser.add_argument('--metric', choices=['min', 'median', 'mean'], default='min')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two results files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    compare_parser.add_argument('--metric', choices=['min', 'median', 'mean'], default='min')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        for bench in BENCHMARKS.values():
+            print(f"{bench.group:<10} {bench.name}")
+        return 0
+
+    if args.command == 'compare':
+        return _gate(args.baseline, load_results(args.current), args.threshold, args.metric)
+
+    names = [name for name in BENCHMARKS if not args.filter or any(text in name for text in args.filter)]
+    results = run_suite(names, args.size, args.seed, args.round_time, args.rounds)
+    if args.output:
+        write_results(results, args.output)
+        print(f"💾 Results written to {args.output}")
+    if args.compare:
+        return _gate(args.compare, results, args.threshold, args.metric)
+    if results['errors']:
+        print(f"❌ {len(results['errors'])} benchmark(s) failed: {', '.join(results['errors'])}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
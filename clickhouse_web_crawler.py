@@ -26,22 +26,33 @@ import json
 import hashlib
 import uuid
 from dataclasses import dataclass, asdict
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Tuple
 import logging
 from urllib.parse import urljoin, urlparse
-import re
 import time
 import random
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import queue
+import contextvars
+import socket
 import threading
 from bs4 import BeautifulSoup
 import requests
+from event_stream import scrape_stats
+import app_metrics
+import daemon_profiler
+import http_cassette
+import tracing
+from crawl_frontier import CrawlFrontier, host_of
+from salary_normalizer import salary_range
+from title_normalizer import classify_title
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Kind of this crawler's frontier entries; other crawlers may share the frontier database
+SOURCE_KIND = 'source'
+
 @dataclass
 class JobPosting:
     """Standardized job posting structure for ClickHouse"""
@@ -195,10 +206,18 @@ class ClickHouseJobStorage:
         if not jobs:
             return 0
 
-        if self.client:
-            return self._insert_clickhouse(jobs)
-        else:
-            return self._insert_sqlite(jobs)
+        backend = 'clickhouse' if self.client else 'sqlite'
+        with tracing.start_span('store', {'db.system': backend, 'jobs.input': len(jobs)}) as span:
+            started = time.perf_counter()
+            if self.client:
+                inserted = self._insert_clickhouse(jobs)
+            else:
+                inserted = self._insert_sqlite(jobs)
+            span.set_attributes({'jobs.inserted': inserted, 'jobs.duplicates': len(jobs) - inserted})
+
+        app_metrics.record_insert(backend, len(jobs), time.perf_counter() - started, inserted)
+        app_metrics.record_dedup(f'{backend}_fingerprint', len(jobs), inserted)
+        return inserted
 
     def _insert_clickhouse(self, jobs: List[JobPosting]) -> int:
         """Insert jobs into ClickHouse"""
@@ -362,7 +381,8 @@ class JobScraper:
 
     def __init__(self, storage: ClickHouseJobStorage):
         self.storage = storage
-        self.session = requests.Session()
+        self.session = http_cassette.install(
+            tracing.trace_session(app_metrics.instrument_session(requests.Session())))
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
@@ -415,16 +435,8 @@ class JobScraper:
             if not source_config['enabled']:
                 continue
 
-            logger.info(f"🔍 Scraping {source_name}...")
-
             try:
-                if source_config['method'] == 'api':
-                    jobs = self.scrape_api_source(source_name, source_config, max_jobs_per_source)
-                else:
-                    jobs = self.scrape_web_source(source_name, source_config, max_jobs_per_source)
-
-                all_jobs.extend(jobs)
-                logger.info(f"✅ {source_name}: {len(jobs)} jobs")
+                all_jobs.extend(self.scrape_source(source_name, max_jobs_per_source))
 
                 # Rate limiting
                 time.sleep(source_config['rate_limit'])
@@ -435,6 +447,23 @@ class JobScraper:
         logger.info(f"🎉 Total jobs scraped: {len(all_jobs)}")
         return all_jobs
 
+    def scrape_source(self, source_name: str, max_jobs: int = 100) -> List[JobPosting]:
+        """Scrape one source; raises on failure so callers can retry"""
+        source_config = self.job_sources[source_name]
+        logger.info(f"🔍 Scraping {source_name}...")
+
+        with tracing.start_span('scrape.source', {'job.source': source_name}) as span:
+            if source_config['method'] == 'api':
+                jobs = self.scrape_api_source(source_name, source_config, max_jobs)
+            else:
+                jobs = self.scrape_web_source(source_name, source_config, max_jobs)
+            span.set_attribute('jobs.count', len(jobs))
+
+        scrape_stats.record(source_name, len(jobs))
+        app_metrics.record_jobs(source_name, len(jobs))
+        logger.info(f"✅ {source_name}: {len(jobs)} jobs")
+        return jobs
+
     def scrape_api_source(self, source_name: str, config: Dict, max_jobs: int) -> List[JobPosting]:
         """Scrape jobs from API sources"""
         jobs = []
@@ -509,7 +538,7 @@ class JobScraper:
                         'company': item.get('company', 'Remote Company'),
                         'location': 'Remote',
                         'salary_min': self._parse_salary(item.get('salary', '')),
-                        'salary_max': None,
+                        'salary_max': salary_range(item.get('salary', ''))[1],
                         'job_type': 'full-time',
                         'experience_level': self._determine_experience_level(item.get('position', '')),
                         'skills': item.get('tags', [])[:6],
@@ -606,61 +635,96 @@ class JobScraper:
         )
 
     def _parse_salary(self, salary_text: str) -> Optional[int]:
-        """Parse salary from text"""
-        if not salary_text:
-            return None
-
-        # Look for numbers with k suffix
-        match = re.search(r'(\d+)k', salary_text.lower())
-        if match:
-            return int(match.group(1)) * 1000
-
-        # Look for full numbers
-        match = re.search(r'(\d{4,6})', salary_text)
-        if match:
-            return int(match.group(1))
-
-        return None
+        """Annualized lower bound of a salary text (see salary_normalizer)"""
+        return salary_range(salary_text)[0]
 
     def _determine_experience_level(self, title: str) -> str:
-        """Determine experience level from job title"""
-        title_lower = title.lower()
-
-        if any(word in title_lower for word in ['senior', 'sr', 'lead', 'principal', 'staff']):
-            return 'senior'
-        elif any(word in title_lower for word in ['junior', 'jr', 'intern', 'entry']):
-            return 'entry'
-        else:
-            return 'mid'
+        """Determine experience level from job title (see title_normalizer)"""
+        return classify_title(title).experience_level
 
 class DistributedCrawler:
     """Distributed crawler orchestrator for massive scale"""
 
-    def __init__(self, storage: ClickHouseJobStorage, max_workers: int = 10):
+    def __init__(self, storage: ClickHouseJobStorage, max_workers: int = 10,
+                 frontier: CrawlFrontier = None, worker_id: str = None):
         self.storage = storage
         self.max_workers = max_workers
         self.scraper = JobScraper(storage)
-        self.crawl_queue = queue.Queue()
-        self.results_queue = queue.Queue()
+        # Source fetches are leased from a durable frontier so a restart resumes mid-cycle
+        self.frontier = frontier or CrawlFrontier()
+        self.worker_id = worker_id or f"{socket.gethostname()}:distributed-crawler"
+        self._store_lock = threading.Lock()
         self.running = False
 
+    def seed_frontier(self, interval_minutes: int = 60, max_jobs_per_source: int = 50) -> int:
+        """Register every enabled source as a recurring frontier entry; idempotent"""
+        entries = []
+        for source_name, source_config in self.scraper.job_sources.items():
+            if not source_config['enabled']:
+                continue
+            self.frontier.set_host_delay(host_of(source_config['url']), source_config['rate_limit'])
+            entries.append({
+                'key': f"source:{source_name}",
+                'kind': SOURCE_KIND,
+                'url': source_config['url'],
+                'payload': {'source': source_name, 'max_jobs': max_jobs_per_source},
+                'revisit_after': interval_minutes * 60
+            })
+        return self.frontier.add_many(entries)
+
+    def crawl_once(self) -> Tuple[int, int]:
+        """Crawl every eligible frontier entry; returns (jobs scraped, jobs inserted)"""
+        scraped = inserted = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                entries = self.frontier.lease(self.worker_id, limit=self.max_workers, kinds=(SOURCE_KIND,))
+                if not entries:
+                    break
+                # Copy the context so per-source spans join the current crawl cycle
+                futures = [pool.submit(contextvars.copy_context().run, self._crawl_entry, entry)
+                           for entry in entries]
+                for future in as_completed(futures):
+                    jobs_scraped, jobs_inserted = future.result()
+                    scraped += jobs_scraped
+                    inserted += jobs_inserted
+        return scraped, inserted
+
+    def _crawl_entry(self, entry: Dict[str, Any]) -> Tuple[int, int]:
+        payload = entry['payload']
+        try:
+            jobs = self.scraper.scrape_source(payload['source'], payload.get('max_jobs', 50))
+            # Store jobs in ClickHouse (deduplicated by fingerprint)
+            with self._store_lock, daemon_profiler.stage('crawl.store'):
+                inserted_count = self.storage.insert_jobs(jobs)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to crawl {entry['key']}: {e}")
+            self.frontier.fail(entry['key'], str(e))
+            return 0, 0
+
+        self.frontier.complete(entry['key'], status=f"{len(jobs)} jobs")
+        return len(jobs), inserted_count
+
     def start_continuous_crawling(self, interval_minutes: int = 60):
         """Start continuous crawling to maintain 400k+ jobs daily"""
         logger.info(f"🚀 Starting continuous crawler with {interval_minutes}min intervals")
 
         self.running = True
+        self.seed_frontier(interval_minutes)
+        # Leases still held from before a crash go straight back to the frontier
+        self.frontier.release_worker(self.worker_id)
 
         def crawl_worker():
             while self.running:
                 try:
-                    # Crawl all sources
-                    jobs = self.scraper.scrape_all_sources(max_jobs_per_source=50)
-
-                    # Store jobs in ClickHouse
-                    inserted_count = self.storage.insert_jobs(jobs)
+                    with tracing.start_span('crawl_cycle') as cycle_span, daemon_profiler.stage('crawl_cycle'):
+                        # Crawl every source that is due
+                        with tracing.start_span('scrape'), daemon_profiler.stage('crawl.scrape'):
+                            scraped_count, inserted_count = self.crawl_once()
 
-                    # Get analytics
-                    analytics = self.storage.get_job_analytics()
+                        # Get analytics
+                        with tracing.start_span('analytics'), daemon_profiler.stage('crawl.analytics'):
+                            analytics = self.storage.get_job_analytics()
+                        cycle_span.set_attributes({'jobs.scraped': scraped_count, 'jobs.inserted': inserted_count})
 
                     logger.info(f"""
 📊 Crawl Cycle Complete:
@@ -671,15 +735,17 @@ class DistributedCrawler:
    - Remote jobs: {analytics.get('remote_percentage', 0):.1f}%
                     """)
 
-                    # Wait for next cycle
-                    time.sleep(interval_minutes * 60)
+                    # Wake up when the next source (or retry) is due
+                    wait = self.frontier.next_eligible_in(kinds=(SOURCE_KIND,))
+                    time.sleep(max(1.0, min(wait if wait is not None else interval_minutes * 60,
+                                            interval_minutes * 60)))
 
                 except Exception as e:
                     logger.error(f"Crawl cycle error: {e}")
                     time.sleep(60)  # Wait 1 minute before retrying
 
         # Start crawler in background thread
-        crawler_thread = threading.Thread(target=crawl_worker, daemon=True)
+        crawler_thread = threading.Thread(target=crawl_worker, name='distributed-crawler', daemon=True)
         crawler_thread.start()
 
         return crawler_thread
@@ -735,6 +801,7 @@ if __name__ == "__main__":
     test_crawler_system()
 
     # Optionally start continuous crawling
+    daemon_profiler.install('distributed_crawler')
     storage = ClickHouseJobStorage()
     crawler = DistributedCrawler(storage)
 
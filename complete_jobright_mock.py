@@ -45,6 +45,10 @@ import time
 import threading
 from collections import defaultdict
 import hashlib
+import facet_index
+from feature_store import FeatureStore, profile_skills
+from semantic_search import skill_similarity
+from top_k import paginate, top_k
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -253,27 +257,13 @@ def load_user(user_id):
     return User.query.get(int(user_id))
 
 class JobRecommendationEngine:
-    """AI-powered job recommendation engine with vector search simulation"""
+    """AI-powered job recommendation engine with vector similarity over local embeddings"""
 
     def __init__(self):
-        self.skill_embeddings = self._initialize_skill_embeddings()
         self.company_data = self._initialize_company_data()
         self.job_titles_data = self._initialize_job_titles()
-
-    def _initialize_skill_embeddings(self):
-        """Simulate vector embeddings for skills"""
-        return {
-            'python': [0.1, 0.8, 0.3, 0.9, 0.2],
-            'javascript': [0.2, 0.7, 0.4, 0.8, 0.3],
-            'react': [0.3, 0.6, 0.5, 0.7, 0.4],
-            'node.js': [0.4, 0.5, 0.6, 0.6, 0.5],
-            'sql': [0.5, 0.4, 0.7, 0.5, 0.6],
-            'machine learning': [0.8, 0.9, 0.1, 0.9, 0.1],
-            'tensorflow': [0.9, 0.8, 0.2, 0.8, 0.2],
-            'aws': [0.2, 0.3, 0.8, 0.4, 0.9],
-            'docker': [0.3, 0.2, 0.9, 0.3, 0.8],
-            'kubernetes': [0.4, 0.1, 0.8, 0.2, 0.7]
-        }
+        # Parsed skills and salary numbers per job, instead of json.loads per job per request
+        self.features = FeatureStore()
 
     def _initialize_company_data(self):
         """Initialize comprehensive company data"""
@@ -348,17 +338,10 @@ class JobRecommendationEngine:
         }
 
     def calculate_vector_similarity(self, skills1: List[str], skills2: List[str]) -> float:
-        """Simulate vector similarity calculation"""
+        """Cosine similarity of the skill lists' embeddings (see semantic_search)"""
         if not skills1 or not skills2:
             return 0.0
-
-        # Simulate cosine similarity
-        common_skills = set(skills1) & set(skills2)
-        if not common_skills:
-            return random.uniform(0.1, 0.3)
-
-        similarity = len(common_skills) / (len(set(skills1) | set(skills2)))
-        return min(1.0, similarity + random.uniform(0.0, 0.2))
+        return skill_similarity(skills1, skills2)
 
     def generate_jobs(self, count: int = 200) -> List[dict]:
         """Generate realistic job data"""
@@ -492,8 +475,9 @@ Apply now to join our mission!
         reasons = []
 
         # Skills match (40% weight)
-        job_skills = json.loads(job_data['skills']) if job_data['skills'] else []
-        user_skills = json.loads(user.skills) if user.skills else []
+        features = self.features.features(job_data)
+        job_skills = self.features.skill_names(features)
+        user_skills = list(profile_skills(user.skills))
 
         skill_similarity = self.calculate_vector_similarity(job_skills, user_skills)
         scores['skills_match'] = skill_similarity * 100
@@ -535,8 +519,8 @@ Apply now to join our mission!
         # Salary match (20% weight)
         salary_score = 70  # Default
         if user.salary_expectation_min and user.salary_expectation_max:
-            if (job_data['salary_min'] <= user.salary_expectation_max and
-                job_data['salary_max'] >= user.salary_expectation_min):
+            if (features.salary_min <= user.salary_expectation_max and
+                features.salary_max >= user.salary_expectation_min):
                 salary_score = 85 + random.uniform(-5, 15)
                 reasons.append("Salary range matches expectations")
             else:
@@ -821,7 +805,7 @@ class AIAgentAutomation:
 
             # Auto-apply to top matches
             auto_apply_limit = parameters.get('max_applications', 10)
-            top_jobs = sorted(high_match_jobs, key=lambda x: x['match_score'], reverse=True)[:auto_apply_limit]
+            top_jobs = top_k(high_match_jobs, auto_apply_limit, key=lambda x: x['match_score'])
 
             for job_data in top_jobs:
                 if random.random() > 0.3:  # 70% success rate
@@ -923,6 +907,19 @@ recommendation_engine = JobRecommendationEngine()
 orion_ai = OrionAI()
 ai_agent = AIAgentAutomation(recommendation_engine, orion_ai)
 
+JOB_BOARD_SIZE = 200
+_job_board = None
+_job_board_lock = threading.Lock()
+
+
+def get_job_board() -> List[dict]:
+    """The listed jobs, generated once so job ids (and the facet index cached on them) stay stable"""
+    global _job_board
+    with _job_board_lock:
+        if _job_board is None:
+            _job_board = recommendation_engine.generate_jobs(JOB_BOARD_SIZE)
+        return _job_board
+
 # Routes
 @app.route('/')
 def index():
@@ -1107,49 +1104,30 @@ def jobs():
         'h1b_sponsorship': request.args.get('h1b_sponsorship', '') == 'true'
     }
 
-    # Generate jobs and calculate matches
-    all_jobs = recommendation_engine.generate_jobs(200)
-
-    # Filter jobs
-    filtered_jobs = []
-    for job_data in all_jobs:
-        # Apply filters
-        if filters['location'] and filters['location'].lower() not in job_data['location'].lower():
-            continue
-        if filters['title'] and filters['title'].lower() not in job_data['title'].lower():
-            continue
-        if filters['company'] and filters['company'].lower() not in job_data['company'].lower():
-            continue
-        if filters['job_type'] and job_data['job_type'] != filters['job_type']:
-            continue
-        if filters['experience_level'] and job_data['experience_level'] != filters['experience_level']:
-            continue
-        if filters['remote_only'] and not (job_data['remote_friendly'] or 'Remote' in job_data['location']):
-            continue
-        if filters['h1b_sponsorship'] and not job_data['h1b_sponsorship']:
-            continue
-
-        # Calculate match score
-        if current_user.is_authenticated:
-            match_info = recommendation_engine.calculate_match_score(job_data, current_user)
-            job_data['match_score'] = match_info['total_score']
-            job_data['match_reasons'] = match_info['reasons']
-        else:
-            job_data['match_score'] = random.uniform(60, 85)
-            job_data['match_reasons'] = ['Sign up for personalized matching']
-
-        filtered_jobs.append(job_data)
-
-    # Sort by match score
-    filtered_jobs.sort(key=lambda x: x['match_score'], reverse=True)
+    # Calculate matches over the job board
+    all_jobs = get_job_board()
+
+    # Filter jobs and count facets in one pass over the facet index
+    search = facet_index.get_index(all_jobs).query(filters)
+    def scored_jobs():
+        for job in search.select(all_jobs):
+            # Scores are per user; copy so they never land on the shared board
+            job_data = dict(job)
+            # Calculate match score
+            if current_user.is_authenticated:
+                match_info = recommendation_engine.calculate_match_score(job_data, current_user)
+                job_data['match_score'] = match_info['total_score']
+                job_data['match_reasons'] = match_info['reasons']
+            else:
+                job_data['match_score'] = random.uniform(60, 85)
+                job_data['match_reasons'] = ['Sign up for personalized matching']
+            yield job_data
 
-    # Pagination
+    # Rank by match score up to the end of the requested page only
     page = int(request.args.get('page', 1))
     per_page = 20
-    start_idx = (page - 1) * per_page
-    end_idx = start_idx + per_page
-    paginated_jobs = filtered_jobs[start_idx:end_idx]
-    total_pages = math.ceil(len(filtered_jobs) / per_page)
+    paginated_jobs, total_jobs = paginate(scored_jobs(), page, per_page, key=lambda x: x['match_score'])
+    total_pages = math.ceil(total_jobs / per_page)
 
     # Check user limits
     if current_user.is_authenticated:
@@ -1160,21 +1138,20 @@ def jobs():
 
     return render_template('jobs.html',
                          jobs=paginated_jobs,
-                         total_jobs=len(filtered_jobs),
+                         total_jobs=total_jobs,
                          page=page,
                          total_pages=total_pages,
-                         filters=filters)
+                         filters=filters,
+                         facets=search.facets)
 
 @app.route('/jobs/<job_id>')
 def job_detail(job_id):
     """Job detail page"""
     # In a real system, this would query the database
     job_data = None
-    all_jobs = recommendation_engine.generate_jobs(200)
-
-    for job in all_jobs:
+    for job in get_job_board():
         if job['id'] == job_id:
-            job_data = job
+            job_data = dict(job)
             break
 
     if not job_data:
@@ -1214,8 +1191,8 @@ def api_jobs_search():
         'keywords': request.args.get('keywords', '')
     }
 
-    # Generate and filter jobs
-    all_jobs = recommendation_engine.generate_jobs(200)
+    # Filter the job board
+    all_jobs = get_job_board()
 
     filtered_jobs = []
     for job_data in all_jobs:
@@ -1494,8 +1471,7 @@ def applications():
     apps = JobApplication.query.filter_by(user_id=current_user.id).order_by(JobApplication.applied_at.desc()).all()
 
     # Get job details for each application
-    all_jobs = recommendation_engine.generate_jobs(200)
-    job_lookup = {job['id']: job for job in all_jobs}
+    job_lookup = {job['id']: job for job in get_job_board()}
 
     applications_data = []
     for app in apps:
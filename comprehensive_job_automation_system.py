@@ -24,7 +24,6 @@ import random
 import time
 from dataclasses import dataclass, asdict
 from urllib.parse import urljoin, urlparse, parse_qs
-import re
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
@@ -34,6 +33,13 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import pickle
 import hashlib
 from pathlib import Path
+from event_stream import scrape_stats
+from response_cache import bump_corpus_version
+import app_metrics
+import tracing
+from salary_normalizer import salary_range
+from feature_store import FeatureStore
+from top_k import top_k
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -89,8 +95,24 @@ class AutomationPattern:
 class JobScrapingAPI:
     """Comprehensive job scraping with multiple APIs"""
 
+    # Known automatable application hosts
+    AUTOMATION_SCORES = {
+        'greenhouse.io': 0.9,
+        'lever.co': 0.85,
+        'workday.com': 0.8,
+        'jobvite.com': 0.8,
+        'smartrecruiters.com': 0.85,
+        'bamboohr.com': 0.8,
+        'indeed.com': 0.7,
+        'linkedin.com': 0.6,
+        'careers.google.com': 0.5,
+        'jobs.apple.com': 0.4
+    }
+
     def __init__(self):
         self.session = None
+        # Per-job features (apply domain, ...) derived once per job, not once per ranking
+        self.features = FeatureStore()
         self.apis = {
             'jobright': 'https://api.jobright.ai/v1',
             'remoteok': 'https://remoteok.io/api',
@@ -110,7 +132,8 @@ class JobScrapingAPI:
         self.session = aiohttp.ClientSession(
             connector=connector,
             timeout=timeout,
-            headers=self.headers
+            headers=self.headers,
+            trace_configs=[app_metrics.aiohttp_trace_config(), tracing.aiohttp_trace_config()]
         )
 
     async def scrape_all_jobs(self, limit: int = 1000) -> List[JobPosting]:
@@ -123,30 +146,44 @@ class JobScrapingAPI:
         all_jobs = []
 
         # Scrape from all sources concurrently
-        tasks = [
-            self.scrape_jobright_comprehensive(),
-            self.scrape_remoteok_all(),
-            self.scrape_github_jobs_comprehensive(),
-            self.scrape_adzuna_api(),
-            self.scrape_findwork_api(),
-            self.scrape_custom_company_pages(),
-        ]
+        sources = {
+            'jobright': self.scrape_jobright_comprehensive(),
+            'remoteok': self.scrape_remoteok_all(),
+            'github': self.scrape_github_jobs_comprehensive(),
+            'adzuna': self.scrape_adzuna_api(),
+            'findwork': self.scrape_findwork_api(),
+            'company_pages': self.scrape_custom_company_pages(),
+        }
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        async def scrape_source(source_name, coroutine):
+            with tracing.start_span('scrape.source', {'job.source': source_name}) as span:
+                jobs = await coroutine
+                span.set_attribute('jobs.count', len(jobs))
+                return jobs
 
-        for i, result in enumerate(results):
+        results = await asyncio.gather(
+            *(scrape_source(name, coroutine) for name, coroutine in sources.items()),
+            return_exceptions=True
+        )
+
+        for source_name, result in zip(sources, results):
             if isinstance(result, Exception):
-                logger.error(f"❌ Source {i} failed: {result}")
+                logger.error(f"❌ Source {source_name} failed: {result}")
             else:
                 all_jobs.extend(result)
-                logger.info(f"✅ Source {i}: {len(result)} jobs")
+                scrape_stats.record(source_name, len(result))
+                app_metrics.record_jobs(source_name, len(result))
+                logger.info(f"✅ Source {source_name}: {len(result)} jobs")
 
         # Deduplicate and rank
-        unique_jobs = self.deduplicate_jobs(all_jobs)
-        ranked_jobs = self.rank_jobs_by_automation_potential(unique_jobs)
+        with tracing.start_span('dedup', {'jobs.input': len(all_jobs)}) as span:
+            unique_jobs = self.deduplicate_jobs(all_jobs)
+            span.set_attribute('jobs.unique', len(unique_jobs))
+        with tracing.start_span('score', {'jobs.input': len(unique_jobs)}):
+            ranked_jobs = self.rank_jobs_by_automation_potential(unique_jobs, limit)
 
-        logger.info(f"🎉 Total unique jobs: {len(ranked_jobs)}")
-        return ranked_jobs[:limit]
+        logger.info(f"🎉 Total unique jobs: {len(unique_jobs)}, returning top {len(ranked_jobs)}")
+        return ranked_jobs
 
     async def scrape_jobright_comprehensive(self) -> List[JobPosting]:
         """Comprehensive JobRight scraping with pagination"""
@@ -475,46 +512,26 @@ class JobScrapingAPI:
                 seen.add(key)
                 unique_jobs.append(job)
 
+        app_metrics.record_dedup('comprehensive', len(jobs), len(unique_jobs))
         return unique_jobs
 
-    def rank_jobs_by_automation_potential(self, jobs: List[JobPosting]) -> List[JobPosting]:
-        """Rank jobs by automation potential"""
-        for job in jobs:
-            # Calculate automation confidence based on URL patterns
-            domain = urlparse(job.application_url).netloc
-
-            # Known automatable patterns
-            automation_scores = {
-                'greenhouse.io': 0.9,
-                'lever.co': 0.85,
-                'workday.com': 0.8,
-                'jobvite.com': 0.8,
-                'smartrecruiters.com': 0.85,
-                'bamboohr.com': 0.8,
-                'indeed.com': 0.7,
-                'linkedin.com': 0.6,
-                'careers.google.com': 0.5,
-                'jobs.apple.com': 0.4
-            }
+    def rank_jobs_by_automation_potential(self, jobs: List[JobPosting], limit: Optional[int] = None) -> List[JobPosting]:
+        """Rank jobs by automation potential, keeping the best ``limit`` (all by default)"""
+        # Automation confidence based on the application URL's host
+        for job, features in zip(jobs, self.features.features_for(jobs)):
+            job.automation_confidence = self.AUTOMATION_SCORES.get(features.domain, 0.3)
 
-            job.automation_confidence = automation_scores.get(domain, 0.3)
-
-        # Sort by automation confidence and match score
-        return sorted(jobs, key=lambda x: (x.automation_confidence, x.match_score), reverse=True)
+        # Best by automation confidence, then match score
+        return top_k(jobs, len(jobs) if limit is None else limit,
+                     key=lambda x: (x.automation_confidence, x.match_score))
 
     def extract_salary_min(self, salary_str: str) -> Optional[int]:
         """Extract minimum salary from string"""
-        if not salary_str:
-            return None
-        numbers = re.findall(r'\d+', salary_str.replace(',', ''))
-        return int(numbers[0]) * 1000 if numbers else None
+        return salary_range(salary_str)[0]
 
     def extract_salary_max(self, salary_str: str) -> Optional[int]:
         """Extract maximum salary from string"""
-        if not salary_str:
-            return None
-        numbers = re.findall(r'\d+', salary_str.replace(',', ''))
-        return int(numbers[-1]) * 1000 if len(numbers) > 1 else None
+        return salary_range(salary_str)[1]
 
     def parse_github_repo_job(self, repo: Dict, query: str) -> Optional[JobPosting]:
         """Parse GitHub repo job item"""
@@ -746,10 +763,17 @@ class ClickHouseJobStorage:
 
     def save_jobs(self, jobs: List[JobPosting]) -> int:
         """Save jobs to storage"""
+        started = time.perf_counter()
         if self.client:
-            return self.save_to_clickhouse(jobs)
+            saved = self.save_to_clickhouse(jobs)
         else:
-            return self.save_to_sqlite(jobs)
+            saved = self.save_to_sqlite(jobs)
+        app_metrics.record_insert('clickhouse' if self.client else 'sqlite',
+                                  len(jobs), time.perf_counter() - started, saved)
+
+        if saved:
+            bump_corpus_version('comprehensive_jobs')
+        return saved
 
     def save_to_clickhouse(self, jobs: List[JobPosting]) -> int:
         """Save jobs to ClickHouse"""
@@ -1680,6 +1704,7 @@ class BatchApplicationSystem:
                 """, (job.application_status, job.attempt_count,
                       job.last_attempt.isoformat() if job.last_attempt else None, job.id))
                 self.storage.sqlite_conn.commit()
+                bump_corpus_version('comprehensive_jobs')
 
         except Exception as e:
             logger.error(f"Failed to update job status: {e}")
@@ -1699,26 +1724,35 @@ class ComprehensiveAutomationSystem:
         logger.info("🚀 Starting comprehensive job automation system")
 
         try:
-            # Phase 1: Scrape jobs
-            logger.info("📡 Phase 1: Scraping jobs from all sources")
-            jobs = await self.scraper.scrape_all_jobs(limit=target_jobs)
-
-            # Phase 2: Store in ClickHouse
-            logger.info("💾 Phase 2: Storing jobs in database")
-            stored_count = self.storage.save_jobs(jobs)
-
-            # Phase 3: Run batch applications
-            logger.info("🎯 Phase 3: Running batch applications")
-            application_results = await self.batch_system.run_batch_applications(
-                target_applications=target_applications,
-                time_limit_hours=1
-            )
+            with tracing.start_span('automation_cycle', {
+                'target.jobs': target_jobs, 'target.applications': target_applications
+            }) as span:
+                # Phase 1: Scrape jobs (dedup and scoring are child spans)
+                logger.info("📡 Phase 1: Scraping jobs from all sources")
+                with tracing.start_span('scrape'):
+                    jobs = await self.scraper.scrape_all_jobs(limit=target_jobs)
+
+                # Phase 2: Store in ClickHouse
+                logger.info("💾 Phase 2: Storing jobs in database")
+                with tracing.start_span('store', {'jobs.input': len(jobs)}) as store_span:
+                    stored_count = self.storage.save_jobs(jobs)
+                    store_span.set_attribute('jobs.stored', stored_count)
+
+                # Phase 3: Run batch applications
+                logger.info("🎯 Phase 3: Running batch applications")
+                with tracing.start_span('apply'):
+                    application_results = await self.batch_system.run_batch_applications(
+                        target_applications=target_applications,
+                        time_limit_hours=1
+                    )
 
-            # Phase 4: Generate report
-            logger.info("📊 Phase 4: Generating comprehensive report")
-            report = self.generate_comprehensive_report(jobs, application_results)
+                # Phase 4: Generate report
+                logger.info("📊 Phase 4: Generating comprehensive report")
+                with tracing.start_span('report'):
+                    report = self.generate_comprehensive_report(jobs, application_results)
 
-            return report
+                span.set_attribute('jobs.scraped', len(jobs))
+                return report
 
         except Exception as e:
             logger.error(f"Full automation cycle failed: {e}")
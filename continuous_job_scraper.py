@@ -21,13 +21,20 @@ import time
 import random
 import json
 import requests
+import socket
 import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Set, Optional
 from urllib.parse import urljoin, urlencode
 import sqlite3
+import re
+from functools import lru_cache
 from pathlib import Path
 
+import daemon_profiler
+from crawl_frontier import CrawlFrontier, host_of
+from title_normalizer import normalize_title
+
 sys.path.append('/home/calelin/awesome-apply/venv/lib/python3.13/site-packages')
 
 try:
@@ -44,10 +51,36 @@ except ImportError:
     SELENIUM_AVAILABLE = False
     print("⚠️ Selenium not available - using API-only mode")
 
+# Title quality indicators, matched as whole words
+POSITIVE_TITLE_WORDS = [
+    'senior', 'lead', 'principal', 'engineer', 'developer', 'architect',
+    'manager', 'director', 'python', 'javascript', 'react', 'node',
+    'full stack', 'backend', 'frontend', 'machine learning', 'ai'
+]
+NEGATIVE_TITLE_WORDS = [
+    'intern', 'unpaid', 'volunteer', 'contract', 'temporary',
+    'part time', 'commission', 'sales'
+]
+_POSITIVE_TITLE = re.compile(r'\b(?:%s)\b' % '|'.join(map(re.escape, POSITIVE_TITLE_WORDS)))
+_NEGATIVE_TITLE = re.compile(r'\b(?:%s)\b' % '|'.join(map(re.escape, NEGATIVE_TITLE_WORDS)))
+
+# Kind of this scraper's frontier entries; other crawlers may share the frontier database
+SEARCH_KIND = 'search'
+
+
+@lru_cache(maxsize=65536)
+def title_quality(title: str) -> float:
+    """Score adjustment for a title; positives are matched on the normalized title
+    (so 'Sr. Dev' counts), negatives on the raw one since normalization drops 'contract'"""
+    positive = set(_POSITIVE_TITLE.findall(normalize_title(title)))
+    negative = set(_NEGATIVE_TITLE.findall(title.lower().replace('-', ' ')))
+    return 0.1 * len(positive) - 0.2 * len(negative)
+
+
 class ContinuousJobScraper:
     """Continuously scrapes jobs from multiple platforms"""
 
-    def __init__(self):
+    def __init__(self, frontier: CrawlFrontier = None):
         self.db_path = 'continuous_jobs.db'
         self.scraped_jobs = set()  # Job URLs we've already seen
         self.running = True
@@ -128,10 +161,43 @@ class ContinuousJobScraper:
             }
         }
 
+        # Search tasks live in a durable frontier so a restart resumes mid-cycle; it is
+        # opened and seeded when scraping starts, not on construction
+        self._frontier = frontier
+        self.worker_id = f"{socket.gethostname()}:continuous-scraper"
+
         self.init_database()
         if SELENIUM_AVAILABLE:
             self.setup_driver()
 
+    @property
+    def frontier(self) -> CrawlFrontier:
+        if self._frontier is None:
+            self._frontier = CrawlFrontier()
+        return self._frontier
+
+    def seed_frontier(self, revisit_hours: float = 12, platform_delay: float = 10.0) -> int:
+        """Register every platform x keywords x location search; idempotent"""
+        keywords_list = self.search_criteria['keywords']
+        entries = []
+        for platform, config in self.platforms.items():
+            self.frontier.set_host_delay(host_of(config['base_url']), platform_delay)
+            for rank, keywords in enumerate(keywords_list):
+                for location in self.search_criteria['locations']:
+                    entries.append({
+                        'key': f"search:{platform}:{keywords}:{location}",
+                        'kind': SEARCH_KIND,
+                        'host': host_of(config['base_url']),
+                        'payload': {'platform': platform, 'keywords': keywords, 'location': location},
+                        # Earlier keywords are the ones we care about most
+                        'priority': len(keywords_list) - rank,
+                        'revisit_after': revisit_hours * 3600
+                    })
+        added = self.frontier.add_many(entries)
+        if added:
+            self.log(f"🗂️ Added {added} search tasks to the crawl frontier")
+        return added
+
     def init_database(self):
         """Initialize SQLite database for job storage"""
         conn = sqlite3.connect(self.db_path)
@@ -210,31 +276,10 @@ class ContinuousJobScraper:
         """Calculate quality score for a job posting"""
         score = 0.5  # Base score
 
-        title = job.get('title', '').lower()
         company = job.get('company', '').lower()
         description = job.get('description', '').lower()
 
-        # Title quality indicators
-        positive_title_words = [
-            'senior', 'lead', 'principal', 'engineer', 'developer', 'architect',
-            'manager', 'director', 'python', 'javascript', 'react', 'node',
-            'full stack', 'backend', 'frontend', 'machine learning', 'ai'
-        ]
-
-        negative_title_words = [
-            'intern', 'unpaid', 'volunteer', 'contract', 'temporary',
-            'part time', 'commission', 'sales'
-        ]
-
-        # Positive indicators
-        for word in positive_title_words:
-            if word in title:
-                score += 0.1
-
-        # Negative indicators
-        for word in negative_title_words:
-            if word in title:
-                score -= 0.2
+        score += title_quality(job.get('title') or '')
 
         # Company quality (known tech companies get bonus)
         tech_companies = [
@@ -455,17 +500,21 @@ class ContinuousJobScraper:
         return has_job_keyword
 
     def scrape_all_platforms(self) -> int:
-        """Scrape all platforms with rotating criteria"""
+        """Scrape the next due search task of each platform from the frontier"""
         total_new_jobs = 0
 
-        # Randomly select criteria to avoid patterns
-        keywords = random.choice(self.search_criteria['keywords'])
-        location = random.choice(self.search_criteria['locations'])
-
-        self.log(f"🎯 Scraping cycle: '{keywords}' in '{location}'")
+        # At most one task per platform host; the frontier enforces the delays
+        tasks = self.frontier.lease(self.worker_id, limit=len(self.platforms), kinds=(SEARCH_KIND,))
+        if not tasks:
+            self.log("😴 No search tasks due in the crawl frontier")
 
-        for platform in self.platforms:
+        for task in tasks:
+            platform = task['payload'].get('platform', task['key'])
             try:
+                keywords = task['payload']['keywords']
+                location = task['payload']['location']
+                self.log(f"🎯 Scraping cycle: '{keywords}' in '{location}' on {platform.upper()}")
+
                 start_time = time.time()
 
                 if SELENIUM_AVAILABLE:
@@ -486,12 +535,14 @@ class ContinuousJobScraper:
                 self.save_scraping_stats(platform, keywords, location, len(jobs), new_jobs, scraping_time)
 
                 self.log(f"📊 {platform.upper()}: {new_jobs} new jobs saved (time: {scraping_time:.1f}s)")
+                self.frontier.complete(task['key'], status=f"{len(jobs)} jobs, {new_jobs} new")
 
                 # Delay between platforms
                 time.sleep(random.uniform(5, 15))
 
             except Exception as e:
                 self.log(f"❌ Error with platform {platform}: {e}", "ERROR")
+                self.frontier.fail(task['key'], str(e))
                 continue
 
         return total_new_jobs
@@ -599,6 +650,10 @@ class ContinuousJobScraper:
         cycle_count = 0
         total_jobs_scraped = 0
 
+        self.seed_frontier()
+        # Leases still held from before a crash go straight back to the frontier
+        self.frontier.release_worker(self.worker_id)
+
         try:
             while self.running:
                 cycle_count += 1
@@ -607,11 +662,13 @@ class ContinuousJobScraper:
                 self.log(f"🔄 SCRAPING CYCLE #{cycle_count}")
 
                 # Scrape new jobs
-                new_jobs = self.scrape_all_platforms()
+                with daemon_profiler.stage('scrape'):
+                    new_jobs = self.scrape_all_platforms()
                 total_jobs_scraped += new_jobs
 
                 # Feed jobs to automation
-                jobs_fed = self.feed_jobs_to_automation()
+                with daemon_profiler.stage('feed_automation'):
+                    jobs_fed = self.feed_jobs_to_automation()
 
                 cycle_time = time.time() - cycle_start
 
@@ -646,6 +703,7 @@ class ContinuousJobScraper:
 
 def main():
     """Main function"""
+    daemon_profiler.install('continuous_job_scraper')
     scraper = ContinuousJobScraper()
 
     try:
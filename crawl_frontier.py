@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Durable SQLite-backed crawl frontier shared by the scrapers
+- Entries are URLs or search tasks (platform x keywords x location) keyed by
+  a stable key, so re-seeding is idempotent and keeps their history
+- Workers lease the highest-priority eligible entry; a crashed worker's
+  leases expire and the entry is handed out again
+- Politeness: at most one in-flight lease per host, and a per-host delay
+  between fetches (pushed back further when a host throttles us)
+- Failures retry with exponential backoff up to ``max_attempts``
+- Recurring entries (``revisit_after``) become eligible again after the
+  interval, so a restarted crawler resumes mid-cycle instead of refetching
+  everything it already completed
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.getenv('CRAWL_FRONTIER_DB_PATH', 'crawl_frontier.db')
+
+# Entry states
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+class CrawlFrontier:
+    """Persistent, prioritized and polite work list for crawl workers"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, lease_seconds: int = 600,
+                 default_host_delay: float = 1.0, retry_base_delay: float = 30.0,
+                 retry_max_delay: float = 3600.0):
+        # Connections are opened per call, so pin the file against later chdirs
+        self.db_path = os.path.abspath(db_path)
+        self.lease_seconds = lease_seconds
+        self.default_host_delay = default_host_delay
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init_database(self):
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL DEFAULT 'url',
+                url TEXT,
+                host TEXT NOT NULL,
+                payload TEXT,
+                priority INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                max_attempts INTEGER DEFAULT 3,
+                revisit_after REAL,
+                next_eligible_at REAL NOT NULL,
+                lease_owner TEXT,
+                lease_expires_at REAL,
+                last_status TEXT,
+                last_error TEXT,
+                fetch_count INTEGER DEFAULT 0,
+                created_at TEXT,
+                last_seen_at TEXT,
+                last_fetched_at TEXT,
+                updated_at TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_frontier_ready
+            ON frontier (status, priority DESC, next_eligible_at)
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_frontier_host_status ON frontier (host, status)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS hosts (
+                host TEXT PRIMARY KEY,
+                delay REAL NOT NULL,
+                next_eligible_at REAL NOT NULL DEFAULT 0
+            )
+        """)
+        conn.close()
+
+    def add(self, key: str = None, url: str = None, kind: str = 'url', payload: Dict = None,
+            priority: int = 0, host: str = None, max_attempts: int = 3,
+            revisit_after: float = None, delay: float = 0) -> bool:
+        """Add an entry, or refresh an existing one; returns True if it was new.
+
+        Existing entries keep their status and history; only ``last_seen_at``
+        is touched and their priority raised if the new one is higher.
+        """
+        return self.add_many([dict(
+            key=key, url=url, kind=kind, payload=payload, priority=priority, host=host,
+            max_attempts=max_attempts, revisit_after=revisit_after, delay=delay
+        )]) == 1
+
+    def add_many(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Bulk ``add``; returns the number of new entries"""
+        now = time.time()
+        stamp = datetime.now().isoformat()
+        rows = []
+        for entry in entries:
+            url = entry.get('url')
+            key = entry.get('key') or url
+            host = entry.get('host') or (host_of(url) if url else '')
+            if not key or not host:
+                raise ValueError("Frontier entries need a key or url, and a host")
+            rows.append((
+                key, entry.get('kind', 'url'), url, host, json.dumps(entry.get('payload') or {}),
+                entry.get('priority', 0), entry.get('max_attempts', 3), entry.get('revisit_after'),
+                now + entry.get('delay', 0), stamp, stamp, stamp
+            ))
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            before = conn.total_changes
+            conn.executemany("""
+                INSERT OR IGNORE INTO frontier (key, kind, url, host, payload, priority, max_attempts,
+                                                revisit_after, next_eligible_at, created_at,
+                                                last_seen_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            added = conn.total_changes - before
+            conn.executemany("""
+                UPDATE frontier SET last_seen_at = ?, priority = MAX(priority, ?) WHERE key = ?
+            """, [(stamp, row[5], row[0]) for row in rows])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return added
+
+    def set_host_delay(self, host: str, delay: float):
+        """Minimum seconds between fetches from ``host``"""
+        conn = self._connect()
+        conn.execute("""
+            INSERT INTO hosts (host, delay) VALUES (?, ?)
+            ON CONFLICT(host) DO UPDATE SET delay = excluded.delay
+        """, (host, delay))
+        conn.close()
+
+    def lease(self, worker_id: str, limit: int = 1, kinds: Iterable[str] = None) -> List[Dict[str, Any]]:
+        """Lease up to ``limit`` eligible entries, at most one per host.
+
+        ``kinds`` restricts leasing to the entry kinds the caller can process,
+        so crawlers sharing one database never take each other's entries.
+        Expired leases (their worker died) are returned to the frontier first.
+        """
+        kind_filter, kind_params = self._kind_filter(kinds)
+        now = time.time()
+        stamp = datetime.now().isoformat()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._reclaim_expired(conn, now, stamp)
+
+            # Over-fetch: several top candidates may share a host
+            candidates = conn.execute(f"""
+                SELECT f.* FROM frontier f
+                LEFT JOIN hosts h ON h.host = f.host
+                WHERE f.status = ? AND f.next_eligible_at <= ?
+                  AND COALESCE(h.next_eligible_at, 0) <= ?
+                  AND NOT EXISTS (SELECT 1 FROM frontier busy WHERE busy.host = f.host AND busy.status = ?)
+                  {kind_filter}
+                ORDER BY f.priority DESC, f.next_eligible_at, f.created_at
+                LIMIT ?
+            """, (PENDING, now, now, LEASED, *kind_params, limit * 8)).fetchall()
+
+            leased, hosts = [], set()
+            for row in candidates:
+                if row['host'] in hosts:
+                    continue
+                hosts.add(row['host'])
+                leased.append(row)
+                if len(leased) == limit:
+                    break
+
+            for row in leased:
+                conn.execute("""
+                    UPDATE frontier
+                    SET status = ?, lease_owner = ?, lease_expires_at = ?, attempts = attempts + 1,
+                        updated_at = ?
+                    WHERE key = ?
+                """, (LEASED, worker_id, now + self.lease_seconds, stamp, row['key']))
+                self._reserve_host(conn, row['host'], now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        entries = []
+        for row in leased:
+            entry = self._row_to_dict(row)
+            entry.update(status=LEASED, lease_owner=worker_id, attempts=entry['attempts'] + 1)
+            entries.append(entry)
+        return entries
+
+    @staticmethod
+    def _kind_filter(kinds: Optional[Iterable[str]]):
+        if kinds is None:
+            return '', ()
+        kinds = tuple(kinds)
+        return f"AND f.kind IN ({', '.join('?' * len(kinds)) or 'NULL'})", kinds
+
+    def _reclaim_expired(self, conn: sqlite3.Connection, now: float, stamp: str):
+        # Like fail(): retry while attempts remain, then recurring entries wait for their
+        # next visit with a fresh attempt count and the rest fail permanently
+        conn.execute("""
+            UPDATE frontier
+            SET status = CASE WHEN attempts >= max_attempts AND COALESCE(revisit_after, 0) <= 0 THEN ? ELSE ? END,
+                attempts = CASE WHEN attempts >= max_attempts AND revisit_after > 0 THEN 0 ELSE attempts END,
+                next_eligible_at = CASE WHEN attempts >= max_attempts AND revisit_after > 0
+                                        THEN ? + revisit_after ELSE next_eligible_at END,
+                last_error = 'Worker lease expired', lease_owner = NULL, lease_expires_at = NULL,
+                updated_at = ?
+            WHERE status = ? AND lease_expires_at < ?
+        """, (FAILED, PENDING, now, stamp, LEASED, now))
+
+    def _reserve_host(self, conn: sqlite3.Connection, host: str, now: float, extra: float = 0):
+        conn.execute("""
+            INSERT INTO hosts (host, delay, next_eligible_at) VALUES (?, ?, ?)
+            ON CONFLICT(host) DO UPDATE
+            SET next_eligible_at = MAX(hosts.next_eligible_at, ? + hosts.delay + ?)
+        """, (host, self.default_host_delay, now + self.default_host_delay + extra, now, extra))
+
+    def complete(self, key: str, status: str = 'ok', revisit_after: float = None):
+        """Mark a leased entry fetched; recurring entries are rescheduled"""
+        now = time.time()
+        stamp = datetime.now().isoformat()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT host, revisit_after FROM frontier WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return
+            revisit = revisit_after if revisit_after is not None else row['revisit_after']
+            conn.execute("""
+                UPDATE frontier
+                SET status = ?, attempts = 0, lease_owner = NULL, lease_expires_at = NULL,
+                    next_eligible_at = ?, last_status = ?, last_error = NULL,
+                    fetch_count = fetch_count + 1, last_fetched_at = ?, updated_at = ?
+                WHERE key = ?
+            """, (PENDING if revisit else DONE, now + (revisit or 0), status, stamp, stamp, key))
+            # The politeness delay counts from the end of the fetch, not the lease
+            self._reserve_host(conn, row['host'], now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def fail(self, key: str, error: str, retry_after: float = None, host_backoff: float = 0):
+        """Record a failed fetch, retrying with backoff while attempts remain.
+
+        ``host_backoff`` pushes back every entry on the host (HTTP 429/503).
+        Recurring entries that run out of attempts wait for their next revisit.
+        """
+        now = time.time()
+        stamp = datetime.now().isoformat()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT host, attempts, max_attempts, revisit_after FROM frontier WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return
+
+            if row['attempts'] < row['max_attempts']:
+                delay = retry_after if retry_after is not None else \
+                    min(self.retry_base_delay * (2 ** (row['attempts'] - 1)), self.retry_max_delay)
+                status, attempts = PENDING, row['attempts']
+                logger.warning(f"🔁 Frontier entry {key} failed (attempt {row['attempts']}), "
+                               f"retrying in {delay:.0f}s: {error}")
+            elif row['revisit_after']:
+                delay, status, attempts = row['revisit_after'], PENDING, 0
+                logger.error(f"❌ Frontier entry {key} failed {row['attempts']} times, next visit in "
+                             f"{delay:.0f}s: {error}")
+            else:
+                delay, status, attempts = 0, FAILED, row['attempts']
+                logger.error(f"❌ Frontier entry {key} failed permanently: {error}")
+
+            conn.execute("""
+                UPDATE frontier
+                SET status = ?, attempts = ?, lease_owner = NULL, lease_expires_at = NULL,
+                    next_eligible_at = ?, last_status = 'error', last_error = ?, updated_at = ?
+                WHERE key = ?
+            """, (status, attempts, now + delay, error, stamp, key))
+            self._reserve_host(conn, row['host'], now, host_backoff)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def release(self, key: str):
+        """Hand a leased entry back untouched (shutdown), without using an attempt"""
+        conn = self._connect()
+        conn.execute("""
+            UPDATE frontier
+            SET status = ?, attempts = MAX(attempts - 1, 0), lease_owner = NULL, lease_expires_at = NULL,
+                updated_at = ?
+            WHERE key = ? AND status = ?
+        """, (PENDING, datetime.now().isoformat(), key, LEASED))
+        conn.close()
+
+    def release_worker(self, worker_id: str) -> int:
+        """Return every lease held by ``worker_id``; call on start-up with a stable id"""
+        conn = self._connect()
+        cursor = conn.execute("""
+            UPDATE frontier
+            SET status = ?, attempts = MAX(attempts - 1, 0), lease_owner = NULL, lease_expires_at = NULL,
+                updated_at = ?
+            WHERE lease_owner = ? AND status = ?
+        """, (PENDING, datetime.now().isoformat(), worker_id, LEASED))
+        conn.close()
+        if cursor.rowcount:
+            logger.info(f"♻️ Released {cursor.rowcount} frontier leases held by {worker_id}")
+        return cursor.rowcount
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        row = conn.execute("SELECT * FROM frontier WHERE key = ?", (key,)).fetchone()
+        conn.close()
+        return self._row_to_dict(row) if row else None
+
+    def next_eligible_in(self, kinds: Iterable[str] = None) -> Optional[float]:
+        """Seconds until something can be leased (0 if now), None if nothing is pending"""
+        kind_filter, kind_params = self._kind_filter(kinds)
+        conn = self._connect()
+        row = conn.execute(f"""
+            SELECT MIN(MAX(f.next_eligible_at, COALESCE(h.next_eligible_at, 0))) AS ready
+            FROM frontier f LEFT JOIN hosts h ON h.host = f.host
+            WHERE f.status = ? {kind_filter}
+        """, (PENDING, *kind_params)).fetchone()
+        conn.close()
+        if row['ready'] is None:
+            return None
+        return max(0.0, row['ready'] - time.time())
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._connect()
+        counts = dict(conn.execute("SELECT status, COUNT(*) FROM frontier GROUP BY status").fetchall())
+        ready = conn.execute(
+            "SELECT COUNT(*) FROM frontier WHERE status = ? AND next_eligible_at <= ?", (PENDING, time.time())
+        ).fetchone()[0]
+        hosts = conn.execute("SELECT COUNT(DISTINCT host) FROM frontier").fetchone()[0]
+        conn.close()
+        return {'by_status': counts, 'ready': ready, 'hosts': hosts, 'total': sum(counts.values())}
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        entry = dict(row)
+        entry['payload'] = json.loads(entry['payload']) if entry.get('payload') else {}
+        return entry
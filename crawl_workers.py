@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Multi-process crawl workers sharing one crawl frontier
+- A coordinator owns the frontier and the job store; worker processes lease
+  fetch/parse tasks from it over a socket (TCP, or a Unix socket path), so
+  scraping and BeautifulSoup parsing run on every core instead of one GIL
+- Parsed records come back column-oriented (field names once, then value
+  rows) in compact JSON frames, zlib-compressed when large
+- A task is completed in the frontier only after its records are stored,
+  so a worker dying mid-task just lets its lease expire and the task rerun
+- The same protocol scales scraper pods horizontally: run one coordinator
+  and point any number of `worker` replicas at it
+
+    python crawl_workers.py local --workers 8
+    python crawl_workers.py coordinator --bind 0.0.0.0:7070
+    python crawl_workers.py worker --coordinator crawl-coordinator-service:7070 --processes 4
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+import zlib
+from dataclasses import fields
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from crawl_frontier import DEFAULT_DB_PATH, CrawlFrontier
+from json_responses import dumps
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 7070
+# 4-byte length + 1-byte flags, then the (possibly compressed) JSON body
+HEADER = struct.Struct('!IB')
+FLAG_ZLIB = 1
+COMPRESS_THRESHOLD = 4096
+MAX_FRAME = 64 * 1024 * 1024
+
+Address = Union[str, Tuple[str, int]]
+
+
+class ProtocolError(Exception):
+    """Malformed or oversized frame, or an error reported by the coordinator"""
+
+
+def _loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any]):
+    body = dumps(message)
+    flags = 0
+    if len(body) > COMPRESS_THRESHOLD:
+        body = zlib.compress(body, 1)
+        flags |= FLAG_ZLIB
+    sock.sendall(HEADER.pack(len(body), flags) + body)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def recv_message(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """Read one frame; None when the peer closed the connection"""
+    header = _recv_exactly(sock, HEADER.size)
+    if header is None:
+        return None
+    length, flags = HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ProtocolError(f"Frame of {length} bytes exceeds {MAX_FRAME}")
+    body = _recv_exactly(sock, length) if length else b''
+    if body is None:
+        raise ProtocolError("Connection closed mid-frame")
+    if flags & FLAG_ZLIB:
+        body = zlib.decompress(body)
+    return _loads(body)
+
+
+def parse_address(address: Address) -> Address:
+    """``host:port`` -> (host, port); anything with a slash is a Unix socket path"""
+    if isinstance(address, tuple) or '/' in address:
+        return address
+    host, _, port = address.rpartition(':')
+    return (host or '127.0.0.1', int(port or DEFAULT_PORT))
+
+
+# Record encoding: JobPosting <-> {"fields": [...], "rows": [[...], ...]}
+
+def _posting_fields() -> Tuple[str, ...]:
+    from clickhouse_web_crawler import JobPosting
+    return tuple(field.name for field in fields(JobPosting))
+
+
+DATETIME_FIELDS = ('posted_date', 'expires_date', 'created_at', 'updated_at')
+
+
+def encode_records(postings: List[Any]) -> Dict[str, Any]:
+    names = _posting_fields()
+    rows = []
+    for posting in postings:
+        row = [getattr(posting, name) for name in names]
+        rows.append([value.isoformat() if isinstance(value, datetime) else value for value in row])
+    return {'fields': list(names), 'rows': rows}
+
+
+def decode_records(records: Dict[str, Any]) -> List[Any]:
+    from clickhouse_web_crawler import JobPosting
+
+    names = records['fields']
+    dates = [i for i, name in enumerate(names) if name in DATETIME_FIELDS]
+    postings = []
+    for row in records['rows']:
+        for i in dates:
+            if row[i]:
+                row[i] = datetime.fromisoformat(row[i])
+        postings.append(JobPosting(**dict(zip(names, row))))
+    return postings
+
+
+class CrawlCoordinator:
+    """Serves frontier leases to workers and stores the records they return"""
+
+    def __init__(self, frontier: CrawlFrontier, storage, lease_limit: int = 4):
+        self.frontier = frontier
+        self.storage = storage
+        self.lease_limit = lease_limit
+        # The job stores are not safe for concurrent writers
+        self._store_lock = threading.Lock()
+        self.server: Optional[socketserver.BaseServer] = None
+        self.stats = {'leased': 0, 'completed': 0, 'failed': 0, 'records': 0, 'inserted': 0}
+        # handle() runs on one server thread per worker connection
+        self._stats_lock = threading.Lock()
+
+    def handle(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        op = message.get('op')
+        if op == 'lease':
+            entries = self.frontier.lease(message['worker'], min(message.get('limit', 1), self.lease_limit),
+                                          kinds=message.get('kinds'))
+            self._count(leased=len(entries))
+            return {'entries': [
+                {'key': entry['key'], 'kind': entry['kind'], 'url': entry['url'],
+                 'payload': entry['payload'], 'attempts': entry['attempts']}
+                for entry in entries
+            ]}
+        if op == 'complete':
+            postings = decode_records(message['records']) if message.get('records') else []
+            inserted = 0
+            if postings:
+                with self._store_lock:
+                    inserted = self.storage.insert_jobs(postings)
+            self.frontier.complete(message['key'], status=message.get('status', 'ok'))
+            self._count(completed=1, records=len(postings), inserted=inserted)
+            return {'ok': True, 'inserted': inserted}
+        if op == 'fail':
+            self.frontier.fail(message['key'], message.get('error', 'unknown error'),
+                               host_backoff=message.get('host_backoff', 0))
+            self._count(failed=1)
+            return {'ok': True}
+        if op == 'release':
+            self.frontier.release(message['key'])
+            return {'ok': True}
+        if op == 'stats':
+            with self._stats_lock:
+                stats = dict(self.stats)
+            return {'coordinator': stats, 'frontier': self.frontier.stats()}
+        raise ProtocolError(f"Unknown op {op!r}")
+
+    def _count(self, **amounts: int):
+        with self._stats_lock:
+            for name, amount in amounts.items():
+                self.stats[name] += amount
+
+    def serve(self, address: Address) -> Address:
+        """Start serving on a background thread; returns the bound address"""
+        coordinator = self
+        address = parse_address(address)
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                while True:
+                    try:
+                        message = recv_message(self.request)
+                    except (ProtocolError, OSError) as e:
+                        logger.warning(f"Dropping crawl worker connection: {e}")
+                        return
+                    if message is None:
+                        return
+                    try:
+                        reply = coordinator.handle(message)
+                    except Exception as e:
+                        logger.error(f"Coordinator failed on {message.get('op')}: {e}")
+                        reply = {'error': f"{type(e).__name__}: {e}"}
+                    send_message(self.request, reply)
+
+        if isinstance(address, tuple):
+            base = socketserver.ThreadingTCPServer
+        else:
+            if os.path.exists(address):
+                os.unlink(address)
+            base = socketserver.ThreadingUnixStreamServer
+
+        # Options on a subclass, not on the stdlib classes other servers in the process share
+        class Server(base):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        self.server = Server(address, Handler)
+        threading.Thread(target=self.server.serve_forever, name='crawl-coordinator', daemon=True).start()
+
+        bound = self.server.server_address
+        logger.info(f"🧭 Crawl coordinator listening on {bound}")
+        return bound
+
+    def shutdown(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+class CoordinatorClient:
+    """Worker-side connection; reconnects once on a dropped socket"""
+
+    def __init__(self, address: Address, timeout: float = 120.0):
+        self.address = parse_address(address)
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+
+    def _connect(self) -> socket.socket:
+        if isinstance(self.address, tuple):
+            sock = socket.create_connection(self.address, timeout=self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.address)
+        return sock
+
+    def call(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        for attempt in (1, 2):
+            try:
+                if self._sock is None:
+                    self._sock = self._connect()
+                send_message(self._sock, message)
+                reply = recv_message(self._sock)
+                if reply is None:
+                    raise ConnectionError("Coordinator closed the connection")
+                break
+            except OSError:
+                self.close()
+                if attempt == 2:
+                    raise
+        if 'error' in reply:
+            raise ProtocolError(reply['error'])
+        return reply
+
+    def lease(self, worker_id: str, limit: int = 1, kinds: Iterable[str] = None) -> List[Dict[str, Any]]:
+        message = {'op': 'lease', 'worker': worker_id, 'limit': limit}
+        if kinds is not None:
+            message['kinds'] = list(kinds)
+        return self.call(message)['entries']
+
+    def complete(self, key: str, postings: List[Any], status: str = 'ok') -> int:
+        message = {'op': 'complete', 'key': key, 'status': status, 'records': encode_records(postings)}
+        return self.call(message)['inserted']
+
+    def fail(self, key: str, error: str, host_backoff: float = 0):
+        self.call({'op': 'fail', 'key': key, 'error': error, 'host_backoff': host_backoff})
+
+    def stats(self) -> Dict[str, Any]:
+        return self.call({'op': 'stats'})
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+
+def _scrape_source(scraper, entry: Dict[str, Any]) -> List[Any]:
+    payload = entry['payload']
+    return scraper.scrape_source(payload['source'], payload.get('max_jobs', 50))
+
+
+# Frontier entry kind -> fetch/parse function(scraper, entry) returning JobPostings
+TASK_HANDLERS: Dict[str, Callable[[Any, Dict[str, Any]], List[Any]]] = {
+    'source': _scrape_source,
+}
+
+
+class CrawlWorker:
+    """Leases tasks from a coordinator, fetches and parses them, sends back records"""
+
+    def __init__(self, address: Address, worker_id: str = None, poll_interval: float = 2.0, scraper=None):
+        self.client = CoordinatorClient(address)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.poll_interval = poll_interval
+        if scraper is None:
+            from clickhouse_web_crawler import JobScraper
+            scraper = JobScraper(storage=None)
+        self.scraper = scraper
+        self.running = False
+
+    def run_once(self) -> bool:
+        """Process one leased task; returns False when nothing was due"""
+        # Only kinds this worker has handlers for; the frontier may hold other crawlers' entries
+        entries = self.client.lease(self.worker_id, kinds=TASK_HANDLERS)
+        if not entries:
+            return False
+        entry = entries[0]
+        handler = TASK_HANDLERS.get(entry['kind'])
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for frontier entry kind {entry['kind']!r}")
+            postings = handler(self.scraper, entry)
+        except Exception as e:
+            logger.warning(f"⚠️ Worker {self.worker_id} failed {entry['key']}: {e}")
+            self.client.fail(entry['key'], f"{type(e).__name__}: {e}")
+            return True
+
+        inserted = self.client.complete(entry['key'], postings, status=f"{len(postings)} jobs")
+        logger.info(f"✅ Worker {self.worker_id} {entry['key']}: {len(postings)} jobs, {inserted} new")
+        return True
+
+    def run_forever(self):
+        self.running = True
+        logger.info(f"🚀 Crawl worker {self.worker_id} started")
+        while self.running:
+            try:
+                if not self.run_once():
+                    time.sleep(self.poll_interval)
+            except (OSError, ProtocolError) as e:
+                logger.warning(f"Coordinator unavailable ({e}), retrying in {self.poll_interval * 5:.0f}s")
+                time.sleep(self.poll_interval * 5)
+
+    def stop(self):
+        self.running = False
+
+
+def _worker_main(address: Address, poll_interval: float):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    CrawlWorker(address, poll_interval=poll_interval).run_forever()
+
+
+def start_worker_processes(address: Address, num_workers: int = None,
+                           poll_interval: float = 2.0) -> List[multiprocessing.Process]:
+    """Start daemon crawl worker processes talking to the coordinator at ``address``"""
+    num_workers = num_workers or os.cpu_count() or 1
+    processes = []
+    for _ in range(num_workers):
+        process = multiprocessing.Process(target=_worker_main, args=(address, poll_interval), daemon=True)
+        process.start()
+        processes.append(process)
+
+    logger.info(f"🧵 Started {num_workers} crawl worker processes on {address}")
+    return processes
+
+
+def _coordinator_from_args(args) -> CrawlCoordinator:
+    from clickhouse_web_crawler import ClickHouseJobStorage, DistributedCrawler
+
+    storage = ClickHouseJobStorage(host=args.clickhouse_host, port=args.clickhouse_port,
+                                   database=args.clickhouse_db)
+    frontier = CrawlFrontier(args.db)
+    # Sources are registered as recurring frontier entries, exactly as the threaded crawler does
+    DistributedCrawler(storage, frontier=frontier).seed_frontier(args.interval)
+    return CrawlCoordinator(frontier, storage)
+
+
+def _log_stats_forever(coordinator: CrawlCoordinator, processes: List[multiprocessing.Process] = ()):
+    try:
+        while True:
+            time.sleep(60)
+            logger.info(f"📊 Crawl coordinator: {coordinator.stats} frontier: {coordinator.frontier.stats()}")
+            for process in processes:
+                if not process.is_alive():
+                    logger.warning(f"Crawl worker process {process.pid} exited ({process.exitcode})")
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        coordinator.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process crawl workers sharing one frontier")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def coordinator_options(sub):
+        sub.add_argument('--db', default=DEFAULT_DB_PATH, help="Crawl frontier database path")
+        sub.add_argument('--interval', type=int, default=60, help="Minutes between visits of each source")
+        sub.add_argument('--clickhouse-host', default=os.getenv('CLICKHOUSE_HOST', 'localhost'))
+        sub.add_argument('--clickhouse-port', type=int, default=int(os.getenv('CLICKHOUSE_PORT', '8123')))
+        sub.add_argument('--clickhouse-db', default=os.getenv('CLICKHOUSE_DB', 'jobright_db'))
+
+    local = subparsers.add_parser('local', help="Coordinator plus N worker processes on this machine")
+    coordinator_options(local)
+    local.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes")
+
+    coordinator = subparsers.add_parser('coordinator', help="Serve the frontier to remote workers")
+    coordinator_options(coordinator)
+    coordinator.add_argument('--bind', default=f"0.0.0.0:{DEFAULT_PORT}", help="host:port or Unix socket path")
+
+    worker = subparsers.add_parser('worker', help="Worker processes leasing from a coordinator")
+    worker.add_argument('--coordinator', default=os.getenv('CRAWL_COORDINATOR', f"127.0.0.1:{DEFAULT_PORT}"))
+    worker.add_argument('--processes', type=int, default=os.cpu_count(), help="Worker processes")
+    worker.add_argument('--poll-interval', type=float, default=2.0, help="Seconds between polls when idle")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.command == 'worker':
+        processes = start_worker_processes(args.coordinator, args.processes, args.poll_interval)
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+        return
+
+    server = _coordinator_from_args(args)
+    if args.command == 'coordinator':
+        server.serve(args.bind)
+        _log_stats_forever(server)
+    else:
+        address = server.serve(('127.0.0.1', 0))
+        _log_stats_forever(server, start_worker_processes(address, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Opt-in profiling hooks for the long-running daemons
+- Sampling profiler: a background thread snapshots every thread's stack
+  (``sys._current_frames``) at a fixed interval and aggregates them as
+  flamegraph-compatible collapsed stacks (``flamegraph.pl``, speedscope)
+- Per-stage wall/CPU timers (``with stage('scrape'):``), always on and cheap
+- Periodic tracemalloc top-N snapshots with growth since the previous one
+- Everything is dumpable without restarting: SIGUSR1 toggles the sampler
+  (dumping stacks when it stops), SIGUSR2 dumps stacks, stage timers and a
+  memory snapshot; Flask daemons can also mount /debug/profile/* routes
+
+Enable with PROFILING_ENABLED=1; tune with PROFILING_DIR (default profiles),
+PROFILING_INTERVAL (seconds between samples, default 0.01),
+PROFILING_MEMORY_INTERVAL (seconds between tracemalloc snapshots, default
+300, 0 disables) and PROFILING_TOP_N (default 25).
+
+    kill -USR1 <pid>   # start sampling ... kill -USR1 <pid> again to stop and dump
+    kill -USR2 <pid>   # dump everything collected so far
+    flamegraph.pl profiles/continuous_job_scraper-1234-*.collapsed > flame.svg
+"""
+
+import json
+import linecache
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 0.01
+DEFAULT_MEMORY_INTERVAL = 300.0
+DEFAULT_TOP_N = 25
+# The profiler's own threads are never sampled
+HELPER_THREADS = {'sampling-profiler', 'tracemalloc-sampler'}
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    # Keep the last two path components; full paths make flamegraphs unreadable
+    short = os.path.join(os.path.basename(os.path.dirname(filename)), os.path.basename(filename))
+    return f"{code.co_name} ({short}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Wall-clock sampler of all threads, aggregated into collapsed stacks"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, max_depth: int = 128):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self._stacks: Counter = Counter()
+        self._labels: Dict[object, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        if self.running:
+            return False
+        self._stop.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> bool:
+        if not self.running:
+            return False
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample_once()
+
+    def sample_once(self):
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own or names.get(ident) in HELPER_THREADS:
+                continue
+            frames = []
+            while frame is not None and len(frames) < self.max_depth:
+                code = frame.f_code
+                label = self._labels.get(code)
+                if label is None:
+                    label = self._labels[code] = _frame_label(code)
+                frames.append(label)
+                frame = frame.f_back
+            frames.append(names.get(ident, f"thread-{ident}"))
+            stacks.append(';'.join(reversed(frames)))
+        with self._lock:
+            self._stacks.update(stacks)
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """``root;caller;callee count`` lines, heaviest first"""
+        with self._lock:
+            items = self._stacks.most_common()
+        return ''.join(f"{stack} {count}\n" for stack, count in items)
+
+    def clear(self):
+        with self._lock:
+            self._stacks.clear()
+            self.samples = 0
+        self.started_at = time.time() if self.running else None
+
+
+class StageTimers:
+    """Accumulated wall and CPU time per named stage of a daemon loop"""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - wall, time.thread_time() - cpu)
+
+    def record(self, name: str, wall: float, cpu: float):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = {'count': 0, 'wall_total': 0.0, 'cpu_total': 0.0,
+                                             'wall_max': 0.0, 'wall_last': 0.0}
+            stats['count'] += 1
+            stats['wall_total'] += wall
+            stats['cpu_total'] += cpu
+            stats['wall_max'] = max(stats['wall_max'], wall)
+            stats['wall_last'] = wall
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            snapshot = {name: dict(stats) for name, stats in self._stats.items()}
+        for stats in snapshot.values():
+            stats['wall_mean'] = stats['wall_total'] / stats['count']
+            # Low CPU share means the stage is waiting on I/O, locks or sleeps
+            stats['cpu_ratio'] = stats['cpu_total'] / stats['wall_total'] if stats['wall_total'] else 0.0
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+class MemorySampler:
+    """Periodic tracemalloc top-N allocation sites and growth since the last snapshot"""
+
+    def __init__(self, interval: float = DEFAULT_MEMORY_INTERVAL, top_n: int = DEFAULT_TOP_N,
+                 frames: int = 1, keep: int = 12, on_report: Callable[[str], None] = None):
+        self.interval = interval
+        self.top_n = top_n
+        self.frames = frames
+        self.reports: Deque[str] = deque(maxlen=keep)
+        self.on_report = on_report
+        self._previous = None
+        self._owns_tracing = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._ensure_tracing()
+        if self.interval and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='tracemalloc-sampler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+            self._previous = None
+
+    def _ensure_tracing(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._owns_tracing = True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.take()
+            except Exception as e:
+                logger.error(f"tracemalloc snapshot failed: {e}")
+
+    def take(self) -> str:
+        """Take a snapshot now and return its report"""
+        with self._lock:
+            return self._take()
+
+    def _take(self) -> str:
+        self._ensure_tracing()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, linecache.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"# tracemalloc {datetime.now().isoformat()} current={current / 1024 ** 2:.1f}MiB "
+                 f"peak={peak / 1024 ** 2:.1f}MiB", f"## top {self.top_n} by size"]
+        for stat in snapshot.statistics('lineno')[:self.top_n]:
+            lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {stat.traceback}")
+
+        if self._previous is not None:
+            lines.append(f"## top {self.top_n} growth since previous snapshot")
+            for stat in snapshot.compare_to(self._previous, 'lineno')[:self.top_n]:
+                lines.append(f"{stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8d} blocks  {stat.traceback}")
+        self._previous = snapshot
+
+        report = '\n'.join(lines) + '\n'
+        self.reports.append(report)
+        if self.on_report:
+            self.on_report(report)
+        return report
+
+
+timers = StageTimers()
+stage = timers.stage
+
+
+class DaemonProfiler:
+    """Sampler, stage timers and memory snapshots for one process, with dump-to-disk"""
+
+    def __init__(self, service: str, output_dir: str = 'profiles', interval: float = DEFAULT_INTERVAL,
+                 memory_interval: float = DEFAULT_MEMORY_INTERVAL, top_n: int = DEFAULT_TOP_N,
+                 stage_timers: StageTimers = None):
+        self.service = service
+        self.output_dir = os.path.abspath(output_dir)
+        self.sampler = SamplingProfiler(interval)
+        self.timers = stage_timers or timers
+        self.memory = MemorySampler(memory_interval, top_n, on_report=self._write_memory_report)
+
+    def _path(self, suffix: str, stamp: str = None) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        name = f"{self.service}-{os.getpid()}" + (f"-{stamp}" if stamp else '')
+        return os.path.join(self.output_dir, f"{name}.{suffix}")
+
+    def _write_memory_report(self, report: str):
+        # The latest periodic snapshot is always on disk, even if nobody asks for a dump
+        with open(self._path('memory.txt'), 'w') as f:
+            f.write(report)
+
+    def start(self):
+        if self.memory.interval:
+            self.memory.start()
+        return self
+
+    def shutdown(self):
+        self.sampler.stop()
+        self.memory.stop()
+
+    def toggle_sampling(self) -> Dict[str, str]:
+        """Start sampling, or stop it and dump the collapsed stacks"""
+        if self.sampler.running:
+            self.sampler.stop()
+            paths = self.dump(memory=False)
+            self.sampler.clear()
+            return paths
+        self.sampler.start()
+        logger.info(f"🔬 Sampling profiler started ({self.sampler.interval * 1000:.0f}ms interval)")
+        return {}
+
+    def dump(self, stacks: bool = True, stages: bool = True, memory: bool = True) -> Dict[str, str]:
+        """Write what has been collected so far; returns the written paths by kind"""
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        paths = {}
+        if stacks and self.sampler.samples:
+            paths['stacks'] = self._path('collapsed', stamp)
+            with open(paths['stacks'], 'w') as f:
+                f.write(self.sampler.collapsed())
+        if stages:
+            paths['stages'] = self._path('stages.json', stamp)
+            with open(paths['stages'], 'w') as f:
+                json.dump(self.timers.snapshot(), f, indent=2, sort_keys=True)
+        if memory:
+            paths['memory'] = self._path('memory.txt', stamp)
+            with open(paths['memory'], 'w') as f:
+                f.write(self.memory.take())
+        logger.info(f"🔬 Profile dumped: {', '.join(paths.values()) or 'nothing collected'}")
+        return paths
+
+    def status(self) -> Dict:
+        return {
+            'service': self.service,
+            'pid': os.getpid(),
+            'sampling': self.sampler.running,
+            'samples': self.sampler.samples,
+            'interval': self.sampler.interval,
+            'tracemalloc': tracemalloc.is_tracing(),
+            'output_dir': self.output_dir,
+            'stages': self.timers.snapshot()
+        }
+
+    def install_signals(self) -> bool:
+        """SIGUSR1 toggles sampling, SIGUSR2 dumps everything; main thread, POSIX only"""
+        if not hasattr(signal, 'SIGUSR1') or threading.current_thread() is not threading.main_thread():
+            return False
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self._from_signal(self.toggle_sampling))
+        signal.signal(signal.SIGUSR2, lambda signum, frame: self._from_signal(self.dump))
+        return True
+
+    @staticmethod
+    def _from_signal(action):
+        # Never let a failed dump take the daemon down
+        try:
+            action()
+        except Exception as e:
+            logger.error(f"Profiler signal handler failed: {e}")
+
+
+_profiler: Optional[DaemonProfiler] = None
+
+
+def profiling_enabled() -> bool:
+    return os.environ.get('PROFILING_ENABLED', '').lower() in ('1', 'true', 'yes')
+
+
+def get_profiler() -> Optional[DaemonProfiler]:
+    return _profiler
+
+
+def install(service: str, force: bool = False) -> Optional[DaemonProfiler]:
+    """Set up the process profiler when PROFILING_ENABLED is set (or ``force``); idempotent"""
+    global _profiler
+    if _profiler is not None:
+        return _profiler
+    if not (force or profiling_enabled()):
+        return None
+
+    _profiler = DaemonProfiler(
+        service,
+        output_dir=os.environ.get('PROFILING_DIR', 'profiles'),
+        interval=float(os.environ.get('PROFILING_INTERVAL', DEFAULT_INTERVAL)),
+        memory_interval=float(os.environ.get('PROFILING_MEMORY_INTERVAL', DEFAULT_MEMORY_INTERVAL)),
+        top_n=int(os.environ.get('PROFILING_TOP_N', DEFAULT_TOP_N))
+    ).start()
+    signals = _profiler.install_signals()
+    logger.info(f"🔬 Profiling enabled for {service} (pid {os.getpid()}, "
+                f"{'SIGUSR1/SIGUSR2' if signals else 'no signal'} triggers, dumps in {_profiler.output_dir})")
+    return _profiler
+
+
+def register_routes(app, profiler: DaemonProfiler = None):
+    """Mount /debug/profile/* on a Flask app; only when profiling is installed"""
+    from flask import Response, jsonify, request
+
+    profiler = profiler or _profiler
+    if profiler is None or 'profile_status' in app.view_functions:
+        return app
+
+    def profile_status():
+        return jsonify(profiler.status())
+
+    def profile_start():
+        return jsonify({'started': profiler.sampler.start()})
+
+    def profile_stop():
+        stopped = profiler.sampler.running
+        paths = profiler.toggle_sampling() if stopped else {}
+        return jsonify({'stopped': stopped, 'paths': paths})
+
+    def profile_stacks():
+        # ?seconds=N samples for N seconds (if not already sampling) and returns the stacks
+        seconds = min(float(request.args.get('seconds', 0)), 300.0)
+        if seconds and not profiler.sampler.running:
+            sampler = SamplingProfiler(profiler.sampler.interval)
+            sampler.start()
+            time.sleep(seconds)
+            sampler.stop()
+            return Response(sampler.collapsed(), mimetype='text/plain')
+        return Response(profiler.sampler.collapsed(), mimetype='text/plain')
+
+    def profile_memory():
+        return Response(profiler.memory.take(), mimetype='text/plain')
+
+    def profile_dump():
+        return jsonify({'paths': profiler.dump()})
+
+    app.add_url_rule('/debug/profile', 'profile_status', profile_status)
+    app.add_url_rule('/debug/profile/start', 'profile_start', profile_start, methods=['POST'])
+    app.add_url_rule('/debug/profile/stop', 'profile_stop', profile_stop, methods=['POST'])
+    app.add_url_rule('/debug/profile/stacks', 'profile_stacks', profile_stacks)
+    app.add_url_rule('/debug/profile/memory', 'profile_memory', profile_memory)
+    app.add_url_rule('/debug/profile/dump', 'profile_dump', profile_dump, methods=['POST'])
+    return app
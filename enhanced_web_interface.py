@@ -12,9 +12,15 @@ import json
 import sqlite3
 import asyncio
 from datetime import datetime, timedelta
-from comprehensive_job_automation_system import ComprehensiveAutomationSystem
-import threading
 import logging
+import os
+from collections import Counter
+from task_queue import TaskContext, get_task_queue, start_worker_processes
+from event_stream import get_task_bridge, sse_response
+from response_cache import cached_response
+from json_responses import enable_compression
+from app_metrics import instrument_app, track_task_queue
+from tracing import trace_app
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,10 +28,13 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'
+instrument_app(app, 'enhanced_web_interface')
+trace_app(app)
+enable_compression(app)
 
 # Global system instance
 automation_system = None
-background_tasks = {}
+track_task_queue(get_task_queue)
 
 def get_db_connection():
     """Get database connection"""
@@ -193,20 +202,11 @@ def scrape_jobs():
     try:
         target_jobs = request.form.get('target_jobs', 1000, type=int)
 
-        # Start background scraping task
-        task_id = f"scrape_{datetime.now().timestamp()}"
-        thread = threading.Thread(target=run_scraping_task, args=(task_id, target_jobs))
-        thread.daemon = True
-        thread.start()
-
-        background_tasks[task_id] = {
-            'status': 'running',
-            'started_at': datetime.now(),
-            'target_jobs': target_jobs,
-            'progress': 0
-        }
+        # Queue background scraping task
+        task_id = get_task_queue().enqueue('enhanced_web_interface:run_scraping_task',
+                                     {'target_jobs': target_jobs})
 
-        flash(f'Job scraping started! Target: {target_jobs} jobs', 'success')
+        flash(f'Job scraping queued (task {task_id})! Target: {target_jobs} jobs', 'success')
         return redirect(url_for('dashboard'))
 
     except Exception as e:
@@ -222,21 +222,15 @@ def batch_apply():
         time_limit = request.form.get('time_limit', 1, type=int)
         min_confidence = request.form.get('min_confidence', 0.7, type=float)
 
-        # Start background application task
-        task_id = f"apply_{datetime.now().timestamp()}"
-        thread = threading.Thread(target=run_application_task,
-                                args=(task_id, target_applications, time_limit, min_confidence))
-        thread.daemon = True
-        thread.start()
-
-        background_tasks[task_id] = {
-            'status': 'running',
-            'started_at': datetime.now(),
+        # Queue background application task; one attempt, since a retry would start over
+        # and submit the applications made before the failure again
+        task_id = get_task_queue().enqueue('enhanced_web_interface:run_application_task', {
             'target_applications': target_applications,
-            'progress': 0
-        }
+            'time_limit': time_limit,
+            'min_confidence': min_confidence
+        }, max_attempts=1)
 
-        flash(f'Batch applications started! Target: {target_applications} applications', 'success')
+        flash(f'Batch applications queued (task {task_id})! Target: {target_applications} applications', 'success')
         return redirect(url_for('dashboard'))
 
     except Exception as e:
@@ -247,10 +241,24 @@ def batch_apply():
 @app.route('/api/task-status/<task_id>')
 def task_status(task_id):
     """Get status of background task"""
-    if task_id in background_tasks:
-        return jsonify(background_tasks[task_id])
-    else:
+    status = get_task_queue().get_status(task_id)
+    if status is None:
         return jsonify({'status': 'not_found'}), 404
+    return jsonify(status)
+
+@app.route('/api/tasks/<task_id>/cancel', methods=['POST'])
+def cancel_task(task_id):
+    """Cancel a queued or running background task"""
+    if not get_task_queue().cancel(task_id):
+        return jsonify({'error': 'Task not found or already finished'}), 409
+    return jsonify(get_task_queue().get_status(task_id))
+
+@app.route('/api/events')
+def event_stream():
+    """Server-Sent Events stream of task progress and scrape throughput"""
+    get_task_bridge().ensure_started()
+    topics = request.args.get('topics')
+    return sse_response(topics.split(',') if topics else None)
 
 @app.route('/automation-patterns')
 def automation_patterns():
@@ -317,6 +325,7 @@ def settings():
         return render_template('error.html', error=str(e))
 
 @app.route('/api/stats')
+@cached_response('comprehensive_jobs')
 def api_stats():
     """API endpoint for dashboard statistics"""
     try:
@@ -366,84 +375,62 @@ def api_stats():
         logger.error(f"API stats error: {e}")
         return jsonify({'error': str(e)}), 500
 
-def run_scraping_task(task_id, target_jobs):
-    """Background task for job scraping"""
-    try:
-        global automation_system
-        if not automation_system:
-            automation_system = ComprehensiveAutomationSystem()
+def get_automation_system():
+    """Build the automation system on first use; it pulls in selenium, aiohttp and ClickHouse"""
+    global automation_system
+    if not automation_system:
+        from comprehensive_job_automation_system import ComprehensiveAutomationSystem
+        automation_system = ComprehensiveAutomationSystem()
+    return automation_system
 
-        # Update task status
-        background_tasks[task_id]['status'] = 'scraping'
+def run_scraping_task(payload, ctx: TaskContext):
+    """Task queue handler for job scraping"""
+    automation_system = get_automation_system()
 
-        # Run scraping (synchronous call in thread)
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+    target_jobs = payload.get('target_jobs', 1000)
+    ctx.progress(5, stage='scraping')
 
+    # Run scraping (synchronous call in worker process)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
         results = loop.run_until_complete(
             automation_system.scraper.scrape_all_jobs(limit=target_jobs)
         )
+    finally:
+        loop.close()
 
-        # Save results
-        saved_count = automation_system.storage.save_jobs(results)
-
-        # Update task status
-        background_tasks[task_id].update({
-            'status': 'completed',
-            'completed_at': datetime.now(),
-            'jobs_found': len(results),
-            'jobs_saved': saved_count,
-            'progress': 100
-        })
+    ctx.progress(80, stage='saving', jobs_found=len(results),
+                 sources=dict(Counter(job.source for job in results)))
 
-        loop.close()
+    # Save results
+    saved_count = automation_system.storage.save_jobs(results)
 
-    except Exception as e:
-        logger.error(f"Scraping task {task_id} failed: {e}")
-        background_tasks[task_id].update({
-            'status': 'failed',
-            'error': str(e),
-            'completed_at': datetime.now()
-        })
-
-def run_application_task(task_id, target_applications, time_limit, min_confidence):
-    """Background task for batch applications"""
-    try:
-        global automation_system
-        if not automation_system:
-            automation_system = ComprehensiveAutomationSystem()
+    return {
+        'jobs_found': len(results),
+        'jobs_saved': saved_count
+    }
 
-        # Update task status
-        background_tasks[task_id]['status'] = 'applying'
+def run_application_task(payload, ctx: TaskContext):
+    """Task queue handler for batch applications"""
+    automation_system = get_automation_system()
 
-        # Run applications (synchronous call in thread)
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+    ctx.progress(5, stage='applying')
 
+    # Run applications (synchronous call in worker process)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
         results = loop.run_until_complete(
             automation_system.batch_system.run_batch_applications(
-                target_applications=target_applications,
-                time_limit_hours=time_limit
+                target_applications=payload.get('target_applications', 50),
+                time_limit_hours=payload.get('time_limit', 1)
             )
         )
-
-        # Update task status
-        background_tasks[task_id].update({
-            'status': 'completed',
-            'completed_at': datetime.now(),
-            'results': results,
-            'progress': 100
-        })
-
+    finally:
         loop.close()
 
-    except Exception as e:
-        logger.error(f"Application task {task_id} failed: {e}")
-        background_tasks[task_id].update({
-            'status': 'failed',
-            'error': str(e),
-            'completed_at': datetime.now()
-        })
+    return results
 
 # Enhanced HTML Templates (inline for simplicity)
 def create_templates():
@@ -582,6 +569,15 @@ def create_templates():
             </div>
         </div>
 
+        <!-- Live Task Progress -->
+        <div class="bg-white p-6 rounded-lg shadow-sm border mb-8">
+            <h3 class="text-lg font-semibold mb-4">Live Activity</h3>
+            <div id="liveTasks" class="space-y-2 text-sm text-gray-700">
+                <p class="text-gray-500">Waiting for background task updates...</p>
+            </div>
+            <div id="liveScrapes" class="mt-4 text-sm text-gray-700"></div>
+        </div>
+
         <!-- Charts and Data -->
         <div class="grid grid-cols-1 lg:grid-cols-2 gap-6">
             <div class="bg-white p-6 rounded-lg shadow-sm border">
@@ -613,6 +609,29 @@ def create_templates():
     </div>
 
     <script>
+        // Live task progress pushed over Server-Sent Events
+        const liveTasks = {};
+        const events = new EventSource('/api/events?topics=task,scrape');
+        events.addEventListener('task', (e) => {
+            const task = JSON.parse(e.data);
+            liveTasks[task.id] = task;
+            document.getElementById('liveTasks').innerHTML = Object.values(liveTasks)
+                .slice(-10)
+                .map(t => `<div class="flex justify-between"><span>${t.handler.split(':')[1]} (${t.id.slice(0, 8)})</span>` +
+                          `<span>${t.status} • ${Math.round(t.progress)}%</span></div>`)
+                .join('');
+        });
+        events.addEventListener('scrape', (e) => {
+            const stats = JSON.parse(e.data);
+            const errors = stats.errors || {};
+            document.getElementById('liveScrapes').innerHTML =
+                `<div class="font-medium">Scraping ${stats.throughput_per_sec.toFixed(1)} jobs/sec</div>` +
+                Object.entries(stats.sources)
+                    .map(([source, count]) => `<div class="flex justify-between"><span>${source}</span>` +
+                        `<span>${count} jobs${errors[source] ? `, ${errors[source]} failed pages` : ''}</span></div>`)
+                    .join('');
+        });
+
         // Source distribution chart
         const sourceCtx = document.getElementById('sourceChart').getContext('2d');
         const sourceChart = new Chart(sourceCtx, {
@@ -639,12 +658,20 @@ def create_templates():
 </html>
         """)
 
+def create_app(start_workers: bool = True):
+    """Application factory; background task workers are started explicitly here"""
+    if start_workers:
+        start_worker_processes(num_workers=int(os.getenv('TASK_WORKERS', 2)))
+    return app
+
 if __name__ == "__main__":
     # Create templates
     create_templates()
 
-    # Initialize the system
+    # Initialize the system; the debug reloader runs this block in a watcher process and
+    # again in the serving child (WERKZEUG_RUN_MAIN set), and only the child starts workers
     logger.info("🚀 Starting enhanced web interface...")
+    create_app(start_workers=os.environ.get('WERKZEUG_RUN_MAIN') == 'true')
 
     # Run the Flask app
     app.run(host='0.0.0.0', port=5000, debug=True, threaded=True)
\ No newline at end of file
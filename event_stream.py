@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+In-process pub/sub and Server-Sent Events streaming
+- EventBus fans events out to per-client bounded queues
+- ScrapeStats tracks per-source scrape counts and rolling throughput
+- TaskQueueBridge relays task progress and events written by worker processes
+- sse_response turns a subscription into a text/event-stream response
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque, defaultdict
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """A subscriber's view of the bus; iterate or call get() to receive events"""
+
+    def __init__(self, bus: 'EventBus', topics: Optional[Iterable[str]], max_queue: int):
+        self.bus = bus
+        self.topics = set(topics) if topics else None
+        self.events = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def wants(self, topic: str) -> bool:
+        return self.topics is None or topic in self.topics
+
+    def deliver(self, event: Dict[str, Any]):
+        # Slow consumers lose their oldest events instead of blocking publishers
+        while True:
+            try:
+                self.events.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.events.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: float = None) -> Optional[Dict[str, Any]]:
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventBus:
+    """Thread-safe topic based publish/subscribe"""
+
+    def __init__(self, max_queue: int = 1000):
+        self.max_queue = max_queue
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._sequence = 0
+
+    def subscribe(self, topics: Iterable[str] = None) -> Subscription:
+        subscription = Subscription(self, topics, self.max_queue)
+        with self._lock:
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, topic: str, data: Dict[str, Any]):
+        with self._lock:
+            self._sequence += 1
+            event = {'id': self._sequence, 'topic': topic, 'time': time.time(), 'data': data}
+            subscribers = [s for s in self._subscribers if s.wants(topic)]
+
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+
+class ScrapeStats:
+    """Per-source scrape and error counters with a rolling jobs/second window"""
+
+    def __init__(self, bus: EventBus, window_seconds: float = 60.0):
+        self.bus = bus
+        self.store = None
+        self.window_seconds = window_seconds
+        self.source_counts = defaultdict(int)
+        self.source_errors = defaultdict(int)
+        self._samples = deque()
+        self._lock = threading.Lock()
+
+    def record(self, source: str, jobs_count: int):
+        now = time.time()
+        with self._lock:
+            self.source_counts[source] += jobs_count
+            self._samples.append((now, jobs_count))
+            self._expire(now)
+            snapshot = self._snapshot(source, jobs_count)
+        self._publish(snapshot)
+
+    def record_error(self, source: str):
+        """Count a page of ``source`` that could not be scraped or parsed"""
+        with self._lock:
+            self.source_errors[source] += 1
+            self._expire(time.time())
+            snapshot = self._snapshot(source, 0)
+        self._publish(snapshot)
+
+    def _snapshot(self, source: str, jobs_count: int) -> Dict:
+        return {
+            'source': source,
+            'jobs': jobs_count,
+            'source_total': self.source_counts.get(source, 0),
+            'sources': dict(self.source_counts),
+            'errors': dict(self.source_errors),
+            'throughput_per_sec': self._throughput()
+        }
+
+    def _publish(self, snapshot: Dict):
+        if self.store is not None:
+            self.store.publish_event('scrape', snapshot)
+        else:
+            self.bus.publish('scrape', snapshot)
+
+    def persist_to(self, store):
+        """Send events to ``store`` (a TaskQueue) instead of this process's bus.
+
+        Used in worker processes, where no SSE client is subscribed; the web
+        process's TaskQueueBridge relays them from there.
+        """
+        self.store = store
+
+    def throughput(self) -> float:
+        with self._lock:
+            self._expire(time.time())
+            return self._throughput()
+
+    def _expire(self, now: float):
+        while self._samples and self._samples[0][0] < now - self.window_seconds:
+            self._samples.popleft()
+
+    def _throughput(self) -> float:
+        return sum(count for _, count in self._samples) / self.window_seconds
+
+
+class TaskQueueBridge:
+    """Polls the task queue once per interval and publishes changed tasks and events.
+
+    Workers run in other processes, so their progress only reaches this
+    process through the database. A single bridge thread serves every SSE
+    client, keeping DB load independent of the number of open dashboards.
+    """
+
+    def __init__(self, bus: EventBus, task_queue, interval: float = 1.0):
+        self.bus = bus
+        self.task_queue = task_queue
+        self.interval = interval
+        self.cursor = None
+        self.event_cursor = None
+        self.running = False
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self.running = True
+            self.start_cursors()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self.running = False
+
+    def start_cursors(self):
+        """Relay only what changes from now on; clients load current state over the REST API"""
+        if self.cursor is None:
+            self.cursor = self.task_queue.last_updated_at() or ''
+        if self.event_cursor is None:
+            self.event_cursor = self.task_queue.last_event_id()
+
+    def poll_once(self) -> int:
+        self.start_cursors()
+        tasks = self.task_queue.changed_since(self.cursor)
+        for task in tasks:
+            self.bus.publish('task', task)
+            self.cursor = task['updated_at']
+        events = self.task_queue.events_since(self.event_cursor)
+        for event in events:
+            self.bus.publish(event['topic'], event['data'])
+            self.event_cursor = event['id']
+        return len(tasks) + len(events)
+
+    def _run(self):
+        while self.running:
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.warning(f"⚠️ Task bridge poll failed: {e}")
+            time.sleep(self.interval)
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    payload = json.dumps(event['data'], default=str)
+    return f"id: {event['id']}\nevent: {event['topic']}\ndata: {payload}\n\n"
+
+
+def sse_stream(subscription: Subscription, heartbeat_seconds: float = 15.0) -> Iterator[str]:
+    """Yield SSE frames until the client disconnects"""
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            event = subscription.get(timeout=heartbeat_seconds)
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield format_sse(event)
+    finally:
+        subscription.close()
+
+
+def sse_response(topics: Iterable[str] = None, bus: EventBus = None):
+    """Flask response streaming events from ``bus`` (default: the module bus)"""
+    from flask import Response, stream_with_context
+
+    subscription = (bus or event_bus).subscribe(topics)
+    return Response(
+        stream_with_context(sse_stream(subscription)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+# Process-wide bus shared by scrapers, task bridge and SSE endpoints
+event_bus = EventBus()
+scrape_stats = ScrapeStats(event_bus)
+
+_default_bridge = None
+_default_lock = threading.Lock()
+
+
+def get_task_bridge() -> TaskQueueBridge:
+    """Bridge from the process-wide task queue to ``event_bus``, created on first use"""
+    global _default_bridge
+    from task_queue import get_task_queue
+
+    with _default_lock:
+        if _default_bridge is None:
+            _default_bridge = TaskQueueBridge(event_bus, get_task_queue())
+        return _default_bridge
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+In-memory faceted filter index for job listing pages
+- One bitmap (a Python int, bit i = job i) per value of each categorical
+  facet: job_type, experience_level, company_size, remote, h1b_sponsorship
+  and source
+- Salary ranges answered from sorted arrays plus precomputed suffix
+  bitmaps, so a bound costs a bisect and at most one partial block
+- Substring filters (location, title, company) test each distinct
+  lowercased value once instead of every job; keywords also match skills
+  by distinct value and scan pre-lowercased descriptions of the remaining
+  candidates only
+- Facet counts come out of the same query by bitmap intersection; each
+  facet is counted under every filter except its own, so the UI can show
+  how many jobs switching that facet would give
+
+    from facet_index import get_index
+    result = get_index(jobs).query({'job_type': 'full-time', 'salary_min': '150000'})
+    result.count, result.facets['experience_level'], result.select(jobs, limit=20)
+"""
+
+import argparse
+import itertools
+import logging
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+FACETS = ('job_type', 'experience_level', 'company_size', 'remote', 'h1b_sponsorship', 'source')
+TEXT_FIELDS = ('location', 'title', 'company')
+BOOLEAN_FACETS = {'remote': 'remote_only', 'h1b_sponsorship': 'h1b_sponsorship'}
+
+# Ranks per precomputed suffix bitmap of a salary column
+MIN_RANGE_BLOCK = 1024
+RANGE_BLOCKS = 64
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def popcount(mask: int) -> int:
+        return bin(mask).count('1')
+
+
+def _get(job: Any, name: str) -> Any:
+    if isinstance(job, dict):
+        return job.get(name)
+    return getattr(job, name, None)
+
+
+def from_positions(positions: Iterable[int], size: int) -> int:
+    """Bitmap with the given job positions set"""
+    buf = bytearray((size + 7) >> 3)
+    for position in positions:
+        buf[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buf, 'little')
+
+
+def iter_positions(mask: int) -> Iterator[int]:
+    """Set bits of ``mask`` in ascending order, skipping empty 64-bit words"""
+    if mask <= 0:
+        return
+    nwords = (mask.bit_length() + 63) >> 6
+    words = memoryview(mask.to_bytes(nwords * 8, 'little')).cast('Q')
+    for index, word in enumerate(words):
+        if word:
+            base = index << 6
+            while word:
+                low = word & -word
+                yield base + low.bit_length() - 1
+                word ^= low
+
+
+def is_set(value: Any) -> bool:
+    """Checkbox-style filter values: True, 'true', 'on', '1'"""
+    if isinstance(value, str):
+        return value.lower() in ('true', 'on', '1')
+    return bool(value)
+
+
+class RangeColumn:
+    """Sorted numeric column answering ``>=`` / ``<=`` bounds as bitmaps.
+    Jobs without a value never match a bound."""
+
+    def __init__(self, values: Sequence[Optional[float]], block: int = None):
+        self.size = len(values)
+        ranked = sorted((value, position) for position, value in enumerate(values) if value is not None)
+        self.keys = [value for value, _ in ranked]
+        self.order = array('I', (position for _, position in ranked))
+        self.block = block or max(MIN_RANGE_BLOCK, -(-len(ranked) // RANGE_BLOCKS))
+
+        # _suffixes[k] has every rank >= k * block set; a trailing 0 covers the end
+        suffixes = [0]
+        mask = 0
+        for start in reversed(range(0, len(ranked), self.block)):
+            mask |= from_positions(self.order[start:start + self.block], self.size)
+            suffixes.append(mask)
+        suffixes.reverse()
+        self._suffixes = suffixes
+        self.known = suffixes[0]
+
+    def _from_rank(self, rank: int) -> int:
+        checkpoint = -(-rank // self.block)
+        partial = self.order[rank:checkpoint * self.block]
+        mask = self._suffixes[checkpoint]
+        return mask | from_positions(partial, self.size) if partial else mask
+
+    def at_least(self, value: float) -> int:
+        return self._from_rank(bisect_left(self.keys, value))
+
+    def at_most(self, value: float) -> int:
+        return self.known ^ self._from_rank(bisect_right(self.keys, value))
+
+
+class TextColumn:
+    """Distinct lowercased values with the positions holding them"""
+
+    def __init__(self):
+        self._positions: Dict[str, array] = defaultdict(lambda: array('I'))
+
+    def add(self, position: int, value: Optional[str]):
+        if value:
+            self._positions[value.lower()].append(position)
+
+    def contains(self, needle: str, size: int) -> int:
+        needle = needle.lower()
+        matched = [positions for value, positions in self._positions.items() if needle in value]
+        return from_positions(itertools.chain.from_iterable(matched), size)
+
+    def __len__(self):
+        return len(self._positions)
+
+
+class FacetResult:
+    """Matching jobs of one query plus the facet counts around it"""
+
+    def __init__(self, mask: int, facets: Dict[str, Dict[Any, int]]):
+        self.mask = mask
+        self.count = popcount(mask)
+        self.facets = facets
+
+    def positions(self) -> Iterator[int]:
+        return iter_positions(self.mask)
+
+    def select(self, jobs: Sequence[Any], offset: int = 0, limit: int = None) -> List[Any]:
+        """The matching jobs of ``jobs`` (the list the index was built from), in order"""
+        stop = None if limit is None else offset + limit
+        return [jobs[position] for position in itertools.islice(self.positions(), offset, stop)]
+
+
+class FacetIndex:
+    """Read-only filter index over a list of job dicts or objects. Positions
+    are list positions, so results map back onto any list with the same
+    jobs in the same order."""
+
+    def __init__(self, jobs: Sequence[Any], facets: Sequence[str] = FACETS,
+                 text_fields: Sequence[str] = TEXT_FIELDS):
+        started = time.perf_counter()
+        self.size = size = len(jobs)
+        self.all = (1 << size) - 1
+        self.facet_names = tuple(facets)
+
+        facet_positions = {name: defaultdict(list) for name in self.facet_names}
+        self.text = {name: TextColumn() for name in text_fields}
+        self.skills = TextColumn()
+        self.descriptions: List[str] = []
+        salary_min, salary_max = [], []
+
+        for position, job in enumerate(jobs):
+            location = _get(job, 'location') or ''
+            for name in self.facet_names:
+                if name == 'remote':
+                    value = bool(_get(job, 'remote_friendly')) or 'Remote' in location
+                elif name in BOOLEAN_FACETS:
+                    value = bool(_get(job, name))
+                else:
+                    value = _get(job, name)
+                    if value is None:
+                        continue
+                facet_positions[name][value].append(position)
+            for name, column in self.text.items():
+                column.add(position, _get(job, name))
+
+            skills = _get(job, 'skills') or ()
+            for skill in [skills] if isinstance(skills, str) else skills:
+                self.skills.add(position, skill)
+            self.descriptions.append((_get(job, 'description') or '').lower())
+            salary_min.append(_get(job, 'salary_min'))
+            salary_max.append(_get(job, 'salary_max'))
+
+        self.bitmaps: Dict[str, Dict[Any, int]] = {
+            name: {value: from_positions(positions, size) for value, positions in values.items()}
+            for name, values in facet_positions.items()
+        }
+        self.salary_min = RangeColumn(salary_min)
+        self.salary_max = RangeColumn(salary_max)
+        self.build_seconds = time.perf_counter() - started
+
+    def __len__(self):
+        return self.size
+
+    def facet(self, name: str, value: Any) -> int:
+        return self.bitmaps[name].get(value, 0)
+
+    def keywords(self, needle: str, candidates: int) -> int:
+        """Jobs among ``candidates`` with ``needle`` in the title, a skill or the description"""
+        needle = needle.lower()
+        matched = candidates & (self.text['title'].contains(needle, self.size) if 'title' in self.text else 0)
+        matched |= candidates & self.skills.contains(needle, self.size)
+        descriptions = self.descriptions
+        found = [position for position in iter_positions(candidates & ~matched) if needle in descriptions[position]]
+        return matched | from_positions(found, self.size)
+
+    def _facet_filters(self, filters: Dict[str, Any]) -> Dict[str, int]:
+        masks = {}
+        for name in self.facet_names:
+            if name in BOOLEAN_FACETS:
+                if is_set(filters.get(BOOLEAN_FACETS[name])):
+                    masks[name] = self.facet(name, True)
+            elif filters.get(name):
+                masks[name] = self.facet(name, filters[name])
+        return masks
+
+    def _base_filter(self, filters: Dict[str, Any]) -> int:
+        mask = self.all
+        for name, column in self.text.items():
+            if filters.get(name):
+                mask &= column.contains(filters[name], self.size)
+        # Same overlap semantics as the list filters: the posted range reaches the bound
+        if filters.get('salary_min'):
+            mask &= self.salary_max.at_least(int(filters['salary_min']))
+        if filters.get('salary_max'):
+            mask &= self.salary_min.at_most(int(filters['salary_max']))
+        return mask
+
+    def query(self, filters: Dict[str, Any], facets: bool = True) -> FacetResult:
+        """Apply the request's filters; empty values are ignored.
+
+        Facet filters: job_type, experience_level, company_size, source,
+        remote_only, h1b_sponsorship. Others: location, title, company
+        (substring), salary_min, salary_max and keywords."""
+        base = self._base_filter(filters)
+        facet_masks = self._facet_filters(filters)
+
+        mask = base
+        for facet_mask in facet_masks.values():
+            mask &= facet_mask
+        # Keywords last: description scans only touch jobs that passed everything else
+        if filters.get('keywords'):
+            keyword_mask = self.keywords(filters['keywords'], mask if not facets else base)
+            base &= keyword_mask
+            mask &= keyword_mask
+
+        counts = {}
+        if facets:
+            for name in self.facet_names:
+                scope = base
+                for other, facet_mask in facet_masks.items():
+                    if other != name:
+                        scope &= facet_mask
+                counts[name] = {value: count for value, bitmap in self.bitmaps[name].items()
+                                if (count := popcount(scope & bitmap))}
+        return FacetResult(mask, counts)
+
+
+_cache: 'OrderedDict[tuple, FacetIndex]' = OrderedDict()
+_cache_lock = threading.Lock()
+CACHE_SIZE = 4
+
+
+def get_index(jobs: Sequence[Any]) -> FacetIndex:
+    """Index for ``jobs``, reused while the same job ids come back in the same order"""
+    key = tuple(_get(job, 'id') for job in jobs)
+    with _cache_lock:
+        index = _cache.get(key)
+        if index is not None:
+            _cache.move_to_end(key)
+            return index
+    index = FacetIndex(jobs)
+    with _cache_lock:
+        _cache[key] = index
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Build a facet index over a synthetic corpus and time queries')
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    from synthetic_corpus import CorpusGenerator
+
+    jobs = list(CorpusGenerator(args.rows, seed=args.seed))
+    index = FacetIndex(jobs)
+    print(f"🏗️ Indexed {len(index):,} jobs in {index.build_seconds:.2f}s")
+
+    queries = [
+        {},
+        {'job_type': 'full-time'},
+        {'job_type': 'full-time', 'experience_level': 'senior', 'remote_only': 'true'},
+        {'location': 'san', 'salary_min': '150000', 'company_size': 'enterprise'},
+        {'job_type': 'contract', 'keywords': 'kubernetes'},
+    ]
+    for filters in queries:
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            result = index.query(filters)
+        elapsed = (time.perf_counter() - started) / args.repeat
+        print(f"🔎 {filters or 'all jobs'}: {result.count:,} matches, "
+              f"{sum(len(values) for values in result.facets.values())} facet values in {elapsed * 1000:.1f}ms")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
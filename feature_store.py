@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Per-job feature store shared by the scorers and rankers
+- extract_features() derives everything the match scores and rankings
+  need from a job (dict, dataclass or ORM row): normalized skill ids,
+  seniority and role family (title_normalizer), apply domain, geo cell
+  (geo_index), annualized salary (salary_normalizer) and text length
+- FeatureStore keeps them in a versioned job_features table, written at
+  ingest (put) or lazily on first read (features / features_for); rows
+  from an older FEATURE_VERSION are recomputed on read
+- publish() writes the table as a columnar memory-mapped snapshot
+  (mmap_snapshot) after each ingest; every worker's FeatureStore reads it
+  before SQLite, so N workers share one copy of the pages
+- Without a database path the store is an in-process LRU, for apps that
+  hold their jobs in memory
+
+    from feature_store import FeatureStore
+    store = FeatureStore('jobright_clone.db')
+    store.put(jobs)                           # at ingest
+    store.publish()                           # after the ingest cycle
+    for job, features in zip(jobs, store.features_for(jobs)):
+        features.domain, features.skill_ids, features.salary_max
+"""
+
+import json
+import logging
+import math
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from geo_index import geo_columns
+from mmap_snapshot import Snapshot, SnapshotReader, SnapshotWriter
+from salary_normalizer import salary_range
+from title_normalizer import classify_title
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extract_features() changes; stored rows of other versions are recomputed
+FEATURE_VERSION = 1
+FEATURE_COLUMNS = {
+    'version': 'INTEGER', 'skill_ids': 'TEXT', 'seniority': 'TEXT', 'experience_level': 'TEXT',
+    'role_family': 'TEXT', 'title_words': 'TEXT', 'domain': 'TEXT', 'geohash': 'TEXT',
+    'latitude': 'REAL', 'longitude': 'REAL', 'salary_min': 'INTEGER', 'salary_max': 'INTEGER',
+    'text_length': 'INTEGER',
+}
+SKILL_ALIASES = {
+    'js': 'javascript', 'ts': 'typescript', 'node': 'node.js', 'nodejs': 'node.js', 'reactjs': 'react',
+    'react.js': 'react', 'vuejs': 'vue.js', 'vue': 'vue.js', 'golang': 'go', 'postgres': 'postgresql',
+    'k8s': 'kubernetes', 'amazon web services': 'aws', 'gcp': 'google cloud', 'ml': 'machine learning',
+    'tf': 'tensorflow', 'c sharp': 'c#', 'py': 'python',
+}
+TITLE_STOP_WORDS = frozenset({'and', 'or', 'the', 'a', 'an', 'in', 'at', 'for', 'with', 'on', 'of', '&'})
+SQLITE_VARIABLES = 900
+SNAPSHOT_CODED = ('seniority', 'experience_level', 'role_family')  # few distinct values, stored as codes
+SNAPSHOT_STRINGS = ('title_words', 'domain', 'geohash')
+NO_SALARY = -1 << 63
+
+
+class JobFeatures(NamedTuple):
+    skill_ids: Tuple[int, ...]  # in posting order, see SkillVocabulary
+    seniority: Optional[str]
+    experience_level: str
+    role_family: str
+    title_words: FrozenSet[str]  # canonical title words without stop words
+    domain: str  # host of the apply link, '' when there is none
+    geohash: Optional[str]  # 9 characters; prefixes are coarser cells
+    latitude: Optional[float]
+    longitude: Optional[float]
+    salary_min: Optional[int]  # annualized
+    salary_max: Optional[int]
+    text_length: int
+
+    @property
+    def skill_set(self) -> FrozenSet[int]:
+        return frozenset(self.skill_ids)
+
+
+def normalize_skill(name: str) -> str:
+    key = ' '.join(str(name).lower().split())
+    return SKILL_ALIASES.get(key, key)
+
+
+@lru_cache(maxsize=16384)
+def title_words(title: Optional[str]) -> FrozenSet[str]:
+    """Words of the canonical title used for title similarity"""
+    return frozenset(classify_title(title).canonical.split()) - TITLE_STOP_WORDS
+
+
+def _field(job: Any, *names: str, default=None):
+    for name in names:
+        value = job.get(name) if isinstance(job, dict) else getattr(job, name, None)
+        if value is not None:
+            return value
+    return default
+
+
+def _skill_list(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            value = value.split(',')
+    return [skill for skill in value if skill and str(skill).strip()]
+
+
+@lru_cache(maxsize=4096)
+def profile_skills(skills_json: Optional[str]) -> Tuple[str, ...]:
+    """Skills of a user profile column (JSON list), parsed once per distinct value"""
+    return tuple(_skill_list(skills_json))
+
+
+class SkillVocabulary:
+    """Normalized skill name <-> small integer id, optionally persisted in a skills table"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path
+        self._ids = {}
+        self._names = {}
+        self._lock = threading.Lock()
+        if db_path:
+            conn = sqlite3.connect(db_path)
+            conn.execute("CREATE TABLE IF NOT EXISTS feature_skills (id INTEGER PRIMARY KEY, "
+                         "skill TEXT UNIQUE NOT NULL, name TEXT)")
+            for skill_id, skill, name in conn.execute("SELECT id, skill, name FROM feature_skills"):
+                self._ids[skill] = skill_id
+                self._names[skill_id] = name
+            conn.commit()
+            conn.close()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def ids(self, names: Iterable[str], conn: Optional[sqlite3.Connection] = None) -> Tuple[int, ...]:
+        """Ids of the skills, registering unseen ones (through ``conn`` if given); duplicates are dropped"""
+        result = []
+        for name in names:
+            skill = normalize_skill(name)
+            skill_id = self._ids.get(skill)
+            if skill_id is None:
+                skill_id = self._register(skill, str(name).strip(), conn)
+            if skill_id not in result:
+                result.append(skill_id)
+        return tuple(result)
+
+    def known_ids(self, names: Iterable[str]) -> FrozenSet[int]:
+        """Ids of the skills already in the vocabulary, without registering new ones"""
+        found = (self._ids.get(normalize_skill(name)) for name in names)
+        return frozenset(skill_id for skill_id in found if skill_id is not None)
+
+    def names(self, skill_ids: Iterable[int]) -> List[str]:
+        """Display names, as first posted"""
+        return [self._names[skill_id] for skill_id in skill_ids if skill_id in self._names]
+
+    def _register(self, skill: str, name: str, conn: Optional[sqlite3.Connection]) -> int:
+        with self._lock:
+            if skill in self._ids:
+                return self._ids[skill]
+            if self.db_path:
+                # Other processes may have registered it meanwhile; the table decides the id
+                own = conn is None
+                conn = conn or sqlite3.connect(self.db_path)
+                conn.execute("INSERT OR IGNORE INTO feature_skills (skill, name) VALUES (?, ?)", (skill, name))
+                skill_id, name = conn.execute("SELECT id, name FROM feature_skills WHERE skill = ?",
+                                              (skill,)).fetchone()
+                if own:
+                    conn.commit()
+                    conn.close()
+            else:
+                skill_id = len(self._ids) + 1
+            self._ids[skill] = skill_id
+            self._names[skill_id] = name
+            return skill_id
+
+
+def extract_features(job: Any, vocabulary: SkillVocabulary,
+                     conn: Optional[sqlite3.Connection] = None) -> JobFeatures:
+    """Derive the stored features of one job; ``conn`` is used to register new skills"""
+    title = _field(job, 'title', default='')
+    info = classify_title(title)
+    url = _field(job, 'application_url', 'apply_url', 'url', default='')
+    _, latitude, longitude, geohash = geo_columns(_field(job, 'location'))
+
+    salary_min, salary_max = _field(job, 'salary_min'), _field(job, 'salary_max')
+    if salary_min is None and salary_max is None:
+        salary_min, salary_max = salary_range(_field(job, 'salary'))
+
+    return JobFeatures(
+        skill_ids=vocabulary.ids(_skill_list(_field(job, 'skills', 'skills_required')), conn),
+        seniority=info.seniority,
+        experience_level=info.experience_level,
+        role_family=info.family,
+        title_words=title_words(title),
+        domain=urlparse(url).netloc.lower() if url else '',
+        geohash=geohash,
+        latitude=latitude,
+        longitude=longitude,
+        salary_min=salary_min,
+        salary_max=salary_max,
+        text_length=len(_field(job, 'description', default='') or ''),
+    )
+
+
+def _to_row(job_id: str, features: JobFeatures) -> tuple:
+    return (job_id, FEATURE_VERSION, json.dumps(features.skill_ids), features.seniority,
+            features.experience_level, features.role_family, ' '.join(sorted(features.title_words)),
+            features.domain, features.geohash, features.latitude, features.longitude,
+            features.salary_min, features.salary_max, features.text_length)
+
+
+def _from_row(row: Sequence) -> JobFeatures:
+    (skill_ids, seniority, experience_level, role_family, words, domain, geohash,
+     latitude, longitude, salary_min, salary_max, text_length) = row
+    return JobFeatures(tuple(json.loads(skill_ids)), seniority, experience_level, role_family,
+                       frozenset(words.split()), domain, geohash, latitude, longitude,
+                       salary_min, salary_max, text_length)
+
+
+_COLUMNS = ', '.join(column for column in FEATURE_COLUMNS if column != 'version')
+_INSERT_SQL = (f"INSERT OR REPLACE INTO job_features (job_id, {', '.join(FEATURE_COLUMNS)}) "
+               f"VALUES ({', '.join('?' * (len(FEATURE_COLUMNS) + 1))})")
+
+
+class FeatureSnapshot:
+    """Features of every stored job, read from a memory-mapped version written by FeatureStore.publish()"""
+
+    def __init__(self, snapshot: Snapshot):
+        self.version = snapshot.version
+        self.feature_version = snapshot.json('feature_version')
+        self._ids = snapshot.strings('ids')
+        self._skill_offsets = snapshot.array('skill_offsets')
+        self._skill_ids = snapshot.array('skill_ids')
+        self._coded = [(snapshot.json(column), snapshot.array(column)) for column in SNAPSHOT_CODED]
+        self._strings = [snapshot.strings(column) for column in SNAPSHOT_STRINGS]
+        self._latitude, self._longitude = snapshot.array('latitude'), snapshot.array('longitude')
+        self._salary_min, self._salary_max = snapshot.array('salary_min'), snapshot.array('salary_max')
+        self._text_length = snapshot.array('text_length')
+
+    def __len__(self):
+        return len(self._ids)
+
+    def get(self, job_id: str) -> Optional[JobFeatures]:
+        row = self._ids.find(job_id)
+        if row is None:
+            return None
+        start = self._skill_offsets[row - 1] if row else 0
+        seniority, experience_level, role_family = (values[codes[row]] for values, codes in self._coded)
+        words, domain, geohash = (column[row] for column in self._strings)
+        latitude, longitude = self._latitude[row], self._longitude[row]
+        salary_min, salary_max = self._salary_min[row], self._salary_max[row]
+        return JobFeatures(
+            tuple(self._skill_ids[start:self._skill_offsets[row]]), seniority, experience_level, role_family,
+            frozenset(words.split()), domain, geohash or None,
+            None if math.isnan(latitude) else latitude, None if math.isnan(longitude) else longitude,
+            None if salary_min == NO_SALARY else salary_min, None if salary_max == NO_SALARY else salary_max,
+            self._text_length[row],
+        )
+
+
+class FeatureStore:
+    """Versioned per-job features, in SQLite when given a path and in an in-process LRU always
+
+    With a database path, reads first consult the latest snapshot published
+    under ``snapshot_root`` (``<db_path>.snapshots/features`` by default), so
+    web workers share one memory-mapped copy instead of each filling an LRU.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, capacity: int = 100_000,
+                 snapshot_root: Optional[str] = None):
+        self.db_path = db_path
+        self.capacity = capacity
+        self.snapshot_root = snapshot_root or (f"{db_path}.snapshots/features" if db_path else None)
+        self.vocabulary = SkillVocabulary(db_path)
+        self._snapshots = SnapshotReader(self.snapshot_root) if self.snapshot_root else None
+        self._snapshot = None
+        self._memo = OrderedDict()
+        self._profiles = {}
+        self._lock = threading.Lock()
+        if db_path:
+            conn = sqlite3.connect(db_path)
+            self.init_table(conn)
+            conn.commit()
+            conn.close()
+
+    @staticmethod
+    def init_table(conn: sqlite3.Connection):
+        columns = ', '.join(f"{column} {kind}" for column, kind in FEATURE_COLUMNS.items())
+        conn.execute(f"CREATE TABLE IF NOT EXISTS job_features (job_id TEXT PRIMARY KEY, {columns})")
+
+    def put(self, jobs: Iterable[Any], conn: Optional[sqlite3.Connection] = None) -> int:
+        """Compute and store the features of freshly ingested jobs; pass ``conn`` to join its transaction"""
+        own = conn is None and self.db_path is not None
+        if own:
+            conn = sqlite3.connect(self.db_path)
+        try:
+            rows = []
+            for job in jobs:
+                job_id = _field(job, 'id', 'job_id')
+                features = extract_features(job, self.vocabulary, conn)
+                if job_id is not None:
+                    self._remember(str(job_id), features)
+                    rows.append(_to_row(str(job_id), features))
+            if self.db_path and rows:
+                conn.executemany(_INSERT_SQL, rows)
+            if own:
+                conn.commit()
+        finally:
+            if own:
+                conn.close()
+        return len(rows)
+
+    def features(self, job: Any) -> JobFeatures:
+        job_id = _field(job, 'id', 'job_id')
+        features = self._memo.get(str(job_id)) if job_id is not None else None
+        return features or self.features_for([job])[0]
+
+    def features_for(self, jobs: Sequence[Any]) -> List[JobFeatures]:
+        """Features of each job, in order; missing or outdated ones are computed and stored"""
+        ids = [_field(job, 'id', 'job_id') for job in jobs]
+        ids = [None if job_id is None else str(job_id) for job_id in ids]
+        with self._lock:
+            found = {job_id: self._memo[job_id] for job_id in ids if job_id in self._memo}
+            for job_id in found:
+                self._memo.move_to_end(job_id)
+
+        wanted = [job_id for job_id in dict.fromkeys(ids) if job_id is not None and job_id not in found]
+        snapshot = self.snapshot() if wanted else None
+        if snapshot is not None:
+            # Not copied into the LRU: the mapped pages are already shared by every worker
+            hits = {job_id: snapshot.get(job_id) for job_id in wanted}
+            found.update((job_id, features) for job_id, features in hits.items() if features is not None)
+            wanted = [job_id for job_id in wanted if job_id not in found]
+        if self.db_path and wanted:
+            for job_id, features in self._load(wanted):
+                found[job_id] = features
+                self._remember(job_id, features)
+
+        missing = [job for job, job_id in zip(jobs, ids) if job_id not in found]
+        if missing:
+            self.put(missing)
+            with self._lock:
+                found.update((job_id, self._memo[job_id]) for job_id in ids if job_id in self._memo)
+        return [found[job_id] if job_id in found else extract_features(job, self.vocabulary)
+                for job, job_id in zip(jobs, ids)]
+
+    def snapshot(self) -> Optional[FeatureSnapshot]:
+        """The latest published snapshot of this FEATURE_VERSION, if any"""
+        current = self._snapshots.current() if self._snapshots else None
+        if current is None:
+            return None
+        if self._snapshot is None or self._snapshot.version != current.version:
+            self._snapshot = FeatureSnapshot(current)
+        return self._snapshot if self._snapshot.feature_version == FEATURE_VERSION else None
+
+    def publish(self, root: Optional[str] = None) -> Optional[str]:
+        """Write every stored row of this FEATURE_VERSION as a new snapshot version, for the readers"""
+        root = root or self.snapshot_root
+        if not self.db_path or not root:
+            return None
+        conn = sqlite3.connect(self.db_path)
+        try:
+            # SQLite's binary collation orders UTF-8 like Python orders str, so the ids bisect
+            rows = conn.execute(f"SELECT job_id, {_COLUMNS} FROM job_features WHERE version = ? ORDER BY job_id",
+                                (FEATURE_VERSION,)).fetchall()
+        finally:
+            conn.close()
+
+        features = [_from_row(row[1:]) for row in rows]
+        with SnapshotWriter(root) as writer:
+            writer.add_json('feature_version', FEATURE_VERSION)
+            writer.add_strings('ids', (row[0] for row in rows))
+            skill_ids, offsets = array('I'), array('Q')
+            for item in features:
+                skill_ids.extend(item.skill_ids)
+                offsets.append(len(skill_ids))
+            writer.add_array('skill_ids', 'I', skill_ids)
+            writer.add_array('skill_offsets', 'Q', offsets)
+            for column in SNAPSHOT_CODED:
+                values = sorted({getattr(item, column) for item in features}, key=lambda value: value or '')
+                codes = {value: code for code, value in enumerate(values)}
+                writer.add_json(column, values)
+                writer.add_array(column, 'B', (codes[getattr(item, column)] for item in features))
+            writer.add_strings('title_words', (' '.join(sorted(item.title_words)) for item in features))
+            writer.add_strings('domain', (item.domain or '' for item in features))
+            writer.add_strings('geohash', (item.geohash or '' for item in features))
+            for column in ('latitude', 'longitude'):
+                writer.add_array(column, 'd', (math.nan if getattr(item, column) is None else getattr(item, column)
+                                               for item in features))
+            for column in ('salary_min', 'salary_max'):
+                writer.add_array(column, 'q', (NO_SALARY if getattr(item, column) is None else getattr(item, column)
+                                               for item in features))
+            writer.add_array('text_length', 'Q', (item.text_length or 0 for item in features))
+        if self._snapshots is not None and root == self.snapshot_root:
+            self._snapshots.refresh()
+        return writer.version
+
+    def invalidate(self, job_ids: Optional[Iterable[str]] = None):
+        """Forget features of changed jobs, or of every job; published snapshots catch up on the next publish"""
+        with self._lock:
+            if job_ids is None:
+                self._memo.clear()
+            else:
+                job_ids = [str(job_id) for job_id in job_ids]
+                for job_id in job_ids:
+                    self._memo.pop(job_id, None)
+        if self.db_path:
+            conn = sqlite3.connect(self.db_path)
+            if job_ids is None:
+                conn.execute("DELETE FROM job_features")
+            else:
+                conn.executemany("DELETE FROM job_features WHERE job_id = ?", [(job_id,) for job_id in job_ids])
+            conn.commit()
+            conn.close()
+
+    def skill_ids(self, names: Tuple[str, ...]) -> FrozenSet[int]:
+        """Ids of a profile's skills, to intersect with JobFeatures.skill_set"""
+        # Only skills some job has are known, so the answer holds until the vocabulary grows
+        key = (names, len(self.vocabulary))
+        ids = self._profiles.get(key)
+        if ids is None:
+            if len(self._profiles) >= 4096:
+                self._profiles.clear()
+            ids = self._profiles[key] = self.vocabulary.known_ids(names)
+        return ids
+
+    def skill_names(self, features: JobFeatures) -> List[str]:
+        return self.vocabulary.names(features.skill_ids)
+
+    def _load(self, job_ids: List[str]):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for start in range(0, len(job_ids), SQLITE_VARIABLES):
+                chunk = job_ids[start:start + SQLITE_VARIABLES]
+                rows = conn.execute(
+                    f"SELECT job_id, {_COLUMNS} FROM job_features "
+                    f"WHERE version = ? AND job_id IN ({', '.join('?' * len(chunk))})",
+                    (FEATURE_VERSION, *chunk)
+                )
+                for row in rows:
+                    yield row[0], _from_row(row[1:])
+        finally:
+            conn.close()
+
+    def _remember(self, job_id: str, features: JobFeatures):
+        with self._lock:
+            self._memo[job_id] = features
+            self._memo.move_to_end(job_id)
+            while len(self._memo) > self.capacity:
+                self._memo.popitem(last=False)
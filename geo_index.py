@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Offline gazetteer and geohash index for location filtering
+- normalize_location() maps scraped location strings ("San Jose, CA -
+  Hybrid", "San José, California 95112", "Greater Seattle Area", "NYC")
+  to a canonical Place with coordinates; results are memoized
+- Remote-only strings and places not in the gazetteer normalize to None,
+  so callers can keep their substring fallback for those
+- GeoIndex buckets points by geohash; within() reads only the cells
+  covering the query circle and checks exact great-circle distances
+- geo_columns() gives the (place, latitude, longitude, geohash) values
+  stored next to each job at ingest time
+
+    from geo_index import GeoIndex, normalize_location
+    normalize_location('Sunnyvale, CA (Onsite)').label     # 'Sunnyvale, CA'
+    index = GeoIndex()
+    index.add_location(job_id, job.location)
+    index.within_location('San Jose, CA', miles=25)        # [(job_id, miles), ...]
+"""
+
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE_LAT = 69.0
+DEFAULT_RADIUS_MILES = 25.0
+# Precision 4 cells are ~24 x 12 miles at mid-latitudes
+GEOHASH_PRECISION = 4
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+class Place(NamedTuple):
+    name: str
+    region: str  # state / province code, or '' for country-level places
+    country: str
+    latitude: float
+    longitude: float
+    kind: str = 'city'  # city | area
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}, {self.region or self.country}"
+
+
+# (name, region, country, latitude, longitude); the first entry of a name wins
+# when a location gives no state
+PLACES = [
+    # Bay Area
+    ('San Jose', 'CA', 'US', 37.3382, -121.8863),
+    ('San Francisco', 'CA', 'US', 37.7749, -122.4194),
+    ('Oakland', 'CA', 'US', 37.8044, -122.2712),
+    ('Berkeley', 'CA', 'US', 37.8715, -122.2730),
+    ('Emeryville', 'CA', 'US', 37.8313, -122.2852),
+    ('Santa Clara', 'CA', 'US', 37.3541, -121.9552),
+    ('Sunnyvale', 'CA', 'US', 37.3688, -122.0363),
+    ('Mountain View', 'CA', 'US', 37.3861, -122.0839),
+    ('Palo Alto', 'CA', 'US', 37.4419, -122.1430),
+    ('Los Altos', 'CA', 'US', 37.3852, -122.1141),
+    ('Cupertino', 'CA', 'US', 37.3230, -122.0322),
+    ('Milpitas', 'CA', 'US', 37.4323, -121.8996),
+    ('Campbell', 'CA', 'US', 37.2872, -121.9500),
+    ('Los Gatos', 'CA', 'US', 37.2358, -121.9624),
+    ('Saratoga', 'CA', 'US', 37.2638, -122.0230),
+    ('Morgan Hill', 'CA', 'US', 37.1305, -121.6544),
+    ('Menlo Park', 'CA', 'US', 37.4530, -122.1817),
+    ('Redwood City', 'CA', 'US', 37.4852, -122.2364),
+    ('Foster City', 'CA', 'US', 37.5585, -122.2711),
+    ('San Mateo', 'CA', 'US', 37.5630, -122.3255),
+    ('South San Francisco', 'CA', 'US', 37.6547, -122.4077),
+    ('Fremont', 'CA', 'US', 37.5485, -121.9886),
+    ('Hayward', 'CA', 'US', 37.6688, -122.0808),
+    ('Pleasanton', 'CA', 'US', 37.6624, -121.8747),
+    ('San Ramon', 'CA', 'US', 37.7799, -121.9780),
+    ('Walnut Creek', 'CA', 'US', 37.9101, -122.0652),
+    # Rest of the West Coast
+    ('Los Angeles', 'CA', 'US', 34.0522, -118.2437),
+    ('Santa Monica', 'CA', 'US', 34.0195, -118.4912),
+    ('Pasadena', 'CA', 'US', 34.1478, -118.1445),
+    ('Irvine', 'CA', 'US', 33.6846, -117.8265),
+    ('San Diego', 'CA', 'US', 32.7157, -117.1611),
+    ('Sacramento', 'CA', 'US', 38.5816, -121.4944),
+    ('Seattle', 'WA', 'US', 47.6062, -122.3321),
+    ('Bellevue', 'WA', 'US', 47.6101, -122.2015),
+    ('Redmond', 'WA', 'US', 47.6740, -122.1215),
+    ('Kirkland', 'WA', 'US', 47.6815, -122.2087),
+    ('Tacoma', 'WA', 'US', 47.2529, -122.4443),
+    ('Portland', 'OR', 'US', 45.5152, -122.6784),
+    ('Portland', 'ME', 'US', 43.6591, -70.2568),
+    ('Boise', 'ID', 'US', 43.6150, -116.2023),
+    ('Las Vegas', 'NV', 'US', 36.1699, -115.1398),
+    ('Salt Lake City', 'UT', 'US', 40.7608, -111.8910),
+    ('Lehi', 'UT', 'US', 40.3916, -111.8508),
+    ('Phoenix', 'AZ', 'US', 33.4484, -112.0740),
+    ('Scottsdale', 'AZ', 'US', 33.4942, -111.9261),
+    ('Tempe', 'AZ', 'US', 33.4255, -111.9400),
+    ('Denver', 'CO', 'US', 39.7392, -104.9903),
+    ('Boulder', 'CO', 'US', 40.0150, -105.2705),
+    ('Albuquerque', 'NM', 'US', 35.0844, -106.6504),
+    ('Honolulu', 'HI', 'US', 21.3069, -157.8583),
+    ('Anchorage', 'AK', 'US', 61.2181, -149.9003),
+    # Texas and the middle of the country
+    ('Austin', 'TX', 'US', 30.2672, -97.7431),
+    ('Dallas', 'TX', 'US', 32.7767, -96.7970),
+    ('Plano', 'TX', 'US', 33.0198, -96.6989),
+    ('Irving', 'TX', 'US', 32.8140, -96.9489),
+    ('Fort Worth', 'TX', 'US', 32.7555, -97.3308),
+    ('Houston', 'TX', 'US', 29.7604, -95.3698),
+    ('San Antonio', 'TX', 'US', 29.4241, -98.4936),
+    ('Chicago', 'IL', 'US', 41.8781, -87.6298),
+    ('Minneapolis', 'MN', 'US', 44.9778, -93.2650),
+    ('Madison', 'WI', 'US', 43.0731, -89.4012),
+    ('Milwaukee', 'WI', 'US', 43.0389, -87.9065),
+    ('Detroit', 'MI', 'US', 42.3314, -83.0458),
+    ('Ann Arbor', 'MI', 'US', 42.2808, -83.7430),
+    ('Columbus', 'OH', 'US', 39.9612, -82.9988),
+    ('Cleveland', 'OH', 'US', 41.4993, -81.6944),
+    ('Cincinnati', 'OH', 'US', 39.1031, -84.5120),
+    ('Indianapolis', 'IN', 'US', 39.7684, -86.1581),
+    ('St. Louis', 'MO', 'US', 38.6270, -90.1994),
+    ('Kansas City', 'MO', 'US', 39.0997, -94.5786),
+    ('Nashville', 'TN', 'US', 36.1627, -86.7816),
+    ('New Orleans', 'LA', 'US', 29.9511, -90.0715),
+    # East Coast
+    ('New York', 'NY', 'US', 40.7128, -74.0060),
+    ('Brooklyn', 'NY', 'US', 40.6782, -73.9442),
+    ('Jersey City', 'NJ', 'US', 40.7178, -74.0431),
+    ('Hoboken', 'NJ', 'US', 40.7440, -74.0324),
+    ('Newark', 'NJ', 'US', 40.7357, -74.1724),
+    ('Stamford', 'CT', 'US', 41.0534, -73.5387),
+    ('Boston', 'MA', 'US', 42.3601, -71.0589),
+    ('Cambridge', 'MA', 'US', 42.3736, -71.1097),
+    ('Somerville', 'MA', 'US', 42.3876, -71.0995),
+    ('Waltham', 'MA', 'US', 42.3765, -71.2356),
+    ('Philadelphia', 'PA', 'US', 39.9526, -75.1652),
+    ('Pittsburgh', 'PA', 'US', 40.4406, -79.9959),
+    ('Baltimore', 'MD', 'US', 39.2904, -76.6122),
+    ('Bethesda', 'MD', 'US', 38.9847, -77.0947),
+    ('Washington', 'DC', 'US', 38.9072, -77.0369),
+    ('Arlington', 'VA', 'US', 38.8816, -77.0910),
+    ('McLean', 'VA', 'US', 38.9339, -77.1773),
+    ('Reston', 'VA', 'US', 38.9586, -77.3570),
+    ('Raleigh', 'NC', 'US', 35.7796, -78.6382),
+    ('Durham', 'NC', 'US', 35.9940, -78.8986),
+    ('Charlotte', 'NC', 'US', 35.2271, -80.8431),
+    ('Atlanta', 'GA', 'US', 33.7490, -84.3880),
+    ('Miami', 'FL', 'US', 25.7617, -80.1918),
+    ('Tampa', 'FL', 'US', 27.9506, -82.4572),
+    ('Orlando', 'FL', 'US', 28.5383, -81.3792),
+    ('Jacksonville', 'FL', 'US', 30.3322, -81.6557),
+    # Outside the US
+    ('Toronto', 'ON', 'CA', 43.6532, -79.3832),
+    ('Vancouver', 'BC', 'CA', 49.2827, -123.1207),
+    ('Montreal', 'QC', 'CA', 45.5017, -73.5673),
+    ('London', '', 'GB', 51.5074, -0.1278),
+    ('Dublin', '', 'IE', 53.3498, -6.2603),
+    ('Amsterdam', '', 'NL', 52.3676, 4.9041),
+    ('Berlin', '', 'DE', 52.5200, 13.4050),
+    ('Paris', '', 'FR', 48.8566, 2.3522),
+    ('Tel Aviv', '', 'IL', 32.0853, 34.7818),
+    ('Bangalore', '', 'IN', 12.9716, 77.5946),
+    ('Hyderabad', '', 'IN', 17.3850, 78.4867),
+    ('Singapore', '', 'SG', 1.3521, 103.8198),
+    ('Sydney', '', 'AU', -33.8688, 151.2093),
+]
+
+# Multi-city areas, placed at a representative centre
+AREAS = [
+    ('San Francisco Bay Area', 'CA', 'US', 37.6000, -122.2000),
+    ('Silicon Valley', 'CA', 'US', 37.3875, -122.0575),
+]
+
+ALIASES = {
+    'bay area': 'San Francisco Bay Area',
+    'sf bay area': 'San Francisco Bay Area',
+    'greater bay area': 'San Francisco Bay Area',
+    'sf': 'San Francisco',
+    'nyc': 'New York',
+    'new york city': 'New York',
+    'manhattan': 'New York',
+    'dc': 'Washington',
+    'washington dc': 'Washington',
+    'washington d c': 'Washington',
+    'dfw': 'Dallas',
+    'saint louis': 'St. Louis',
+    'st louis': 'St. Louis',
+    'bengaluru': 'Bangalore',
+    'montréal': 'Montreal',
+}
+
+US_STATES = {
+    'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR', 'california': 'CA',
+    'colorado': 'CO', 'connecticut': 'CT', 'delaware': 'DE', 'district of columbia': 'DC', 'florida': 'FL',
+    'georgia': 'GA', 'hawaii': 'HI', 'idaho': 'ID', 'illinois': 'IL', 'indiana': 'IN', 'iowa': 'IA',
+    'kansas': 'KS', 'kentucky': 'KY', 'louisiana': 'LA', 'maine': 'ME', 'maryland': 'MD',
+    'massachusetts': 'MA', 'michigan': 'MI', 'minnesota': 'MN', 'mississippi': 'MS', 'missouri': 'MO',
+    'montana': 'MT', 'nebraska': 'NE', 'nevada': 'NV', 'new hampshire': 'NH', 'new jersey': 'NJ',
+    'new mexico': 'NM', 'new york': 'NY', 'north carolina': 'NC', 'north dakota': 'ND', 'ohio': 'OH',
+    'oklahoma': 'OK', 'oregon': 'OR', 'pennsylvania': 'PA', 'rhode island': 'RI', 'south carolina': 'SC',
+    'south dakota': 'SD', 'tennessee': 'TN', 'texas': 'TX', 'utah': 'UT', 'vermont': 'VT', 'virginia': 'VA',
+    'washington': 'WA', 'west virginia': 'WV', 'wisconsin': 'WI', 'wyoming': 'WY',
+    'ontario': 'ON', 'british columbia': 'BC', 'quebec': 'QC',
+}
+COUNTRIES = {
+    'united states': 'US', 'united states of america': 'US', 'usa': 'US', 'us': 'US', 'u s': 'US',
+    'canada': 'CA', 'united kingdom': 'GB', 'uk': 'GB', 'england': 'GB', 'ireland': 'IE',
+    'netherlands': 'NL', 'germany': 'DE', 'france': 'FR', 'israel': 'IL', 'india': 'IN',
+    'singapore': 'SG', 'australia': 'AU',
+}
+_STATE_CODES = set(US_STATES.values())
+_IGNORED_PARTS = {'remote', 'hybrid', 'onsite', 'on site', 'in office', 'anywhere', 'worldwide', 'multiple locations'}
+
+_PARENTHESES = re.compile(r'\([^)]*\)')
+_TRAILER = re.compile(r'\s+[-–—|·•]\s+.*$')
+_POSTCODE = re.compile(r'\b\d{5}(?:-\d{4})?\b')
+_PUNCTUATION = re.compile(r'[^\w\s,]')
+_SPACES = re.compile(r'\s+')
+_AREA = re.compile(r'^(?:greater\s+)?(.+?)(?:\s+(?:bay|metro|metropolitan|metroplex))?\s+area$')
+_TRAILING_STATE = re.compile(r'^(.+?)\s+([a-z]{2})$')
+
+
+def _fold(text: str) -> str:
+    """Lowercase, strip accents and punctuation (keeping commas), squeeze spaces"""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return _SPACES.sub(' ', _PUNCTUATION.sub(' ', text)).strip()
+
+
+def _build_gazetteer() -> Dict[str, List[Place]]:
+    by_name = defaultdict(list)
+    for name, region, country, latitude, longitude in PLACES:
+        by_name[_fold(name)].append(Place(name, region, country, latitude, longitude))
+    for name, region, country, latitude, longitude in AREAS:
+        by_name[_fold(name)].append(Place(name, region, country, latitude, longitude, kind='area'))
+    for alias, name in ALIASES.items():
+        by_name[_fold(alias)] = by_name[_fold(name)]
+    return dict(by_name)
+
+
+GAZETTEER = _build_gazetteer()
+
+
+def _pick(candidates: List[Place], qualifier: Optional[str]) -> Optional[Place]:
+    if not qualifier:
+        return candidates[0]
+    code = US_STATES.get(qualifier) or COUNTRIES.get(qualifier) or qualifier.replace(' ', '').upper()
+    for place in candidates:
+        if code in (place.region, place.country):
+            return place
+    return None
+
+
+@lru_cache(maxsize=65536)
+def normalize_location(text: Optional[str]) -> Optional[Place]:
+    """Canonical Place for a free-form location string, or None"""
+    if not text:
+        return None
+    cleaned = _POSTCODE.sub(' ', _TRAILER.sub('', _PARENTHESES.sub(' ', text)))
+    parts = [part for part in (_fold(part) for part in cleaned.split(','))
+             if part and part not in _IGNORED_PARTS and part not in COUNTRIES]
+    if not parts:
+        return None
+
+    city, qualifier = parts[0], (parts[1] if len(parts) > 1 else None)
+    candidates = GAZETTEER.get(city)
+    if candidates is None and qualifier is None:
+        # 'San Jose CA'
+        match = _TRAILING_STATE.match(city)
+        if match and match.group(2).upper() in _STATE_CODES:
+            city, qualifier = match.groups()
+            candidates = GAZETTEER.get(city)
+    if candidates is None:
+        # 'Greater Seattle Area', 'Greater Boston Metropolitan Area'
+        match = _AREA.match(city)
+        if match:
+            candidates = GAZETTEER.get(match.group(0)) or GAZETTEER.get(match.group(1))
+    if candidates is None:
+        return None
+    return _pick(candidates, qualifier)
+
+
+def is_remote(text: Optional[str]) -> bool:
+    return bool(text) and 'remote' in text.lower()
+
+
+def haversine_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in miles"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+
+def distance_miles(a: Place, b: Place) -> float:
+    return haversine_miles(a.latitude, a.longitude, b.latitude, b.longitude)
+
+
+def bounding_box(latitude: float, longitude: float, miles: float) -> Tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) enclosing the circle; a cheap prefilter.
+
+    Longitudes are not wrapped: near the antimeridian they extend past +-180,
+    see longitude_ranges(). A circle around a pole spans every longitude.
+    """
+    dlat = miles / MILES_PER_DEGREE_LAT
+    cos_lat = math.cos(math.radians(latitude))
+    if cos_lat < 1e-6 or abs(latitude) + dlat >= 90.0:
+        dlon = 180.0
+    else:
+        dlon = min(180.0, dlat / cos_lat)
+    return (max(-90.0, latitude - dlat), min(90.0, latitude + dlat), longitude - dlon, longitude + dlon)
+
+
+def longitude_ranges(min_lon: float, max_lon: float) -> List[Tuple[float, float]]:
+    """Split a bounding box's longitude span into ranges within [-180, 180]"""
+    if max_lon - min_lon >= 360.0:
+        return [(-180.0, 180.0)]
+    if min_lon < -180.0:
+        return [(min_lon + 360.0, 180.0), (-180.0, max_lon)]
+    if max_lon > 180.0:
+        return [(min_lon, 180.0), (-180.0, max_lon - 360.0)]
+    return [(min_lon, max_lon)]
+
+
+def geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits = bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = bit_count = 0
+    return ''.join(chars)
+
+
+def _cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) in degrees of a geohash cell"""
+    total = 5 * precision
+    lon_bits = (total + 1) // 2
+    return 180.0 / (1 << (total - lon_bits)), 360.0 / (1 << lon_bits)
+
+
+def covering_cells(latitude: float, longitude: float, miles: float,
+                   precision: int = GEOHASH_PRECISION) -> Set[str]:
+    """Geohashes of every cell intersecting the circle's bounding box"""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, miles)
+    height, width = _cell_size(precision)
+    lats = [min_lat + i * height for i in range(int((max_lat - min_lat) / height) + 1)] + [max_lat]
+    lons = [min_lon + i * width for i in range(int((max_lon - min_lon) / width) + 1)] + [max_lon]
+    return {geohash(lat, (lon + 180.0) % 360.0 - 180.0, precision) for lat in lats for lon in lons}
+
+
+def geo_columns(location: Optional[str]) -> Tuple[Optional[str], Optional[float], Optional[float], Optional[str]]:
+    """(place label, latitude, longitude, geohash) to store with a job; all None when unresolved"""
+    place = normalize_location(location)
+    if place is None:
+        return None, None, None, None
+    return place.label, place.latitude, place.longitude, geohash(place.latitude, place.longitude, 9)
+
+
+class GeoIndex:
+    """In-memory geohash buckets of (key, latitude, longitude) points"""
+
+    def __init__(self, precision: int = GEOHASH_PRECISION):
+        self.precision = precision
+        self.buckets: Dict[str, List[Tuple[Any, float, float]]] = defaultdict(list)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, key: Any, latitude: float, longitude: float):
+        self.buckets[geohash(latitude, longitude, self.precision)].append((key, latitude, longitude))
+        self.size += 1
+
+    def add_location(self, key: Any, location: Optional[str]) -> Optional[Place]:
+        """Index ``key`` at its normalized location; unresolved locations are skipped"""
+        place = normalize_location(location)
+        if place is not None:
+            self.add(key, place.latitude, place.longitude)
+        return place
+
+    def within(self, latitude: float, longitude: float, miles: float) -> List[Tuple[Any, float]]:
+        """(key, distance) of every point within ``miles``, nearest first"""
+        found = []
+        for cell in covering_cells(latitude, longitude, miles, self.precision):
+            for key, lat, lon in self.buckets.get(cell, ()):
+                distance = haversine_miles(latitude, longitude, lat, lon)
+                if distance <= miles:
+                    found.append((key, distance))
+        found.sort(key=lambda item: item[1])
+        return found
+
+    def within_location(self, location: str, miles: float = DEFAULT_RADIUS_MILES) -> List[Tuple[Any, float]]:
+        center = normalize_location(location)
+        if center is None:
+            raise ValueError(f"Unknown location: {location}")
+        return self.within(center.latitude, center.longitude, miles)
@@ -38,6 +38,7 @@ import webbrowser
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
+from top_k import top_k
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -135,12 +136,12 @@ class JobScraper:
                 all_jobs.extend(result)
                 logger.info(f"✅ Source {i}: {len(result)} jobs")
 
-        # Deduplicate and sort by automation confidence
+        # Deduplicate and keep the most automatable
         unique_jobs = self.deduplicate_jobs(all_jobs)
-        sorted_jobs = sorted(unique_jobs, key=lambda x: x.automation_confidence, reverse=True)
+        best_jobs = top_k(unique_jobs, target_count, key=lambda x: x.automation_confidence)
 
-        logger.info(f"🎉 Total unique jobs scraped: {len(sorted_jobs)}")
-        return sorted_jobs[:target_count]
+        logger.info(f"🎉 Total unique jobs scraped: {len(unique_jobs)}")
+        return best_jobs
 
     async def scrape_synthetic_jobs(self, category: str, count: int) -> List[JobListing]:
         """Generate realistic synthetic job listings for testing"""
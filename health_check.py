@@ -9,6 +9,7 @@ import clickhouse_connect
 from flask import Flask, jsonify
 from datetime import datetime
 import os
+from app_metrics import CONTENT_TYPE, render_metrics
 
 app = Flask(__name__)
 
@@ -146,9 +147,10 @@ disk_free_bytes {system_resources['disk_free_gb'] * 1024**3}
 # HELP service_health_status Service health status (1 = healthy, 0 = unhealthy)
 # TYPE service_health_status gauge
 service_health_status {1 if check_database_connection() else 0}
-"""
 
-        return metrics_text, 200, {'Content-Type': 'text/plain; charset=utf-8'}
+""" + render_metrics()
+
+        return metrics_text, 200, {'Content-Type': CONTENT_TYPE}
     except Exception as e:
         return f"# Error generating metrics: {e}\n", 500
 
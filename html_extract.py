@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Fast HTML extraction with per-source precompiled selector sets
+- Each job board gets a SelectorSet: how to find job cards and, per card,
+  the fields to pull out (text or an attribute)
+- Selectors are written once as tag/class-substring matches, the same
+  shape as the scrapers' ``find(..., class_=lambda x: 'job' in x.lower())``
+  calls, and compiled up front for the active backend
+- Backends: lxml (C parser, precompiled XPath) when installed, otherwise
+  BeautifulSoup with precompiled soupsieve selectors. lxml failures fall
+  back to BeautifulSoup for that page
+- Pages that cannot contain a card (no card class substring anywhere) are
+  skipped without building a tree
+
+    from html_extract import extract
+    for fields in extract('indeed', html):
+        fields['title'], fields['company'], fields['url']
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+_UPPER = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+_LOWER = _UPPER.lower()
+
+BACKENDS = ('lxml', 'bs4')
+
+
+def default_backend() -> str:
+    """HTML_EXTRACT_BACKEND if set, else lxml when installed, else bs4"""
+    requested = os.getenv('HTML_EXTRACT_BACKEND')
+    if requested in BACKENDS and (requested != 'lxml' or lxml is not None):
+        return requested
+    return 'lxml' if lxml is not None else 'bs4'
+
+
+@dataclass(frozen=True)
+class Match:
+    """Element test: any of ``tags`` (any tag when empty) whose class contains
+    any of ``classes`` case-insensitively, optionally carrying ``attr``"""
+    tags: Tuple[str, ...] = ()
+    classes: Tuple[str, ...] = ()
+    attr: Optional[str] = None
+
+    def xpath(self) -> str:
+        conditions = []
+        if self.tags:
+            conditions.append(' or '.join(f"self::{tag}" for tag in self.tags))
+        if self.classes:
+            lowered = f"translate(@class, '{_UPPER}', '{_LOWER}')"
+            conditions.append(' or '.join(f"contains({lowered}, '{name.lower()}')" for name in self.classes))
+        if self.attr:
+            conditions.append(f"@{self.attr}")
+        return './/*' + ''.join(f"[{condition}]" for condition in conditions)
+
+    def css(self) -> str:
+        tags = self.tags or ('',)
+        classes = [f'[class*="{name}" i]' for name in self.classes] or ['']
+        attr = f"[{self.attr}]" if self.attr else ''
+        selectors = [f"{tag}{cls}{attr}" for tag in tags for cls in classes]
+        return ', '.join(selector or '*' for selector in selectors)
+
+
+@dataclass(frozen=True)
+class Field:
+    """First element found by ``matches`` (tried in order; the card itself
+    when empty); its text, own text (excluding children) or ``attr`` value"""
+    matches: Tuple[Match, ...]
+    attr: Optional[str] = None
+    own_text: bool = False
+
+
+def field(*matches: Match, attr: str = None, own_text: bool = False) -> Field:
+    return Field(tuple(matches), attr, own_text)
+
+
+def _soup_text(element, own_text: bool) -> str:
+    if own_text:
+        return ''.join(element.find_all(string=True, recursive=False)).strip()
+    return element.get_text(strip=True)
+
+
+def _lxml_text(element, own_text: bool) -> str:
+    if own_text:
+        # Direct text nodes: element.text plus each child's tail, like recursive=False in bs4
+        return ''.join(element.xpath('text()')).strip()
+    return ''.join(text.strip() for text in element.xpath('.//text()'))
+
+
+class SelectorSet:
+    """Card and field selectors for one source, compiled once per backend"""
+
+    def __init__(self, name: str, cards: Sequence[Match], fields: Dict[str, Field], limit: int = None):
+        self.name = name
+        self.cards = tuple(cards)
+        self.fields = dict(fields)
+        self.limit = limit
+        # Lowercased substrings of which at least one must be in the page
+        self.markers = None if any(not match.classes for match in self.cards) else tuple(
+            name.lower() for match in self.cards for name in match.classes)
+        self._compiled: Dict[str, tuple] = {}
+
+    def compile(self, backend: str) -> tuple:
+        compiled = self._compiled.get(backend)
+        if compiled is None:
+            if backend == 'lxml':
+                cards = etree.XPath(' | '.join(match.xpath() for match in self.cards))
+                fields = {name: ([etree.XPath(f"({match.xpath()})[1]") for match in spec.matches], spec)
+                          for name, spec in self.fields.items()}
+            else:
+                cards = soupsieve.compile(', '.join(match.css() for match in self.cards))
+                fields = {name: ([soupsieve.compile(match.css()) for match in spec.matches], spec)
+                          for name, spec in self.fields.items()}
+            compiled = self._compiled[backend] = (cards, fields)
+        return compiled
+
+    def extract(self, html: str, backend: str = None) -> List[Dict[str, Optional[str]]]:
+        if not html:
+            return []
+        if self.markers is not None:
+            lowered = html.lower()
+            if not any(marker in lowered for marker in self.markers):
+                return []
+
+        backend = backend or default_backend()
+        if backend == 'lxml':
+            try:
+                return self._extract_lxml(html)
+            except (etree.ParserError, ValueError) as e:
+                logger.debug(f"lxml could not parse {self.name} page ({e}), using BeautifulSoup")
+        return self._extract_soup(html)
+
+    def _extract_lxml(self, html: str) -> List[Dict[str, Optional[str]]]:
+        cards, fields = self.compile('lxml')
+        data = html.encode('utf-8', 'replace') if isinstance(html, str) else html
+        root = lxml.html.document_fromstring(data, parser=_LXML_PARSER)
+
+        rows = []
+        for card in cards(root)[:self.limit]:
+            row = {}
+            for name, (xpaths, spec) in fields.items():
+                element = card if not xpaths else None
+                for xpath in xpaths:
+                    found = xpath(card)
+                    if found:
+                        element = found[0]
+                        break
+                if element is None:
+                    row[name] = None
+                else:
+                    row[name] = element.get(spec.attr) if spec.attr else _lxml_text(element, spec.own_text)
+            rows.append(row)
+        return rows
+
+    def _extract_soup(self, html: str) -> List[Dict[str, Optional[str]]]:
+        cards, fields = self.compile('bs4')
+        soup = BeautifulSoup(html, 'lxml' if lxml is not None else 'html.parser')
+
+        rows = []
+        for card in cards.select(soup, limit=self.limit or 0):
+            row = {}
+            for name, (selectors, spec) in fields.items():
+                element = card if not selectors else None
+                for selector in selectors:
+                    element = selector.select_one(card)
+                    if element is not None:
+                        break
+                if element is None:
+                    row[name] = None
+                else:
+                    row[name] = element.get(spec.attr) if spec.attr else _soup_text(element, spec.own_text)
+            rows.append(row)
+        return rows
+
+
+_LXML_PARSER = lxml.html.HTMLParser(encoding='utf-8') if lxml is not None else None
+
+SELECTOR_SETS: Dict[str, SelectorSet] = {}
+
+
+def register(selector_set: SelectorSet) -> SelectorSet:
+    """Add a selector set and precompile it for the active backend"""
+    SELECTOR_SETS[selector_set.name] = selector_set
+    selector_set.compile(default_backend())
+    return selector_set
+
+
+def extract(source: str, html: str, backend: str = None) -> List[Dict[str, Optional[str]]]:
+    """Field dicts for each job card of ``source`` found in ``html``"""
+    return SELECTOR_SETS[source].extract(html, backend)
+
+
+register(SelectorSet(
+    'indeed',
+    cards=[Match(('div', 'article'), ('job', 'result'))],
+    fields={
+        'title': field(Match(('h2',)), Match(('span', 'a'), attr='title')),
+        'company': field(Match(('span',), ('company',)), Match(('a',), ('company',))),
+        'location': field(Match(('div', 'span'), ('location',))),
+        'url': field(Match(('a',), attr='href'), attr='href'),
+    },
+    limit=15,
+))
+
+register(SelectorSet(
+    'simplyhired',
+    cards=[Match(('article',), ('job',))],
+    fields={
+        'title': field(Match(('h3', 'h2', 'a'))),
+        'company': field(Match(('span',), ('company',))),
+    },
+    limit=10,
+))
+
+register(SelectorSet(
+    'linkedin_guest',
+    cards=[Match(('li', 'div'), ('job',))],
+    fields={
+        'title': field(Match(('h3', 'h2', 'a'))),
+        'company': field(Match(('h4', 'span'), ('company', 'subtitle'))),
+    },
+    limit=15,
+))
+
+register(SelectorSet(
+    'san_jose_indeed',
+    cards=[Match(('div',), ('job',))],
+    fields={
+        'title': field(Match(('a', 'h2'), ('title',))),
+        'company': field(Match(('span', 'div'), ('company',))),
+    },
+    limit=20,
+))
+
+register(SelectorSet(
+    'san_jose_linkedin',
+    cards=[Match(('div', 'li'), ('job',))],
+    fields={},
+    limit=15,
+))
+
+register(SelectorSet(
+    'jobright',
+    cards=[Match(('a',), ('main-job-card__',))],
+    fields={
+        'title': field(Match((), ('main-job-card-title',))),
+        'company': field(Match((), ('main-job-card-company-info',)), own_text=True),
+        'posted': field(Match((), ('main-job-card-extra-info',))),
+        'url': field(attr='href'),
+    },
+))
@@ -0,0 +1,593 @@
+#!/usr/bin/env python3
+"""
+Record/replay cassettes for HTTP traffic
+- One gzip-compressed JSON Lines file per cassette; every response is
+  appended as its own gzip member, so a crash loses at most the last one:
+  loading stops at a cut-off member and the next recording overwrites it
+- Requests are matched on method, URL (query sorted, volatile cache-busting
+  parameters dropped) and a body hash. Repeated requests replay their
+  recordings in order, then keep returning the last one
+- Works with `requests.Session` (a mounted transport adapter) and
+  `aiohttp.ClientSession` (a drop-in session wrapper)
+- Modes: replay (never touch the network, a miss raises CassetteMiss),
+  record (always fetch and append), once (replay if recorded, else
+  record), off
+- Set HTTP_CASSETTE=path (and optionally HTTP_CASSETTE_MODE) to route the
+  crawler's and the San Jose scraper's sessions through a cassette
+- `throughput` pushes recorded traffic through fetch, parse and store as
+  fast as it will go, for benchmarking ingest without network noise
+
+    HTTP_CASSETTE=cassettes/crawl.jsonl.gz HTTP_CASSETTE_MODE=record python clickhouse_web_crawler.py
+    python http_cassette.py import raw_responses_*.json api_exploration_*.json -o cassettes/captured.jsonl.gz
+    python http_cassette.py throughput cassettes/crawl.jsonl.gz --iterations 50
+"""
+
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+MODES = ('replay', 'record', 'once', 'off')
+DEFAULT_MODE = 'once'
+# Query parameters that only bust caches and would defeat matching
+VOLATILE_PARAMS = frozenset({'_', 'cb', 'cachebuster', 'ts', 'timestamp'})
+# Bodies are stored decoded, so these no longer describe them
+HOP_HEADERS = frozenset({'content-encoding', 'transfer-encoding', 'content-length', 'connection'})
+
+
+class CassetteMiss(LookupError):
+    """A replay-mode request that was never recorded"""
+
+
+def _body_bytes(body) -> bytes:
+    if body is None:
+        return b''
+    if isinstance(body, str):
+        return body.encode('utf-8')
+    if isinstance(body, (bytes, bytearray)):
+        return bytes(body)
+    if isinstance(body, dict):
+        return urlencode(sorted(body.items())).encode('utf-8')
+    return b''  # Streams and generators are not matched on
+
+
+def request_key(method: str, url: str, body=None) -> str:
+    parts = urlsplit(str(url))
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                             if k not in VOLATILE_PARAMS))
+    normalized = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+    data = _body_bytes(body)
+    digest = hashlib.sha1(data).hexdigest()[:16] if data else '-'
+    return f"{method.upper()} {normalized} {digest}"
+
+
+def entry_content(entry: Dict[str, Any]) -> bytes:
+    if 'body_b64' in entry:
+        return base64.b64decode(entry['body_b64'])
+    return entry.get('body', '').encode('utf-8')
+
+
+def make_entry(method: str, url: str, body, status: int, headers: Dict[str, str], content: bytes,
+               elapsed: float = 0.0, **extra) -> Dict[str, Any]:
+    entry = {
+        'key': request_key(method, url, body),
+        'method': method.upper(),
+        'url': str(url),
+        'status': status,
+        'headers': {k: v for k, v in headers.items() if k.lower() not in HOP_HEADERS},
+        'elapsed': round(elapsed, 6),
+        'recorded_at': datetime.now().isoformat(),
+    }
+    try:
+        entry['body'] = content.decode('utf-8')
+    except UnicodeDecodeError:
+        entry['body_b64'] = base64.b64encode(content).decode('ascii')
+    entry.update(extra)
+    return entry
+
+
+class Cassette:
+    """Recorded responses keyed by request, persisted as gzip JSON Lines"""
+
+    def __init__(self, path: str, mode: str = DEFAULT_MODE):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.path = path
+        self.mode = mode
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._order: List[Dict[str, Any]] = []
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self.bytes_replayed = 0
+        # Size up to the last complete gzip member when the file ends in a cut-off one
+        self._truncate_to = None
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self, chunk_size: int = 1 << 20):
+        """Read member by member, so a member cut off by a crash only loses itself"""
+        complete = 0  # Bytes of the file in complete members
+        member = b''  # Decompressed text of the member being read
+        decoder = None
+        corrupt = False
+        with open(self.path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                while chunk and not corrupt:
+                    decoder = decoder or zlib.decompressobj(wbits=31)
+                    try:
+                        member += decoder.decompress(chunk)
+                    except zlib.error as e:
+                        logger.warning(f"⚠️ Corrupt gzip data after byte {complete} of {self.path}: {e}")
+                        corrupt = True
+                        break
+                    if not decoder.eof:
+                        break  # The member continues in the next chunk
+                    complete += len(chunk) - len(decoder.unused_data)
+                    for line in member.decode('utf-8').splitlines():
+                        if line.strip():
+                            self._add(json.loads(line))
+                    chunk, member, decoder = decoder.unused_data, b'', None
+                if corrupt:
+                    break
+        if decoder is not None:
+            # The next recording starts a fresh member where the damaged one began
+            self._truncate_to = complete
+            logger.warning(f"⚠️ {self.path} ends in an incomplete recording after byte {complete}; "
+                           f"kept {len(self._order)} responses")
+        logger.info(f"📼 Loaded {len(self._order)} recorded responses from {self.path}")
+
+    def _add(self, entry: Dict[str, Any]):
+        self._entries.setdefault(entry['key'], []).append(entry)
+        self._order.append(entry)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self._order))
+
+    @property
+    def records(self) -> bool:
+        return self.mode in ('record', 'once')
+
+    def has(self, method: str, url: str, body=None) -> bool:
+        return request_key(method, url, body) in self._entries
+
+    def play(self, method: str, url: str, body=None) -> Optional[Dict[str, Any]]:
+        """The recorded entry to replay, or None when the network should be used"""
+        if self.mode in ('off', 'record'):
+            return None
+        key = request_key(method, url, body)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                if self.mode == 'replay':
+                    raise CassetteMiss(f"No recording for {key} in {self.path}")
+                return None
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            entry = entries[min(cursor, len(entries) - 1)]
+            self.hits += 1
+            self.bytes_replayed += len(entry.get('body') or entry.get('body_b64') or '')
+        return entry
+
+    def add(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Store an entry in memory and append it to the cassette file"""
+        line = (json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'ab') as f:
+                if self._truncate_to is not None:
+                    f.truncate(self._truncate_to)
+                    self._truncate_to = None
+                f.write(gzip.compress(line))
+            self._add(entry)
+            self.recorded += 1
+        return entry
+
+    def record(self, method: str, url: str, body, status: int, headers: Dict[str, str], content: bytes,
+               elapsed: float = 0.0) -> Dict[str, Any]:
+        return self.add(make_entry(method, url, body, status, headers, content, elapsed))
+
+    def rewind(self):
+        """Start every request's replay sequence from its first recording again"""
+        with self._lock:
+            self._cursors.clear()
+
+
+# requests
+
+class CassetteAdapter(HTTPAdapter):
+    """Transport adapter answering from a cassette and recording real responses"""
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        entry = self.cassette.play(request.method, request.url, request.body)
+        if entry is not None:
+            return self._replayed_response(request, entry)
+
+        response = super().send(request, **kwargs)
+        if self.cassette.records:
+            self.cassette.record(request.method, request.url, request.body, response.status_code,
+                                 dict(response.headers), response.content, response.elapsed.total_seconds())
+        return response
+
+    def _replayed_response(self, request, entry: Dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = entry_content(entry)
+        # There is no raw stream; iter_content()/iter_lines() serve _content once it counts as read
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.reason = 'Replayed'
+        response.elapsed = timedelta(0)
+        response.connection = self
+        return response
+
+
+def use_cassette(session: requests.Session, cassette: Cassette) -> requests.Session:
+    """Route every request of ``session`` through ``cassette``"""
+    adapter = CassetteAdapter(cassette)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# aiohttp
+
+class ReplayedClientResponse:
+    """The parts of aiohttp.ClientResponse the scrapers use"""
+
+    def __init__(self, method: str, url: str, entry: Dict[str, Any]):
+        from multidict import CIMultiDict, CIMultiDictProxy
+        from yarl import URL
+
+        self.method = method
+        self.url = URL(url)
+        self.status = entry['status']
+        self.reason = 'Replayed'
+        self.headers = CIMultiDictProxy(CIMultiDict(entry['headers']))
+        self._content = entry_content(entry)
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get('Content-Type', 'application/octet-stream').split(';')[0].strip()
+
+    async def read(self) -> bytes:
+        return self._content
+
+    async def text(self, encoding: str = None, errors: str = 'strict') -> str:
+        if encoding is None:
+            encoding = get_encoding_from_headers(CaseInsensitiveDict(self.headers)) or 'utf-8'
+        return self._content.decode(encoding, errors)
+
+    async def json(self, *, loads=json.loads, **kwargs) -> Any:
+        return loads(self._content.decode('utf-8')) if self._content else None
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status} replayed for {self.url}")
+
+    def release(self):
+        pass
+
+    def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+class _RequestContext:
+    """Awaitable and async context manager, like aiohttp's request context"""
+
+    def __init__(self, coro):
+        self._coro = coro
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self):
+        self._response = await self._coro
+        return self._response
+
+    async def __aexit__(self, *exc_info):
+        self._response.release()
+
+
+class CassetteClientSession:
+    """aiohttp.ClientSession stand-in answering from a cassette; ``session``
+    (or one created from ``session_kwargs``) does the real fetching"""
+
+    def __init__(self, cassette: Cassette, session=None, **session_kwargs):
+        self.cassette = cassette
+        self._session = session
+        self._session_kwargs = session_kwargs
+
+    def request(self, method: str, url, **kwargs) -> _RequestContext:
+        return _RequestContext(self._request(method, str(url), **kwargs))
+
+    def get(self, url, **kwargs) -> _RequestContext:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs) -> _RequestContext:
+        return self.request('POST', url, **kwargs)
+
+    def head(self, url, **kwargs) -> _RequestContext:
+        return self.request('HEAD', url, **kwargs)
+
+    async def _request(self, method: str, url: str, **kwargs) -> ReplayedClientResponse:
+        params = kwargs.pop('params', None)
+        if params:
+            from yarl import URL
+            url = str(URL(url).update_query(params))
+        body = kwargs.get('data')
+        if body is None and kwargs.get('json') is not None:
+            body = json.dumps(kwargs['json'], sort_keys=True)
+
+        entry = self.cassette.play(method, url, body)
+        if entry is None:
+            if self._session is None:
+                import aiohttp
+                self._session = aiohttp.ClientSession(**self._session_kwargs)
+            started = time.perf_counter()
+            async with self._session.request(method, url, **kwargs) as response:
+                content = await response.read()
+                headers = dict(response.headers)
+                status = response.status
+            elapsed = time.perf_counter() - started
+            if self.cassette.records:
+                entry = self.cassette.record(method, url, body, status, headers, content, elapsed)
+            else:
+                entry = make_entry(method, url, body, status, headers, content, elapsed)
+        return ReplayedClientResponse(method, url, entry)
+
+    @property
+    def closed(self) -> bool:
+        return self._session is None or self._session.closed
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+# Environment hooks
+
+_cassettes: Dict[str, Cassette] = {}
+
+
+def from_env() -> Optional[Cassette]:
+    """The cassette named by HTTP_CASSETTE, shared by every session in the process"""
+    path = os.getenv('HTTP_CASSETTE')
+    if not path:
+        return None
+    if path not in _cassettes:
+        _cassettes[path] = Cassette(path, os.getenv('HTTP_CASSETTE_MODE', DEFAULT_MODE))
+    return _cassettes[path]
+
+
+def install(session: requests.Session) -> requests.Session:
+    """use_cassette() when HTTP_CASSETTE is set; the session unchanged otherwise"""
+    cassette = from_env()
+    return use_cassette(session, cassette) if cassette else session
+
+
+def wrap_aiohttp(session):
+    """CassetteClientSession around ``session`` when HTTP_CASSETTE is set"""
+    cassette = from_env()
+    return CassetteClientSession(cassette, session) if cassette else session
+
+
+# Importing existing captures
+
+def _capture_entry(method, url, status, headers, preview, full_length=None, source=None):
+    content = (preview or '').encode('utf-8')
+    extra = {'imported_from': source}
+    if full_length and full_length > len(content):
+        extra['truncated'] = True
+    return make_entry(method, url, None, status or 200, headers or {'Content-Type': 'text/html; charset=utf-8'},
+                      content, **extra)
+
+
+def _walk_capture(node, source) -> Iterator[Dict[str, Any]]:
+    """raw_responses_*.json and api_exploration_*.json shaped captures"""
+    if isinstance(node, list):
+        for item in node:
+            yield from _walk_capture(item, source)
+        return
+    if not isinstance(node, dict):
+        return
+    if 'url' in node and ('html_preview' in node or 'content_preview' in node):
+        preview = node.get('html_preview', node.get('content_preview'))
+        length = node.get('full_html_length', node.get('content_length'))
+        headers = {'Content-Type': node['content_type']} if node.get('content_type') else None
+        yield _capture_entry('GET', node['url'], node.get('status_code'), headers, preview, length, source)
+    if 'endpoint' in node and isinstance(node.get('methods_tested'), dict):
+        for method, result in node['methods_tested'].items():
+            if isinstance(result, dict) and 'status_code' in result:
+                yield _capture_entry(method, node['endpoint'], result['status_code'], result.get('headers'),
+                                     result.get('content_preview'), result.get('content_length'), source)
+    for value in node.values():
+        if isinstance(value, (dict, list)):
+            yield from _walk_capture(value, source)
+
+
+def import_capture(path: str, cassette: Cassette, url: str = None) -> int:
+    """Append a JSON capture, or an HTML page recorded for ``url``, to ``cassette``"""
+    source = os.path.basename(path)
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            entries = list(_walk_capture(json.load(f), source))
+    else:
+        if not url:
+            raise ValueError(f"--url is required to import {path}")
+        with open(path, encoding='utf-8', errors='replace') as f:
+            entries = [_capture_entry('GET', url, 200, None, f.read(), source=source)]
+
+    for entry in entries:
+        cassette.add(entry)
+    return len(entries)
+
+
+# Throughput mode
+
+# Hosts whose recorded HTML pages are parsed with an html_extract selector set
+HTML_SELECTOR_SETS = {
+    'indeed.com': 'indeed',
+    'linkedin.com': 'linkedin_guest',
+    'simplyhired.com': 'simplyhired',
+    'jobright.ai': 'jobright',
+}
+
+
+def _selector_set_for(url: str) -> Optional[str]:
+    host = urlsplit(url).netloc.lower()
+    host = host[4:] if host.startswith('www.') else host
+    return HTML_SELECTOR_SETS.get(host)
+
+
+def replay_throughput(cassette: Cassette, iterations: int = 10, storage=None, max_jobs: int = 100) -> Dict[str, Any]:
+    """Replay the cassette through fetch -> parse -> (store) with no network or rate limits
+
+    Crawler API sources with recordings go through JobScraper.scrape_source;
+    recorded HTML pages from known boards are fetched through the same
+    session and parsed with html_extract.
+    """
+    import html_extract
+    from clickhouse_web_crawler import JobScraper
+
+    cassette.mode = 'replay'
+    scraper = JobScraper(storage=None)
+    use_cassette(scraper.session, cassette)
+    sources = [name for name, config in scraper.job_sources.items()
+               if config['method'] == 'api' and cassette.has('GET', config['url'])]
+    pages = [(entry['url'], _selector_set_for(entry['url'])) for entry in cassette
+             if entry['method'] == 'GET' and entry['status'] < 400 and _selector_set_for(entry['url'])]
+    pages = list(dict.fromkeys(pages))
+
+    jobs_total = inserted = 0
+    cassette.hits = cassette.bytes_replayed = 0
+    started = time.perf_counter()
+    for iteration in range(iterations):
+        cassette.rewind()
+        batch = []
+        for name in sources:
+            batch.extend(scraper.scrape_source(name, max_jobs))
+        for url, selector_set in pages:
+            response = scraper.session.get(url)
+            for i, card in enumerate(html_extract.extract(selector_set, response.text)):
+                if not card.get('title'):
+                    continue
+                batch.append(scraper._create_job_posting({
+                    'id': f"{selector_set}_{iteration}_{i}_{hashlib.md5(url.encode()).hexdigest()[:8]}",
+                    'title': card['title'],
+                    'company': card.get('company') or 'Unknown Company',
+                    'location': card.get('location') or 'Unknown',
+                    'application_url': card.get('url') or url,
+                }, selector_set))
+        jobs_total += len(batch)
+        if storage is not None and batch:
+            inserted += storage.insert_jobs(batch)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'iterations': iterations,
+        'sources': sources,
+        'pages': len(pages),
+        'requests': cassette.hits,
+        'jobs': jobs_total,
+        'inserted': inserted,
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(cassette.hits / elapsed, 1) if elapsed else None,
+        'jobs_per_second': round(jobs_total / elapsed, 1) if elapsed else None,
+        'mb_per_second': round(cassette.bytes_replayed / elapsed / 1e6, 2) if elapsed else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record/replay cassettes for HTTP traffic")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    importer = subparsers.add_parser('import', help="Append existing captures to a cassette")
+    importer.add_argument('paths', nargs='+', help="raw_responses_*.json, api_exploration_*.json or .html files")
+    importer.add_argument('-o', '--output', required=True, help="Cassette path (.jsonl.gz)")
+    importer.add_argument('--url', help="URL an imported .html page was fetched from")
+
+    show = subparsers.add_parser('list', help="List recorded requests")
+    show.add_argument('cassette')
+
+    throughput = subparsers.add_parser('throughput', help="Replay a cassette through the ingest pipeline")
+    throughput.add_argument('cassette')
+    throughput.add_argument('--iterations', type=int, default=10)
+    throughput.add_argument('--max-jobs', type=int, default=100, help="Jobs per API source per iteration")
+    throughput.add_argument('--store', action='store_true',
+                            help="Also insert into ClickHouse (CLICKHOUSE_HOST) or its SQLite fallback")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.command == 'import':
+        cassette = Cassette(args.output, mode='record')
+        for path in args.paths:
+            count = import_capture(path, cassette, args.url)
+            print(f"📥 {path}: {count} responses")
+        print(f"📼 {args.output}: {len(cassette)} responses")
+    elif args.command == 'list':
+        for entry in Cassette(args.cassette, mode='replay'):
+            flag = ' (truncated)' if entry.get('truncated') else ''
+            print(f"{entry['status']} {entry['method']:<7} {entry['url']} {len(entry_content(entry)):>9,}B{flag}")
+    else:
+        if not os.path.exists(args.cassette):
+            parser.error(f"{args.cassette} does not exist")
+        storage = None
+        if args.store:
+            from clickhouse_web_crawler import ClickHouseJobStorage
+            storage = ClickHouseJobStorage(host=os.getenv('CLICKHOUSE_HOST', 'localhost'),
+                                           port=int(os.getenv('CLICKHOUSE_PORT', '8123')))
+        result = replay_throughput(Cassette(args.cassette, mode='replay'), args.iterations, storage, args.max_jobs)
+        print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -28,6 +28,8 @@ from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import random
 
+import daemon_profiler
+
 sys.path.append('/home/calelin/awesome-apply/venv/lib/python3.13/site-packages')
 
 class IntelligentApplicationManager:
@@ -368,13 +370,16 @@ Best regards,
         while self.running:
             try:
                 # Check JobRight system
-                applications_added = self.check_jobright_applications()
+                with daemon_profiler.stage('check_jobright'):
+                    applications_added = self.check_jobright_applications()
 
                 # Check continuous scraper database
-                scraper_apps = self.check_scraper_applications()
+                with daemon_profiler.stage('check_scraper'):
+                    scraper_apps = self.check_scraper_applications()
 
                 # Check other automation systems
-                other_apps = self.check_other_systems()
+                with daemon_profiler.stage('check_other_systems'):
+                    other_apps = self.check_other_systems()
 
                 total_new = applications_added + scraper_apps + other_apps
 
@@ -382,10 +387,12 @@ Best regards,
                     self.log(f"📊 Monitored {total_new} new applications this cycle", "SUCCESS")
 
                 # Update analytics
-                self.update_analytics()
+                with daemon_profiler.stage('update_analytics'):
+                    self.update_analytics()
 
                 # Check for follow-ups needed
-                self.check_follow_ups_needed()
+                with daemon_profiler.stage('follow_ups'):
+                    self.check_follow_ups_needed()
 
                 # Sleep before next monitoring cycle
                 time.sleep(300)  # Check every 5 minutes
@@ -631,13 +638,15 @@ Best regards,
         self.log("=" * 60)
 
         # Start monitoring in background
-        monitor_thread = threading.Thread(target=self.monitor_applications_from_systems, daemon=True)
+        monitor_thread = threading.Thread(target=self.monitor_applications_from_systems,
+                                          name='application-monitor', daemon=True)
         monitor_thread.start()
 
         try:
             while self.running:
                 # Display dashboard every 30 minutes
-                dashboard = self.get_application_dashboard()
+                with daemon_profiler.stage('dashboard'):
+                    dashboard = self.get_application_dashboard()
 
                 self.log("=" * 60)
                 self.log("📊 APPLICATION DASHBOARD")
@@ -667,6 +676,7 @@ Best regards,
 
 def main():
     """Main function"""
+    daemon_profiler.install('intelligent_application_manager')
     manager = IntelligentApplicationManager()
 
     try:
@@ -7,24 +7,29 @@ Provides job scraping, auto-application, and pattern analysis
 import asyncio
 import json
 import sqlite3
+import threading
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, List, Optional
 import logging
-from dataclasses import dataclass, asdict
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import requests
-from bs4 import BeautifulSoup
+from dataclasses import dataclass, fields
 import re
 from flask import Flask, jsonify, request, render_template
 from flask_cors import CORS
-import threading
+import os
+from task_queue import TaskContext, get_task_queue, start_worker_processes
+from event_stream import get_task_bridge, sse_response
+from response_cache import cached_response, bump_corpus_version
+from json_responses import enable_compression, json_page_response, parse_fields, row_getter
+from app_metrics import instrument_app, track_task_queue
+from tracing import trace_app
+from geo_index import (DEFAULT_RADIUS_MILES, bounding_box, geo_columns, haversine_miles, longitude_ranges,
+                       normalize_location)
+from salary_normalizer import DEFAULT_CURRENCY, normalize_column, salary_columns
+from feature_store import FeatureStore
+from semantic_search import VectorIndex, VectorSnapshot
+from mmap_snapshot import SnapshotReader
+from sqlite_snapshot import ReadSnapshot, publish as publish_read_snapshot
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -52,6 +57,24 @@ class Job:
         if self.tags is None:
             self.tags = []
 
+JOB_COLUMNS = tuple(f.name for f in fields(Job))
+# Normalized location (see geo_index) and salary (see salary_normalizer) stored next
+# to each job at ingest, so filters never re-parse the raw text
+GEO_COLUMNS = ('place', 'latitude', 'longitude', 'geohash')
+SALARY_COLUMNS = ('salary_min', 'salary_max', 'salary_period', 'salary_currency')
+DERIVED_COLUMNS = {
+    'place': 'TEXT', 'latitude': 'REAL', 'longitude': 'REAL', 'geohash': 'TEXT',
+    'salary_min': 'INTEGER', 'salary_max': 'INTEGER', 'salary_period': 'TEXT', 'salary_currency': 'TEXT',
+}
+STORED_COLUMNS = JOB_COLUMNS + GEO_COLUMNS + SALARY_COLUMNS
+INSERT_JOB_SQL = (f"INSERT OR REPLACE INTO jobs ({', '.join(STORED_COLUMNS)}) "
+                  f"VALUES ({', '.join('?' * len(STORED_COLUMNS))})")
+
+
+def derived_columns(location: Optional[str], salary: Optional[str]) -> tuple:
+    """Values of GEO_COLUMNS + SALARY_COLUMNS for one job"""
+    return (*geo_columns(location), *salary_columns(salary))
+
 @dataclass
 class SearchCriteria:
     keywords: List[str]
@@ -64,10 +87,40 @@ class SearchCriteria:
     company_size: Optional[str]
     remote_ok: bool
 
+# Seconds between background snapshot publishes (see JobDatabase.schedule_publish)
+PUBLISH_INTERVAL = float(os.getenv('SNAPSHOT_PUBLISH_INTERVAL', '10'))
+
+
 class JobDatabase:
-    def __init__(self, db_path: str = "jobright_clone.db"):
+    def __init__(self, db_path: str = "jobright_clone.db", read_snapshots: Optional[bool] = None,
+                 publish_interval: float = PUBLISH_INTERVAL):
         self.db_path = db_path
         self.init_database()
+        # Scoring features (see feature_store) are written with each job and read by rankers
+        self.features = FeatureStore(db_path)
+        self._vectors = None
+        self._vectors_lock = threading.Lock()
+        # Read-only copies published after each ingest, memory-mapped and shared by every worker
+        self.snapshot_root = f"{db_path}.snapshots"
+        self._vector_snapshots = SnapshotReader(os.path.join(self.snapshot_root, 'vectors'))
+        self._vector_snapshot = None
+        # Snapshot read mode (see sqlite_snapshot): job listings read an immutable copy of the
+        # database published after each ingest, so page loads never wait on ingest writes
+        if read_snapshots is None:
+            read_snapshots = os.getenv('READ_SNAPSHOTS', '0') == '1'
+        self.read_snapshot = None
+        if read_snapshots:
+            # CURRENT is re-read on every connect (one small file read), so a read in any process
+            # after a publish sees it; writers publish before bumping the corpus version, and a
+            # response cached under the new version is never built from the old snapshot
+            self.read_snapshot = ReadSnapshot(db_path, os.path.join(self.snapshot_root, 'sqlite'), check_interval=0)
+        # Publishing copies the whole corpus, so request handlers only schedule it (debounced)
+        self.publish_interval = publish_interval
+        self._publish_lock = threading.Lock()
+        self._publishing = threading.Lock()
+        self._publish_timer = None
+        self._last_publish = float('-inf')
+        self._on_published = []
 
     def init_database(self):
         conn = sqlite3.connect(self.db_path)
@@ -91,9 +144,18 @@ class JobDatabase:
                 scraped_at TEXT,
                 application_status TEXT DEFAULT 'not_applied',
                 automation_score REAL DEFAULT 0.0,
-                tags TEXT
+                tags TEXT,
+                place TEXT,
+                latitude REAL,
+                longitude REAL,
+                geohash TEXT,
+                salary_min INTEGER,
+                salary_max INTEGER,
+                salary_period TEXT,
+                salary_currency TEXT
             )
         """)
+        self._migrate_derived_columns(cursor)
 
         # Application attempts table
         cursor.execute("""
@@ -126,46 +188,220 @@ class JobDatabase:
         conn.commit()
         conn.close()
 
+    def _migrate_derived_columns(self, cursor):
+        """Add the normalized location/salary columns to older databases and backfill them"""
+        existing = {row[1] for row in cursor.execute("PRAGMA table_info(jobs)")}
+        added = [column for column in DERIVED_COLUMNS if column not in existing]
+        for column in added:
+            cursor.execute(f"ALTER TABLE jobs ADD COLUMN {column} {DERIVED_COLUMNS[column]}")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_latitude ON jobs (latitude, longitude)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_place ON jobs (place)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_salary ON jobs (salary_max, salary_min)")
+
+        # Backfill from the raw columns; tables created by other tools may lack them
+        if set(added) & set(GEO_COLUMNS) and 'location' in existing:
+            rows = cursor.execute("SELECT id, location FROM jobs").fetchall()
+            cursor.executemany(
+                "UPDATE jobs SET place = ?, latitude = ?, longitude = ?, geohash = ? WHERE id = ?",
+                [(*geo_columns(location), job_id) for job_id, location in rows]
+            )
+            logger.info(f"🗺️ Normalized locations of {len(rows)} existing jobs")
+        if set(added) & set(SALARY_COLUMNS) and 'salary' in existing:
+            rows = cursor.execute("SELECT id, salary FROM jobs").fetchall()
+            salaries = zip(*normalize_column(salary for _, salary in rows))
+            cursor.executemany(
+                "UPDATE jobs SET salary_min = ?, salary_max = ?, salary_period = ?, salary_currency = ? WHERE id = ?",
+                [(*salary, job_id) for (job_id, _), salary in zip(rows, salaries)]
+            )
+            logger.info(f"💵 Normalized salaries of {len(rows)} existing jobs")
+
+    def _connect(self, read: bool = False) -> sqlite3.Connection:
+        """Connection to the primary, or to the read snapshot for ``read`` in snapshot read mode"""
+        if read and self.read_snapshot is not None:
+            conn = self.read_snapshot.connect()
+        else:
+            conn = sqlite3.connect(self.db_path)
+        conn.create_function('distance_miles', 4, haversine_miles, deterministic=True)
+        return conn
+
     def save_job(self, job: Job):
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
-        cursor.execute("""
-            INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        self.features.put([job], conn)
+
+        cursor.execute(INSERT_JOB_SQL, (
             job.id, job.title, job.company, job.location, job.salary,
             job.description, job.url, job.apply_url, job.posted_date,
             job.job_type, job.experience_level, job.source, job.scraped_at,
-            job.application_status, job.automation_score, json.dumps(job.tags)
+            job.application_status, job.automation_score, json.dumps(job.tags),
+            *derived_columns(job.location, job.salary)
         ))
 
         conn.commit()
         conn.close()
 
-    def get_jobs(self, limit: int = 100, filters: Dict = None) -> List[Job]:
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        query = "SELECT * FROM jobs"
+        if self._vectors is not None:
+            self._vectors.add_jobs([job])
+
+    @property
+    def vectors(self) -> VectorIndex:
+        """Embedding index of the jobs (see semantic_search), opened and caught up on first use"""
+        with self._vectors_lock:
+            if self._vectors is None:
+                index = VectorIndex(f"{self.db_path}.vectors")
+                conn = sqlite3.connect(self.db_path)
+                known = [job_id for (job_id,) in conn.execute("SELECT id FROM jobs") if job_id not in index]
+                for start in range(0, len(known), 500):
+                    chunk = known[start:start + 500]
+                    rows = conn.execute(f"SELECT id, title, description, tags FROM jobs "
+                                        f"WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+                    index.add_jobs({'id': job_id, 'title': title, 'description': description, 'tags': tags}
+                                   for job_id, title, description, tags in rows)
+                conn.close()
+                if known:
+                    logger.info(f"🧭 Embedded {len(known)} jobs missing from the vector index")
+                self._vectors = index
+            return self._vectors
+
+    def publish_snapshots(self):
+        """Publish the feature, vector and read snapshots readers switch to; call after an ingest cycle"""
+        self.features.publish(os.path.join(self.snapshot_root, 'features'))
+        self.vectors.publish(os.path.join(self.snapshot_root, 'vectors'))
+        self._vector_snapshots.refresh()
+        self.publish_read_snapshot()
+
+    def schedule_publish(self, on_published: Callable[[], None] = None):
+        """Publish snapshots in the background, at most once per ``publish_interval`` seconds.
+
+        Writes arriving before the scheduled publish starts share it. ``on_published``
+        (e.g. bumping the corpus version) runs once the snapshots are out.
+        """
+        with self._publish_lock:
+            if on_published is not None and on_published not in self._on_published:
+                self._on_published.append(on_published)
+            if self._publish_timer is not None:
+                return
+            delay = max(self._last_publish + self.publish_interval - time.monotonic(), 0)
+            self._publish_timer = threading.Timer(delay, self._scheduled_publish)
+            self._publish_timer.daemon = True
+            self._publish_timer.start()
+
+    def _scheduled_publish(self):
+        with self._publishing:
+            with self._publish_lock:
+                self._publish_timer = None
+                self._last_publish = time.monotonic()
+                callbacks, self._on_published = self._on_published, []
+            try:
+                self.publish_snapshots()
+            except Exception as e:
+                logger.error(f"❌ Snapshot publish failed: {e}")
+                return
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.warning(f"⚠️ Post-publish callback failed: {e}")
+
+    def publish_read_snapshot(self):
+        """Publish the database copy snapshot read mode serves; call after writes, before bump_corpus_version"""
+        if self.read_snapshot is not None:
+            publish_read_snapshot(self.db_path, os.path.join(self.snapshot_root, 'sqlite'))
+            self.read_snapshot.refresh()
+
+    def vector_snapshot(self) -> Optional[VectorSnapshot]:
+        current = self._vector_snapshots.current()
+        if current is None:
+            return None
+        if self._vector_snapshot is None or self._vector_snapshot.version != current.version:
+            self._vector_snapshot = VectorSnapshot(current)
+        return self._vector_snapshot
+
+    def similar_jobs(self, job_id: str = None, profile: Dict = None, k: int = 10) -> List[tuple]:
+        """(Job, similarity) pairs nearest to a stored job or to a profile, best first"""
+        snapshot = self.vector_snapshot()
+        live = False
+        if job_id is not None:
+            # Jobs ingested since the last publish are only in the live index
+            if snapshot is not None and job_id in snapshot:
+                hits = snapshot.similar_to_job(job_id, k)
+            else:
+                live = True
+                try:
+                    hits = self.vectors.similar_to_job(job_id, k)
+                except KeyError:
+                    raise ValueError(f"Unknown job: {job_id}")
+        else:
+            live = snapshot is None
+            hits = (snapshot or self.vectors).search_profile(profile or {}, k)
+        # Hits from the live index may be newer than the read snapshot
+        jobs = {job.id: job for job in self.get_jobs(limit=len(hits), filters={'ids': [hit for hit, _ in hits]},
+                                                      fresh=live)}
+        return [(jobs[hit], score) for hit, score in hits if hit in jobs]
+
+    def _where_clause(self, filters: Dict = None):
+        conditions = []
         params = []
 
         if filters:
-            conditions = []
+            if filters.get('id'):
+                conditions.append("id = ?")
+                params.append(filters['id'])
+            if filters.get('ids') is not None:
+                conditions.append(f"id IN ({', '.join('?' * len(filters['ids']))})")
+                params.extend(filters['ids'])
             if filters.get('keywords'):
                 conditions.append("(title LIKE ? OR description LIKE ?)")
                 keyword = f"%{' '.join(filters['keywords'])}%"
                 params.extend([keyword, keyword])
             if filters.get('location'):
-                conditions.append("location LIKE ?")
+                place = normalize_location(filters['location'])
+                if place is not None:
+                    conditions.append("(place = ? OR location LIKE ?)")
+                    params.append(place.label)
+                else:
+                    conditions.append("location LIKE ?")
                 params.append(f"%{filters['location']}%")
+            # Overlap with the requested range, on the annualized salary stored at ingest;
+            # open-ended postings ("$120k+", "up to $150k") are unbounded on their missing side.
+            # Amounts are only comparable within one currency, USD unless asked otherwise
+            if filters.get('salary_min') or filters.get('salary_max'):
+                conditions.append("salary_currency = ?")
+                params.append((filters.get('salary_currency') or DEFAULT_CURRENCY).upper())
+            if filters.get('salary_min'):
+                conditions.append("(salary_max >= ? OR salary_max IS NULL AND salary_min IS NOT NULL)")
+                params.append(int(filters['salary_min']))
+            if filters.get('salary_max'):
+                conditions.append("(salary_min <= ? OR salary_min IS NULL AND salary_max IS NOT NULL)")
+                params.append(int(filters['salary_max']))
+            if filters.get('near'):
+                center = normalize_location(filters['near'])
+                if center is None:
+                    raise ValueError(f"Unknown location: {filters['near']}")
+                radius = float(filters.get('radius') or DEFAULT_RADIUS_MILES)
+                min_lat, max_lat, min_lon, max_lon = bounding_box(center.latitude, center.longitude, radius)
+                # Two longitude ranges when the box crosses the antimeridian
+                lon_ranges = longitude_ranges(min_lon, max_lon)
+                conditions.append(f"latitude BETWEEN ? AND ? "
+                                  f"AND ({' OR '.join(['longitude BETWEEN ? AND ?'] * len(lon_ranges))}) "
+                                  f"AND distance_miles(latitude, longitude, ?, ?) <= ?")
+                params.extend([min_lat, max_lat, *(bound for lon_range in lon_ranges for bound in lon_range),
+                               center.latitude, center.longitude, radius])
             if filters.get('company'):
                 conditions.append("company LIKE ?")
                 params.append(f"%{filters['company']}%")
 
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return where, params
 
-        query += f" ORDER BY scraped_at DESC LIMIT {limit}"
+    def get_jobs(self, limit: int = 100, filters: Dict = None, fresh: bool = False) -> List[Job]:
+        """Jobs matching ``filters``, newest first; ``fresh`` reads the primary even in snapshot read mode"""
+        where, params = self._where_clause(filters)
+        query = f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs{where} ORDER BY scraped_at DESC LIMIT {int(limit)}"
+
+        conn = self._connect(read=not fresh)
+        cursor = conn.cursor()
 
         cursor.execute(query, params)
         rows = cursor.fetchall()
@@ -184,6 +420,36 @@ class JobDatabase:
 
         return jobs
 
+    def iter_job_rows(self, columns=JOB_COLUMNS, limit: int = 100, filters: Dict = None):
+        """Iterator of raw row tuples of ``columns`` for serialization without building Job objects.
+
+        Filters are validated here, not on first iteration: a streamed response
+        is already under way by then, past the route's error handling.
+        """
+        unknown = set(columns) - set(JOB_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+
+        where, params = self._where_clause(filters)
+        query = f"SELECT {', '.join(columns)} FROM jobs{where} ORDER BY scraped_at DESC LIMIT {int(limit)}"
+        return self._iter_rows(query, params, columns)
+
+    def _iter_rows(self, query: str, params: List, columns):
+        conn = self._connect(read=True)
+        try:
+            cursor = conn.execute(query, params)
+            if 'tags' not in columns:
+                yield from cursor
+                return
+
+            tags_index = columns.index('tags')
+            for row in cursor:
+                row = list(row)
+                row[tags_index] = json.loads(row[tags_index]) if row[tags_index] else []
+                yield tuple(row)
+        finally:
+            conn.close()
+
 class LinkedInJobScraper:
     def __init__(self):
         from robust_job_scraper import RobustJobScraper
@@ -332,6 +598,10 @@ class AutoApplicationSystem:
             return {"success": False, "error": str(e)}
 
     def _setup_application_driver(self):
+        # Selenium is only needed once an application actually runs
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
         chrome_options = Options()
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
@@ -398,6 +668,10 @@ class AutoApplicationSystem:
 
     def _handle_linkedin_easy_apply(self, driver, job: Job) -> Dict:
         """Handle LinkedIn Easy Apply process"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
         try:
             # Click Easy Apply button
             easy_apply_btn = WebDriverWait(driver, 10).until(
@@ -440,6 +714,8 @@ class AutoApplicationSystem:
 
     def _handle_greenhouse_form(self, driver, job: Job) -> Dict:
         """Handle Greenhouse application forms"""
+        from selenium.webdriver.common.by import By
+
         try:
             # Fill basic information
             self._fill_form_fields(driver)
@@ -470,6 +746,8 @@ class AutoApplicationSystem:
 
     def _handle_workday_form(self, driver, job: Job) -> Dict:
         """Handle Workday application forms"""
+        from selenium.webdriver.common.by import By
+
         try:
             # Workday forms are complex, implement basic field filling
             self._fill_form_fields(driver)
@@ -490,6 +768,8 @@ class AutoApplicationSystem:
 
     def _handle_generic_form(self, driver, job: Job) -> Dict:
         """Handle generic application forms"""
+        from selenium.webdriver.common.by import By
+
         try:
             form_filled = self._fill_form_fields(driver)
 
@@ -510,6 +790,8 @@ class AutoApplicationSystem:
 
     def _analyze_unknown_form(self, driver, job: Job) -> Dict:
         """Analyze unknown form patterns for future automation"""
+        from selenium.webdriver.common.by import By
+
         try:
             form_analysis = {
                 "url": driver.current_url,
@@ -559,6 +841,8 @@ class AutoApplicationSystem:
 
     def _fill_form_fields(self, driver) -> bool:
         """Generic form field filling"""
+        from selenium.webdriver.common.by import By
+
         try:
             fields_filled = 0
 
@@ -644,11 +928,47 @@ class AutoApplicationSystem:
 # Flask API
 app = Flask(__name__)
 CORS(app)
+instrument_app(app, 'jobright_clone_backend')
+trace_app(app)
+enable_compression(app)
 
-# Global instances
-db = JobDatabase()
+# Global instances, opened on first use so importing the app creates no files
 scraper = None
-auto_applier = AutoApplicationSystem(db)
+_default_db = None
+_default_applier = None
+_default_lock = threading.Lock()
+track_task_queue(get_task_queue)
+
+
+def _bump_jobs_version():
+    bump_corpus_version('jobright_clone')
+
+
+def _jobs_changed(db: JobDatabase):
+    """Invalidate cached listings once readers can see the change"""
+    # Reads that go to the primary see it now; snapshot reads only after the publish, and
+    # a response cached under the bumped version must never be built from the old snapshot
+    if db.read_snapshot is None:
+        _bump_jobs_version()
+    db.schedule_publish(on_published=_bump_jobs_version)
+
+
+def get_db() -> JobDatabase:
+    """Process-wide JobDatabase on the default path"""
+    global _default_db
+    with _default_lock:
+        if _default_db is None:
+            _default_db = JobDatabase()
+        return _default_db
+
+
+def get_auto_applier() -> AutoApplicationSystem:
+    global _default_applier
+    db = get_db()
+    with _default_lock:
+        if _default_applier is None:
+            _default_applier = AutoApplicationSystem(db)
+        return _default_applier
 
 @app.route('/')
 def index():
@@ -664,23 +984,27 @@ def search_jobs():
         if not scraper:
             scraper = LinkedInJobScraper()
 
+        columns = parse_fields(request.args.get('fields'), JOB_COLUMNS)
         jobs = scraper.search_jobs(criteria)
 
         # Save jobs to database
+        db = get_db()
         for job in jobs:
             db.save_job(job)
+        if jobs:
+            _jobs_changed(db)
 
-        return jsonify({
-            "success": True,
-            "jobs": [asdict(job) for job in jobs],
-            "count": len(jobs)
-        })
+        return json_page_response({"success": True}, "jobs", columns, map(row_getter(columns), jobs))
+
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
 
     except Exception as e:
         logger.error(f"Search error: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/jobs', methods=['GET'])
+@cached_response('jobright_clone')
 def get_jobs():
     try:
         limit = request.args.get('limit', 100, type=int)
@@ -692,37 +1016,88 @@ def get_jobs():
             filters['location'] = request.args.get('location')
         if request.args.get('company'):
             filters['company'] = request.args.get('company')
+        if request.args.get('salary_min'):
+            filters['salary_min'] = request.args.get('salary_min', type=int)
+        if request.args.get('salary_max'):
+            filters['salary_max'] = request.args.get('salary_max', type=int)
+        if request.args.get('salary_currency'):
+            filters['salary_currency'] = request.args.get('salary_currency')
+        if request.args.get('near'):
+            # e.g. ?near=San Jose, CA&radius=25 (miles)
+            filters['near'] = request.args.get('near')
+            filters['radius'] = request.args.get('radius', DEFAULT_RADIUS_MILES, type=float)
 
-        jobs = db.get_jobs(limit=limit, filters=filters)
+        columns = parse_fields(request.args.get('fields'), JOB_COLUMNS)
+        rows = get_db().iter_job_rows(columns=columns, limit=limit, filters=filters)
 
-        return jsonify({
-            "success": True,
-            "jobs": [asdict(job) for job in jobs],
-            "count": len(jobs)
-        })
+        return json_page_response({"success": True}, "jobs", columns, rows)
+
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
 
     except Exception as e:
         logger.error(f"Get jobs error: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+def _similar_jobs_response(job_id: str = None, profile: Dict = None):
+    k = max(1, min(request.args.get('k', 10, type=int), 100))
+    columns = parse_fields(request.args.get('fields'), JOB_COLUMNS)
+    getter = row_getter(columns)
+    hits = get_db().similar_jobs(job_id=job_id, profile=profile, k=k)
+    rows = (getter(job) + (round(score, 4),) for job, score in hits)
+    return json_page_response({"success": True}, "jobs", columns + ('similarity',), rows)
+
+@app.route('/api/jobs/<job_id>/similar', methods=['GET'])
+def similar_jobs(job_id):
+    try:
+        return _similar_jobs_response(job_id=job_id)
+
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 404
+
+    except Exception as e:
+        logger.error(f"Similar jobs error: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/jobs/for-profile', methods=['POST'])
+def jobs_for_profile():
+    """Body: {"title": ..., "skills": [...], "summary": ...}"""
+    try:
+        profile = request.json or {}
+        if not any(profile.get(key) for key in ('title', 'preferred_title', 'skills', 'summary')):
+            raise ValueError("Profile needs a title, skills or a summary")
+        return _similar_jobs_response(profile=profile)
+
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    except Exception as e:
+        logger.error(f"Profile search error: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @app.route('/api/apply', methods=['POST'])
 def apply_to_job():
     try:
         data = request.json
         job_id = data.get('job_id')
 
-        # Get job from database
-        jobs = db.get_jobs(filters={'id': job_id})
+        # Get job from database; the primary, so a job applied to moments ago shows its new status
+        db = get_db()
+        jobs = db.get_jobs(filters={'id': job_id}, fresh=True)
         if not jobs:
             return jsonify({"success": False, "error": "Job not found"}), 404
 
         job = jobs[0]
-        result = auto_applier.apply_to_job(job)
+        result = get_auto_applier().apply_to_job(job)
 
-        # Update job status
+        # Update job status; listings catch up with the next snapshot publish, the status
+        # returned here is read from the primary
         if result.get("success"):
             job.application_status = "applied"
             db.save_job(job)
+            _jobs_changed(db)
+        saved = db.get_jobs(filters={'id': job_id}, fresh=True)
+        result["application_status"] = saved[0].application_status if saved else job.application_status
 
         return jsonify(result)
 
@@ -736,28 +1111,65 @@ def bulk_apply():
         data = request.json
         job_ids = data.get('job_ids', [])
 
-        results = []
-        for job_id in job_ids:
-            jobs = db.get_jobs(filters={'id': job_id})
-            if jobs:
-                result = auto_applier.apply_to_job(jobs[0])
-                results.append({"job_id": job_id, "result": result})
-                time.sleep(2)  # Rate limiting
+        # One attempt: a retry would start over and submit the applications made before the failure again
+        task_id = get_task_queue().enqueue('jobright_clone_backend:run_bulk_apply_task', {'job_ids': job_ids},
+                                           max_attempts=1)
 
         return jsonify({
             "success": True,
-            "results": results,
-            "total_processed": len(results)
-        })
+            "task_id": task_id,
+            "status": "queued",
+            "total_jobs": len(job_ids)
+        }), 202
 
     except Exception as e:
         logger.error(f"Bulk apply error: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+def run_bulk_apply_task(payload: Dict, ctx: TaskContext) -> Dict:
+    """Task queue handler applying to each job in ``payload['job_ids']``"""
+    job_ids = payload.get('job_ids', [])
+
+    results = []
+    for index, job_id in enumerate(job_ids):
+        ctx.check_cancelled()
+
+        jobs = get_db().get_jobs(filters={'id': job_id}, fresh=True)
+        if jobs:
+            result = get_auto_applier().apply_to_job(jobs[0])
+            results.append({"job_id": job_id, "result": result})
+            time.sleep(2)  # Rate limiting
+
+        ctx.progress((index + 1) / len(job_ids) * 100, processed=index + 1, total=len(job_ids))
+
+    return {
+        "results": results,
+        "total_processed": len(results)
+    }
+
+@app.route('/api/task-status/<task_id>', methods=['GET'])
+def task_status(task_id):
+    status = get_task_queue().get_status(task_id)
+    if status is None:
+        return jsonify({"status": "not_found"}), 404
+    return jsonify(status)
+
+@app.route('/api/events', methods=['GET'])
+def event_stream():
+    get_task_bridge().ensure_started()
+    topics = request.args.get('topics')
+    return sse_response(topics.split(',') if topics else None)
+
+@app.route('/api/tasks/<task_id>/cancel', methods=['POST'])
+def cancel_task(task_id):
+    if not get_task_queue().cancel(task_id):
+        return jsonify({"success": False, "error": "Task not found or already finished"}), 409
+    return jsonify({"success": True, "task": get_task_queue().get_status(task_id)})
+
 @app.route('/api/analytics', methods=['GET'])
 def get_analytics():
     try:
-        conn = sqlite3.connect(db.db_path)
+        conn = get_db()._connect(read=True)
         cursor = conn.cursor()
 
         # Application statistics
@@ -801,7 +1213,16 @@ def get_analytics():
         logger.error(f"Analytics error: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+def create_app(start_workers: bool = True) -> Flask:
+    """Application factory; background task workers are started explicitly here"""
+    if start_workers:
+        start_worker_processes(num_workers=int(os.getenv('TASK_WORKERS', 2)))
+    return app
+
 if __name__ == '__main__':
+    # The debug reloader runs this block in a watcher process and again in the serving
+    # child (WERKZEUG_RUN_MAIN set); only the child starts workers
+    create_app(start_workers=os.environ.get('WERKZEUG_RUN_MAIN') == 'true')
     try:
         app.run(debug=True, host='0.0.0.0', port=5000)
     finally:
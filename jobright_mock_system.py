@@ -25,12 +25,14 @@ import random
 import uuid
 import sqlite3
 import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 import logging
 from dataclasses import dataclass, asdict
 import math
 import re
 from real_job_aggregator import RealJobAggregator, RealJob
+import facet_index
+from recommendation_cache import get_recommendation_cache, profile_updated, profile_version
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -356,52 +358,17 @@ Join us in building the future of technology!
 
     def filter_jobs(self, jobs: List[JobData], filters: Dict[str, Any]) -> List[JobData]:
         """Filter jobs based on user criteria"""
-        filtered_jobs = jobs
-
-        # Location filter
-        if filters.get('location'):
-            location = filters['location'].lower()
-            filtered_jobs = [j for j in filtered_jobs if location in j.location.lower()]
-
-        # Job type filter
-        if filters.get('job_type'):
-            job_type = filters['job_type']
-            filtered_jobs = [j for j in filtered_jobs if j.job_type == job_type]
-
-        # Experience level filter
-        if filters.get('experience_level'):
-            exp_level = filters['experience_level']
-            filtered_jobs = [j for j in filtered_jobs if j.experience_level == exp_level]
-
-        # Salary range filter
-        if filters.get('salary_min'):
-            salary_min = int(filters['salary_min'])
-            filtered_jobs = [j for j in filtered_jobs if j.salary_max >= salary_min]
-
-        if filters.get('salary_max'):
-            salary_max = int(filters['salary_max'])
-            filtered_jobs = [j for j in filtered_jobs if j.salary_min <= salary_max]
-
-        # Remote work filter
-        if filters.get('remote_only') == 'true':
-            filtered_jobs = [j for j in filtered_jobs if j.remote_friendly or 'Remote' in j.location]
-
-        # Company size filter
-        if filters.get('company_size'):
-            company_size = filters['company_size']
-            filtered_jobs = [j for j in filtered_jobs if j.company_size == company_size]
-
-        # Keywords search
-        if filters.get('keywords'):
-            keywords = filters['keywords'].lower()
-            filtered_jobs = [
-                j for j in filtered_jobs
-                if keywords in j.title.lower() or
-                   keywords in j.description.lower() or
-                   any(keywords in skill.lower() for skill in j.skills)
-            ]
-
-        return filtered_jobs
+        return self.search_jobs(jobs, filters, facets=False)[0]
+
+    def search_jobs(self, jobs: List[JobData], filters: Dict[str, Any],
+                    facets: bool = True) -> Tuple[List[JobData], Dict[str, Dict[Any, int]]]:
+        """Filtered jobs plus facet counts, answered from the facet index.
+
+        Location and keywords match substrings case-insensitively, salary
+        bounds keep jobs whose range overlaps them, remote_only='true' keeps
+        remote-friendly jobs and any job located in 'Remote'."""
+        result = facet_index.get_index(jobs).query(filters, facets=facets)
+        return result.select(jobs), result.facets
 
 # Initialize recommendation engine
 recommendation_engine = JobRecommendationEngine()
@@ -465,16 +432,54 @@ def logout():
     logout_user()
     return redirect(url_for('login'))
 
+def recommended_page(all_jobs: List[JobData], filters: Dict[str, Any], page: int, per_page: int,
+                     cacheable: bool = True) -> Tuple[List[JobData], int, Dict[str, Dict[Any, int]]]:
+    """One page of the jobs matching ``filters``, the total count and facet counts.
+
+    Signed-in users get the jobs ranked by match score. The ranked ids are
+    cached per user (recommendation_cache), so paging through them does not
+    filter and score again; ``cacheable=False`` for job lists whose ids are
+    not stable between requests, like the generated fallback."""
+    start_idx = (page - 1) * per_page
+    end_idx = start_idx + per_page
+    if not current_user.is_authenticated:
+        filtered_jobs, facets = recommendation_engine.search_jobs(all_jobs, filters)
+        return filtered_jobs[start_idx:end_idx], len(filtered_jobs), facets
+
+    def rank():
+        filtered_jobs, facets = recommendation_engine.search_jobs(all_jobs, filters)
+        for job in filtered_jobs:
+            job.match_score = recommendation_engine.calculate_match_score(job, current_user)
+        filtered_jobs.sort(key=lambda x: x.match_score, reverse=True)
+        return [(job.id, job.match_score) for job in filtered_jobs], facets
+
+    if cacheable:
+        ranked, facets = get_recommendation_cache().ranked(
+            current_user.id, profile_version(current_user), 'real_jobs', filters, rank)
+    else:
+        ranked, facets = rank()
+
+    jobs_by_id = {job.id: job for job in all_jobs}
+    paginated_jobs = []
+    for job_id, match_score in ranked[start_idx:end_idx]:
+        job = jobs_by_id.get(job_id)
+        if job is not None:
+            job.match_score = match_score
+            paginated_jobs.append(job)
+    return paginated_jobs, len(ranked), facets
+
 @app.route('/jobs/recommend')
 def jobs_recommend():
     """Main job recommendations page with REAL job postings"""
     # Get REAL jobs first, fallback to mock if needed
+    real_jobs = True
     try:
         all_jobs = recommendation_engine.get_real_jobs(150)
         logger.info(f"✅ Loaded {len(all_jobs)} real jobs")
     except Exception as e:
         logger.warning(f"⚠️ Failed to load real jobs, using mock data: {e}")
         all_jobs = recommendation_engine.generate_mock_jobs(150)
+        real_jobs = False
 
     # Apply filters if any
     filters = {
@@ -488,25 +493,11 @@ def jobs_recommend():
         'keywords': request.args.get('keywords', '')
     }
 
-    # Filter jobs based on criteria
-    filtered_jobs = recommendation_engine.filter_jobs(all_jobs, filters)
-
-    # Recalculate match scores for current user
-    if current_user.is_authenticated:
-        for job in filtered_jobs:
-            job.match_score = recommendation_engine.calculate_match_score(job, current_user)
-
-        # Re-sort by match score
-        filtered_jobs.sort(key=lambda x: x.match_score, reverse=True)
-
-    # Pagination
+    # Filter, score for the current user and paginate; facet counts come from the same index query
     page = int(request.args.get('page', 1))
     per_page = int(request.args.get('per_page', 20))
-    start_idx = (page - 1) * per_page
-    end_idx = start_idx + per_page
-
-    paginated_jobs = filtered_jobs[start_idx:end_idx]
-    total_pages = math.ceil(len(filtered_jobs) / per_page)
+    paginated_jobs, total_jobs, facets = recommended_page(all_jobs, filters, page, per_page, cacheable=real_jobs)
+    total_pages = math.ceil(total_jobs / per_page)
 
     # Get user's saved and applied jobs
     saved_job_ids = set()
@@ -521,11 +512,12 @@ def jobs_recommend():
 
     return render_template('jobs_recommend_modern.html',
                          jobs=paginated_jobs,
-                         total_jobs=len(filtered_jobs),
+                         total_jobs=total_jobs,
                          page=page,
                          total_pages=total_pages,
                          per_page=per_page,
                          filters=filters,
+                         facets=facets,
                          saved_job_ids=saved_job_ids,
                          applied_job_ids=applied_job_ids)
 
@@ -544,27 +536,17 @@ def api_jobs_search():
         'keywords': request.args.get('keywords', '')
     }
 
-    # Get REAL jobs and filter
+    # Get REAL jobs, then filter, score and paginate
+    real_jobs = True
     try:
         all_jobs = recommendation_engine.get_real_jobs(150)
     except Exception as e:
         logger.warning(f"⚠️ API: Failed to load real jobs: {e}")
         all_jobs = recommendation_engine.generate_mock_jobs(150)
-    filtered_jobs = recommendation_engine.filter_jobs(all_jobs, filters)
-
-    # Recalculate match scores for current user
-    if current_user.is_authenticated:
-        for job in filtered_jobs:
-            job.match_score = recommendation_engine.calculate_match_score(job, current_user)
-        filtered_jobs.sort(key=lambda x: x.match_score, reverse=True)
-
-    # Pagination
+        real_jobs = False
     page = int(request.args.get('page', 1))
     per_page = int(request.args.get('per_page', 20))
-    start_idx = (page - 1) * per_page
-    end_idx = start_idx + per_page
-
-    paginated_jobs = filtered_jobs[start_idx:end_idx]
+    paginated_jobs, total_jobs, facets = recommended_page(all_jobs, filters, page, per_page, cacheable=real_jobs)
 
     # Convert to JSON-serializable format
     jobs_data = []
@@ -576,10 +558,11 @@ def api_jobs_search():
 
     return jsonify({
         'jobs': jobs_data,
-        'total_jobs': len(filtered_jobs),
+        'total_jobs': total_jobs,
         'page': page,
-        'total_pages': math.ceil(len(filtered_jobs) / per_page),
-        'per_page': per_page
+        'total_pages': math.ceil(total_jobs / per_page),
+        'per_page': per_page,
+        'facets': facets
     })
 
 @app.route('/api/jobs/<job_id>/save', methods=['POST'])
@@ -657,6 +640,7 @@ def update_profile():
         current_user.preferred_job_types = json.dumps(data['preferred_job_types'])
 
     db.session.commit()
+    profile_updated(current_user.id)
 
     return jsonify({'success': True, 'message': 'Profile updated successfully'})
 
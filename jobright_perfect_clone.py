@@ -521,6 +521,7 @@ from typing import List, Dict, Any
 import logging
 import math
 import os
+from title_normalizer import classify_title
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -718,13 +719,8 @@ class JobRecommendationEngine:
         return int(base)
 
     def _determine_experience_level(self, title: str) -> str:
-        """Determine experience level from title"""
-        if 'Senior' in title or 'Staff' in title or 'Manager' in title:
-            return 'senior'
-        elif 'Junior' in title or 'Intern' in title:
-            return 'entry'
-        else:
-            return 'mid'
+        """Determine experience level from title (see title_normalizer)"""
+        return classify_title(title).experience_level
 
     def _generate_description(self, title: str, company: str) -> str:
         """Generate realistic job description"""
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Fast JSON serialization and compressed responses for job listing APIs
+- orjson when installed, compact stdlib json otherwise
+- Rows are encoded straight from (column, value) tuples; no dataclass asdict
+- Field projection via ?fields=id,title,company
+- Streams large pages in batches and negotiates gzip/brotli
+"""
+
+import gzip
+import json
+import logging
+import zlib
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'text/html', 'text/css', 'text/plain',
+    'application/javascript', 'text/javascript', 'image/svg+xml'
+}
+
+# Suffixes appended to strong ETags of encoded representations
+ENCODING_ETAG_SUFFIXES = ('-br', '-gzip')
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize ``obj`` to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+
+def parse_fields(fields_param: Optional[str], allowed: Sequence[str]) -> Tuple[str, ...]:
+    """Validate a comma separated ``fields`` parameter against ``allowed``.
+
+    Returns all allowed fields when nothing was requested. Raises ValueError
+    naming any unknown field.
+    """
+    if not fields_param:
+        return tuple(allowed)
+
+    requested = [field.strip() for field in fields_param.split(',') if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(requested))
+
+
+def row_getter(fields: Sequence[str]) -> Callable[[Any], tuple]:
+    """Attribute getter returning a tuple for any number of fields"""
+    getter = attrgetter(*fields)
+    if len(fields) == 1:
+        return lambda obj: (getter(obj),)
+    return getter
+
+
+def encode_rows(columns: Sequence[str], rows: Iterable[tuple]) -> bytes:
+    """Encode row tuples as a JSON array of objects"""
+    return dumps([dict(zip(columns, row)) for row in rows])
+
+
+def stream_json_page(envelope: Dict[str, Any], key: str, columns: Sequence[str],
+                     rows: Iterable[tuple], batch_size: int = 250,
+                     count_key: Optional[str] = 'count') -> Iterator[bytes]:
+    """Yield ``{**envelope, key: [rows...], count_key: n}`` in batches.
+
+    Rows are encoded ``batch_size`` at a time so a page never needs to be
+    materialized as Python dicts all at once.
+    """
+    head = dumps(envelope)[:-1]
+    yield head + (b',' if envelope else b'') + dumps(key) + b':['
+
+    written = 0
+    batch = []
+    for row in rows:
+        batch.append(dict(zip(columns, row)))
+        if len(batch) >= batch_size:
+            yield (b',' if written else b'') + dumps(batch)[1:-1]
+            written += len(batch)
+            batch = []
+    if batch:
+        yield (b',' if written else b'') + dumps(batch)[1:-1]
+        written += len(batch)
+
+    tail = b']'
+    if count_key:
+        tail += b',' + dumps(count_key) + b':' + dumps(written)
+    yield tail + b'}'
+
+
+def json_response(obj: Any, status: int = 200):
+    """Flask response for ``obj`` using the fast encoder"""
+    from flask import Response
+    return Response(dumps(obj), status=status, mimetype='application/json')
+
+
+def json_page_response(envelope: Dict[str, Any], key: str, columns: Sequence[str],
+                       rows: Iterable[tuple], **kwargs):
+    """Streaming Flask response for a page of rows"""
+    from flask import Response
+    return Response(stream_json_page(envelope, key, columns, rows, **kwargs), mimetype='application/json')
+
+
+def negotiate_encoding(accept_encodings) -> Optional[str]:
+    """Pick br or gzip from a werkzeug MIMEAccept-style header, else None"""
+    candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+    best = accept_encodings.best_match(candidates) if accept_encodings else None
+    return best
+
+
+def compress(data: bytes, encoding: str, level: int = 6) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=min(level, 11))
+    return gzip.compress(data, compresslevel=level)
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str, level: int = 6) -> Iterator[bytes]:
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=min(level, 11))
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+def enable_compression(app, min_size: int = 1024, level: int = 6):
+    """Register an after_request hook compressing eligible responses"""
+    from flask import request
+
+    @app.after_request
+    def compress_response(response):
+        if response.status_code == 304:
+            # Echo the validator of the representation the client would have received
+            etag, weak = response.get_etag()
+            encoding = negotiate_encoding(request.accept_encodings)
+            if etag and encoding and not etag.endswith(ENCODING_ETAG_SUFFIXES):
+                response.set_etag(f"{etag}-{encoding}", weak)
+            response.vary.add('Accept-Encoding')
+            return response
+
+        if (response.status_code != 200
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or 'Content-Encoding' in response.headers
+                or response.direct_passthrough and not response.is_streamed):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoding, level)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            response.set_data(compress(data, encoding, level))
+
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            # A different byte representation needs a different strong validator
+            response.set_etag(f"{etag}-{encoding}", weak)
+        return response
+
+    return app
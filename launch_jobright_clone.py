@@ -78,7 +78,8 @@ def start_backend():
 
     def run_server():
         try:
-            from jobright_clone_backend import app
+            from jobright_clone_backend import create_app
+            app = create_app()
             app.run(debug=False, host='0.0.0.0', port=5000, use_reloader=False)
         except Exception as e:
             print(f"❌ Backend server error: {e}")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Versioned, memory-mapped read-only snapshots shared by worker processes
+- SnapshotWriter writes typed arrays, string columns and small JSON blobs
+  into a fresh version directory, then atomically points CURRENT at it;
+  older versions beyond ``keep`` are removed
+- Snapshot maps every file of a version read-only: arrays are memoryviews
+  over the page cache, so N workers share one copy of the data and the
+  per-process cost stays flat as workers are added
+- SnapshotReader follows CURRENT, switching to a new version after an
+  ingest publishes one; requests holding the old version keep using it
+
+    from mmap_snapshot import SnapshotReader, SnapshotWriter
+    with SnapshotWriter('features.snapshot') as writer:
+        writer.add_array('salary_max', 'q', salaries)
+        writer.add_strings('ids', sorted_ids)
+    snapshot = SnapshotReader('features.snapshot').current()
+    snapshot.array('salary_max')[row], snapshot.strings('ids').find('job_1')
+"""
+
+import bisect
+import json
+import logging
+import mmap
+import os
+import shutil
+import threading
+import time
+from array import array
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+CURRENT = 'CURRENT'
+MANIFEST = 'manifest.json'
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def current_version(root: str) -> Optional[str]:
+    try:
+        with open(os.path.join(root, CURRENT)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+class StringColumn:
+    """Strings stored as one UTF-8 blob plus end offsets; find() bisects columns written sorted"""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < len(self._offsets):
+            raise IndexError(i)
+        start = self._offsets[i - 1] if i else 0
+        return bytes(self._blob[start:self._offsets[i]]).decode('utf-8')
+
+    def find(self, value: str) -> Optional[int]:
+        i = bisect.bisect_left(self, value)
+        return i if i < len(self) and self[i] == value else None
+
+
+class Snapshot:
+    """One published version, every file mapped read-only"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.version = os.path.basename(path)
+        with open(os.path.join(path, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        self._maps = []
+        self._arrays = {name: self._map(spec) for name, spec in self.manifest['arrays'].items()}
+
+    def _map(self, spec: Dict) -> memoryview:
+        if not spec['length']:
+            return memoryview(array(spec['typecode']))
+        # Linked files may have grown since publishing; only the published prefix is part of the version
+        size = spec['length'] * array(spec['typecode']).itemsize
+        with open(os.path.join(self.path, spec['file']), 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return memoryview(mapped).cast(spec['typecode'])
+
+    def array(self, name: str) -> memoryview:
+        return self._arrays[name]
+
+    def strings(self, name: str) -> StringColumn:
+        return StringColumn(self._arrays[f"{name}.offsets"], self._arrays[f"{name}.blob"])
+
+    def json(self, name: str) -> Any:
+        return self.manifest['json'][name]
+
+    def __contains__(self, name: str):
+        return name in self._arrays or f"{name}.offsets" in self._arrays
+
+
+class SnapshotWriter:
+    """Build a new version; it becomes CURRENT when the ``with`` block exits cleanly"""
+
+    def __init__(self, root: str, keep: int = 2):
+        self.root = root
+        self.keep = keep
+        os.makedirs(root, exist_ok=True)
+        self.version = f"v{time.time_ns():020d}-{os.getpid()}"
+        self.path = os.path.join(root, f".{self.version}.tmp")
+        os.makedirs(self.path)
+        self.manifest = {'arrays': {}, 'json': {}, 'created': time.time()}
+
+    def add_array(self, name: str, typecode: str, values: Iterable) -> int:
+        data = values if isinstance(values, array) and values.typecode == typecode else array(typecode, values)
+        with open(os.path.join(self.path, name), 'wb') as f:
+            data.tofile(f)
+        self.manifest['arrays'][name] = {'file': name, 'typecode': typecode, 'length': len(data)}
+        return len(data)
+
+    def link_array(self, name: str, typecode: str, source: str, length: int):
+        """Publish the first ``length`` items of an append-only file without copying it"""
+        target = os.path.join(self.path, name)
+        try:
+            os.link(source, target)
+        except OSError:
+            with open(source, 'rb') as src, open(target, 'wb') as dst:
+                dst.write(src.read(length * array(typecode).itemsize))
+        self.manifest['arrays'][name] = {'file': name, 'typecode': typecode, 'length': length}
+
+    def add_strings(self, name: str, values: Iterable[str]) -> int:
+        blob, offsets = bytearray(), array('Q')
+        for value in values:
+            blob += value.encode('utf-8')
+            offsets.append(len(blob))
+        self.add_array(f"{name}.offsets", 'Q', offsets)
+        self.add_array(f"{name}.blob", 'B', blob)
+        return len(offsets)
+
+    def add_json(self, name: str, value: Any):
+        self.manifest['json'][name] = value
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            shutil.rmtree(self.path, ignore_errors=True)
+            return False
+        self.commit()
+        return False
+
+    def commit(self) -> str:
+        _write_atomic(os.path.join(self.path, MANIFEST), json.dumps(self.manifest).encode('utf-8'))
+        final = os.path.join(self.root, self.version)
+        os.rename(self.path, final)
+        _write_atomic(os.path.join(self.root, CURRENT), self.version.encode('utf-8'))
+        self._remove_old_versions()
+        logger.info(f"📸 Published snapshot {self.version} to {self.root}")
+        return final
+
+    def _remove_old_versions(self):
+        versions = sorted(name for name in os.listdir(self.root) if name.startswith('v'))
+        for name in versions[:-self.keep]:
+            # Readers that mapped an old version keep their pages until they let go of it
+            shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+
+class SnapshotReader:
+    """The current Snapshot of ``root``, re-checked at most every ``check_interval`` seconds"""
+
+    def __init__(self, root: str, check_interval: float = 1.0):
+        self.root = root
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._checked = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Look at CURRENT on the next call, e.g. right after this process published"""
+        self._checked = None
+
+    def current(self) -> Optional[Snapshot]:
+        now = time.monotonic()
+        if self._checked is not None and now - self._checked < self.check_interval:
+            return self._snapshot
+        with self._lock:
+            self._checked = now
+            version = current_version(self.root)
+            if version is None:
+                self._snapshot = None
+            elif self._snapshot is None or self._snapshot.version != version:
+                try:
+                    self._snapshot = Snapshot(os.path.join(self.root, version))
+                except FileNotFoundError:
+                    # Superseded and removed between reading CURRENT and opening it; next check catches up
+                    self._checked = None
+            return self._snapshot
@@ -20,6 +20,7 @@ import random
 import uuid
 from datetime import datetime, timedelta
 import logging
+import geo_index
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -303,6 +304,26 @@ class SanJoseJobGenerator:
         ]
         return random.sample(benefits, random.randint(8, 12))
 
+# ================================
+# LOCATION FILTER
+# ================================
+
+SAN_JOSE = geo_index.normalize_location('San Jose, CA')
+
+def area_filter(radius=0.0, center=SAN_JOSE):
+    """Filter for jobs whose location normalizes to a place within ``radius``
+    miles of ``center``; radius 0 means the city itself, in any spelling
+    ('San Jose, California', 'San Jose, CA - Hybrid', ...)"""
+    nearby = []
+    for (location,) in db.session.query(Job.location).distinct():
+        place = geo_index.normalize_location(location)
+        if place is not None:
+            if geo_index.distance_miles(place, center) <= radius:
+                nearby.append(location)
+        elif location and center.name.lower() in location.lower():
+            nearby.append(location)
+    return Job.location.in_(nearby)
+
 # ================================
 # FLASK ROUTES
 # ================================
@@ -313,8 +334,10 @@ def index():
 
 @app.route('/jobs')
 def jobs():
-    # Get San Jose jobs with filters
-    query = Job.query.filter(Job.location.contains('San Jose'))
+    # Get San Jose jobs with filters; ?radius=N widens to nearby cities
+    radius = request.args.get('radius', 0.0, type=float)
+    area = area_filter(radius)
+    query = Job.query.filter(area)
 
     # Apply filters
     company_filter = request.args.get('company', '')
@@ -345,7 +368,7 @@ def jobs():
     jobs = jobs_pagination.items
 
     # Get filter options
-    companies = db.session.query(Job.company).filter(Job.location.contains('San Jose')).distinct().all()
+    companies = db.session.query(Job.company).filter(area).distinct().all()
     companies = [c[0] for c in companies]
 
     return render_template('perfect_jobs_clean.html',
@@ -357,13 +380,15 @@ def jobs():
                              'search': title_filter,
                              'experience_level': experience_filter,
                              'job_type': job_type_filter,
-                             'remote': remote_filter
+                             'remote': remote_filter,
+                             'radius': radius
                          })
 
 @app.route('/api/jobs/san-jose')
 def api_san_jose_jobs():
     """API endpoint for San Jose jobs"""
-    query = Job.query.filter(Job.location.contains('San Jose'))
+    radius = request.args.get('radius', 0.0, type=float)
+    query = Job.query.filter(area_filter(radius))
     total = query.count()
 
     jobs = query.order_by(Job.posted_date.desc()).limit(100).all()
@@ -387,18 +412,20 @@ def api_san_jose_jobs():
     return jsonify({
         'jobs': jobs_data,
         'total': total,
-        'location': 'San Jose, CA'
+        'location': 'San Jose, CA',
+        'radius_miles': radius
     })
 
 @app.route('/api/stats')
 def api_stats():
     """Get San Jose job statistics"""
-    san_jose_jobs = Job.query.filter(Job.location.contains('San Jose')).count()
+    area = area_filter()
+    san_jose_jobs = Job.query.filter(area).count()
 
     # Company breakdown for San Jose
     company_stats = db.session.query(
         Job.company, db.func.count(Job.id)
-    ).filter(Job.location.contains('San Jose')).group_by(Job.company).all()
+    ).filter(area).group_by(Job.company).all()
 
     return jsonify({
         'san_jose_jobs': san_jose_jobs,
@@ -419,7 +446,7 @@ def initialize_system():
         logger.info("✅ Database tables created")
 
         # Check San Jose job count
-        san_jose_count = Job.query.filter(Job.location.contains('San Jose')).count()
+        san_jose_count = Job.query.filter(area_filter()).count()
         logger.info(f"📊 Current San Jose jobs: {san_jose_count}")
 
         if san_jose_count < 1000:
@@ -427,7 +454,7 @@ def initialize_system():
             generator = SanJoseJobGenerator()
             generator.generate_san_jose_jobs(1500)
 
-        final_count = Job.query.filter(Job.location.contains('San Jose')).count()
+        final_count = Job.query.filter(area_filter()).count()
         logger.info(f"🎉 San Jose jobs ready: {final_count}")
 
 if __name__ == '__main__':
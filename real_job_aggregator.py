@@ -18,7 +18,6 @@ sys.path.append('/home/calelin/awesome-apply/venv/lib/python3.13/site-packages')
 
 import requests
 import json
-import re
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import logging
@@ -27,6 +26,11 @@ import random
 import time
 from urllib.parse import urljoin, urlparse
 import sqlite3
+from response_cache import bump_corpus_version
+import app_metrics
+import tracing
+from salary_normalizer import salary_range
+from title_normalizer import classify_title
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -58,7 +62,7 @@ class RealJobAggregator:
     """Aggregates real job postings from multiple sources"""
 
     def __init__(self):
-        self.session = requests.Session()
+        self.session = tracing.trace_session(app_metrics.instrument_session(requests.Session()))
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
@@ -85,6 +89,7 @@ class RealJobAggregator:
             # RemoteOK API (real remote jobs)
             remoteok_jobs = self.fetch_remoteok_jobs()
             all_jobs.extend(remoteok_jobs)
+            app_metrics.record_jobs('remoteok', len(remoteok_jobs))
             logger.info(f"✅ RemoteOK: {len(remoteok_jobs)} jobs")
         except Exception as e:
             logger.warning(f"⚠️ RemoteOK failed: {e}")
@@ -93,6 +98,7 @@ class RealJobAggregator:
             # GitHub Jobs (via public repositories)
             github_jobs = self.fetch_github_jobs()
             all_jobs.extend(github_jobs)
+            app_metrics.record_jobs('github', len(github_jobs))
             logger.info(f"✅ GitHub: {len(github_jobs)} jobs")
         except Exception as e:
             logger.warning(f"⚠️ GitHub failed: {e}")
@@ -101,6 +107,7 @@ class RealJobAggregator:
             # YCombinator Jobs
             yc_jobs = self.fetch_ycombinator_jobs()
             all_jobs.extend(yc_jobs)
+            app_metrics.record_jobs('ycombinator', len(yc_jobs))
             logger.info(f"✅ YCombinator: {len(yc_jobs)} jobs")
         except Exception as e:
             logger.warning(f"⚠️ YCombinator failed: {e}")
@@ -109,6 +116,7 @@ class RealJobAggregator:
             # AngelList/Wellfound Jobs
             angel_jobs = self.fetch_angellist_jobs()
             all_jobs.extend(angel_jobs)
+            app_metrics.record_jobs('angellist', len(angel_jobs))
             logger.info(f"✅ AngelList: {len(angel_jobs)} jobs")
         except Exception as e:
             logger.warning(f"⚠️ AngelList failed: {e}")
@@ -117,6 +125,7 @@ class RealJobAggregator:
             # Hacker News Who's Hiring
             hn_jobs = self.fetch_hackernews_jobs()
             all_jobs.extend(hn_jobs)
+            app_metrics.record_jobs('hackernews', len(hn_jobs))
             logger.info(f"✅ Hacker News: {len(hn_jobs)} jobs")
         except Exception as e:
             logger.warning(f"⚠️ Hacker News failed: {e}")
@@ -128,6 +137,7 @@ class RealJobAggregator:
         # Cache the results
         self.jobs_cache = sorted_jobs
         self.cache_timestamp = datetime.now()
+        bump_corpus_version('real_jobs')
 
         logger.info(f"🎉 Total real jobs fetched: {len(sorted_jobs)}")
         return sorted_jobs[:limit]
@@ -477,55 +487,22 @@ class RealJobAggregator:
         return jobs
 
     def parse_salary(self, salary_text: str) -> tuple[Optional[int], Optional[int]]:
-        """Parse salary from text"""
-        if not salary_text:
-            return None, None
-
-        # Look for patterns like "$120k-$150k", "$120,000 - $150,000", etc.
-        pattern = r'\$?(\d{1,3}[,k]?\d{0,3})\s*-?\s*\$?(\d{1,3}[,k]?\d{0,3})?'
-        match = re.search(pattern, salary_text.replace(',', ''))
-
-        if match:
-            min_str, max_str = match.groups()
-
-            # Convert to numbers
-            salary_min = self.parse_salary_number(min_str)
-            salary_max = self.parse_salary_number(max_str) if max_str else None
-
-            return salary_min, salary_max
-
-        return None, None
+        """Annualized (min, max) from salary text; see salary_normalizer"""
+        return salary_range(salary_text)
 
     def parse_salary_number(self, salary_str: str) -> Optional[int]:
         """Parse individual salary number"""
-        if not salary_str:
-            return None
-
-        # Remove non-digits except k
-        clean = re.sub(r'[^\dk]', '', salary_str.lower())
-
-        if 'k' in clean:
-            # Handle "120k" format
-            num = re.sub(r'[^\d]', '', clean)
-            if num:
-                return int(num) * 1000
-        else:
-            # Handle "120000" format
-            if clean.isdigit():
-                return int(clean)
-
-        return None
+        return salary_range(salary_str)[0]
 
     def determine_experience_level(self, title: str, description: str) -> str:
         """Determine experience level from title and description"""
-        title_lower = title.lower()
-        desc_lower = description.lower()
+        info = classify_title(title)
+        if info.seniority:
+            return info.experience_level
 
-        if any(word in title_lower for word in ['senior', 'sr', 'lead', 'principal', 'staff']):
-            return 'senior'
-        elif any(word in title_lower for word in ['junior', 'jr', 'intern', 'entry']):
-            return 'entry'
-        elif any(word in desc_lower for word in ['5+ years', '5 years', 'experienced']):
+        # The title states no seniority; fall back to hints in the description
+        desc_lower = description.lower()
+        if any(word in desc_lower for word in ['5+ years', '5 years', 'experienced']):
             return 'senior'
         elif any(word in desc_lower for word in ['0-2 years', 'new grad', 'recent graduate']):
             return 'entry'
@@ -576,6 +553,7 @@ class RealJobAggregator:
                 seen.add(key)
                 unique_jobs.append(job)
 
+        app_metrics.record_dedup('real_jobs', len(jobs), len(unique_jobs))
         return unique_jobs
 
 def test_real_job_aggregator():
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Per-user cache of ranked recommendations
+- Entries are a user's ranked (job_id, score) list for one filter set,
+  keyed by (user, profile version, corpus version, filters hash), so
+  paging through recommendations filters and scores once
+- The profile version hashes the fields match scoring reads, and the corpus
+  version is the response_cache counter bumped at ingest: a profile edit
+  or an ingest in any process makes older entries unreachable, and
+  profile_updated() frees them right away in this one
+- Bounded memory: LRU over all users plus a TTL per entry; a user's
+  superseded entries are dropped when their replacement is stored
+
+    from recommendation_cache import get_recommendation_cache, profile_version, profile_updated
+    ranked = get_recommendation_cache().ranked(
+        user.id, profile_version(user), 'real_jobs', filters,
+        lambda: [(job.id, job.match_score) for job in rank_jobs(user, filters)])
+    page_ids = ranked[(page - 1) * per_page:page * per_page]
+    profile_updated(user.id)              # after saving profile changes
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from response_cache import CorpusVersion, get_response_cache
+
+logger = logging.getLogger(__name__)
+
+# User fields the match scorers read; changing any of them changes the ranking
+PROFILE_FIELDS = (
+    'preferred_title', 'preferred_location', 'salary_expectation_min', 'salary_expectation_max',
+    'preferred_experience_level', 'skills', 'remote_preference', 'profile_completed',
+)
+
+
+def profile_version(user: Any, fields: Iterable[str] = PROFILE_FIELDS) -> str:
+    """Content hash of a user's scoring-relevant profile fields"""
+    material = repr(tuple(getattr(user, field, None) for field in fields))
+    return hashlib.sha256(material.encode()).hexdigest()[:16]
+
+
+def filters_key(filters: Optional[Dict[str, Any]]) -> str:
+    """Canonical hash of a filter dict; empty values are the same as absent ones"""
+    items = sorted((key, repr(value)) for key, value in (filters or {}).items()
+                   if value is not None and value != '' and value is not False)
+    return hashlib.sha256(repr(items).encode()).hexdigest()[:16]
+
+
+class RecommendationCache:
+    """Thread-safe LRU of per-user ranked lists with a TTL per entry"""
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 600, versions: CorpusVersion = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._versions = versions
+        self._entries = OrderedDict()  # (user, profile, corpus, corpus version, filters) -> (expires_at, value)
+        self._by_user = defaultdict(set)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def versions(self) -> CorpusVersion:
+        # The response cache's counters, so one ingest bump invalidates both caches
+        if self._versions is None:
+            self._versions = get_response_cache().versions
+        return self._versions
+
+    def key(self, user_id: Any, profile: str, corpus: str, filters: Optional[Dict[str, Any]]) -> tuple:
+        return user_id, profile, corpus, self.versions.get(corpus), filters_key(filters)
+
+    def get(self, key: tuple) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: tuple, value: Any):
+        user_id, profile, corpus, version, _ = key
+        with self._lock:
+            # Entries for an older profile or corpus version of this user can never be hit again
+            for stale in [other for other in self._by_user.get(user_id, ())
+                          if other[2] == corpus and (other[1] != profile or other[3] != version)]:
+                self._drop(stale)
+            self._entries[key] = (time.time() + self.ttl, value)
+            self._entries.move_to_end(key)
+            self._by_user[user_id].add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def ranked(self, user_id: Any, profile: str, corpus: str, filters: Optional[Dict[str, Any]],
+               rank: Callable[[], Any]) -> Any:
+        """Cached ranking for the key, calling ``rank()`` to build it on a miss"""
+        key = self.key(user_id, profile, corpus, filters)
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = rank()
+        self.set(key, value)
+        return value
+
+    def invalidate_user(self, user_id: Any):
+        """Profile-update event: forget every ranking of the user"""
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def _drop(self, key: tuple):
+        self._entries.pop(key, None)
+        keys = self._by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[key[0]]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_recommendation_cache() -> RecommendationCache:
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = RecommendationCache()
+        return _default_cache
+
+
+def profile_updated(user_id: Any):
+    """Drop a user's cached rankings after their profile changed"""
+    get_recommendation_cache().invalidate_user(user_id)
+    logger.debug(f"♻️ Cleared cached recommendations for user {user_id}")
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Response caching for read-heavy job listing APIs
+- Cache keys combine the endpoint, normalized query parameters and the
+  corpus version, so a scrape/ingest bump invalidates every stale entry
+- In-process LRU by default, Redis when REDIS_HOST is configured
+- Strong ETags with 304 answers to conditional GETs
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CORPUS_VERSION_DB_PATH = os.getenv('CORPUS_VERSION_DB_PATH', 'corpus_versions.db')
+
+
+class LRUCache:
+    """Thread-safe in-process LRU with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCache:
+    """Redis-backed cache shared by every web worker"""
+
+    def __init__(self, client, prefix: str = 'response_cache:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: float):
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=max(1, int(ttl)))
+
+
+class CorpusVersion:
+    """Monotonic per-corpus counters bumped whenever jobs are ingested.
+
+    Stored in SQLite (or Redis) so bumps made by scraper and task worker
+    processes are seen by every web process.
+    """
+
+    def __init__(self, db_path: str = CORPUS_VERSION_DB_PATH, redis_client=None):
+        self.db_path = db_path
+        self.redis_client = redis_client
+        self._local = threading.local()
+        if redis_client is None:
+            conn = self._connection()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS corpus_versions (
+                    name TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, name: str) -> int:
+        if self.redis_client is not None:
+            return int(self.redis_client.get(f'corpus_version:{name}') or 0)
+
+        row = self._connection().execute(
+            "SELECT version FROM corpus_versions WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, name: str) -> int:
+        if self.redis_client is not None:
+            return int(self.redis_client.incr(f'corpus_version:{name}'))
+
+        conn = self._connection()
+        conn.execute("""
+            INSERT INTO corpus_versions (name, version) VALUES (?, 1)
+            ON CONFLICT(name) DO UPDATE SET version = version + 1
+        """, (name,))
+        return self.get(name)
+
+
+def normalize_query(args) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """Canonical form of query parameters: sorted keys, sorted values, empties dropped"""
+    items = []
+    for key in sorted(set(args.keys())):
+        values = args.getlist(key) if hasattr(args, 'getlist') else [args[key]]
+        values = tuple(sorted(v.strip() for v in values if v is not None and v.strip() != ''))
+        if values:
+            items.append((key, values))
+    return tuple(items)
+
+
+def make_etag(body: bytes) -> str:
+    """Strong validator for ``body`` (unquoted; werkzeug adds the quotes)"""
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+class ResponseCache:
+    """Caches rendered JSON responses per (endpoint, query, corpus version)"""
+
+    def __init__(self, backend=None, versions: CorpusVersion = None, default_ttl: float = 300):
+        self.backend = backend or LRUCache()
+        self.versions = versions or CorpusVersion()
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> 'ResponseCache':
+        """LRU by default; Redis when REDIS_HOST is set and reachable"""
+        redis_host = os.getenv('REDIS_HOST')
+        if redis_host:
+            try:
+                import redis
+                client = redis.Redis(host=redis_host, port=int(os.getenv('REDIS_PORT', 6379)))
+                client.ping()
+                logger.info("✅ Response cache using Redis")
+                return cls(RedisCache(client), CorpusVersion(redis_client=client))
+            except Exception as e:
+                logger.warning(f"⚠️ Redis not available, using in-process response cache: {e}")
+        return cls()
+
+    def bump(self, corpus: str) -> int:
+        return self.versions.bump(corpus)
+
+    def cache_key(self, endpoint: str, corpus: str, args, extra: str = '') -> str:
+        material = repr((endpoint, self.versions.get(corpus), normalize_query(args), extra))
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def cached(self, corpus: str, ttl: float = None, vary: Callable[[], Any] = None):
+        """Decorator for Flask GET views returning JSON.
+
+        ``vary`` returns extra key material, e.g. the current user's profile
+        fingerprint for personalized endpoints. Only 200 responses are cached.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                from flask import request, make_response
+
+                if request.method != 'GET':
+                    return view(*args, **kwargs)
+
+                extra = repr(vary()) if vary else ''
+                key = self.cache_key(request.endpoint, corpus, request.args, extra)
+                entry = self.backend.get(key)
+
+                if entry is None:
+                    self.misses += 1
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200 or response.direct_passthrough:
+                        return response
+                    body = response.get_data()
+                    entry = {
+                        'body': body,
+                        'mimetype': response.mimetype,
+                        'etag': make_etag(body)
+                    }
+                    self.backend.set(key, entry, ttl or self.default_ttl)
+                    cache_status = 'MISS'
+                else:
+                    self.hits += 1
+                    cache_status = 'HIT'
+
+                # Compressed representations carry suffixed validators (json_responses)
+                if any(request.if_none_match.contains(entry['etag'] + suffix)
+                       for suffix in ('', '-br', '-gzip')):
+                    response = make_response('', 304)
+                else:
+                    response = make_response(entry['body'], 200)
+                    response.mimetype = entry['mimetype']
+                response.set_etag(entry['etag'])
+                response.headers['X-Cache'] = cache_status
+                response.headers['Cache-Control'] = 'no-cache'
+                return response
+            return wrapper
+        return decorator
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache.from_env()
+        return _default_cache
+
+
+def cached_response(corpus: str, ttl: float = None, vary: Callable[[], Any] = None):
+    """Cache a Flask JSON view in the process-wide response cache"""
+    def decorator(view):
+        cached_view = {}
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Resolve the backend on first request so importing stays cheap
+            if 'view' not in cached_view:
+                cached_view['view'] = get_response_cache().cached(corpus, ttl, vary)(view)
+            return cached_view['view'](*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def bump_corpus_version(corpus: str) -> Optional[int]:
+    """Invalidate cached responses for ``corpus`` after new jobs are ingested"""
+    try:
+        return get_response_cache().bump(corpus)
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to bump corpus version for {corpus}: {e}")
+        return None
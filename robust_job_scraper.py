@@ -20,9 +20,10 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urlencode, quote_plus, urlparse
 
+import html_extract
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -194,8 +195,7 @@ class RobustJobScraper:
                 guest_url = url.replace('/jobs/search', '/jobs-guest/jobs/api/seeMoreJobPostings/search')
                 response = self.session.get(guest_url)
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    return self._parse_linkedin_guest_results(soup, criteria)
+                    return self._parse_linkedin_guest_results(response.text, criteria)
 
             # Find job cards
             self._wait_for_jobs_to_load()
@@ -252,12 +252,8 @@ class RobustJobScraper:
             response = self.session.get(url, timeout=10)
 
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-
-                # Find job cards
-                job_cards = soup.find_all(['div', 'article'], class_=lambda x: x and any(keyword in x.lower() for keyword in ['job', 'result']))
-
-                for i, card in enumerate(job_cards[:15]):  # Limit to 15 jobs
+                # Job cards and their fields (limited to 15 jobs)
+                for i, card in enumerate(html_extract.extract('indeed', response.text)):
                     try:
                         job = self._extract_indeed_job(card, i)
                         if job:
@@ -284,12 +280,8 @@ class RobustJobScraper:
             response = self.session.get(url, timeout=10)
 
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-
-                # Find job cards
-                job_cards = soup.find_all('article', class_=lambda x: x and 'job' in x.lower())
-
-                for i, card in enumerate(job_cards[:10]):  # Limit to 10 jobs
+                # Job cards and their fields (limited to 10 jobs)
+                for i, card in enumerate(html_extract.extract('simplyhired', response.text)):
                     try:
                         job = self._extract_simplyhired_job(card, i)
                         if job:
@@ -378,21 +370,16 @@ class RobustJobScraper:
         return None
 
     def _extract_indeed_job(self, card, index) -> Optional[Job]:
-        """Extract job from Indeed card"""
+        """Extract job from Indeed card fields"""
         try:
-            title_elem = card.find('h2') or card.find(['span', 'a'], title=True)
-            company_elem = card.find('span', class_=lambda x: x and 'company' in x.lower()) or card.find('a', class_=lambda x: x and 'company' in x.lower())
-            location_elem = card.find(['div', 'span'], class_=lambda x: x and 'location' in x.lower())
-
-            title = title_elem.get_text(strip=True) if title_elem else f"Position #{index + 1}"
-            company = company_elem.get_text(strip=True) if company_elem else "Company Name"
-            location = location_elem.get_text(strip=True) if location_elem else "Location"
+            title = card['title'] or f"Position #{index + 1}"
+            company = card['company'] or "Company Name"
+            location = card['location'] or "Location"
 
             # Get job URL
             url = ""
-            link_elem = card.find('a', href=True)
-            if link_elem:
-                href = link_elem['href']
+            href = card['url']
+            if href:
                 if href.startswith('/'):
                     url = f"https://www.indeed.com{href}"
                 else:
@@ -422,13 +409,10 @@ class RobustJobScraper:
         return None
 
     def _extract_simplyhired_job(self, card, index) -> Optional[Job]:
-        """Extract job from SimplyHired card"""
+        """Extract job from SimplyHired card fields"""
         try:
-            title_elem = card.find(['h3', 'h2', 'a'])
-            company_elem = card.find('span', class_=lambda x: x and 'company' in x.lower())
-
-            title = title_elem.get_text(strip=True) if title_elem else f"Job #{index + 1}"
-            company = company_elem.get_text(strip=True) if company_elem else "Company"
+            title = card['title'] or f"Job #{index + 1}"
+            company = card['company'] or "Company"
 
             job_id = f"simplyhired_{hash(title)}_{int(time.time())}_{index}"
 
@@ -480,21 +464,16 @@ class RobustJobScraper:
         except Exception as e:
             logger.debug(f"Wait for jobs error: {e}")
 
-    def _parse_linkedin_guest_results(self, soup, criteria) -> List[Job]:
+    def _parse_linkedin_guest_results(self, html, criteria) -> List[Job]:
         """Parse LinkedIn guest API results"""
         jobs = []
 
         try:
-            job_cards = soup.find_all(['li', 'div'], class_=lambda x: x and 'job' in x.lower())
-
-            for i, card in enumerate(job_cards[:15]):
+            for i, card in enumerate(html_extract.extract('linkedin_guest', html)):
                 try:
-                    title_elem = card.find(['h3', 'h2', 'a'])
-                    company_elem = card.find(['h4', 'span'], class_=lambda x: x and any(keyword in x.lower() for keyword in ['company', 'subtitle']))
-
-                    if title_elem:
-                        title = title_elem.get_text(strip=True)
-                        company = company_elem.get_text(strip=True) if company_elem else "Company"
+                    if card['title']:
+                        title = card['title']
+                        company = card['company'] or "Company"
 
                         job_id = f"linkedin_guest_{hash(title)}_{int(time.time())}_{i}"
 
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Salary normalization shared by the scrapers, aggregators and job stores
+- parse_salary() understands ranges ("$120k - $150k", "120-150K"), single
+  values with "up to" / "from" / "+" bounds, k and M suffixes, "," and "."
+  thousands separators ("$80,000", "€80.000"), hourly/daily/weekly/monthly/
+  yearly periods and the common currency symbols and codes
+- Only amounts tied to a currency or a k/M suffix, or ranged with one, are
+  read, so "3 years exp" or "401k match" next to the pay are ignored; bare
+  numbers count only when salary-sized (10,000 and up)
+- Amounts are annualized (2080 hours, 260 days, 52 weeks, 12 months) so
+  salary filters compare like with like; the period and currency as
+  posted are kept alongside. The period is the one written closest to the
+  amounts ("$90k a year, 3 weeks PTO" is yearly), and a period that would
+  annualize past MAX_ANNUAL is dropped for the default guess
+- normalize_column() parses a whole column at once, each distinct text
+  only once, for ingest and backfills; salary_columns() gives the values
+  stored next to the raw text
+
+    from salary_normalizer import parse_salary, normalize_column
+    parse_salary('$55 - $70 an hour')   # Salary(min=114400, max=145600, period='hour', currency='USD')
+    columns = normalize_column(job['salary'] for job in jobs)
+    columns.min, columns.max, columns.period, columns.currency
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+# Multipliers to a yearly amount
+PERIODS = {'hour': 2080, 'day': 260, 'week': 52, 'month': 12, 'year': 1}
+DEFAULT_CURRENCY = 'USD'
+# Without a stated period, currency amounts below this are hourly rates ...
+HOURLY_BELOW = 300
+# ... and amounts between the two are too ambiguous to guess; bare numbers
+# without a currency or suffix are only read from here up
+YEARLY_FROM = 10_000
+# Period words are looked for this many characters around the amounts ...
+PERIOD_WINDOW = 20
+# ... and a period annualizing an amount past this is a misread ("$130k, 4 day week")
+MAX_ANNUAL = 5_000_000
+
+_PERIOD_PATTERNS = [
+    (period, re.compile(pattern)) for period, pattern in [
+        ('hour', r'hour|\bhr\b|\bhrs\b|/\s*h\b'),
+        ('day', r'\bday\b|\bdaily\b|per diem|/\s*d\b'),
+        ('week', r'\bweek|\bwk\b'),
+        ('month', r'\bmonth|\bmo\b|/\s*m\b'),
+        ('year', r'\byear|\byr\b|annual|annum|\bp\.?a\.?(?:\s|$)|/\s*y\b'),
+    ]
+]
+_CODES = r'\b(?:usd|eur|gbp|cad|aud|inr|jpy|sgd|chf)\b'
+_CURRENCY_CODES = re.compile(f'({_CODES})')
+_CURRENCY_SYMBOLS = [('ca$', 'CAD'), ('c$', 'CAD'), ('a$', 'AUD'), ('s$', 'SGD'), ('€', 'EUR'),
+                     ('£', 'GBP'), ('₹', 'INR'), ('¥', 'JPY'), ('$', 'USD')]
+_CURRENCY = r'ca\$|c\$|a\$|s\$|[$€£₹¥]|' + _CODES
+# Groups of exactly three digits after "," or "." are thousands ("80,000", "80.000"),
+# one or two digits are decimals ("1.2M", "1,5k", "1.234,56")
+_AMOUNT = re.compile(
+    rf'(?P<before>{_CURRENCY})?\s*'
+    r'(?P<whole>\d{1,3}(?:[.,]\d{3})+(?!\d)|\d+)(?:[.,](?P<fraction>\d{1,2})(?!\d))?'
+    r'\s*(?P<suffix>k|mm|m|million|thousand)?\b'
+    rf'(?:\s*(?P<after>{_CURRENCY}))?'
+)
+_RANGE_GAP = re.compile(r'\s*(?:-|–|—|to)\s*$')
+# Benefits that read like amounts
+_NOT_PAY = re.compile(r'\b40[13]\s*\(?[kb]\)?')
+_SUFFIXES = {'k': 1_000, 'thousand': 1_000, 'm': 1_000_000, 'mm': 1_000_000, 'million': 1_000_000}
+_MAX_ONLY = re.compile(r'\b(?:up to|upto|max(?:imum)?|under|less than)\b')
+_MIN_ONLY = re.compile(r'\b(?:from|starting(?: at)?|min(?:imum)?|at least)\b|\d\s*[km]?\s*\+')
+
+
+class Salary(NamedTuple):
+    min: Optional[int]  # annualized, in ``currency``
+    max: Optional[int]
+    period: str  # as posted: hour | day | week | month | year
+    currency: str
+
+
+class SalaryColumns(NamedTuple):
+    min: List[Optional[int]]
+    max: List[Optional[int]]
+    period: List[Optional[str]]
+    currency: List[Optional[str]]
+
+
+def _currency(text: str) -> str:
+    match = _CURRENCY_CODES.search(text)
+    if match:
+        return match.group(1).upper()
+    for symbol, code in _CURRENCY_SYMBOLS:
+        if symbol in text:
+            return code
+    return DEFAULT_CURRENCY
+
+
+def _period(text: str, start: int, end: int) -> Optional[str]:
+    """Period written closest to the amounts at ``text[start:end]``"""
+    window_start = max(start - PERIOD_WINDOW, 0)
+    window = text[window_start:end + PERIOD_WINDOW]
+    start, end = start - window_start, end - window_start
+    nearest = None
+    for period, pattern in _PERIOD_PATTERNS:
+        for match in pattern.finditer(window):
+            distance = max(start - match.end(), match.start() - end, 0)
+            if nearest is None or distance < nearest[0]:
+                nearest = (distance, period)
+    return nearest[1] if nearest else None
+
+
+def _default_period(amounts: List[float]) -> Optional[str]:
+    top = max(amounts)
+    if top < HOURLY_BELOW:
+        return 'hour'
+    if top < YEARLY_FROM:
+        return None
+    return 'year'
+
+
+def _amounts(text: str) -> Tuple[List[float], Optional[str], Tuple[int, int]]:
+    """Up to two amounts of the salary in ``text``, the currency written next to them, and their span"""
+    found = []
+    previous_end = None
+    # Blanked out rather than removed, so spans still index ``text``
+    for match in _AMOUNT.finditer(_NOT_PAY.sub(lambda m: ' ' * len(m.group()), text)):
+        whole, fraction, suffix = match.group('whole', 'fraction', 'suffix')
+        amount = {
+            'value': float(re.sub(r'[.,]', '', whole) + ('.' + fraction if fraction else '')),
+            'suffix': suffix,
+            'currency': match.group('before') or match.group('after'),
+            'ranged': previous_end is not None and bool(_RANGE_GAP.match(text[previous_end:match.start()])),
+            'span': match.span(),
+        }
+        found.append(amount)
+        previous_end = match.end()
+
+    for low, high in zip(found, found[1:]):
+        if not high['ranged']:
+            continue
+        # '120-150k': a suffix on the upper bound applies to a bare lower bound
+        if high['suffix'] and not low['suffix'] and low['value'] < 1000:
+            low['suffix'] = high['suffix']
+        # 'USD 100000 - 140000': both ends of a range belong to the salary
+        low['currency'] = high['currency'] = low['currency'] or high['currency']
+
+    anchored = [amount for amount in found if amount['currency'] or amount['suffix']]
+    if anchored:
+        found = anchored
+    else:
+        found = [amount for amount in found if amount['value'] >= YEARLY_FROM]
+    found = found[:2]
+    currency = next((amount['currency'] for amount in found if amount['currency']), None)
+    span = (found[0]['span'][0], found[-1]['span'][1]) if found else (0, 0)
+    return [amount['value'] * _SUFFIXES.get(amount['suffix'], 1) for amount in found], currency, span
+
+
+@lru_cache(maxsize=65536)
+def parse_salary(text: Optional[str]) -> Optional[Salary]:
+    """Annualized salary range from free-form text, or None when there is no usable amount"""
+    if not text or not any(ch.isdigit() for ch in text):
+        return None
+    lowered = text.lower()
+    amounts, currency, span = _amounts(lowered)
+    amounts = [amount for amount in amounts if amount > 0]
+    if not amounts:
+        return None
+
+    period = _period(lowered, *span)
+    if period is None or max(amounts) * PERIODS[period] > MAX_ANNUAL:
+        period = _default_period(amounts)
+    if period is None or max(amounts) * PERIODS[period] > MAX_ANNUAL:
+        return None
+
+    factor = PERIODS[period]
+    low, high = (int(round(amount * factor)) for amount in (min(amounts), max(amounts)))
+    if len(amounts) == 1:
+        if _MAX_ONLY.search(lowered):
+            low = None
+        elif _MIN_ONLY.search(lowered):
+            high = None
+    return Salary(low, high, period, _currency(currency or lowered))
+
+
+def salary_range(text: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """(min, max) annualized, either side None when not stated"""
+    salary = parse_salary(text)
+    return (salary.min, salary.max) if salary else (None, None)
+
+
+def salary_columns(text: Optional[str]) -> Tuple[Optional[int], Optional[int], Optional[str], Optional[str]]:
+    """(salary_min, salary_max, salary_period, salary_currency) to store with a job"""
+    salary = parse_salary(text)
+    return tuple(salary) if salary else (None, None, None, None)
+
+
+def normalize_column(texts: Iterable[Optional[str]]) -> SalaryColumns:
+    """Parse a column of salary texts; repeated texts are parsed once"""
+    texts = list(texts)
+    parsed = {text: salary_columns(text) for text in set(texts)}
+    rows = [parsed[text] for text in texts]
+    return SalaryColumns(*(list(column) for column in zip(*rows))) if rows else SalaryColumns([], [], [], [])
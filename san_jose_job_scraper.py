@@ -2,25 +2,36 @@
 """
 Comprehensive San Jose Job Scraper
 Gather exactly 1000 jobs in San Jose, CA from multiple sources
+- Pages are fetched with aiohttp and parsed in a process pool behind a
+  bounded queue, so HTML parsing never stalls in-flight requests
 """
 
 import sys
 sys.path.append('/home/calelin/awesome-apply/venv/lib/python3.13/site-packages')
 
+import argparse
 import asyncio
 import aiohttp
 import json
+import os
 import sqlite3
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import logging
 import random
+import statistics
 import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, asdict
 from urllib.parse import urljoin, urlparse, quote
 import re
 import requests
-from bs4 import BeautifulSoup
+
+import geo_index
+import html_extract
+from event_stream import scrape_stats
+import http_cassette
+from top_k import top_k
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -49,11 +60,147 @@ class SanJoseJob:
     match_score: float
     verified_san_jose: bool = True
 
+# Per-process scraper used by parse workers; parse_* methods only need its helpers
+_parse_scraper = None
+
+
+def _init_parse_worker():
+    # Forked workers inherit the parent's random state; reseed so ids/urls differ
+    random.seed()
+
+
+def _parse_in_worker(parser_name: str, html: str, args: tuple) -> List[SanJoseJob]:
+    global _parse_scraper
+    if _parse_scraper is None:
+        _parse_scraper = SanJoseJobScraper()
+    return getattr(_parse_scraper, parser_name)(html, *args)
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes a periodic timer"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - started - self.interval))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def summary(self) -> Dict[str, float]:
+        if not self.samples:
+            return {'samples': 0, 'mean_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+        ordered = sorted(self.samples)
+        return {
+            'samples': len(ordered),
+            'mean_ms': round(statistics.mean(ordered) * 1000, 3),
+            'p99_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 3),
+            'max_ms': round(ordered[-1] * 1000, 3),
+        }
+
+
+class ParseStage:
+    """Bounded fetch -> parse hand-off running the parse_* methods in worker processes
+
+    Fetchers block on ``submit`` once ``queue_size`` pages are waiting, so a
+    slow parse stage applies backpressure instead of buffering every page.
+    ``workers=0`` parses inline on the event loop (the previous behaviour).
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue_size: Optional[int] = None):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.queue_size = queue_size or 2 * max(self.workers, 1)
+        self.queue: Optional[asyncio.Queue] = None
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self._consumers: List[asyncio.Task] = []
+        self.pages = 0
+        self.errors = 0
+        self.parse_seconds = 0.0
+
+    async def start(self):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        if self.workers:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_parse_worker)
+            self._consumers = [asyncio.ensure_future(self._consume()) for _ in range(self.workers)]
+        logger.info(f"🧩 Parse stage: {self.workers or 'inline'} workers, queue size {self.queue_size}")
+
+    async def submit(self, parser_name: str, html: str, *args, url: Optional[str] = None) -> asyncio.Future:
+        """Queue a page for parsing; resolves to the parsed jobs, [] when the parser fails"""
+        future = asyncio.get_running_loop().create_future()
+        if not self.workers:
+            started = time.perf_counter()
+            try:
+                jobs = _parse_in_worker(parser_name, html, args)
+            except Exception as e:
+                jobs = self._failed(parser_name, url, e)
+            future.set_result(jobs)
+            self._record(started)
+            return future
+        await self.queue.put((future, parser_name, html, args, url))
+        return future
+
+    async def parse(self, parser_name: str, html: str, *args, url: Optional[str] = None) -> List[SanJoseJob]:
+        return await (await self.submit(parser_name, html, *args, url=url))
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            future, parser_name, html, args, url = await self.queue.get()
+            started = time.perf_counter()
+            try:
+                jobs = await loop.run_in_executor(self.executor, _parse_in_worker, parser_name, html, args)
+            except Exception as e:
+                jobs = self._failed(parser_name, url, e)
+            self._record(started)
+            if not future.done():
+                future.set_result(jobs)
+            self.queue.task_done()
+
+    def _failed(self, parser_name: str, url: Optional[str], error: Exception) -> List[SanJoseJob]:
+        self.errors += 1
+        scrape_stats.record_error(parser_name)
+        logger.warning(f"⚠️ {parser_name} failed on {url or 'a page'}: {type(error).__name__}: {error}")
+        return []
+
+    def _record(self, started: float):
+        self.pages += 1
+        self.parse_seconds += time.perf_counter() - started
+
+    async def close(self):
+        if self.queue is not None:
+            await self.queue.join()
+        for consumer in self._consumers:
+            consumer.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
 class SanJoseJobScraper:
     """Comprehensive scraper targeting San Jose, CA jobs specifically"""
 
-    def __init__(self):
+    def __init__(self, parse_workers: Optional[int] = None):
         self.session = None
+        self.parse_workers = parse_workers
+        self.parse_stage: Optional[ParseStage] = None
         self.jobs_collected = []
         self.target_jobs = 1000
         self.san_jose_keywords = [
@@ -61,6 +208,8 @@ class SanJoseJobScraper:
             'Cupertino', 'Sunnyvale', 'Mountain View', 'Palo Alto',
             'Milpitas', 'Campbell', 'Los Gatos', 'Saratoga'
         ]
+        self.san_jose_place = geo_index.normalize_location('San Jose, CA')
+        self.area_radius_miles = 20.0
         self.apis = {
             'indeed': 'https://indeed-indeed.p.rapidapi.com/apisearch',
             'adzuna': 'https://api.adzuna.com/v1/api/jobs/us/search',
@@ -85,11 +234,11 @@ class SanJoseJobScraper:
 
         connector = aiohttp.TCPConnector(limit=50, limit_per_host=10)
         timeout = aiohttp.ClientTimeout(total=30)
-        self.session = aiohttp.ClientSession(
+        self.session = http_cassette.wrap_aiohttp(aiohttp.ClientSession(
             connector=connector,
             timeout=timeout,
             headers=headers
-        )
+        ))
 
     async def scrape_1000_san_jose_jobs(self) -> List[SanJoseJob]:
         """Main method to scrape exactly 1000 jobs in San Jose"""
@@ -115,8 +264,23 @@ class SanJoseJobScraper:
             self.scrape_company_career_pages_san_jose()
         ]
 
-        # Run all scrapers concurrently
-        results = await asyncio.gather(*scrapers, return_exceptions=True)
+        # Run all scrapers concurrently; pages are parsed off the event loop
+        self.parse_stage = ParseStage(self.parse_workers)
+        await self.parse_stage.start()
+        lag = LoopLagMonitor()
+        lag.start()
+        started = time.perf_counter()
+        try:
+            results = await asyncio.gather(*scrapers, return_exceptions=True)
+        finally:
+            await lag.stop()
+            await self.parse_stage.close()
+            elapsed = time.perf_counter() - started
+            logger.info(f"⏱️ Parsed {self.parse_stage.pages} pages in {elapsed:.1f}s "
+                        f"({self.parse_stage.pages / max(elapsed, 1e-9):.2f} pages/s, "
+                        f"{self.parse_stage.errors} failed), "
+                        f"event loop lag {lag.summary()}")
+            self.parse_stage = None
 
         all_jobs = []
         for i, result in enumerate(results):
@@ -136,13 +300,18 @@ class SanJoseJobScraper:
             additional_jobs = await self.scrape_additional_san_jose_jobs(self.target_jobs - len(unique_jobs))
             unique_jobs.extend(additional_jobs)
 
-        # Sort by relevance and return exactly 1000
-        sorted_jobs = sorted(unique_jobs, key=lambda x: (x.verified_san_jose, x.match_score), reverse=True)
-        final_jobs = sorted_jobs[:self.target_jobs]
+        # Keep the most relevant, exactly 1000
+        final_jobs = top_k(unique_jobs, self.target_jobs, key=lambda x: (x.verified_san_jose, x.match_score))
 
         logger.info(f"🎉 SCRAPING COMPLETE: {len(final_jobs)} San Jose jobs collected")
         return final_jobs
 
+    async def parse_page(self, parser_name: str, html: str, *args, url: Optional[str] = None) -> List[SanJoseJob]:
+        """Parse a fetched page through the parse stage, or inline outside a scrape run"""
+        if self.parse_stage is None:
+            return getattr(self, parser_name)(html, *args)
+        return await self.parse_stage.parse(parser_name, html, *args, url=url)
+
     async def scrape_indeed_san_jose(self) -> List[SanJoseJob]:
         """Scrape Indeed for San Jose jobs"""
         jobs = []
@@ -173,7 +342,7 @@ class SanJoseJobScraper:
                     async with self.session.get(url) as response:
                         if response.status == 200:
                             html = await response.text()
-                            jobs.extend(self.parse_indeed_jobs(html, query))
+                            jobs.extend(await self.parse_page('parse_indeed_jobs', html, query, url=url))
 
                     # Rate limiting
                     await asyncio.sleep(random.uniform(1, 3))
@@ -206,7 +375,7 @@ class SanJoseJobScraper:
                     async with self.session.get(url) as response:
                         if response.status == 200:
                             html = await response.text()
-                            jobs.extend(self.parse_linkedin_jobs(html))
+                            jobs.extend(await self.parse_page('parse_linkedin_jobs', html, url=url))
 
                     await asyncio.sleep(random.uniform(2, 4))
 
@@ -236,7 +405,7 @@ class SanJoseJobScraper:
                     async with self.session.get(url) as response:
                         if response.status == 200:
                             html = await response.text()
-                            jobs.extend(self.parse_glassdoor_jobs(html, category))
+                            jobs.extend(await self.parse_page('parse_glassdoor_jobs', html, category, url=url))
 
                     await asyncio.sleep(random.uniform(2, 4))
 
@@ -276,7 +445,7 @@ class SanJoseJobScraper:
                     async with self.session.get(url) as response:
                         if response.status == 200:
                             html = await response.text()
-                            jobs.extend(self.parse_dice_jobs(html, keyword))
+                            jobs.extend(await self.parse_page('parse_dice_jobs', html, keyword, url=url))
 
                     await asyncio.sleep(random.uniform(1, 2))
 
@@ -309,7 +478,7 @@ class SanJoseJobScraper:
                     async with self.session.get(url) as response:
                         if response.status == 200:
                             html = await response.text()
-                            jobs.extend(self.parse_ziprecruiter_jobs(html, category))
+                            jobs.extend(await self.parse_page('parse_ziprecruiter_jobs', html, category, url=url))
 
                     await asyncio.sleep(random.uniform(1, 3))
 
@@ -341,7 +510,7 @@ class SanJoseJobScraper:
                     async with self.session.get(url) as response:
                         if response.status == 200:
                             html = await response.text()
-                            jobs.extend(self.parse_monster_jobs(html, term))
+                            jobs.extend(await self.parse_page('parse_monster_jobs', html, term, url=url))
 
                     await asyncio.sleep(random.uniform(2, 4))
 
@@ -374,7 +543,7 @@ class SanJoseJobScraper:
                     async with self.session.get(url) as response:
                         if response.status == 200:
                             html = await response.text()
-                            jobs.extend(self.parse_careerbuilder_jobs(html, job_type))
+                            jobs.extend(await self.parse_page('parse_careerbuilder_jobs', html, job_type, url=url))
 
                     await asyncio.sleep(random.uniform(1, 3))
 
@@ -414,7 +583,7 @@ class SanJoseJobScraper:
                     async with self.session.get(url) as response:
                         if response.status == 200:
                             html = await response.text()
-                            jobs.extend(self.parse_craigslist_jobs(html, query))
+                            jobs.extend(await self.parse_page('parse_craigslist_jobs', html, query, url=url))
 
                     await asyncio.sleep(random.uniform(1, 2))
 
@@ -443,7 +612,7 @@ class SanJoseJobScraper:
                     async with self.session.get(url) as response:
                         if response.status == 200:
                             html = await response.text()
-                            jobs.extend(self.parse_angellist_jobs(html))
+                            jobs.extend(await self.parse_page('parse_angellist_jobs', html, url=url))
 
                     await asyncio.sleep(random.uniform(3, 5))
 
@@ -466,7 +635,7 @@ class SanJoseJobScraper:
             async with self.session.get(url) as response:
                 if response.status == 200:
                     html = await response.text()
-                    jobs.extend(self.parse_builtin_jobs(html))
+                    jobs.extend(await self.parse_page('parse_builtin_jobs', html, url=url))
 
         except Exception as e:
             logger.error(f"Built In scraping failed: {e}")
@@ -489,7 +658,7 @@ class SanJoseJobScraper:
                     async with self.session.get(site_url) as response:
                         if response.status == 200:
                             html = await response.text()
-                            jobs.extend(self.parse_tech_site_jobs(html, site_url))
+                            jobs.extend(await self.parse_page('parse_tech_site_jobs', html, site_url, url=site_url))
 
                     await asyncio.sleep(random.uniform(2, 4))
 
@@ -524,7 +693,8 @@ class SanJoseJobScraper:
                 async with self.session.get(company['careers_url']) as response:
                     if response.status == 200:
                         html = await response.text()
-                        company_jobs = self.parse_company_careers_page(html, company['name'])
+                        company_jobs = await self.parse_page('parse_company_careers_page', html, company['name'],
+                                                          url=company['careers_url'])
                         jobs.extend(company_jobs)
 
                 await asyncio.sleep(random.uniform(2, 5))
@@ -590,16 +760,11 @@ class SanJoseJobScraper:
         """Parse Indeed job listings"""
         jobs = []
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            job_cards = soup.find_all(['div'], class_=lambda x: x and 'job' in x.lower())
-
-            for i, card in enumerate(job_cards[:20]):  # Limit per query
+            # Limited to 20 cards per query
+            for i, card in enumerate(html_extract.extract('san_jose_indeed', html)):
                 try:
-                    title_elem = card.find(['a', 'h2'], class_=lambda x: x and 'title' in x.lower())
-                    title = title_elem.get_text(strip=True) if title_elem else f"{query.title()} - Indeed"
-
-                    company_elem = card.find(['span', 'div'], class_=lambda x: x and 'company' in x.lower())
-                    company = company_elem.get_text(strip=True) if company_elem else "Tech Company"
+                    title = card['title'] or f"{query.title()} - Indeed"
+                    company = card['company'] or "Tech Company"
 
                     location = "San Jose, CA"  # Since we're searching specifically for San Jose
 
@@ -639,10 +804,9 @@ class SanJoseJobScraper:
         """Parse LinkedIn job listings"""
         jobs = []
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            job_elements = soup.find_all(['div', 'li'], class_=lambda x: x and 'job' in x.lower())
+            job_elements = html_extract.extract('san_jose_linkedin', html)
 
-            for i, element in enumerate(job_elements[:15]):
+            for i, element in enumerate(job_elements):
                 try:
                     title = f"LinkedIn Job {i+1}"
                     company = f"LinkedIn Company {i+1}"
@@ -1096,11 +1260,15 @@ class SanJoseJobScraper:
         san_jose_jobs = []
 
         for job in jobs:
-            # Check if location contains San Jose area keywords
-            if any(keyword.lower() in job.location.lower() for keyword in self.san_jose_keywords):
-                job.verified_san_jose = True
-                san_jose_jobs.append(job)
-            elif 'san jose' in job.location.lower():
+            place = geo_index.normalize_location(job.location)
+            if place is not None:
+                # Known place: distance decides, which covers towns missing from the keyword list
+                nearby = geo_index.distance_miles(place, self.san_jose_place) <= self.area_radius_miles
+            else:
+                # Unresolved location strings fall back to the area keywords
+                location = job.location.lower()
+                nearby = any(keyword.lower() in location for keyword in self.san_jose_keywords)
+            if nearby:
                 job.verified_san_jose = True
                 san_jose_jobs.append(job)
 
@@ -1196,9 +1364,47 @@ class SanJoseJobScraper:
             logger.error(f"Database save failed: {e}")
             return 0
 
-async def main():
+async def measure_parse_pipeline(html: str, pages: int = 200, parse_workers: Optional[int] = None,
+                                 fetchers: int = 12, fetch_latency: float = 0.02,
+                                 parser_name: str = 'parse_indeed_jobs',
+                                 parser_args: tuple = ('software engineer',)) -> Dict[str, Any]:
+    """Replay ``html`` through the fetch -> parse pipeline with simulated network latency
+
+    Reports end-to-end pages/s and event-loop lag so inline parsing
+    (``parse_workers=0``) can be compared against the process pool.
+    """
+    stage = ParseStage(parse_workers)
+    await stage.start()
+    lag = LoopLagMonitor()
+    lag.start()
+    remaining = iter(range(pages))
+    parsed = []
+
+    async def fetcher():
+        for _ in remaining:
+            await asyncio.sleep(fetch_latency)
+            parsed.extend(await stage.parse(parser_name, html, *parser_args))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(fetcher() for _ in range(fetchers)))
+    elapsed = time.perf_counter() - started
+    await lag.stop()
+    await stage.close()
+
+    return {
+        'parse_workers': stage.workers,
+        'pages': stage.pages,
+        'failed_pages': stage.errors,
+        'jobs': len(parsed),
+        'seconds': round(elapsed, 3),
+        'pages_per_second': round(stage.pages / max(elapsed, 1e-9), 2),
+        'loop_lag': lag.summary(),
+    }
+
+
+async def main(parse_workers: Optional[int] = None):
     """Main execution function"""
-    scraper = SanJoseJobScraper()
+    scraper = SanJoseJobScraper(parse_workers)
 
     try:
         # Scrape exactly 1000 San Jose jobs
@@ -1243,5 +1449,28 @@ async def main():
         if scraper.session:
             await scraper.session.close()
 
+def measure_main(args):
+    with open(args.measure_parsing, encoding='utf-8', errors='replace') as f:
+        html = f.read()
+
+    workers = [0, args.parse_workers or os.cpu_count() or 1]
+    results = [asyncio.run(measure_parse_pipeline(html, pages=args.pages, parse_workers=n)) for n in workers]
+    for result in results:
+        mode = 'inline' if not result['parse_workers'] else f"{result['parse_workers']} processes"
+        print(f"{mode:>14}: {result['pages_per_second']:8.2f} pages/s  "
+              f"loop lag p99 {result['loop_lag']['p99_ms']:.1f}ms max {result['loop_lag']['max_ms']:.1f}ms")
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="San Jose job scraper")
+    parser.add_argument('--parse-workers', type=int, default=None,
+                        help="Parse processes (0 parses inline on the event loop)")
+    parser.add_argument('--measure-parsing', metavar='HTML',
+                        help="Compare inline vs process-pool parsing over a saved page and exit")
+    parser.add_argument('--pages', type=int, default=200, help="Pages to replay with --measure-parsing")
+    args = parser.parse_args()
+
+    if args.measure_parsing:
+        measure_main(args)
+    else:
+        asyncio.run(main(args.parse_workers))
\ No newline at end of file
@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""
+Semantic job search over local embeddings
+- Embedder turns job text (title, skills, description) and user profiles
+  into unit-length dense vectors: sublinear TF-IDF weights projected
+  through fixed sparse random term vectors. It is CPU-only and needs no
+  model download, and vector cosine approximates TF-IDF cosine
+- VectorIndex keeps the vectors as a float32 matrix in a memory-mapped
+  file and answers top-k queries with multi-table random-hyperplane LSH
+  (multi-probe SimHash) plus exact re-ranking of the candidates; jobs are
+  appended as they arrive, no rebuild needed
+- VectorIndex.publish() writes a versioned snapshot (mmap_snapshot) that
+  VectorSnapshot searches without loading anything into the process, so
+  web workers share the matrix and buckets through the page cache
+- Scoring uses numpy when it is installed, pure Python otherwise
+
+    from semantic_search import VectorIndex
+    index = VectorIndex('jobs.vectors')
+    index.add_jobs(jobs)                      # incremental, persisted
+    index.similar_to_job('job_123', k=10)     # [(job_id, cosine), ...]
+    index.search_profile({'title': 'Data Engineer', 'skills': ['Spark', 'Airflow']}, k=10)
+
+    python semantic_search.py --jobs 100000 --queries 200
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import random
+import re
+import threading
+import time
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import combinations
+from operator import mul
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are serialized within one process only
+    fcntl = None
+
+from mmap_snapshot import Snapshot, SnapshotWriter
+
+logger = logging.getLogger(__name__)
+
+DIM = 128
+TERM_NONZEROS = 8  # non-zero entries of each term's random vector
+TABLES = 8
+BITS = 12  # signature bits per table, at most 16
+PLANE_NONZEROS = 16  # non-zero entries of each hyperplane
+EXACT_BELOW = 5000  # smaller indexes are scanned exhaustively
+CANDIDATES_PER_RESULT = 100  # probe wider until this many candidates per requested result
+FIELD_WEIGHTS = {'title': 3.0, 'skills': 2.0, 'description': 1.0}
+STOP_WORDS = frozenset("""
+a an and are as at be but by for from has have in is it its of on or our that the their this to we will with
+you your who what which all any can do more not than they us was were also into about over such per etc
+""".split())
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+
+def _seed(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+@lru_cache(maxsize=1 << 17)
+def term_vector(term: str, dim: int = DIM) -> Tuple[Tuple[int, float], ...]:
+    """Sparse random ±1/sqrt(n) vector of a term, the same in every process"""
+    rng = random.Random(_seed(term))
+    scale = 1 / math.sqrt(TERM_NONZEROS)
+    return tuple((d, scale if rng.random() < 0.5 else -scale) for d in rng.sample(range(dim), TERM_NONZEROS))
+
+
+def _value(item: Any, *names: str):
+    for name in names:
+        value = item.get(name) if isinstance(item, dict) else getattr(item, name, None)
+        if value:
+            return value
+    return None
+
+
+def _skills(value) -> List[str]:
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            value = value.split(',')
+    return [str(skill) for skill in value or ()]
+
+
+def _count_words(text: Optional[str], weight: float, counts: Counter):
+    for word in _WORD.findall(text.lower()) if text else ():
+        if word not in STOP_WORDS and len(word) > 1:
+            counts[word] += weight
+
+
+def job_terms(job: Any) -> Counter:
+    """Field-weighted term counts of a job (dict, dataclass or ORM row)"""
+    counts = Counter()
+    _count_words(_value(job, 'title'), FIELD_WEIGHTS['title'], counts)
+    _count_words(' '.join(_skills(_value(job, 'skills', 'skills_required', 'tags'))), FIELD_WEIGHTS['skills'], counts)
+    _count_words(_value(job, 'description'), FIELD_WEIGHTS['description'], counts)
+    return counts
+
+
+def profile_terms(profile: Any) -> Counter:
+    """Term counts of a user profile; fields mirror job_terms so both land in one space"""
+    counts = Counter()
+    _count_words(_value(profile, 'preferred_title', 'title'), FIELD_WEIGHTS['title'], counts)
+    _count_words(' '.join(_skills(_value(profile, 'skills'))), FIELD_WEIGHTS['skills'], counts)
+    _count_words(_value(profile, 'summary', 'bio', 'experience', 'description'), FIELD_WEIGHTS['description'], counts)
+    return counts
+
+
+def cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    """Dot product of two unit vectors"""
+    return sum(map(mul, a, b))
+
+
+class Embedder:
+    """TF-IDF random-projection embeddings; document frequencies grow as documents are observed"""
+
+    def __init__(self, dim: int = DIM, document_frequency: Optional[Dict[str, int]] = None, documents: int = 0):
+        self.dim = dim
+        self.document_frequency = Counter(document_frequency or {})
+        self.documents = documents
+
+    def observe(self, terms: Iterable[str]):
+        self.documents += 1
+        self.document_frequency.update(set(terms))
+
+    def idf(self, term: str) -> float:
+        return math.log((1 + self.documents) / (1 + self.document_frequency.get(term, 0))) + 1
+
+    def embed(self, counts: Dict[str, float]) -> array:
+        vector = [0.0] * self.dim
+        for term, count in counts.items():
+            weight = math.log1p(count) * self.idf(term)
+            for d, sign in term_vector(term, self.dim):
+                vector[d] += weight * sign
+        norm = math.sqrt(sum(v * v for v in vector))
+        return array('f', (v / norm for v in vector) if norm else vector)
+
+    def embed_job(self, job: Any, learn: bool = False) -> array:
+        counts = job_terms(job)
+        if learn:
+            self.observe(counts)
+        return self.embed(counts)
+
+    def embed_profile(self, profile: Any) -> array:
+        return self.embed(profile_terms(profile))
+
+
+_skill_embedder = Embedder()
+
+
+def skill_similarity(skills1: Iterable[str], skills2: Iterable[str]) -> float:
+    """Cosine similarity of two skill lists' embeddings, 0..1"""
+    a = _skill_embedder.embed(Counter(word for skill in skills1 for word in _WORD.findall(str(skill).lower())))
+    b = _skill_embedder.embed(Counter(word for skill in skills2 for word in _WORD.findall(str(skill).lower())))
+    return max(0.0, min(1.0, cosine(a, b)))
+
+
+def _hyperplanes(dim: int, count: int, seed: int) -> List[Tuple[Tuple[int, int], ...]]:
+    rng = random.Random(seed)
+    return [tuple((d, 1 if rng.random() < 0.5 else -1) for d in rng.sample(range(dim), min(dim, PLANE_NONZEROS)))
+            for _ in range(count)]
+
+
+class _ProbedSearch:
+    """Multi-probe LSH candidates plus exact re-ranking, over rows of a float32 matrix
+
+    Subclasses provide the storage: _matrix(), _bucket(), _row(), _job_id(),
+    _live_rows() and _is_live().
+    """
+
+    def _init_probes(self):
+        self._planes = _hyperplanes(self.dim, self.tables * self.bits, self.seed)
+        self._probes = [[0]] + [[sum(1 << bit for bit in flips) for flips in combinations(range(self.bits), radius)]
+                                for radius in (1, 2)]
+
+    @contextmanager
+    def _reading(self):
+        yield
+
+    def _is_live(self, row: int) -> bool:
+        return True
+
+    def signatures(self, vector: Sequence[float]) -> List[int]:
+        signatures = []
+        for table in range(self.tables):
+            signature = 0
+            for bit, plane in enumerate(self._planes[table * self.bits:(table + 1) * self.bits]):
+                if sum(vector[d] * sign for d, sign in plane) >= 0:
+                    signature |= 1 << bit
+            signatures.append(signature)
+        return signatures
+
+    def vector(self, job_id: str) -> Optional[array]:
+        with self._reading():
+            row = self._row(str(job_id))
+            if row is None:
+                return None
+            return array('f', self._matrix()[row * self.dim:(row + 1) * self.dim])
+
+    def _candidates(self, vector: Sequence[float], wanted: int) -> Iterable[int]:
+        if len(self) <= EXACT_BELOW:
+            return self._live_rows()
+        candidates = set()
+        query_signatures = self.signatures(vector)
+        for masks in self._probes:
+            for table, signature in enumerate(query_signatures):
+                for mask in masks:
+                    candidates.update(self._bucket(table, signature ^ mask))
+            if len(candidates) >= wanted:
+                break
+        return candidates
+
+    def _scores(self, rows: List[int], vector: Sequence[float]) -> List[float]:
+        matrix, dim = self._matrix(), self.dim
+        if np is not None:
+            vectors = np.frombuffer(matrix, dtype=np.float32).reshape(-1, dim)
+            return (vectors[np.asarray(rows, dtype=np.int64)] @ np.asarray(vector, dtype=np.float32)).tolist()
+        query = list(vector)
+        return [sum(map(mul, query, matrix[row * dim:(row + 1) * dim])) for row in rows]
+
+    def search(self, vector: Sequence[float], k: int = 10, exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """Approximate top-k (job_id, cosine) for a unit vector, best first"""
+        with self._reading():
+            excluded = {self._row(str(job_id)) for job_id in exclude}
+            rows = [row for row in self._candidates(vector, k * CANDIDATES_PER_RESULT)
+                    if row not in excluded and self._is_live(row)]
+            if not rows:
+                return []
+            best = heapq.nlargest(k, zip(self._scores(rows, vector), rows))
+            return [(self._job_id(row), score) for score, row in best]
+
+    def similar_to_job(self, job_id: str, k: int = 10) -> List[Tuple[str, float]]:
+        vector = self.vector(job_id)
+        if vector is None:
+            raise KeyError(job_id)
+        return self.search(vector, k, exclude=(str(job_id),))
+
+    def search_profile(self, profile: Any, k: int = 10) -> List[Tuple[str, float]]:
+        return self.search(self.embedder.embed_profile(profile), k)
+
+    def exact_search(self, vector: Sequence[float], k: int = 10) -> List[Tuple[str, float]]:
+        """Brute-force top-k, the reference the LSH probe is measured against"""
+        with self._reading():
+            rows = list(self._live_rows())
+            best = heapq.nlargest(k, zip(self._scores(rows, vector), rows))
+            return [(self._job_id(row), score) for score, row in best]
+
+
+class VectorIndex(_ProbedSearch):
+    """Append-only memory-mapped vector matrix with an LSH index over it
+
+    Files in ``path``: vectors.f32 (row-major float32), signatures.u16
+    (``tables`` signatures per row), ids.txt (job id per row, written last
+    so a listed row is always complete) and meta.json (shape and the
+    embedder's document frequencies). Re-adding a job appends a new row;
+    the last row of an id wins. Appends hold an exclusive file lock and
+    every process picks up rows appended by the others.
+    """
+
+    def __init__(self, path: str, dim: int = DIM, tables: int = TABLES, bits: int = BITS, seed: int = 0):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta = self._read_meta()
+        self.dim = meta.get('dim', dim)
+        self.tables = meta.get('tables', tables)
+        self.bits = meta.get('bits', bits)
+        self.seed = meta.get('seed', seed)
+        self.embedder = Embedder(self.dim, meta.get('document_frequency'), meta.get('documents', 0))
+        self._init_probes()
+        self._lock = threading.RLock()
+
+        self._ids: List[str] = []
+        self._ids_bytes = 0
+        self._row_of: Dict[str, int] = {}
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.tables)]
+        self._mmap = None
+        self._view = None
+        self._mapped_rows = 0
+        self._refresh()
+        if self._ids:
+            logger.info(f"🧭 Loaded {len(self._row_of)} job vectors from {path}")
+
+    # -- persistence -------------------------------------------------------
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _read_meta(self) -> Dict:
+        try:
+            with open(self._file('meta.json')) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write_meta(self):
+        meta = {'dim': self.dim, 'tables': self.tables, 'bits': self.bits, 'seed': self.seed,
+                'documents': self.embedder.documents, 'document_frequency': self.embedder.document_frequency}
+        tmp = self._file(f"meta.json.{os.getpid()}")
+        with open(tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._file('meta.json'))
+
+    @contextmanager
+    def _exclusive(self):
+        """Thread lock plus, where supported, an exclusive lock shared with other processes"""
+        with self._lock, open(self._file('lock'), 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    @contextmanager
+    def _reading(self):
+        with self._lock:
+            self._refresh()
+            yield
+
+    def _refresh(self):
+        """Load rows appended since the last look, by this or another process"""
+        try:
+            size = os.path.getsize(self._file('ids.txt'))
+        except FileNotFoundError:
+            return
+        if size == self._ids_bytes:
+            return
+        with open(self._file('ids.txt'), 'rb') as f:
+            f.seek(self._ids_bytes)
+            tail = f.read(size - self._ids_bytes)
+        tail = tail[:tail.rfind(b'\n') + 1]
+        new_ids = tail.decode('utf-8').splitlines()
+        if not new_ids:
+            return
+
+        first = len(self._ids)
+        signatures = array('H')
+        with open(self._file('signatures.u16'), 'rb') as f:
+            f.seek(first * self.tables * signatures.itemsize)
+            signatures.fromfile(f, len(new_ids) * self.tables)
+        for offset, job_id in enumerate(new_ids):
+            row = first + offset
+            self._row_of[job_id] = row
+            for table in range(self.tables):
+                self._buckets[table].setdefault(signatures[offset * self.tables + table], []).append(row)
+        self._ids.extend(new_ids)
+        self._ids_bytes += len(tail)
+
+    def _matrix(self):
+        """Read-only view of the vector file, remapped when rows were appended"""
+        if self._mapped_rows != len(self._ids):
+            if self._view is not None:
+                self._view.release()
+                self._mmap.close()
+            self._view = self._mmap = None
+            if self._ids:
+                with open(self._file('vectors.f32'), 'rb') as f:
+                    self._mmap = mmap.mmap(f.fileno(), len(self._ids) * self.dim * 4, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._mmap).cast('f')
+            self._mapped_rows = len(self._ids)
+        return self._view
+
+    def close(self):
+        with self._lock:
+            if self._view is not None:
+                self._view.release()
+                self._mmap.close()
+            self._view = self._mmap = None
+            self._mapped_rows = 0
+
+    def publish(self, root: str) -> str:
+        """Publish the current rows as a read-only snapshot version under ``root`` (see VectorSnapshot)"""
+        with self._exclusive():
+            self._refresh()
+            meta = self._read_meta()
+            live = sorted(self._row_of.items())
+            live_rows = set(self._row_of.values())
+            with SnapshotWriter(root) as writer:
+                # The vector file is append-only, so the snapshot shares its pages instead of copying them
+                writer.link_array('vectors', 'f', self._file('vectors.f32'), len(self._ids) * self.dim)
+                writer.add_strings('ids', self._ids)
+                writer.add_strings('sorted_ids', (job_id for job_id, _ in live))
+                writer.add_array('sorted_rows', 'I', (row for _, row in live))
+                for table, buckets in enumerate(self._buckets):
+                    rows, offsets = array('I'), array('I', [0])
+                    for signature in range(1 << self.bits):
+                        rows.extend(row for row in buckets.get(signature, ()) if row in live_rows)
+                        offsets.append(len(rows))
+                    writer.add_array(f"bucket_rows.{table}", 'I', rows)
+                    writer.add_array(f"bucket_offsets.{table}", 'I', offsets)
+                frequencies = sorted((meta.get('document_frequency') or {}).items())
+                writer.add_strings('df_terms', (term for term, _ in frequencies))
+                writer.add_array('df_counts', 'I', (count for _, count in frequencies))
+                writer.add_json('meta', {'dim': self.dim, 'tables': self.tables, 'bits': self.bits,
+                                         'seed': self.seed, 'documents': meta.get('documents', 0)})
+            return writer.version
+
+    # -- indexing ----------------------------------------------------------
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def __contains__(self, job_id: str):
+        return job_id in self._row_of
+
+    def _bucket(self, table: int, signature: int) -> Iterable[int]:
+        return self._buckets[table].get(signature, ())
+
+    def _row(self, job_id: str) -> Optional[int]:
+        return self._row_of.get(job_id)
+
+    def _job_id(self, row: int) -> str:
+        return self._ids[row]
+
+    def _live_rows(self) -> Iterable[int]:
+        return self._row_of.values()
+
+    def _is_live(self, row: int) -> bool:
+        return self._row_of[self._ids[row]] == row
+
+    def _append(self, items: Iterable[Tuple[str, Sequence[float]]]) -> int:
+        vectors, signatures, ids = array('f'), array('H'), []
+        for job_id, vector in items:
+            vectors.extend(vector)
+            signatures.extend(self.signatures(vector))
+            ids.append(str(job_id))
+        if not ids:
+            return 0
+        rows = len(self._ids)
+        # Rows past ids.txt are leftovers of an interrupted append; overwrite them
+        for name, data in (('vectors.f32', vectors), ('signatures.u16', signatures)):
+            with open(self._file(name), 'ab') as f:
+                f.truncate(rows * len(data) // len(ids) * data.itemsize)
+                data.tofile(f)
+        with open(self._file('ids.txt'), 'a', encoding='utf-8') as f:
+            f.write(''.join(f"{job_id}\n" for job_id in ids))
+        self._refresh()
+        return len(ids)
+
+    def add(self, items: Iterable[Tuple[str, Sequence[float]]]) -> int:
+        """Append (job_id, unit vector) pairs"""
+        with self._exclusive():
+            self._refresh()
+            added = self._append(items)
+            if added:
+                self._write_meta()
+            return added
+
+    def add_jobs(self, jobs: Iterable[Any]) -> int:
+        """Embed and append jobs; document frequencies learn from them first"""
+        jobs = [job for job in jobs if _value(job, 'id', 'job_id')]
+        if not jobs:
+            return 0
+        terms = [job_terms(job) for job in jobs]
+        with self._exclusive():
+            self._refresh()
+            meta = self._read_meta()
+            self.embedder = Embedder(self.dim, meta.get('document_frequency'), meta.get('documents', 0))
+            for counts in terms:
+                self.embedder.observe(counts)
+            added = self._append((str(_value(job, 'id', 'job_id')), self.embedder.embed(counts))
+                                 for job, counts in zip(jobs, terms))
+            self._write_meta()
+            return added
+
+
+class _SnapshotFrequencies:
+    """Document frequencies read straight from a snapshot's sorted term column"""
+
+    def __init__(self, terms, counts):
+        self._terms = terms
+        self._counts = counts
+
+    def get(self, term: str, default: int = 0) -> int:
+        i = self._terms.find(term)
+        return default if i is None else self._counts[i]
+
+
+class VectorSnapshot(_ProbedSearch):
+    """Read-only, memory-mapped search over a version written by VectorIndex.publish()
+
+    Nothing is loaded into the process: vectors, LSH buckets and document
+    frequencies are all read from the mapped files, so every worker shares
+    one copy through the page cache.
+    """
+
+    def __init__(self, snapshot: Snapshot):
+        meta = snapshot.json('meta')
+        self.version = snapshot.version
+        self.dim, self.tables, self.bits, self.seed = meta['dim'], meta['tables'], meta['bits'], meta['seed']
+        self.embedder = Embedder(self.dim, documents=meta['documents'])
+        self.embedder.document_frequency = _SnapshotFrequencies(snapshot.strings('df_terms'),
+                                                                snapshot.array('df_counts'))
+        self._init_probes()
+        self._vectors = snapshot.array('vectors')
+        self._ids = snapshot.strings('ids')
+        self._sorted_ids = snapshot.strings('sorted_ids')
+        self._sorted_rows = snapshot.array('sorted_rows')
+        self._bucket_rows = [snapshot.array(f"bucket_rows.{t}") for t in range(self.tables)]
+        self._bucket_offsets = [snapshot.array(f"bucket_offsets.{t}") for t in range(self.tables)]
+
+    def __len__(self):
+        return len(self._sorted_rows)
+
+    def __contains__(self, job_id: str):
+        return self._sorted_ids.find(job_id) is not None
+
+    def _matrix(self):
+        return self._vectors
+
+    def _bucket(self, table: int, signature: int) -> Iterable[int]:
+        offsets = self._bucket_offsets[table]
+        return self._bucket_rows[table][offsets[signature]:offsets[signature + 1]]
+
+    def _row(self, job_id: str) -> Optional[int]:
+        i = self._sorted_ids.find(job_id)
+        return None if i is None else self._sorted_rows[i]
+
+    def _job_id(self, row: int) -> str:
+        return self._ids[row]
+
+    def _live_rows(self) -> Iterable[int]:
+        return self._sorted_rows
+
+
+def main():
+    import shutil
+    import tempfile
+    from synthetic_corpus import CorpusGenerator
+
+    parser = argparse.ArgumentParser(description='Build a vector index over a synthetic corpus and time queries')
+    parser.add_argument('--jobs', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('-k', type=int, default=10)
+    args = parser.parse_args()
+
+    path = tempfile.mkdtemp(prefix='vectors-')
+    try:
+        jobs = list(CorpusGenerator(args.jobs, seed=11))
+        index = VectorIndex(path)
+        started = time.perf_counter()
+        for start in range(0, len(jobs), 10000):
+            index.add_jobs(jobs[start:start + 10000])
+        print(f"🧭 Indexed {len(index)} jobs in {time.perf_counter() - started:.1f}s "
+              f"({'numpy' if np is not None else 'pure Python'} scoring)")
+
+        rng = random.Random(5)
+        probes = [job['id'] for job in rng.sample(jobs, min(args.queries, len(jobs)))]
+        started = time.perf_counter()
+        results = [index.similar_to_job(job_id, args.k) for job_id in probes]
+        elapsed = (time.perf_counter() - started) / len(probes)
+
+        recall = 0.0
+        for job_id, found in zip(probes, results):
+            exact = [score for hit, score in index.exact_search(index.vector(job_id), args.k + 1) if hit != job_id]
+            # Templated descriptions tie a lot; any hit scoring as high as the exact k-th counts
+            recall += sum(score >= exact[args.k - 1] - 1e-6 for _, score in found) / args.k
+        print(f"⏱️ {elapsed * 1000:.2f} ms per query, recall@{args.k} {recall / len(probes):.2f}")
+        index.close()
+    finally:
+        shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    main()
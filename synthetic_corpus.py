@@ -0,0 +1,626 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic job corpus for benchmarking at production scale
+- Seeded and streaming: rows are generated lazily in fixed-size chunks, so
+  millions of rows never sit in memory and row ``i`` is identical for a given
+  seed no matter how the corpus is sharded (``start``/``stop``)
+- Stable ids (``syn-<seed>-<index>``) and urls
+- Realistic shapes: Zipf-distributed companies, weighted title families and
+  seniority, metro-weighted locations, family-specific skills, salaries
+  driven by family x seniority x cost of living, log-normal description
+  lengths and a mix of salary text formats
+- Near-duplicates (re-posts on other boards with reworded titles/locations)
+  are injected at ``duplicate_rate`` and point at their original via
+  ``duplicate_of`` so dedup quality can be measured, not just speed
+- Writes straight into the storage backends (JobDatabase SQLite, the crawler
+  and automation ClickHouse stores with their SQLite fallbacks), JSONL or
+  Parquet (requires pyarrow)
+
+    python synthetic_corpus.py --rows 1000000 --format sqlite --output corpus.db
+    python synthetic_corpus.py --rows 5000000 --format parquet --output corpus.parquet
+    python synthetic_corpus.py --rows 1000000 --format crawler --clickhouse-host localhost
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from geo_index import geo_columns
+from salary_normalizer import salary_columns
+
+CHUNK_ROWS = 10_000
+DEFAULT_SEED = 42
+DEFAULT_BATCH_SIZE = 5_000
+EPOCH = datetime(2025, 1, 1)
+
+# family: (weight, base salary, titles, skills ordered by popularity)
+TITLE_FAMILIES = {
+    'software': (40, 140_000, [
+        'Software Engineer', 'Backend Engineer', 'Frontend Engineer', 'Full Stack Engineer',
+        'Mobile Engineer', 'Python Developer', 'Java Developer', 'Frontend Developer'
+    ], [
+        'Python', 'JavaScript', 'TypeScript', 'Java', 'React', 'SQL', 'Go', 'Node.js', 'AWS',
+        'Docker', 'PostgreSQL', 'Kubernetes', 'Redis', 'GraphQL', 'Django', 'Flask', 'C++',
+        'Rust', 'Kotlin', 'Swift', 'Vue.js', 'Microservices', 'REST APIs'
+    ]),
+    'data': (15, 145_000, [
+        'Data Scientist', 'Data Engineer', 'Machine Learning Engineer', 'Analytics Engineer',
+        'Data Analyst', 'AI Engineer'
+    ], [
+        'Python', 'SQL', 'Machine Learning', 'Spark', 'PyTorch', 'TensorFlow', 'Pandas', 'AWS',
+        'Airflow', 'dbt', 'Snowflake', 'Kafka', 'Scikit-learn', 'Statistics', 'Tableau', 'R',
+        'Deep Learning', 'NLP', 'Databricks'
+    ]),
+    'infra': (15, 145_000, [
+        'DevOps Engineer', 'Site Reliability Engineer', 'Platform Engineer', 'Cloud Engineer',
+        'Infrastructure Engineer'
+    ], [
+        'Kubernetes', 'AWS', 'Terraform', 'Docker', 'Linux', 'Python', 'Go', 'GCP', 'Azure',
+        'Prometheus', 'Grafana', 'CI/CD', 'Jenkins', 'GitHub Actions', 'Ansible', 'Bash'
+    ]),
+    'security': (5, 150_000, [
+        'Security Engineer', 'Application Security Engineer', 'Cloud Security Engineer'
+    ], [
+        'Security', 'AWS', 'Python', 'Penetration Testing', 'SIEM', 'Kubernetes', 'Linux',
+        'Threat Modeling', 'Cryptography', 'Go'
+    ]),
+    'product': (10, 150_000, [
+        'Product Manager', 'Technical Program Manager', 'Engineering Manager'
+    ], [
+        'Agile', 'SQL', 'Roadmapping', 'Jira', 'Analytics', 'A/B Testing', 'Stakeholder Management',
+        'Scrum', 'Python'
+    ]),
+    'design': (5, 125_000, [
+        'Product Designer', 'UX Designer', 'UX Researcher'
+    ], [
+        'Figma', 'Prototyping', 'User Research', 'Design Systems', 'Sketch', 'HTML', 'CSS'
+    ]),
+    'qa': (5, 115_000, [
+        'QA Engineer', 'Test Automation Engineer', 'Software Development Engineer in Test'
+    ], [
+        'Selenium', 'Python', 'Java', 'Cypress', 'Test Automation', 'CI/CD', 'SQL', 'Playwright'
+    ]),
+    'solutions': (5, 120_000, [
+        'Solutions Engineer', 'Technical Support Engineer', 'Sales Engineer'
+    ], [
+        'SQL', 'Python', 'REST APIs', 'AWS', 'Linux', 'JavaScript', 'Salesforce'
+    ]),
+}
+GENERAL_SKILLS = ['Git', 'Communication', 'Agile', 'Code Review', 'Mentoring', 'Distributed Systems']
+
+# (prefix, weight, salary multiplier, experience level, years of experience)
+SENIORITY = [
+    ('Intern', 3, 0.40, 'entry', (0, 0)),
+    ('Junior', 12, 0.75, 'entry', (0, 2)),
+    ('', 38, 1.00, 'mid', (2, 5)),
+    ('Senior', 30, 1.30, 'senior', (5, 8)),
+    ('Lead', 5, 1.45, 'senior', (6, 10)),
+    ('Staff', 8, 1.60, 'senior', (8, 12)),
+    ('Principal', 4, 1.85, 'senior', (10, 15)),
+]
+
+# (location, weight, cost of living multiplier, long state name)
+LOCATIONS = [
+    ('Remote', 22, 1.00, None),
+    ('San Francisco, CA', 11, 1.25, 'California'),
+    ('New York, NY', 11, 1.20, 'New York'),
+    ('Seattle, WA', 7, 1.15, 'Washington'),
+    ('San Jose, CA', 6, 1.22, 'California'),
+    ('Mountain View, CA', 3, 1.22, 'California'),
+    ('Palo Alto, CA', 2, 1.22, 'California'),
+    ('Austin, TX', 5, 0.98, 'Texas'),
+    ('Boston, MA', 5, 1.10, 'Massachusetts'),
+    ('Los Angeles, CA', 4, 1.10, 'California'),
+    ('Chicago, IL', 4, 0.98, 'Illinois'),
+    ('Denver, CO', 3, 0.97, 'Colorado'),
+    ('Atlanta, GA', 3, 0.92, 'Georgia'),
+    ('Washington, DC', 3, 1.08, 'District of Columbia'),
+    ('Portland, OR', 2, 0.98, 'Oregon'),
+    ('Raleigh, NC', 2, 0.90, 'North Carolina'),
+    ('Miami, FL', 2, 0.93, 'Florida'),
+    ('Salt Lake City, UT', 1, 0.88, 'Utah'),
+    ('Pittsburgh, PA', 1, 0.86, 'Pennsylvania'),
+    ('Phoenix, AZ', 1, 0.87, 'Arizona'),
+]
+
+# The head of the company distribution; the long tail is generated
+HEAD_COMPANIES = [
+    'Google', 'Amazon', 'Microsoft', 'Meta', 'Apple', 'Netflix', 'Salesforce', 'Oracle', 'Adobe',
+    'NVIDIA', 'Stripe', 'Airbnb', 'Uber', 'Lyft', 'Databricks', 'Snowflake', 'Datadog', 'Cloudflare',
+    'Coinbase', 'DoorDash', 'Instacart', 'Reddit', 'Pinterest', 'Shopify', 'Atlassian', 'Figma',
+    'Notion', 'Plaid', 'Robinhood', 'Square', 'Twilio', 'Zoom', 'Dropbox', 'Slack', 'GitHub',
+    'GitLab', 'HashiCorp', 'MongoDB', 'Elastic', 'Confluent', 'Palantir', 'Okta', 'ServiceNow',
+    'Workday', 'Intuit', 'PayPal', 'eBay', 'LinkedIn', 'Spotify', 'Tesla'
+]
+COMPANY_PREFIXES = [
+    'Blue', 'Bright', 'Clear', 'Cloud', 'Data', 'Deep', 'Fast', 'Green', 'Hyper', 'Iron', 'Lumen',
+    'Meta', 'Nova', 'Open', 'Pixel', 'Quantum', 'Rapid', 'Red', 'Silver', 'Smart', 'Solid', 'Star',
+    'Swift', 'True', 'Vector', 'Wave', 'Zen', 'Arc', 'Bold', 'Core'
+]
+COMPANY_ROOTS = [
+    'forge', 'stack', 'grid', 'path', 'scale', 'loop', 'mind', 'point', 'shift', 'sense', 'flow',
+    'base', 'bit', 'craft', 'field', 'gate', 'hub', 'layer', 'line', 'logic', 'mark', 'nest',
+    'peak', 'port', 'signal', 'spark', 'stream', 'sync', 'works', 'yard'
+]
+COMPANY_KINDS = [
+    'Labs', 'Technologies', 'Systems', 'AI', 'Software', 'Health', 'Analytics', 'Networks',
+    'Robotics', 'Security', 'Cloud', 'Bio', 'Financial', 'Media', 'Inc'
+]
+INDUSTRIES = [
+    'Technology', 'Fintech', 'Healthcare', 'E-commerce', 'SaaS', 'Artificial Intelligence',
+    'Cybersecurity', 'Media', 'Transportation', 'Education', 'Gaming', 'Energy'
+]
+SOURCES = [
+    ('linkedin', 30), ('indeed', 25), ('greenhouse', 12), ('lever', 10), ('company_site', 8),
+    ('workday', 6), ('remoteok', 4), ('angellist', 3), ('hackernews', 2)
+]
+JOB_TYPES = [('full-time', 86), ('contract', 9), ('part-time', 3), ('temporary', 2)]
+# (format, weight, divisor applied to the yearly amounts)
+SALARY_FORMATS = [
+    ('${lo}k - ${hi}k', 30, 1000), ('${lo:,} - ${hi:,}', 25, 1), ('${lo:,} - ${hi:,} a year', 12, 1),
+    ('{lo}k-{hi}k', 8, 1000), ('USD {lo} - {hi}', 6, 1), ('${lo}k+', 4, 1000), ('Up to ${hi}k', 3, 1000),
+    ('Competitive', 7, 1), ('', 5, 1)
+]
+BENEFITS = [
+    'Health insurance', '401(k) matching', 'Equity', 'Unlimited PTO', 'Remote stipend',
+    'Parental leave', 'Learning budget', 'Dental and vision'
+]
+
+INTRO_SENTENCES = [
+    '{company} is hiring a {title} to join a fast-growing team.',
+    'At {company}, we are looking for a {title} who loves solving hard problems.',
+    'Join {company} as a {title} and help shape the future of {industry}.',
+    '{company} is a {industry} company on a mission to make work better for everyone.',
+]
+BODY_SENTENCES = [
+    'You will design, build and operate services used by millions of people.',
+    'We value ownership, clear writing and pragmatic engineering.',
+    'You will collaborate closely with product, design and data teams.',
+    'Our stack includes {skill} and {skill2}, running in production at scale.',
+    'You will own features end to end, from design docs to on-call.',
+    'Experience with {skill} is a strong plus.',
+    'You will mentor teammates and raise the bar for code quality.',
+    'We ship small changes often and measure everything.',
+    'You care about reliability, performance and the people who use our product.',
+    'The team works across time zones with a strong written culture.',
+    'You will help define the technical roadmap for the {family} organization.',
+    'Hands-on experience with {skill} in a production environment is preferred.',
+    'We offer competitive compensation, equity and generous benefits.',
+    'You will improve observability, testing and deployment tooling.',
+    'Strong communication skills and a bias for action are essential.',
+]
+
+
+def _cumulative(weights: Iterable[float]) -> List[float]:
+    return list(accumulate(weights))
+
+
+def company_name(rank: int) -> str:
+    """Company at popularity ``rank``; stable across seeds"""
+    if rank < len(HEAD_COMPANIES):
+        return HEAD_COMPANIES[rank]
+    rest, prefix = divmod(rank - len(HEAD_COMPANIES), len(COMPANY_PREFIXES))
+    rest, root = divmod(rest, len(COMPANY_ROOTS))
+    kind = rest % len(COMPANY_KINDS)
+    name = f"{COMPANY_PREFIXES[prefix]}{COMPANY_ROOTS[root]} {COMPANY_KINDS[kind]}"
+    # Past the name space, keep names unique with a numeric suffix
+    generation = rest // len(COMPANY_KINDS)
+    return f"{name} {generation + 1}" if generation else name
+
+
+def job_fingerprint(title: str, company: str, location: str) -> str:
+    """Same fingerprint JobScraper.generate_fingerprint computes for storage dedup"""
+    return hashlib.md5(f"{title.lower()}{company.lower()}{location.lower()}".encode()).hexdigest()
+
+
+class CorpusGenerator:
+    """Seeded, streaming generator of job dicts with injected near-duplicates"""
+
+    def __init__(self, rows: int, seed: int = DEFAULT_SEED, duplicate_rate: float = 0.05,
+                 num_companies: int = 20_000, company_skew: float = 1.1, epoch: datetime = EPOCH):
+        if rows < 0:
+            raise ValueError("rows must be non-negative")
+        if not 0 <= duplicate_rate < 1:
+            raise ValueError("duplicate_rate must be in [0, 1)")
+        self.rows = rows
+        self.seed = seed
+        self.duplicate_rate = duplicate_rate
+        self.num_companies = max(1, num_companies)
+        self.epoch = epoch
+
+        self._families = list(TITLE_FAMILIES.items())
+        self._family_weights = _cumulative(spec[0] for _, spec in self._families)
+        self._seniority_weights = _cumulative(level[1] for level in SENIORITY)
+        self._location_weights = _cumulative(location[1] for location in LOCATIONS)
+        self._company_weights = _cumulative(1 / (rank + 1) ** company_skew for rank in range(self.num_companies))
+        self._companies: Dict[int, str] = {}
+        self._source_names = [name for name, _ in SOURCES]
+        self._source_weights = _cumulative(weight for _, weight in SOURCES)
+        self._job_type_names = [name for name, _ in JOB_TYPES]
+        self._job_type_weights = _cumulative(weight for _, weight in JOB_TYPES)
+        self._salary_format_weights = _cumulative(entry[1] for entry in SALARY_FORMATS)
+        # Skill popularity falls off with list position
+        self._skill_weights = {
+            family: _cumulative(1 / (i + 1) ** 0.8 for i in range(len(spec[3])))
+            for family, spec in TITLE_FAMILIES.items()
+        }
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_jobs()
+
+    def job_id(self, index: int) -> str:
+        return f"syn-{self.seed}-{index:09d}"
+
+    def iter_jobs(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield rows ``start..stop``; any shard yields the same rows as a full pass"""
+        stop = self.rows if stop is None else min(stop, self.rows)
+        for chunk in range(start // CHUNK_ROWS, (stop + CHUNK_ROWS - 1) // CHUNK_ROWS):
+            first = chunk * CHUNK_ROWS
+            for index, job in enumerate(self._generate_chunk(chunk), first):
+                if index >= stop:
+                    return
+                if index >= start:
+                    yield job
+
+    def iter_batches(self, batch_size: int = DEFAULT_BATCH_SIZE, start: int = 0,
+                     stop: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        return batched(self.iter_jobs(start, stop), batch_size)
+
+    def _generate_chunk(self, chunk: int) -> Iterator[Dict[str, Any]]:
+        # Each chunk has its own RNG stream so shards are reproducible on their own
+        rng = random.Random(f"{self.seed}:{chunk}")
+        recent: List[Dict[str, Any]] = []
+        first = chunk * CHUNK_ROWS
+        for index in range(first, min(first + CHUNK_ROWS, self.rows)):
+            if recent and rng.random() < self.duplicate_rate:
+                job = self._near_duplicate(rng, index, recent[rng.randrange(len(recent))])
+            else:
+                job = self._job(rng, index)
+                if len(recent) < 1000:
+                    recent.append(job)
+                else:
+                    recent[rng.randrange(1000)] = job
+            yield job
+
+    def _company(self, rank: int) -> str:
+        name = self._companies.get(rank)
+        if name is None:
+            name = self._companies[rank] = company_name(rank)
+        return name
+
+    def _job(self, rng: random.Random, index: int) -> Dict[str, Any]:
+        family, (_, base_salary, titles, skills) = rng.choices(self._families, cum_weights=self._family_weights)[0]
+        prefix, _, multiplier, level, years = rng.choices(SENIORITY, cum_weights=self._seniority_weights)[0]
+        location, _, cost, _ = rng.choices(LOCATIONS, cum_weights=self._location_weights)[0]
+        rank = rng.choices(range(self.num_companies), cum_weights=self._company_weights)[0]
+        company = self._company(rank)
+        industry = INDUSTRIES[(rank * 7) % len(INDUSTRIES)]
+
+        role = titles[int(rng.random() ** 1.5 * len(titles))]
+        title = f"{prefix} {role}" if prefix else role
+        job_type = 'internship' if prefix == 'Intern' else \
+            rng.choices(self._job_type_names, cum_weights=self._job_type_weights)[0]
+
+        picked = set()
+        wanted = min(rng.randint(3, 9), len(skills))
+        while len(picked) < wanted:
+            picked.update(rng.choices(skills, cum_weights=self._skill_weights[family], k=wanted - len(picked)))
+        job_skills = sorted(picked)
+        if rng.random() < 0.4:
+            job_skills.append(rng.choice(GENERAL_SKILLS))
+
+        salary_min = salary_max = None
+        salary_text = ''
+        if rng.random() < 0.82:
+            salary = base_salary * multiplier * cost * rng.lognormvariate(0, 0.12)
+            salary_min = int(salary / 5000) * 5000
+            salary_max = int(salary_min * rng.uniform(1.1, 1.45) / 5000) * 5000
+            if job_type == 'contract' and rng.random() < 0.6:
+                salary_text = f"${salary_min // 2080} - ${salary_max // 2080} an hour"
+            else:
+                fmt, _, divisor = rng.choices(SALARY_FORMATS, cum_weights=self._salary_format_weights)[0]
+                salary_text = fmt.format(lo=salary_min // divisor, hi=salary_max // divisor)
+
+        remote = location == 'Remote' or rng.random() < 0.15
+        source = rng.choices(self._source_names, cum_weights=self._source_weights)[0]
+        job_id = self.job_id(index)
+
+        return {
+            'id': job_id,
+            'title': title,
+            'company': company,
+            'location': location,
+            'remote_friendly': remote,
+            'salary_min': salary_min,
+            'salary_max': salary_max,
+            'salary_text': salary_text,
+            'skills': job_skills,
+            'description': self._description(rng, company, title, family, industry, job_skills, years),
+            'experience_level': level,
+            'job_type': job_type,
+            'industry': industry,
+            'company_size': 'enterprise' if rank < 100 else 'large' if rank < 1000 else
+                            'medium' if rank < 5000 else 'startup',
+            'benefits': rng.sample(BENEFITS, rng.randint(0, 4)),
+            'source': source,
+            'url': f"https://jobs.example.com/{source}/{job_id}",
+            'posted_date': (self.epoch - timedelta(minutes=rng.randrange(60 * 24 * 60))).isoformat(),
+            'duplicate_of': None,
+        }
+
+    def _description(self, rng: random.Random, company: str, title: str, family: str, industry: str,
+                     skills: List[str], years) -> str:
+        # Log-normal sentence count: median ~10 sentences with a long tail
+        count = min(80, max(3, int(rng.lognormvariate(2.3, 0.55))))
+        values = {'company': company, 'title': title, 'industry': industry, 'family': family}
+        sentences = [rng.choice(INTRO_SENTENCES).format(**values)]
+        if years[1]:
+            sentences.append(f"Requirements: {rng.randint(*years) or 1}+ years of experience with "
+                             f"{', '.join(skills[:4])}.")
+        for _ in range(count - len(sentences)):
+            sentence = rng.choice(BODY_SENTENCES)
+            if '{' in sentence:
+                sentence = sentence.format(skill=rng.choice(skills), skill2=rng.choice(skills), **values)
+            sentences.append(sentence)
+        return ' '.join(sentences)
+
+    def _near_duplicate(self, rng: random.Random, index: int, original: Dict[str, Any]) -> Dict[str, Any]:
+        """The same opening re-posted elsewhere with cosmetic differences"""
+        job = dict(original)
+        job_id = self.job_id(index)
+        job['id'] = job_id
+        job['duplicate_of'] = original['id']
+        job['source'] = rng.choice([name for name in self._source_names if name != original['source']])
+        job['url'] = f"https://jobs.example.com/{job['source']}/{job_id}"
+        posted = datetime.fromisoformat(original['posted_date']) + timedelta(hours=rng.randint(1, 96))
+        job['posted_date'] = posted.isoformat()
+
+        for mutate in rng.sample(NEAR_DUPLICATE_MUTATIONS, rng.randint(1, 2)):
+            mutate(rng, job)
+        return job
+
+
+def _mutate_title(rng: random.Random, job: Dict[str, Any]) -> None:
+    title = job['title']
+    variants = [
+        title.replace('Senior ', 'Sr. ').replace('Junior ', 'Jr. '),
+        title.upper(),
+        f"{title} (Remote)" if job['remote_friendly'] else f"{title} - {job['location'].split(',')[0]}",
+        f" {title}  ",
+    ]
+    job['title'] = rng.choice(variants)
+
+
+def _mutate_location(rng: random.Random, job: Dict[str, Any]) -> None:
+    city, _, state = job['location'].partition(', ')
+    if not state:
+        job['location'] = rng.choice(['Remote - US', 'Anywhere', 'Remote (US)'])
+        return
+    long_state = next(entry[3] for entry in LOCATIONS if entry[0] == job['location'])
+    job['location'] = rng.choice([city, f"{city}, {long_state}", f"{city}, {state}, USA"])
+
+
+def _mutate_company(rng: random.Random, job: Dict[str, Any]) -> None:
+    job['company'] = rng.choice([f"{job['company']}, Inc.", f"{job['company']} Inc", job['company'].upper()])
+
+
+def _mutate_description(rng: random.Random, job: Dict[str, Any]) -> None:
+    sentences = job['description'].split('. ')
+    if len(sentences) > 3 and rng.random() < 0.5:
+        del sentences[rng.randrange(1, len(sentences))]
+        job['description'] = '. '.join(sentences)
+    else:
+        job['description'] += f" Apply on {job['source'].replace('_', ' ').title()}."
+
+
+def _mutate_salary(rng: random.Random, job: Dict[str, Any]) -> None:
+    if job['salary_min']:
+        job['salary_text'] = f"${job['salary_min']:,} - ${job['salary_max']:,}"
+    else:
+        job['salary_text'] = 'Competitive'
+
+
+NEAR_DUPLICATE_MUTATIONS = [_mutate_title, _mutate_location, _mutate_company, _mutate_description, _mutate_salary]
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+# Adapters to the storage backends' own record types
+
+def to_clone_row(job: Dict[str, Any]) -> tuple:
+    """Row for the ``jobs`` table of jobright_clone_backend.JobDatabase"""
+    return (
+        job['id'], job['title'], job['company'], job['location'], job['salary_text'] or None,
+        job['description'], job['url'], job['url'], job['posted_date'], job['job_type'],
+        job['experience_level'], job['source'], job['posted_date'], 'not_applied', 0.0,
+        json.dumps(job['skills']), *geo_columns(job['location']), *salary_columns(job['salary_text'] or None)
+    )
+
+
+def to_crawler_posting(job: Dict[str, Any]):
+    """clickhouse_web_crawler.JobPosting with the crawler's dedup fingerprint"""
+    from clickhouse_web_crawler import JobPosting
+
+    posted = datetime.fromisoformat(job['posted_date'])
+    return JobPosting(
+        id=job['id'], title=job['title'], company=job['company'], location=job['location'],
+        salary_min=job['salary_min'], salary_max=job['salary_max'], job_type=job['job_type'],
+        experience_level=job['experience_level'], skills=job['skills'], description=job['description'],
+        posted_date=posted, expires_date=posted + timedelta(days=30), application_url=job['url'],
+        source=job['source'], source_job_id=job['id'], remote_friendly=job['remote_friendly'],
+        benefits=job['benefits'], company_size=job['company_size'], industry=job['industry'],
+        match_score=0.0, ai_summary='', created_at=posted, updated_at=posted,
+        fingerprint=job_fingerprint(job['title'], job['company'], job['location'])
+    )
+
+
+def to_automation_posting(job: Dict[str, Any]):
+    """comprehensive_job_automation_system.JobPosting"""
+    from comprehensive_job_automation_system import JobPosting
+
+    posted = datetime.fromisoformat(job['posted_date'])
+    return JobPosting(
+        id=job['id'], title=job['title'], company=job['company'], location=job['location'],
+        salary_min=job['salary_min'], salary_max=job['salary_max'], job_type=job['job_type'],
+        experience_level=job['experience_level'], skills=job['skills'], description=job['description'],
+        posted_date=posted, expires_date=posted + timedelta(days=30), application_url=job['url'],
+        source=job['source'], remote_friendly=job['remote_friendly'], benefits=job['benefits'],
+        company_size=job['company_size'], industry=job['industry'], match_score=0.0
+    )
+
+
+# Sinks: each takes an iterable of job dicts and returns the number of rows written
+
+def write_jsonl(jobs: Iterable[Dict[str, Any]], path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    written = 0
+    with open(path, 'w', encoding='utf-8') as handle:
+        for batch in batched(jobs, batch_size):
+            handle.write(''.join(json.dumps(job) + '\n' for job in batch))
+            written += len(batch)
+    return written
+
+
+def write_sqlite(jobs: Iterable[Dict[str, Any]], path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Bulk load into the JobDatabase schema used by the web backends"""
+    from jobright_clone_backend import INSERT_JOB_SQL, JobDatabase
+
+    JobDatabase(path)
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        written = 0
+        for batch in batched(jobs, batch_size):
+            with conn:
+                conn.executemany(INSERT_JOB_SQL, map(to_clone_row, batch))
+            written += len(batch)
+        return written
+    finally:
+        conn.close()
+
+
+def write_storage(jobs: Iterable[Dict[str, Any]], storage, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Feed a ClickHouse job store (or its SQLite fallback) through its own insert path"""
+    if hasattr(storage, 'insert_jobs'):
+        insert, convert = storage.insert_jobs, to_crawler_posting
+    elif hasattr(storage, 'save_jobs'):
+        insert, convert = storage.save_jobs, to_automation_posting
+    else:
+        raise TypeError(f"{type(storage).__name__} has no insert_jobs/save_jobs method")
+
+    written = 0
+    for batch in batched(jobs, batch_size):
+        insert([convert(job) for job in batch])
+        written += len(batch)
+    return written
+
+
+PARQUET_COLUMNS = [
+    ('id', 'string'), ('title', 'string'), ('company', 'string'), ('location', 'string'),
+    ('remote_friendly', 'bool'), ('salary_min', 'int64'), ('salary_max', 'int64'),
+    ('salary_text', 'string'), ('skills', 'list<string>'), ('description', 'string'),
+    ('experience_level', 'string'), ('job_type', 'string'), ('industry', 'string'),
+    ('company_size', 'string'), ('benefits', 'list<string>'), ('source', 'string'), ('url', 'string'),
+    ('posted_date', 'string'), ('duplicate_of', 'string'),
+]
+
+
+def write_parquet(jobs: Iterable[Dict[str, Any]], path: str, batch_size: int = 50_000) -> int:
+    """One row group per batch; requires pyarrow"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)")
+
+    types = {'string': pa.string(), 'bool': pa.bool_(), 'int64': pa.int64(), 'list<string>': pa.list_(pa.string())}
+    schema = pa.schema([(name, types[kind]) for name, kind in PARQUET_COLUMNS])
+    written = 0
+    with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+        for batch in batched(jobs, batch_size):
+            columns = {name: [job[name] for job in batch] for name, _ in PARQUET_COLUMNS}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            written += len(batch)
+    return written
+
+
+def _clickhouse_store(kind: str, args):
+    if kind == 'crawler':
+        from clickhouse_web_crawler import ClickHouseJobStorage
+        return ClickHouseJobStorage(host=args.clickhouse_host, port=args.clickhouse_port)
+    from comprehensive_job_automation_system import ClickHouseJobStorage
+    return ClickHouseJobStorage()
+
+
+def _progress(jobs: Iterable[Dict[str, Any]], total: int, log: Callable[[str], None],
+              every: int = 100_000) -> Iterator[Dict[str, Any]]:
+    started = time.perf_counter()
+    for count, job in enumerate(jobs, 1):
+        yield job
+        if count % every == 0 or count == total:
+            elapsed = time.perf_counter() - started
+            log(f"  {count:,}/{total:,} rows ({count / elapsed:,.0f} rows/s)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Generate a deterministic synthetic job corpus')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--duplicate-rate', type=float, default=0.05, help='Share of injected near-duplicates')
+    parser.add_argument('--companies', type=int, default=20_000, help='Number of distinct companies')
+    parser.add_argument('--start', type=int, default=0, help='First row (for sharded generation)')
+    parser.add_argument('--stop', type=int, help='Row after the last one (for sharded generation)')
+    parser.add_argument('--format', choices=['jsonl', 'sqlite', 'parquet', 'crawler', 'automation'],
+                        default='jsonl', help='crawler/automation write through the ClickHouse job stores')
+    parser.add_argument('--output', help='Output path for jsonl/sqlite/parquet')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--clickhouse-host', default='localhost')
+    parser.add_argument('--clickhouse-port', type=int, default=8123)
+    args = parser.parse_args(argv)
+
+    if args.format in ('jsonl', 'sqlite', 'parquet') and not args.output:
+        parser.error(f"--output is required for {args.format}")
+
+    generator = CorpusGenerator(args.rows, seed=args.seed, duplicate_rate=args.duplicate_rate,
+                                num_companies=args.companies)
+    stop = args.rows if args.stop is None else min(args.stop, args.rows)
+    total = max(0, stop - args.start)
+    jobs = _progress(generator.iter_jobs(args.start, stop), total, print)
+
+    print(f"🏭 Generating {total:,} jobs (seed {args.seed}) -> {args.format}")
+    started = time.perf_counter()
+    try:
+        if args.format == 'jsonl':
+            written = write_jsonl(jobs, args.output, args.batch_size)
+        elif args.format == 'sqlite':
+            written = write_sqlite(jobs, args.output, args.batch_size)
+        elif args.format == 'parquet':
+            written = write_parquet(jobs, args.output, args.batch_size)
+        else:
+            written = write_storage(jobs, _clickhouse_store(args.format, args), args.batch_size)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"✅ Wrote {written:,} jobs in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
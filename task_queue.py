@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+Durable SQLite-backed task queue for long-running background work
+- Tasks are persisted so status survives web-server restarts
+- Worker processes lease tasks atomically and report progress
+- Failed tasks are retried with exponential backoff
+- Queued or running tasks can be cancelled cooperatively
+- Workers append live events (e.g. scrape stats) for web processes to relay
+"""
+
+import argparse
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from tracing import TASK_CONTEXT_KEY, inject_task_context, start_span, use_context
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.getenv('TASK_QUEUE_DB_PATH', 'task_queue.db')
+
+# Task states
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+TERMINAL_STATES = (COMPLETED, FAILED, CANCELLED)
+
+# Events kept for relaying; the bridge polls every second, so older ones are never read
+MAX_EVENTS = 1000
+
+
+class TaskCancelled(Exception):
+    """Raised inside a handler when cancellation of its task was requested"""
+
+
+class TaskQueue:
+    """Persistent task queue shared by web processes and worker processes"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, lease_seconds: int = 300,
+                 retry_base_delay: float = 5.0, retry_max_delay: float = 600.0):
+        # Connections are opened per call, so pin the file against later chdirs
+        self.db_path = os.path.abspath(db_path)
+        self.lease_seconds = lease_seconds
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def init_database(self):
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                handler TEXT NOT NULL,
+                payload TEXT,
+                status TEXT NOT NULL DEFAULT 'queued',
+                progress REAL DEFAULT 0,
+                details TEXT,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER DEFAULT 0,
+                max_attempts INTEGER DEFAULT 3,
+                cancel_requested INTEGER DEFAULT 0,
+                worker_id TEXT,
+                next_run_at REAL NOT NULL,
+                lease_expires_at REAL,
+                created_at TEXT,
+                started_at TEXT,
+                updated_at TEXT,
+                completed_at TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tasks_status_next_run
+            ON tasks (status, next_run_at)
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_updated_at ON tasks (updated_at)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                topic TEXT NOT NULL,
+                data TEXT,
+                created_at REAL NOT NULL
+            )
+        """)
+        conn.close()
+
+    def enqueue(self, handler: str, payload: Dict = None, max_attempts: int = 3,
+                task_id: str = None, delay: float = 0) -> str:
+        """Persist a new task and return its id.
+
+        ``handler`` is an import path of the form ``module:function``; the
+        function is called as ``function(payload, ctx)`` inside a worker.
+        """
+        task_id = task_id or uuid.uuid4().hex
+        now = datetime.now().isoformat()
+        payload = inject_task_context(payload)
+
+        conn = self._connect()
+        conn.execute("""
+            INSERT INTO tasks (id, handler, payload, status, max_attempts,
+                               next_run_at, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            task_id, handler, json.dumps(payload or {}), QUEUED, max_attempts,
+            time.time() + delay, now, now
+        ))
+        conn.close()
+
+        logger.info(f"📥 Queued task {task_id} ({handler})")
+        return task_id
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Lease the next runnable task for ``worker_id``.
+
+        Running tasks whose lease expired (their worker died) are put back in
+        the queue first so a crash never strands work.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("""
+                UPDATE tasks
+                SET status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END,
+                    completed_at = CASE WHEN attempts >= max_attempts THEN ? ELSE completed_at END,
+                    error = 'Worker lease expired', worker_id = NULL, lease_expires_at = NULL,
+                    updated_at = ?
+                WHERE status = ? AND lease_expires_at < ?
+            """, (FAILED, QUEUED, datetime.now().isoformat(), datetime.now().isoformat(), RUNNING, now))
+
+            row = conn.execute("""
+                SELECT * FROM tasks
+                WHERE status = ? AND next_run_at <= ?
+                ORDER BY next_run_at, created_at
+                LIMIT 1
+            """, (QUEUED, now)).fetchone()
+
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            if row['cancel_requested']:
+                conn.execute("""
+                    UPDATE tasks SET status = ?, completed_at = ?, updated_at = ?
+                    WHERE id = ?
+                """, (CANCELLED, datetime.now().isoformat(), datetime.now().isoformat(), row['id']))
+                conn.execute("COMMIT")
+                return None
+
+            started_at = row['started_at'] or datetime.now().isoformat()
+            conn.execute("""
+                UPDATE tasks
+                SET status = ?, worker_id = ?, attempts = attempts + 1,
+                    lease_expires_at = ?, started_at = ?, updated_at = ?
+                WHERE id = ?
+            """, (
+                RUNNING, worker_id, now + self.lease_seconds, started_at,
+                datetime.now().isoformat(), row['id']
+            ))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        task = self._row_to_dict(row)
+        task['status'] = RUNNING
+        task['attempts'] += 1
+        task['worker_id'] = worker_id
+        return task
+
+    def update_progress(self, task_id: str, progress: float, **details) -> bool:
+        """Record progress (0-100) and renew the lease.
+
+        Returns True when cancellation of the task has been requested.
+        """
+        conn = self._connect()
+        conn.execute("""
+            UPDATE tasks SET progress = ?, details = ?, lease_expires_at = ?, updated_at = ?
+            WHERE id = ? AND status = ?
+        """, (
+            progress, json.dumps(details, default=str), time.time() + self.lease_seconds,
+            datetime.now().isoformat(), task_id, RUNNING
+        ))
+        row = conn.execute("SELECT cancel_requested FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        conn.close()
+        return bool(row and row['cancel_requested'])
+
+    def complete(self, task_id: str, result: Any = None):
+        now = datetime.now().isoformat()
+        conn = self._connect()
+        conn.execute("""
+            UPDATE tasks
+            SET status = ?, progress = 100, result = ?, error = NULL,
+                lease_expires_at = NULL, completed_at = ?, updated_at = ?
+            WHERE id = ?
+        """, (COMPLETED, json.dumps(result, default=str), now, now, task_id))
+        conn.close()
+        logger.info(f"✅ Task {task_id} completed")
+
+    def fail(self, task_id: str, error: str):
+        """Record a failed attempt, rescheduling with backoff while attempts remain"""
+        now = datetime.now().isoformat()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT attempts, max_attempts, cancel_requested FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        if row is None:
+            conn.close()
+            return
+
+        if row['attempts'] < row['max_attempts'] and not row['cancel_requested']:
+            delay = min(self.retry_base_delay * (2 ** (row['attempts'] - 1)), self.retry_max_delay)
+            conn.execute("""
+                UPDATE tasks
+                SET status = ?, error = ?, worker_id = NULL, lease_expires_at = NULL,
+                    next_run_at = ?, updated_at = ?
+                WHERE id = ?
+            """, (QUEUED, error, time.time() + delay, now, task_id))
+            logger.warning(f"🔁 Task {task_id} failed (attempt {row['attempts']}), retrying in {delay:.0f}s")
+        else:
+            conn.execute("""
+                UPDATE tasks
+                SET status = ?, error = ?, lease_expires_at = NULL, completed_at = ?, updated_at = ?
+                WHERE id = ?
+            """, (FAILED, error, now, now, task_id))
+            logger.error(f"❌ Task {task_id} failed permanently: {error}")
+        conn.close()
+
+    def mark_cancelled(self, task_id: str):
+        now = datetime.now().isoformat()
+        conn = self._connect()
+        conn.execute("""
+            UPDATE tasks SET status = ?, lease_expires_at = NULL, completed_at = ?, updated_at = ?
+            WHERE id = ?
+        """, (CANCELLED, now, now, task_id))
+        conn.close()
+        logger.info(f"🛑 Task {task_id} cancelled")
+
+    def cancel(self, task_id: str) -> bool:
+        """Request cancellation; queued tasks are cancelled immediately.
+
+        Running tasks stop at their next progress update. Returns False if the
+        task does not exist or has already finished.
+        """
+        now = datetime.now().isoformat()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT status FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None or row['status'] in TERMINAL_STATES:
+                conn.execute("COMMIT")
+                return False
+
+            if row['status'] == QUEUED:
+                conn.execute("""
+                    UPDATE tasks SET status = ?, cancel_requested = 1, completed_at = ?, updated_at = ?
+                    WHERE id = ?
+                """, (CANCELLED, now, now, task_id))
+            else:
+                conn.execute("""
+                    UPDATE tasks SET cancel_requested = 1, updated_at = ? WHERE id = ?
+                """, (now, task_id))
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def get_status(self, task_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        conn.close()
+        if row is None:
+            return None
+
+        task = self._row_to_dict(row)
+        task.pop('payload', None)
+        return task
+
+    def list_tasks(self, status: str = None, limit: int = 50) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        if status:
+            rows = conn.execute(
+                "SELECT * FROM tasks WHERE status = ? ORDER BY created_at DESC LIMIT ?", (status, limit)
+            ).fetchall()
+        else:
+            rows = conn.execute("SELECT * FROM tasks ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        conn.close()
+        return [self._row_to_dict(row) for row in rows]
+
+    def changed_since(self, updated_at: str = None, limit: int = 200) -> List[Dict[str, Any]]:
+        """Tasks updated after ``updated_at`` (all tasks without a cursor) in update order"""
+        conn = self._connect()
+        rows = conn.execute("""
+            SELECT * FROM tasks WHERE updated_at > ? ORDER BY updated_at LIMIT ?
+        """, (updated_at or '', limit)).fetchall()
+        conn.close()
+
+        tasks = []
+        for row in rows:
+            task = self._row_to_dict(row)
+            task.pop('payload', None)
+            tasks.append(task)
+        return tasks
+
+    def last_updated_at(self) -> Optional[str]:
+        conn = self._connect()
+        row = conn.execute("SELECT MAX(updated_at) FROM tasks").fetchone()
+        conn.close()
+        return row[0]
+
+    def publish_event(self, topic: str, data: Dict[str, Any]):
+        """Append an event for TaskQueueBridge to relay to SSE clients of the web process"""
+        conn = self._connect()
+        cursor = conn.execute("INSERT INTO events (topic, data, created_at) VALUES (?, ?, ?)",
+                              (topic, json.dumps(data, default=str), time.time()))
+        conn.execute("DELETE FROM events WHERE id <= ?", (cursor.lastrowid - MAX_EVENTS,))
+        conn.close()
+
+    def events_since(self, event_id: int = 0, limit: int = 200) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        rows = conn.execute("SELECT * FROM events WHERE id > ? ORDER BY id LIMIT ?", (event_id, limit)).fetchall()
+        conn.close()
+        return [{'id': row['id'], 'topic': row['topic'], 'data': json.loads(row['data'])} for row in rows]
+
+    def last_event_id(self) -> int:
+        conn = self._connect()
+        row = conn.execute("SELECT MAX(id) FROM events").fetchone()
+        conn.close()
+        return row[0] or 0
+
+    def queue_depth(self) -> Dict[str, int]:
+        conn = self._connect()
+        rows = conn.execute("SELECT status, COUNT(*) AS count FROM tasks GROUP BY status").fetchall()
+        conn.close()
+        return {row['status']: row['count'] for row in rows}
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        task = dict(row)
+        for field in ('payload', 'details', 'result'):
+            if task.get(field):
+                task[field] = json.loads(task[field])
+        task['cancel_requested'] = bool(task['cancel_requested'])
+        return task
+
+
+class TaskContext:
+    """Handle given to task handlers for progress reporting and cancellation checks"""
+
+    def __init__(self, queue: TaskQueue, task: Dict[str, Any]):
+        self.queue = queue
+        self.task_id = task['id']
+        self.attempt = task['attempts']
+        self.cancel_requested = task.get('cancel_requested', False)
+
+    def progress(self, percent: float, **details):
+        """Report progress; raises TaskCancelled if the task should stop"""
+        self.cancel_requested = self.queue.update_progress(self.task_id, percent, **details)
+        self.check_cancelled()
+
+    def check_cancelled(self):
+        if self.cancel_requested:
+            raise TaskCancelled(self.task_id)
+
+
+def resolve_handler(path: str) -> Callable[[Dict, TaskContext], Any]:
+    module_name, _, func_name = path.partition(':')
+    module = importlib.import_module(module_name)
+    return getattr(module, func_name)
+
+
+class TaskWorker:
+    """Polls the queue and executes one task at a time"""
+
+    def __init__(self, queue: TaskQueue, worker_id: str = None, poll_interval: float = 1.0):
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.poll_interval = poll_interval
+        self.running = False
+
+    def run_once(self) -> bool:
+        """Run a single task if one is available; returns True if one ran"""
+        task = self.queue.claim(self.worker_id)
+        if task is None:
+            return False
+
+        ctx = TaskContext(self.queue, task)
+        logger.info(f"⚙️ Worker {self.worker_id} running task {task['id']} ({task['handler']})")
+
+        # Continue the trace of the request that enqueued the task
+        carrier = task['payload'].pop(TASK_CONTEXT_KEY, None) if isinstance(task['payload'], dict) else None
+        attributes = {'task.id': task['id'], 'task.handler': task['handler'], 'task.attempt': task['attempts']}
+        with use_context(carrier), start_span('task.run', attributes, kind='consumer') as span:
+            try:
+                ctx.check_cancelled()
+                handler = resolve_handler(task['handler'])
+                result = handler(task['payload'], ctx)
+                self.queue.complete(task['id'], result)
+            except TaskCancelled:
+                span.add_event('cancelled')
+                self.queue.mark_cancelled(task['id'])
+            except Exception as e:
+                span.record_exception(e)
+                logger.debug(traceback.format_exc())
+                self.queue.fail(task['id'], f"{type(e).__name__}: {e}")
+
+        return True
+
+    def run_forever(self):
+        self.running = True
+        logger.info(f"🚀 Task worker {self.worker_id} started")
+        while self.running:
+            if not self.run_once():
+                time.sleep(self.poll_interval)
+
+    def stop(self):
+        self.running = False
+
+
+_default_queue = None
+_default_lock = threading.Lock()
+
+
+def get_task_queue() -> TaskQueue:
+    """Process-wide queue on DEFAULT_DB_PATH, opened on first use so importing an app creates no files"""
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = TaskQueue()
+        return _default_queue
+
+
+def _worker_main(db_path: str, poll_interval: float):
+    from event_stream import scrape_stats
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    queue = TaskQueue(db_path)
+    # Scrapes run here, so their stats reach web processes through the queue database
+    scrape_stats.persist_to(queue)
+    TaskWorker(queue, poll_interval=poll_interval).run_forever()
+
+
+def start_worker_processes(num_workers: int = 2, db_path: str = DEFAULT_DB_PATH,
+                           poll_interval: float = 1.0) -> List[multiprocessing.Process]:
+    """Start daemon worker processes consuming ``db_path``"""
+    processes = []
+    for _ in range(num_workers):
+        process = multiprocessing.Process(target=_worker_main, args=(db_path, poll_interval), daemon=True)
+        process.start()
+        processes.append(process)
+
+    logger.info(f"🧵 Started {num_workers} task worker processes on {db_path}")
+    return processes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Background task queue worker")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help="Task queue database path")
+    parser.add_argument('--workers', type=int, default=2, help="Number of worker processes")
+    parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds between polls when idle")
+    args = parser.parse_args()
+
+    processes = start_worker_processes(args.workers, args.db, args.poll_interval)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Smoke tests for the offline micro-benchmark suite and its regression gate
+"""
+import json
+import os
+
+import pytest
+
+import benchmark_suite
+from benchmark_suite import BenchmarkData, compare_results, main, run_suite
+
+
+@pytest.fixture(autouse=True)
+def cleanup_test_data():
+    """Offline benchmark; no ClickHouse/Redis needed."""
+    yield
+
+
+def results(**timings):
+    return {
+        'version': benchmark_suite.RESULTS_VERSION,
+        'settings': {'size': 100},
+        'benchmarks': {name: {'min': value, 'median': value} for name, value in timings.items()}
+    }
+
+
+def test_dataset_is_deterministic_and_has_duplicates():
+    first = BenchmarkData(size=200, seed=7).jobs
+    second = BenchmarkData(size=200, seed=7).jobs
+
+    assert first == second
+    assert BenchmarkData(size=200, seed=8).jobs != first
+    pairs = [(job['title'], job['company']) for job in first]
+    assert len(set(pairs)) < len(pairs)
+
+
+def test_compare_classifies_changes():
+    comparison = compare_results(
+        results(fast=1.0, slow=1.0, same=1.0, gone=1.0),
+        results(fast=0.5, slow=1.5, same=1.1, added=1.0),
+        threshold=0.2
+    )
+
+    statuses = {row['name']: row['status'] for row in comparison['rows']}
+    assert statuses == {
+        'fast': 'improved', 'slow': 'regressed', 'same': 'unchanged', 'gone': 'missing', 'added': 'new'
+    }
+    assert comparison['regressions'] == ['slow']
+
+
+def test_compare_rejects_mismatched_dataset_sizes():
+    other = results(a=1.0)
+    other['settings']['size'] = 1000
+    with pytest.raises(ValueError):
+        compare_results(results(a=1.0), other)
+
+
+def test_compare_command_exit_code(tmp_path):
+    baseline = tmp_path / 'baseline.json'
+    current = tmp_path / 'current.json'
+    baseline.write_text(json.dumps(results(parse=1.0)))
+
+    current.write_text(json.dumps(results(parse=1.1)))
+    assert main(['compare', str(baseline), str(current)]) == 0
+
+    current.write_text(json.dumps(results(parse=1.5)))
+    assert main(['compare', str(baseline), str(current)]) == 1
+    assert main(['compare', str(baseline), str(current), '--threshold', '0.6']) == 0
+
+
+def test_errored_and_missing_benchmarks_fail_the_gate(tmp_path):
+    baseline = tmp_path / 'baseline.json'
+    current = tmp_path / 'current.json'
+    baseline.write_text(json.dumps(results(parse=1.0, dedup=1.0, html=1.0)))
+
+    errored = results(parse=1.0, dedup=1.0)
+    errored['errors'] = {'html': 'ImportError: No module named bs4'}
+    current.write_text(json.dumps(errored))
+    assert main(['compare', str(baseline), str(current)]) == 1
+
+    # Dropped without an error is just as much a failure
+    current.write_text(json.dumps(results(parse=1.0, dedup=1.0)))
+    assert main(['compare', str(baseline), str(current)]) == 1
+
+    # ...unless the run deliberately selected a subset
+    subset = results(parse=1.0, dedup=1.0)
+    subset['settings']['selected'] = ['parse', 'dedup']
+    comparison = compare_results(json.loads(baseline.read_text()), subset)
+    assert {row['name']: row['status'] for row in comparison['rows']}['html'] == 'not run'
+    assert comparison['failures'] == []
+
+
+def test_run_exits_non_zero_when_a_benchmark_raises(monkeypatch):
+    def broken(data):
+        raise RuntimeError('fixture missing')
+
+    monkeypatch.setitem(benchmark_suite.BENCHMARKS, 'unit.broken',
+                        benchmark_suite.Benchmark('unit.broken', 'unit', broken, lambda data: 1))
+
+    output = run_suite(['unit.broken'], size=10, log=lambda message: None)
+    assert output['errors'] == {'unit.broken': 'RuntimeError: fixture missing'}
+    assert main(['run', '-k', 'unit.broken', '--size', '10']) == 1
+
+
+def test_quick_run_covers_every_group(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    selected = ['salary.crawler_parse_salary', 'dedup.real_jobs', 'json.job_page_rows', 'skills.requirement_analyzer']
+
+    output = run_suite(selected, size=50, round_time=0.001, rounds=2, log=lambda message: None)
+
+    assert sorted(output['benchmarks']) == sorted(selected)
+    for stats in output['benchmarks'].values():
+        assert 0 < stats['min'] <= stats['median']
+        assert stats['items'] > 0
+    # Benchmarks run in a scratch directory; nothing lands in the cwd
+    assert os.listdir(tmp_path) == []
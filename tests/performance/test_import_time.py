@@ -0,0 +1,104 @@
+"""
+Import-time budget for the Flask entry points
+
+Each module is imported in a fresh interpreter with ``python -X importtime``
+so web workers keep booting fast and heavy subsystems stay lazy.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Cumulative import budget per entry point, in milliseconds
+IMPORT_BUDGET_MS = int(os.getenv('IMPORT_TIME_BUDGET_MS', 1500))
+
+ENTRY_POINTS = [
+    'jobright_clone_backend',
+    'enhanced_web_interface',
+    'ultimate_jobright_complete',
+]
+
+# Modules that must only load on first use, never at import
+HEAVY_MODULES = [
+    'selenium',
+    'clickhouse_connect',
+    'bs4',
+    'aiohttp',
+    'robust_job_scraper',
+    'comprehensive_job_automation_system',
+    'clickhouse_web_crawler',
+]
+
+
+@pytest.fixture(autouse=True)
+def cleanup_test_data():
+    """Import checks run in a scratch directory; no ClickHouse/Redis needed."""
+    yield
+
+
+def run_import(module, tmp_path, code=None):
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT), PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code or f'import {module}'],
+        cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120
+    )
+    if result.returncode != 0:
+        if 'ModuleNotFoundError' in result.stderr:
+            pytest.skip(f"{module} dependencies not installed")
+        pytest.fail(result.stderr[-2000:])
+    return result
+
+
+def cumulative_import_ms(importtime_output, module):
+    """Parse the cumulative time of ``module`` from -X importtime output"""
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if name.strip() == module:
+            return int(cumulative_us) / 1000
+    raise AssertionError(f"{module} missing from importtime output")
+
+
+@pytest.mark.parametrize('module', ENTRY_POINTS)
+def test_import_time_within_budget(module, tmp_path):
+    result = run_import(module, tmp_path)
+    elapsed_ms = cumulative_import_ms(result.stderr, module)
+    print(f"{module}: {elapsed_ms:.1f} ms")
+    assert elapsed_ms < IMPORT_BUDGET_MS
+
+
+@pytest.mark.parametrize('module', ENTRY_POINTS)
+def test_heavy_modules_are_lazy(module, tmp_path):
+    code = (
+        f"import sys, threading, {module}\n"
+        f"print('loaded=' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+        f"print('threads=%d' % threading.active_count())"
+    )
+    result = run_import(module, tmp_path, code)
+    output = dict(line.split('=', 1) for line in result.stdout.splitlines() if '=' in line)
+    assert output['loaded'] == ''
+    assert output['threads'] == '1', "no background threads should start at import"
+
+
+def repo_root_files():
+    """Top-level entries of the repo with size and mtime; databases are created there"""
+    return {
+        entry.name: (entry.stat().st_size, entry.stat().st_mtime_ns)
+        for entry in os.scandir(REPO_ROOT) if entry.name != '__pycache__'
+    }
+
+
+@pytest.mark.parametrize('module', ENTRY_POINTS)
+def test_import_from_repo_root_touches_no_files(module):
+    before = repo_root_files()
+    run_import(module, REPO_ROOT)
+    after = repo_root_files()
+
+    assert sorted(set(after) - set(before)) == [], "importing must not create files"
+    assert sorted(name for name in before if after.get(name) != before[name]) == [], \
+        "importing must not modify files"
@@ -0,0 +1,89 @@
+"""
+Payload size and encode time for 1k-job pages
+
+Compares the legacy ``jsonify([asdict(job)])`` path with row tuples encoded
+by json_responses, with and without field projection and compression.
+Run with ``pytest -s`` to see the report.
+"""
+import gzip
+import importlib
+import json
+import time
+from dataclasses import asdict
+
+import pytest
+
+from json_responses import brotli, encode_rows, orjson, row_getter
+
+PAGE_SIZE = 1000
+REPEATS = 5
+
+
+@pytest.fixture(autouse=True)
+def cleanup_test_data():
+    """Offline benchmark; no ClickHouse/Redis needed."""
+    yield
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    # The backend creates its SQLite files in the working directory on import
+    monkeypatch.chdir(tmp_path)
+    pytest.importorskip('flask_cors')
+    return importlib.import_module('jobright_clone_backend')
+
+
+def make_page(Job):
+    description = "We are hiring engineers to build distributed systems with Python and Kubernetes. " * 12
+    return [
+        Job(
+            id=f"job-{i}", title=f"Senior Software Engineer {i % 50}", company=f"Company {i % 200}",
+            location="San Jose, CA", salary="$150,000 - $190,000", description=description,
+            url=f"https://example.com/jobs/{i}", apply_url=f"https://example.com/jobs/{i}/apply",
+            posted_date="2025-09-20T10:00:00", job_type="full-time", experience_level="senior",
+            source="linkedin", scraped_at="2025-09-21T00:00:00", tags=["python", "kubernetes"]
+        )
+        for i in range(PAGE_SIZE)
+    ]
+
+
+def best_time(fn):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000, result
+
+
+def test_job_page_serialization_report(backend):
+    JOB_COLUMNS = backend.JOB_COLUMNS
+    jobs = make_page(backend.Job)
+    rows = [row_getter(JOB_COLUMNS)(job) for job in jobs]
+    projected = ('id', 'title', 'company')
+    projected_rows = [row_getter(projected)(job) for job in jobs]
+
+    legacy_ms, legacy = best_time(lambda: json.dumps([asdict(job) for job in jobs]).encode())
+    fast_ms, fast = best_time(lambda: encode_rows(JOB_COLUMNS, map(row_getter(JOB_COLUMNS), jobs)))
+    rows_ms, _ = best_time(lambda: encode_rows(JOB_COLUMNS, rows))
+    projected_ms, projected_body = best_time(lambda: encode_rows(projected, projected_rows))
+
+    assert json.loads(fast) == json.loads(legacy)
+
+    report = [
+        ("asdict + json.dumps", legacy_ms, len(legacy)),
+        ("row tuples + fast dumps", fast_ms, len(fast)),
+        ("precomputed rows only", rows_ms, len(fast)),
+        ("?fields=id,title,company", projected_ms, len(projected_body)),
+        ("gzip (full page)", None, len(gzip.compress(fast, 6))),
+    ]
+    if brotli is not None:
+        report.append(("brotli (full page)", None, len(brotli.compress(fast, quality=6))))
+
+    print(f"\n{PAGE_SIZE}-job page, encoder: {'orjson' if orjson is not None else 'json'}")
+    for name, ms, size in report:
+        timing = f"{ms:8.2f} ms" if ms is not None else " " * 11
+        print(f"  {name:<28} {timing} {size / 1024:9.1f} KiB")
+
+    assert len(projected_body) < len(fast) / 10
+    assert len(gzip.compress(fast, 6)) < len(fast) / 5
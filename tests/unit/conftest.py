@@ -0,0 +1,10 @@
+"""
+Fixtures for unit tests that run without external services
+"""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cleanup_test_data():
+    """Unit tests only touch temporary files; nothing external to clean up."""
+    yield
@@ -0,0 +1,153 @@
+"""
+Unit tests for the Prometheus application metrics
+"""
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from app_metrics import (Counter, Histogram, Registry, instrument_app, instrument_session, request_duration,
+                         track_task_queue)
+from task_queue import TaskQueue
+import app_metrics
+
+
+def test_counter_renders_labelled_samples():
+    counter = Counter('jobs_total', 'Jobs', ('source',))
+    counter.inc(3, source='remoteok')
+    counter.inc(source='remoteok')
+    counter.inc(2, source='git"hub')
+
+    text = counter.render()
+
+    assert '# TYPE jobs_total counter' in text
+    assert 'jobs_total{source="remoteok"} 4' in text
+    assert 'jobs_total{source="git\\"hub"} 2' in text
+
+
+def test_counter_rejects_negative_increments_and_missing_labels():
+    counter = Counter('jobs_total', 'Jobs', ('source',))
+    with pytest.raises(ValueError):
+        counter.inc(-1, source='remoteok')
+    with pytest.raises(ValueError):
+        counter.inc()
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram('latency_seconds', 'Latency', ('backend',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, backend='sqlite')
+
+    text = histogram.render()
+
+    assert 'latency_seconds_bucket{backend="sqlite",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{backend="sqlite",le="1"} 3' in text
+    assert 'latency_seconds_bucket{backend="sqlite",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{backend="sqlite"} 4' in text
+    assert 'latency_seconds_sum{backend="sqlite"} 3.65' in text
+
+
+def test_registry_runs_collectors_and_rejects_duplicates():
+    registry = Registry()
+    gauge = registry.gauge('depth', 'Depth', ('status',))
+    registry.add_collector(lambda: gauge.set(7, status='queued'))
+
+    assert 'depth{status="queued"} 7' in registry.render()
+    with pytest.raises(ValueError):
+        registry.counter('depth', 'Again')
+
+
+def test_record_dedup_counts_duplicates():
+    before_input = app_metrics.dedup_input.get(stage='unit')
+    before_dupes = app_metrics.dedup_duplicates.get(stage='unit')
+
+    app_metrics.record_dedup('unit', total=10, unique=7)
+
+    assert app_metrics.dedup_input.get(stage='unit') - before_input == 10
+    assert app_metrics.dedup_duplicates.get(stage='unit') - before_dupes == 3
+
+
+def test_task_queue_depth_is_sampled_on_render(tmp_path, monkeypatch):
+    # Collectors registered by imported apps open their queue in the cwd
+    monkeypatch.chdir(tmp_path)
+    queue = TaskQueue(str(tmp_path / "tasks.db"))
+    queue.enqueue('test_task_queue:succeeding_handler', {})
+    queue.enqueue('test_task_queue:succeeding_handler', {})
+    collector = track_task_queue(queue)
+    try:
+        assert 'task_queue_depth{status="queued"} 2' in app_metrics.render_metrics()
+    finally:
+        app_metrics.registry.remove_collector(collector)
+
+
+def test_render_adds_up_other_process_shards(tmp_path):
+    registry = Registry()
+    jobs = registry.counter('jobs_total', 'Jobs', ('source',))
+    latency = registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1.0))
+    depth = registry.gauge('depth', 'Depth')
+    jobs.inc(2, source='remoteok')
+    latency.observe(0.05)
+    depth.set(1)
+
+    # A scraper process's shard, and this process's own (stale) shard which is skipped
+    registry.write_shard(str(tmp_path))
+    (tmp_path / '999999999.json').write_text(json.dumps({
+        'jobs_total': [[['remoteok'], 3], [['github'], 1]],
+        'latency_seconds': [[[], [[0, 1, 1], 2.5]]],
+    }))
+    jobs.inc(source='remoteok')
+
+    text = registry.render(str(tmp_path))
+
+    assert 'jobs_total{source="remoteok"} 6' in text
+    assert 'jobs_total{source="github"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_count 3' in text
+    assert 'latency_seconds_sum 2.55' in text
+    assert 'depth 1' in text
+    # Merging never changes the live values of this process
+    assert jobs.get(source='remoteok') == 3
+    assert sorted(os.listdir(tmp_path)) == [f'{os.getpid()}.json', '999999999.json']
+
+
+def test_instrumented_session_counts_bytes_without_reading_the_body():
+    hooks = {'response': []}
+    instrument_session(SimpleNamespace(hooks=hooks))
+    before = app_metrics.fetch_bytes.get(source='stream.test')
+
+    class StreamedResponse:
+        url = 'https://stream.test/jobs'
+        status_code = 200
+        headers = {'Content-Length': '1234'}
+        elapsed = SimpleNamespace(total_seconds=lambda: 0.2)
+
+        @property
+        def content(self):
+            raise AssertionError('body read by the metrics hook')
+
+    hooks['response'][0](StreamedResponse())
+
+    assert app_metrics.fetch_bytes.get(source='stream.test') - before == 1234
+
+
+def test_instrumented_app_times_routes_by_template(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    app = Flask(__name__)
+
+    @app.route('/api/tasks/<task_id>')
+    def task(task_id):
+        return task_id
+
+    instrument_app(app, 'unit_app')
+    client = app.test_client()
+    client.get('/api/tasks/a')
+    client.get('/api/tasks/b')
+
+    labels = dict(app='unit_app', route='/api/tasks/<task_id>', method='GET', status=200)
+    assert request_duration.count(**labels) == 2
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert 'http_request_duration_seconds_count{app="unit_app",route="/api/tasks/<task_id>"' in response.get_data(as_text=True)
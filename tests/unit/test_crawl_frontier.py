@@ -0,0 +1,173 @@
+"""
+Unit tests for the durable crawl frontier
+"""
+import time
+
+import pytest
+
+from crawl_frontier import DONE, FAILED, LEASED, PENDING, CrawlFrontier
+
+
+@pytest.fixture
+def frontier(tmp_path):
+    return CrawlFrontier(str(tmp_path / "frontier.db"), default_host_delay=0, retry_base_delay=0)
+
+
+def test_add_is_idempotent_and_keeps_history(frontier):
+    assert frontier.add(url='https://a.example/jobs?page=1', priority=1)
+    [entry] = frontier.lease('w1')
+    frontier.complete(entry['key'])
+
+    assert not frontier.add(url='https://a.example/jobs?page=1', priority=5)
+    stored = frontier.get('https://a.example/jobs?page=1')
+    assert stored['status'] == DONE
+    assert stored['priority'] == 5
+    assert stored['fetch_count'] == 1
+
+
+def test_lease_orders_by_priority_one_per_host(frontier):
+    frontier.add_many([
+        {'url': 'https://a.example/low', 'priority': 1},
+        {'url': 'https://a.example/high', 'priority': 9},
+        {'url': 'https://b.example/mid', 'priority': 5},
+    ])
+
+    leased = frontier.lease('w1', limit=3)
+
+    assert [entry['url'] for entry in leased] == ['https://a.example/high', 'https://b.example/mid']
+    # Hosts with an in-flight lease are skipped
+    assert frontier.lease('w2') == []
+    frontier.complete(leased[0]['key'])
+    assert [entry['url'] for entry in frontier.lease('w2')] == ['https://a.example/low']
+
+
+def test_lease_only_requested_kinds(frontier):
+    frontier.add_many([
+        {'key': 'source:remoteok', 'kind': 'source', 'host': 'remoteok.example', 'priority': 9},
+        {'key': 'search:indeed:python:Remote', 'kind': 'search', 'host': 'indeed.example'},
+    ])
+
+    assert [entry['key'] for entry in frontier.lease('w1', limit=2, kinds=['search'])] == \
+        ['search:indeed:python:Remote']
+    assert frontier.lease('w1', kinds=['search']) == []
+    assert frontier.next_eligible_in(kinds=['search']) is None
+    assert frontier.lease('w1', kinds=[]) == []
+    assert frontier.get('source:remoteok')['status'] == PENDING
+
+
+def test_host_delay_spaces_out_fetches(frontier):
+    frontier.set_host_delay('a.example', 0.2)
+    frontier.add_many([{'url': 'https://a.example/1'}, {'url': 'https://a.example/2'}])
+
+    [first] = frontier.lease('w1')
+    frontier.complete(first['key'])
+    assert frontier.lease('w1') == []
+    assert 0 < frontier.next_eligible_in() <= 0.2
+
+    time.sleep(0.25)
+    assert [entry['url'] for entry in frontier.lease('w1')] == ['https://a.example/2']
+
+
+def test_failures_retry_then_fail_permanently(frontier):
+    frontier.add(url='https://a.example/flaky', max_attempts=2)
+
+    [entry] = frontier.lease('w1')
+    frontier.fail(entry['key'], 'HTTP 500')
+    assert frontier.get(entry['key'])['status'] == PENDING
+
+    [entry] = frontier.lease('w1')
+    assert entry['attempts'] == 2
+    frontier.fail(entry['key'], 'HTTP 500')
+    stored = frontier.get(entry['key'])
+    assert (stored['status'], stored['last_error']) == (FAILED, 'HTTP 500')
+
+
+def test_host_backoff_delays_the_whole_host(frontier):
+    frontier.add_many([{'url': 'https://a.example/1'}, {'url': 'https://a.example/2'}])
+    [entry] = frontier.lease('w1')
+    frontier.fail(entry['key'], 'HTTP 429', retry_after=0, host_backoff=60)
+
+    assert frontier.lease('w1') == []
+    assert frontier.next_eligible_in() > 50
+
+
+def test_recurring_entries_resume_after_restart(tmp_path):
+    path = str(tmp_path / "frontier.db")
+    frontier = CrawlFrontier(path, default_host_delay=0)
+    frontier.add_many([
+        {'key': f"search:{platform}", 'host': f"{platform}.example", 'kind': 'search', 'revisit_after': 3600}
+        for platform in ('indeed', 'glassdoor', 'ziprecruiter')
+    ])
+
+    # Crash mid-cycle: one search done, one in flight, one never started
+    [done, in_flight] = frontier.lease('host:scraper', limit=2)
+    frontier.complete(done['key'])
+
+    restarted = CrawlFrontier(path, default_host_delay=0)
+    assert restarted.release_worker('host:scraper') == 1
+    remaining = {entry['key'] for entry in restarted.lease('host:scraper', limit=3)}
+
+    assert remaining == {'search:indeed', 'search:glassdoor', 'search:ziprecruiter'} - {done['key']}
+    assert in_flight['key'] in remaining
+    assert restarted.get(done['key'])['next_eligible_at'] > time.time() + 3500
+
+
+def test_expired_leases_are_reclaimed(tmp_path):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.db"), lease_seconds=0, default_host_delay=0)
+    frontier.add(url='https://a.example/1')
+
+    [entry] = frontier.lease('dead-worker')
+    assert frontier.get(entry['key'])['status'] == LEASED
+    time.sleep(0.01)
+
+    [again] = frontier.lease('w2')
+    assert again['key'] == entry['key']
+    assert again['lease_owner'] == 'w2'
+
+
+def test_expired_last_attempt_of_recurring_entry_waits_for_next_visit(tmp_path):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.db"), lease_seconds=0, default_host_delay=0)
+    frontier.add(key='search:indeed', host='indeed.example', kind='search', max_attempts=1, revisit_after=3600)
+    frontier.add(key='once', url='https://a.example/1', max_attempts=1)
+
+    assert len(frontier.lease('dead-worker', limit=2)) == 2
+    time.sleep(0.01)
+    assert frontier.lease('w2', limit=2) == []
+
+    search = frontier.get('search:indeed')
+    assert search['status'] == PENDING and search['attempts'] == 0
+    assert search['next_eligible_at'] > time.time() + 3500
+    assert frontier.get('once')['status'] == FAILED
+
+
+def test_distributed_crawler_leases_sources(tmp_path, monkeypatch):
+    from clickhouse_web_crawler import DistributedCrawler
+
+    class Storage:
+        def __init__(self):
+            self.batches = []
+
+        def insert_jobs(self, jobs):
+            self.batches.append(jobs)
+            return len(jobs)
+
+    frontier = CrawlFrontier(str(tmp_path / "frontier.db"), default_host_delay=0)
+    crawler = DistributedCrawler(Storage(), max_workers=4, frontier=frontier, worker_id='test')
+    for config in crawler.scraper.job_sources.values():
+        config['rate_limit'] = 0
+
+    def scrape_source(name, max_jobs):
+        if name == 'github':
+            raise ConnectionError('github down')
+        return [name] * 2
+    monkeypatch.setattr(crawler.scraper, 'scrape_source', scrape_source)
+
+    assert crawler.seed_frontier(interval_minutes=60) == 4
+    assert crawler.seed_frontier(interval_minutes=60) == 0
+
+    scraped, inserted = crawler.crawl_once()
+
+    assert (scraped, inserted) == (6, 6)
+    assert frontier.get('source:remoteok')['last_status'] == '2 jobs'
+    assert frontier.get('source:github')['last_error'] == 'github down'
+    assert frontier.get('source:stackoverflow') is None
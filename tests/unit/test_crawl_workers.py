@@ -0,0 +1,103 @@
+"""
+Unit tests for the multi-process crawl worker protocol
+"""
+import socket
+import socketserver
+from datetime import datetime
+
+import pytest
+
+from clickhouse_web_crawler import JobPosting
+from crawl_frontier import DONE, PENDING, CrawlFrontier
+from crawl_workers import (FLAG_ZLIB, HEADER, CrawlCoordinator, CrawlWorker, ProtocolError,
+                           decode_records, encode_records, recv_message, send_message)
+
+
+def posting(i):
+    now = datetime(2025, 3, 1, 12, 0)
+    return JobPosting(
+        id=f"job-{i}", title='Backend Engineer', company='Acme', location='Remote',
+        salary_min=120000, salary_max=None, job_type='Full-time', experience_level='Senior',
+        skills=['Python', 'Go'], description='Build things ' * 50, posted_date=now, expires_date=now,
+        application_url=f"https://acme.example/jobs/{i}", source='remoteok', source_job_id=str(i),
+        remote_friendly=True, benefits=[], company_size='', industry='Technology', match_score=0.0,
+        ai_summary='', created_at=now, updated_at=now, fingerprint=f"fp-{i}",
+    )
+
+
+class Storage:
+    def __init__(self):
+        self.jobs = []
+
+    def insert_jobs(self, jobs):
+        self.jobs.extend(jobs)
+        return len(jobs)
+
+
+def test_frames_round_trip_and_compress_large_bodies():
+    left, right = socket.socketpair()
+    with left, right:
+        send_message(left, {'op': 'stats'})
+        assert recv_message(right) == {'op': 'stats'}
+
+        records = encode_records([posting(i) for i in range(20)])
+        send_message(left, {'records': records})
+        length, flags = HEADER.unpack(right.recv(HEADER.size, socket.MSG_PEEK))
+        assert flags & FLAG_ZLIB
+        assert decode_records(recv_message(right)['records']) == [posting(i) for i in range(20)]
+
+        left.close()
+        assert recv_message(right) is None
+
+
+def test_rejects_oversized_frames():
+    left, right = socket.socketpair()
+    with left, right:
+        left.sendall(HEADER.pack(1 << 30, 0))
+        with pytest.raises(ProtocolError):
+            recv_message(right)
+
+
+def test_workers_lease_and_return_records_over_tcp(tmp_path):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.db"), default_host_delay=0)
+    frontier.add_many([
+        {'key': f"source:{name}", 'kind': 'source', 'host': f"{name}.example",
+         'payload': {'source': name, 'max_jobs': 3}}
+        for name in ('remoteok', 'github', 'indeed')
+    ] + [
+        # Another crawler's entry in the same database
+        {'key': 'search:indeed:python:Remote', 'kind': 'search', 'host': 'www.indeed.example', 'priority': 9},
+    ])
+    storage = Storage()
+    coordinator = CrawlCoordinator(frontier, storage)
+    address = coordinator.serve(('127.0.0.1', 0))
+
+    class Scraper:
+        def scrape_source(self, name, max_jobs):
+            if name == 'github':
+                raise ConnectionError('github down')
+            return [posting(f"{name}-{i}") for i in range(max_jobs)]
+
+    try:
+        workers = [CrawlWorker(address, worker_id=f"w{i}", scraper=Scraper()) for i in range(2)]
+        while any([worker.run_once() for worker in workers]):
+            pass
+        stats = workers[0].client.stats()
+        for worker in workers:
+            worker.client.close()
+    finally:
+        coordinator.shutdown()
+
+    assert sorted(job.id for job in storage.jobs) == sorted(
+        f"job-{name}-{i}" for name in ('remoteok', 'indeed') for i in range(3))
+    assert frontier.get('source:remoteok')['status'] == DONE
+    assert frontier.get('source:indeed')['last_status'] == '3 jobs'
+    github = frontier.get('source:github')
+    assert github['status'] == PENDING
+    assert github['last_error'] == 'ConnectionError: github down'
+    assert stats['coordinator']['inserted'] == 6
+    search = frontier.get('search:indeed:python:Remote')
+    assert search['status'] == PENDING and search['attempts'] == 0
+    # Server options stay on the coordinator's own server class
+    assert not socketserver.ThreadingTCPServer.daemon_threads
+    assert not socketserver.ThreadingTCPServer.allow_reuse_address
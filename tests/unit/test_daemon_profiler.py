@@ -0,0 +1,131 @@
+"""
+Unit tests for the opt-in daemon profiling hooks
+"""
+import json
+import os
+import signal
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+import daemon_profiler
+from daemon_profiler import DaemonProfiler, SamplingProfiler, StageTimers
+
+
+def spin(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+@pytest.fixture
+def worker():
+    stop = threading.Event()
+    thread = threading.Thread(target=spin, args=(stop,), name='crawl-worker', daemon=True)
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    profiler = DaemonProfiler('unit', output_dir=str(tmp_path), interval=0.001, memory_interval=0,
+                              stage_timers=StageTimers())
+    yield profiler
+    profiler.shutdown()
+
+
+def test_sampler_collapses_stacks_per_thread(worker):
+    sampler = SamplingProfiler()
+    for _ in range(5):
+        sampler.sample_once()
+
+    lines = sampler.collapsed().splitlines()
+    worker_lines = [line for line in lines if line.startswith('crawl-worker;')]
+    assert sampler.samples == 5
+    assert worker_lines and all('spin (unit/test_daemon_profiler.py:' in line for line in worker_lines)
+    assert sum(int(line.rsplit(' ', 1)[1]) for line in worker_lines) == 5
+
+
+def test_stage_timers_split_wall_and_cpu():
+    timers = StageTimers()
+    with timers.stage('scrape'):
+        time.sleep(0.05)
+    with pytest.raises(RuntimeError):
+        with timers.stage('scrape'):
+            raise RuntimeError('fetch failed')
+
+    stats = timers.snapshot()['scrape']
+    assert stats['count'] == 2
+    assert stats['wall_total'] >= 0.05
+    # Sleeping is wall time, not CPU time
+    assert stats['cpu_ratio'] < 0.5
+
+
+def test_signals_toggle_sampling_and_dump(profiler, worker, tmp_path):
+    if not hasattr(signal, 'SIGUSR1'):
+        pytest.skip('POSIX signals only')
+    previous = signal.getsignal(signal.SIGUSR1), signal.getsignal(signal.SIGUSR2)
+    try:
+        assert profiler.install_signals()
+        with profiler.timers.stage('feed_automation'):
+            pass
+
+        os.kill(os.getpid(), signal.SIGUSR1)
+        time.sleep(0.1)
+        assert profiler.sampler.running
+        os.kill(os.getpid(), signal.SIGUSR1)
+        assert not profiler.sampler.running
+
+        os.kill(os.getpid(), signal.SIGUSR2)
+    finally:
+        signal.signal(signal.SIGUSR1, previous[0])
+        signal.signal(signal.SIGUSR2, previous[1])
+
+    files = sorted(os.listdir(tmp_path))
+    stacks = [name for name in files if name.endswith('.collapsed')]
+    assert len(stacks) == 1
+    assert 'crawl-worker;' in (tmp_path / stacks[0]).read_text()
+    stages = [name for name in files if name.endswith('.stages.json')]
+    assert 'feed_automation' in json.loads((tmp_path / stages[-1]).read_text())
+    memory = [name for name in files if name.endswith('.memory.txt')]
+    assert (tmp_path / memory[0]).read_text().startswith('# tracemalloc')
+
+
+def test_memory_snapshots_report_growth(profiler):
+    profiler.memory.take()
+    retained = [bytes(512) for _ in range(2000)]
+
+    report = profiler.memory.take()
+
+    assert '## top 25 growth since previous snapshot' in report
+    assert 'test_daemon_profiler.py' in report.split('growth since previous snapshot')[1]
+    assert len(retained) == 2000
+
+
+def test_install_is_opt_in(monkeypatch):
+    monkeypatch.setattr(daemon_profiler, '_profiler', None)
+    monkeypatch.delenv('PROFILING_ENABLED', raising=False)
+
+    assert daemon_profiler.install('unit') is None
+    app = Flask(__name__)
+    daemon_profiler.register_routes(app)
+    assert 'profile_status' not in app.view_functions
+
+
+def test_debug_routes(profiler, worker):
+    app = Flask(__name__)
+    daemon_profiler.register_routes(app, profiler)
+    client = app.test_client()
+
+    assert client.get('/debug/profile').get_json()['sampling'] is False
+    stacks = client.get('/debug/profile/stacks?seconds=0.05').get_data(as_text=True)
+    assert 'crawl-worker;' in stacks
+
+    assert client.post('/debug/profile/start').get_json() == {'started': True}
+    time.sleep(0.05)
+    stopped = client.post('/debug/profile/stop').get_json()
+    assert stopped['stopped'] and stopped['paths']['stacks'].endswith('.collapsed')
+    assert client.get('/debug/profile/memory').get_data(as_text=True).startswith('# tracemalloc')
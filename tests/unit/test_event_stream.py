@@ -0,0 +1,109 @@
+"""
+Unit tests for the in-process event bus and SSE framing
+"""
+from event_stream import EventBus, ScrapeStats, TaskQueueBridge, format_sse, sse_stream
+from task_queue import TaskQueue
+
+
+def test_publish_respects_topics():
+    bus = EventBus()
+    tasks_only = bus.subscribe(['task'])
+    everything = bus.subscribe()
+
+    bus.publish('scrape', {'source': 'remoteok'})
+    bus.publish('task', {'id': 't1'})
+
+    assert tasks_only.get(timeout=0)['data'] == {'id': 't1'}
+    assert tasks_only.get(timeout=0) is None
+    assert [everything.get(timeout=0)['topic'] for _ in range(2)] == ['scrape', 'task']
+
+
+def test_slow_subscriber_drops_oldest():
+    bus = EventBus(max_queue=2)
+    subscription = bus.subscribe()
+    for i in range(5):
+        bus.publish('task', {'n': i})
+
+    assert subscription.dropped == 3
+    assert [subscription.get(timeout=0)['data']['n'] for _ in range(2)] == [3, 4]
+
+
+def test_scrape_stats_publishes_counts_and_throughput():
+    bus = EventBus()
+    stats = ScrapeStats(bus, window_seconds=10)
+    subscription = bus.subscribe(['scrape'])
+
+    stats.record('remoteok', 30)
+    stats.record('github', 20)
+
+    event = [subscription.get(timeout=0) for _ in range(2)][-1]['data']
+    assert event['sources'] == {'remoteok': 30, 'github': 20}
+    assert event['throughput_per_sec'] == 5.0
+
+    stats.record_error('github')
+    event = subscription.get(timeout=0)['data']
+    assert event['jobs'] == 0
+    assert event['errors'] == {'github': 1}
+    assert event['sources'] == {'remoteok': 30, 'github': 20}
+
+
+def test_bridge_relays_task_updates(tmp_path):
+    bus = EventBus()
+    queue = TaskQueue(str(tmp_path / "tasks.db"))
+    queue.enqueue('module:earlier', delay=60)
+    bridge = TaskQueueBridge(bus, queue)
+    subscription = bus.subscribe(['task'])
+
+    # Tasks changed before the bridge started are not replayed
+    assert bridge.poll_once() == 0
+
+    task_id = queue.enqueue('module:handler')
+    assert bridge.poll_once() == 1
+    assert bridge.poll_once() == 0
+
+    queue.claim('w1')
+    queue.update_progress(task_id, 40, processed=4)
+    bridge.poll_once()
+
+    first, second = subscription.get(timeout=0), subscription.get(timeout=0)
+    assert first['data']['status'] == 'queued'
+    assert second['data']['progress'] == 40
+    assert second['data']['details'] == {'processed': 4}
+
+    # Queued and finished between two polls: still published, in its final state
+    quick = queue.enqueue('module:quick')
+    queue.complete(quick, {'ok': True})
+    assert bridge.poll_once() == 1
+    assert subscription.get(timeout=0)['data']['status'] == 'completed'
+
+
+def test_worker_scrape_stats_reach_bridge(tmp_path):
+    bus = EventBus()
+    queue = TaskQueue(str(tmp_path / "tasks.db"))
+    bridge = TaskQueueBridge(bus, queue)
+    bridge.poll_once()
+    subscription = bus.subscribe(['scrape'])
+
+    # A worker process's stats go to the queue database, not its own bus
+    worker_stats = ScrapeStats(EventBus(), window_seconds=10)
+    worker_stats.persist_to(queue)
+    worker_stats.record('remoteok', 30)
+    assert subscription.get(timeout=0) is None
+
+    assert bridge.poll_once() == 1
+    assert subscription.get(timeout=0)['data']['sources'] == {'remoteok': 30}
+
+
+def test_sse_framing_and_unsubscribe_on_close():
+    bus = EventBus()
+    subscription = bus.subscribe()
+    bus.publish('task', {'id': 't1'})
+
+    stream = sse_stream(subscription, heartbeat_seconds=0)
+    assert next(stream).startswith('retry:')
+    assert next(stream) == 'id: 1\nevent: task\ndata: {"id": "t1"}\n\n'
+    assert next(stream) == ': keep-alive\n\n'
+
+    stream.close()
+    assert bus.subscriber_count == 0
+    assert format_sse({'id': 2, 'topic': 'scrape', 'data': {}}) == 'id: 2\nevent: scrape\ndata: {}\n\n'
@@ -0,0 +1,85 @@
+"""
+Unit tests for the faceted filter index
+"""
+import pytest
+
+from facet_index import FacetIndex, RangeColumn, from_positions, get_index, iter_positions
+from synthetic_corpus import CorpusGenerator
+
+
+@pytest.fixture(scope='module')
+def jobs():
+    return list(CorpusGenerator(3000, seed=7))
+
+
+def naive(jobs, filters):
+    """The list-comprehension filters the index replaces"""
+    matched = []
+    for job in jobs:
+        if filters.get('location') and filters['location'].lower() not in job['location'].lower():
+            continue
+        if filters.get('job_type') and job['job_type'] != filters['job_type']:
+            continue
+        if filters.get('experience_level') and job['experience_level'] != filters['experience_level']:
+            continue
+        if filters.get('salary_min') and (job['salary_max'] is None or job['salary_max'] < int(filters['salary_min'])):
+            continue
+        if filters.get('salary_max') and (job['salary_min'] is None or job['salary_min'] > int(filters['salary_max'])):
+            continue
+        if filters.get('remote_only') == 'true' and not (job['remote_friendly'] or 'Remote' in job['location']):
+            continue
+        if filters.get('keywords'):
+            keywords = filters['keywords'].lower()
+            if not (keywords in job['title'].lower() or keywords in job['description'].lower() or
+                    any(keywords in skill.lower() for skill in job['skills'])):
+                continue
+        matched.append(job)
+    return matched
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'job_type': 'full-time', 'experience_level': 'senior'},
+    {'location': 'SAN', 'salary_min': '150000', 'salary_max': '220000'},
+    {'remote_only': 'true', 'keywords': 'Kubernetes'},
+    {'job_type': 'no-such-type'},
+])
+def test_query_matches_list_filters_in_order(jobs, filters):
+    result = FacetIndex(jobs).query(filters)
+
+    expected = naive(jobs, filters)
+    assert result.select(jobs) == expected
+    assert result.count == len(expected)
+    assert result.select(jobs, offset=5, limit=3) == expected[5:8]
+
+
+def test_facet_counts_ignore_their_own_filter(jobs):
+    index = FacetIndex(jobs)
+    result = index.query({'job_type': 'full-time', 'experience_level': 'senior', 'salary_min': '120000'})
+
+    by_level = naive(jobs, {'job_type': 'full-time', 'salary_min': '120000'})
+    assert result.facets['experience_level']['senior'] == result.count
+    assert sum(result.facets['experience_level'].values()) == len(by_level)
+    by_source = naive(jobs, {'job_type': 'full-time', 'experience_level': 'senior', 'salary_min': '120000'})
+    assert result.facets['source'] == {source: sum(job['source'] == source for job in by_source)
+                                       for source in {job['source'] for job in by_source}}
+
+
+def test_range_column_bounds_and_missing_values():
+    values = [50, None, 10, 30, 30, 70, None, 20]
+    column = RangeColumn(values, block=3)
+
+    for bound in range(0, 80, 5):
+        assert list(iter_positions(column.at_least(bound))) == \
+            [i for i, v in enumerate(values) if v is not None and v >= bound]
+        assert list(iter_positions(column.at_most(bound))) == \
+            [i for i, v in enumerate(values) if v is not None and v <= bound]
+
+
+def test_bitmap_round_trip_and_index_reuse(jobs):
+    positions = [0, 1, 63, 64, 65, 1000, 2999]
+    assert list(iter_positions(from_positions(positions, 3000))) == positions
+
+    copies = [dict(job) for job in jobs]
+    assert get_index(copies) is get_index(jobs)
+    assert get_index(jobs[:10]) is not get_index(jobs)
@@ -0,0 +1,78 @@
+"""
+Unit tests for the per-job feature store
+"""
+import json
+import sqlite3
+
+import feature_store
+from feature_store import FeatureStore, SkillVocabulary, extract_features
+
+JOB = {
+    'id': 'j1', 'title': 'Sr. Backend Eng (Remote)', 'location': 'San Jose, CA - Hybrid',
+    'skills': json.dumps(['Python', 'k8s', 'python', 'Go']), 'salary': '$150k - $190k',
+    'description': 'x' * 120, 'application_url': 'https://Boards.Greenhouse.io/acme/jobs/1',
+}
+
+
+def test_extract_features():
+    vocabulary = SkillVocabulary()
+    features = extract_features(JOB, vocabulary)
+
+    assert vocabulary.names(features.skill_ids) == ['Python', 'k8s', 'Go']
+    assert (features.seniority, features.experience_level, features.role_family) == ('senior', 'senior', 'software')
+    assert features.title_words == {'senior', 'backend', 'engineer'}
+    assert features.domain == 'boards.greenhouse.io'
+    assert features.geohash.startswith('9q9')
+    assert (features.salary_min, features.salary_max, features.text_length) == (150000, 190000, 120)
+    # Numeric salary columns win over the text
+    assert extract_features(dict(JOB, salary_min=1, salary_max=2), vocabulary)[9:11] == (1, 2)
+
+
+def test_store_round_trip_and_lazy_fill(tmp_path):
+    path = str(tmp_path / 'features.db')
+    store = FeatureStore(path)
+    assert store.put([JOB]) == 1
+    other = dict(JOB, id='j2', skills=['Rust'], title='Data Scientist')
+
+    reopened = FeatureStore(path)
+    features = reopened.features_for([JOB, other, {'title': 'No id'}])
+    assert features[0] == store.features(JOB)
+    assert reopened.skill_names(features[1]) == ['Rust'] and features[1].role_family == 'data'
+    assert features[2].role_family == 'other'
+    assert reopened.skill_ids(('python', 'Kubernetes', 'COBOL')) == set(features[0].skill_ids[:2])
+
+    conn = sqlite3.connect(path)
+    assert sorted(row[0] for row in conn.execute("SELECT job_id FROM job_features")) == ['j1', 'j2']
+    conn.close()
+
+
+def test_outdated_rows_are_recomputed(tmp_path, monkeypatch):
+    path = str(tmp_path / 'features.db')
+    FeatureStore(path).put([JOB])
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE job_features SET role_family = 'stale'")
+    conn.commit()
+
+    assert FeatureStore(path).features(JOB).role_family == 'stale'
+    monkeypatch.setattr(feature_store, 'FEATURE_VERSION', feature_store.FEATURE_VERSION + 1)
+    assert FeatureStore(path).features(JOB).role_family == 'software'
+    assert conn.execute("SELECT DISTINCT version FROM job_features").fetchall() == [(feature_store.FEATURE_VERSION,)]
+    conn.close()
+
+
+def test_job_database_writes_features_at_ingest(tmp_path, monkeypatch):
+    # The backend opens its app-wide databases in the cwd; keep them out of the repo
+    monkeypatch.chdir(tmp_path)
+    from jobright_clone_backend import Job, JobDatabase
+
+    path = str(tmp_path / 'jobs.db')
+    db = JobDatabase(path)
+    db.save_job(Job(id='j1', title='Junior Developer', company='Acme', location='Austin, TX',
+                    salary='$40/hr', description='', url='u1', apply_url='https://jobs.lever.co/acme/1',
+                    posted_date='', job_type='full-time', experience_level='entry', source='unit',
+                    scraped_at='2025-01-01'))
+
+    conn = sqlite3.connect(path)
+    row = conn.execute("SELECT experience_level, domain, salary_min FROM job_features WHERE job_id = 'j1'").fetchone()
+    conn.close()
+    assert row == ('entry', 'jobs.lever.co', 83200)
@@ -0,0 +1,108 @@
+"""
+Unit tests for the offline gazetteer and geohash index
+"""
+import random
+import sqlite3
+
+import pytest
+
+from geo_index import GeoIndex, bounding_box, haversine_miles, longitude_ranges, normalize_location
+
+
+@pytest.mark.parametrize('text, label', [
+    ('San Jose, CA - Hybrid', 'San Jose, CA'),
+    ('San José, California 95112', 'San Jose, CA'),
+    ('Sunnyvale, CA (Onsite)', 'Sunnyvale, CA'),
+    ('Mountain View, CA, USA', 'Mountain View, CA'),
+    ('Austin TX', 'Austin, TX'),
+    ('Greater Seattle Area', 'Seattle, WA'),
+    ('NYC', 'New York, NY'),
+    ('Washington, D.C.', 'Washington, DC'),
+    ('Portland, ME', 'Portland, ME'),
+    ('Portland', 'Portland, OR'),
+    ('Toronto, ON, Canada', 'Toronto, ON'),
+    ('Remote', None),
+    ('Springfield, IL', None),
+    ('', None),
+])
+def test_normalize_location(text, label):
+    place = normalize_location(text)
+    assert (place.label if place else None) == label
+
+
+def test_within_matches_brute_force():
+    rng = random.Random(3)
+    points = [(i, rng.uniform(25, 49), rng.uniform(-125, -67)) for i in range(5000)]
+    index = GeoIndex()
+    for key, lat, lon in points:
+        index.add(key, lat, lon)
+
+    for miles in (10, 60, 400):
+        found = index.within(37.34, -121.89, miles)
+        expected = {key for key, lat, lon in points if haversine_miles(37.34, -121.89, lat, lon) <= miles}
+        assert {key for key, _ in found} == expected
+        assert [distance for _, distance in found] == sorted(distance for _, distance in found)
+
+
+def test_within_location_radius():
+    index = GeoIndex()
+    for key, location in enumerate(['San Jose, CA', 'Palo Alto, CA', 'San Francisco, CA', 'Remote', 'Seattle, WA']):
+        index.add_location(key, location)
+
+    assert [key for key, _ in index.within_location('Santa Clara, CA', miles=20)] == [0, 1]
+    assert len(index) == 4
+    with pytest.raises(ValueError):
+        index.within_location('Atlantis')
+
+
+def test_bounding_box_wraps_antimeridian_and_poles():
+    min_lat, max_lat, min_lon, max_lon = bounding_box(52.0, 179.0, 100)
+    assert longitude_ranges(min_lon, max_lon) == [(min_lon, 180.0), (-180.0, max_lon - 360.0)]
+    assert longitude_ranges(*bounding_box(52.0, -179.0, 100)[2:])[1][0] == -180.0
+    # The circle covers the pole, so every longitude is in range
+    assert longitude_ranges(*bounding_box(89.0, 10.0, 100)[2:]) == [(-180.0, 180.0)]
+
+
+def test_job_database_stores_coordinates_and_filters_by_radius(tmp_path, monkeypatch):
+    # The backend opens its app-wide databases in the cwd; keep them out of the repo
+    monkeypatch.chdir(tmp_path)
+    from jobright_clone_backend import Job, JobDatabase
+
+    path = str(tmp_path / 'jobs.db')
+    # A database from before the geo columns existed
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE jobs (id TEXT PRIMARY KEY, title TEXT NOT NULL, company TEXT NOT NULL, "
+                 "location TEXT, salary TEXT, description TEXT, url TEXT UNIQUE, apply_url TEXT, "
+                 "posted_date TEXT, job_type TEXT, experience_level TEXT, source TEXT, scraped_at TEXT, "
+                 "application_status TEXT DEFAULT 'not_applied', automation_score REAL DEFAULT 0.0, tags TEXT)")
+    conn.execute("INSERT INTO jobs (id, title, company, location, url, scraped_at) "
+                 "VALUES ('old', 'Engineer', 'Acme', 'Cupertino, California', 'u0', '2025-01-01')")
+    conn.commit()
+    conn.close()
+
+    db = JobDatabase(path)
+    for i, location in enumerate(['San Jose, CA - Hybrid', 'San Francisco, CA', 'Remote']):
+        db.save_job(Job(id=f"j{i}", title='Engineer', company='Acme', location=location, salary=None,
+                        description='', url=f"u{i + 1}", apply_url=None, posted_date='', job_type='full-time',
+                        experience_level='mid', source='unit', scraped_at=f"2025-01-0{i + 2}"))
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT place, geohash FROM jobs WHERE id = 'old'").fetchone() == ('Cupertino, CA', '9q9hr46y5')
+    conn.close()
+
+    assert [job.id for job in db.get_jobs(filters={'near': 'Santa Clara, CA', 'radius': 15})] == ['j0', 'old']
+    assert [job.id for job in db.get_jobs(filters={'near': 'Santa Clara, CA', 'radius': 50})] == ['j1', 'j0', 'old']
+    assert [job.id for job in db.get_jobs(filters={'location': 'San José'})] == ['j0']
+    with pytest.raises(ValueError):
+        db.get_jobs(filters={'near': 'Atlantis'})
+    with pytest.raises(ValueError):
+        db.iter_job_rows(filters={'near': 'Atlantis'})
+
+    # Attu Island (52.9, 173.2) is across the antimeridian from Anchorage, ~1,476 miles away
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO jobs (id, title, company, location, url, scraped_at, latitude, longitude) "
+                 "VALUES ('attu', 'Engineer', 'Acme', 'Attu, AK', 'u9', '2025-01-09', 52.9, 173.2)")
+    conn.commit()
+    conn.close()
+    assert [job.id for job in db.get_jobs(filters={'near': 'Anchorage, AK', 'radius': 1600})] == ['attu']
+    assert db.get_jobs(filters={'near': 'Anchorage, AK', 'radius': 1400}) == []
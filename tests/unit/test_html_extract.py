@@ -0,0 +1,87 @@
+"""
+Unit tests for the precompiled HTML extraction layer
+"""
+import pytest
+
+import html_extract
+from html_extract import Match, SelectorSet, extract, field
+
+BACKENDS = ['bs4'] + (['lxml'] if html_extract.lxml is not None else [])
+
+INDEED = """
+<html><body>
+  <div class="jobsearch-ResultsList">
+    <div class="job_seen_beacon">
+      <h2 class="jobTitle"><a href="/rc/clk?jk=1"><span title="Data Engineer">Data Engineer</span></a></h2>
+      <span class="companyName">Acme</span>
+      <div class="companyLocation">San Jose, CA</div>
+    </div>
+    <article class="Result-card">
+      <a class="CompanyLink" href="https://example.com/2">Globex</a>
+      <span title="ML Engineer">ML <b>Engineer</b></span>
+    </article>
+  </div>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_indeed_cards_and_fallback_selectors(backend):
+    cards = extract('indeed', INDEED, backend=backend)
+
+    # The results list wrapper matches 'job' too, exactly like the find_all it replaces
+    assert [card['title'] for card in cards] == ['Data Engineer', 'Data Engineer', 'MLEngineer']
+    wrapper, first, second = cards
+    assert first == {'title': 'Data Engineer', 'company': 'Acme', 'location': 'San Jose, CA',
+                     'url': '/rc/clk?jk=1'}
+    assert second['company'] == 'Globex'
+    assert second['location'] is None
+    assert second['url'] == 'https://example.com/2'
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_card_attributes_and_own_text(backend):
+    html = ('<a class="index_main-job-card__T1" href="/jobs/info/1">'
+            '<span class="index_main-job-card-company-info__x">Labcorp'
+            '<span class="index_main-job-card-extra-info__y"> · 18 minutes ago</span></span>'
+            '<div class="index_main-job-card-title__z">Senior IOS Engineer</div></a>')
+
+    [card] = extract('jobright', html, backend=backend)
+
+    assert card == {'title': 'Senior IOS Engineer', 'company': 'Labcorp', 'posted': '· 18 minutes ago',
+                    'url': '/jobs/info/1'}
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_own_text_includes_text_after_child_elements(backend):
+    html = ('<a class="index_main-job-card__T1" href="/jobs/info/2">'
+            '<span class="index_main-job-card-company-info__x"><img src="logo.png"/>Initech '
+            '<span class="index_main-job-card-extra-info__y">· 2 hours ago</span> Software</span>'
+            '<div class="index_main-job-card-title__z">Backend Engineer</div></a>')
+
+    [card] = extract('jobright', html, backend=backend)
+
+    assert card['company'] == 'Initech  Software'
+
+
+def test_pages_without_card_markers_are_not_parsed(monkeypatch):
+    selector_set = SelectorSet('unit', cards=[Match(('li',), ('posting',))], fields={'title': field(Match(('h3',)))})
+
+    def fail(html):
+        raise AssertionError('parsed a page that cannot contain cards')
+    monkeypatch.setattr(selector_set, '_extract_soup', fail)
+    monkeypatch.setattr(selector_set, '_extract_lxml', fail)
+
+    assert selector_set.extract('<ul><li class="nav">Home</li></ul>') == []
+    assert selector_set.extract('') == []
+
+
+def test_limit_and_compiled_selectors_are_reused():
+    selector_set = SelectorSet('unit', cards=[Match(('li',), ('posting',))], fields={'title': field(Match(('h3',)))},
+                               limit=2)
+    html = ''.join(f'<li class="Posting"><h3>Job {i}</h3></li>' for i in range(5))
+
+    assert selector_set.extract(html, backend='bs4') == [{'title': 'Job 0'}, {'title': 'Job 1'}]
+    compiled = selector_set.compile('bs4')
+    selector_set.extract(html, backend='bs4')
+    assert selector_set.compile('bs4') is compiled
@@ -0,0 +1,151 @@
+"""
+Unit tests for HTTP record/replay cassettes
+"""
+import asyncio
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from http_cassette import (Cassette, CassetteClientSession, CassetteMiss, import_capture, make_entry,
+                           replay_throughput, request_key, use_cassette)
+
+
+@pytest.fixture
+def server():
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            body = json.dumps({'path': self.path, 'hit': len(hits)}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}", hits
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_request_key_ignores_query_order_and_cache_busters():
+    assert request_key('get', 'https://A.example/jobs?b=2&a=1&_=123') == request_key('GET', 'https://a.example/jobs?a=1&b=2')
+    assert request_key('POST', 'https://a.example/', '{"q": 1}') != request_key('POST', 'https://a.example/', '{"q": 2}')
+
+
+def test_requests_record_then_replay_in_order(server, tmp_path):
+    base, hits = server
+    path = str(tmp_path / 'crawl.jsonl.gz')
+
+    recorder = use_cassette(requests.Session(), Cassette(path, mode='record'))
+    first = recorder.get(f"{base}/jobs?page=1").json()
+    second = recorder.get(f"{base}/jobs?page=1").json()
+    assert (first['hit'], second['hit']) == (1, 2)
+
+    # Each response is its own gzip member; the file reads as one stream
+    with gzip.open(path, 'rt') as f:
+        assert len(f.readlines()) == 2
+
+    cassette = Cassette(path, mode='replay')
+    player = use_cassette(requests.Session(), cassette)
+    replayed = [player.get(f"{base}/jobs?page=1").json()['hit'] for _ in range(3)]
+    assert replayed == [1, 2, 2]
+    assert len(hits) == 2
+    with pytest.raises(CassetteMiss):
+        player.get(f"{base}/jobs?page=2")
+
+    cassette.rewind()
+    assert player.get(f"{base}/jobs?page=1").json()['hit'] == 1
+
+    # Streaming reads of a replayed body
+    cassette.rewind()
+    streamed = player.get(f"{base}/jobs?page=1", stream=True)
+    assert json.loads(b''.join(streamed.iter_content(chunk_size=4)))['hit'] == 1
+
+
+def test_once_mode_only_fetches_new_requests(server, tmp_path):
+    base, hits = server
+    session = use_cassette(requests.Session(), Cassette(str(tmp_path / 'c.jsonl.gz'), mode='once'))
+
+    session.get(f"{base}/a")
+    session.get(f"{base}/a")
+    session.get(f"{base}/b")
+
+    assert hits == ['/a', '/b']
+
+
+def test_cassette_cut_off_by_a_crash_keeps_complete_recordings(tmp_path):
+    path = tmp_path / 'crawl.jsonl.gz'
+    cassette = Cassette(str(path), mode='record')
+    for page in range(3):
+        cassette.add(make_entry('GET', f'https://jobs.test/?page={page}', None, 200, {}, b'x' * 100))
+    path.write_bytes(path.read_bytes()[:-5])
+
+    recovered = Cassette(str(path), mode='once')
+    assert [entry['url'] for entry in recovered] == ['https://jobs.test/?page=0', 'https://jobs.test/?page=1']
+
+    # The next recording replaces the cut-off member instead of following it
+    recovered.add(make_entry('GET', 'https://jobs.test/?page=3', None, 200, {}, b'y'))
+    assert len(Cassette(str(path), mode='replay')) == 3
+    with gzip.open(path, 'rt') as f:
+        assert len(f.readlines()) == 3
+
+
+def test_aiohttp_session_records_and_replays(server, tmp_path):
+    base, hits = server
+    path = str(tmp_path / 'async.jsonl.gz')
+
+    async def fetch(cassette):
+        async with CassetteClientSession(cassette) as session:
+            async with session.get(f"{base}/search", params={'q': 'python'}) as response:
+                return response.status, await response.json(), await response.text()
+
+    recorded = asyncio.run(fetch(Cassette(path, mode='record')))
+    replayed = asyncio.run(fetch(Cassette(path, mode='replay')))
+
+    assert recorded == replayed
+    assert recorded[1]['path'] == '/search?q=python'
+    assert hits == ['/search?q=python']
+
+
+def test_import_and_throughput_replay(tmp_path):
+    cards = ''.join(f'<div class="job_seen_beacon"><h2>Engineer {i}</h2>'
+                    f'<span class="companyName">Acme</span></div>' for i in range(3))
+    capture = tmp_path / 'raw_responses.json'
+    capture.write_text(json.dumps([{
+        'source': 'indeed', 'url': 'https://www.indeed.com/jobs?q=python',
+        'html_preview': f"<html><body>{cards}</body></html>", 'full_html_length': 99999,
+    }]))
+    path = str(tmp_path / 'captured.jsonl.gz')
+
+    assert import_capture(str(capture), Cassette(path, mode='record')) == 1
+    cassette = Cassette(path, mode='replay')
+    [entry] = list(cassette)
+    assert entry['truncated'] and entry['imported_from'] == 'raw_responses.json'
+
+    class Storage:
+        def __init__(self):
+            self.fingerprints = set()
+
+        def insert_jobs(self, jobs):
+            new = {job.fingerprint for job in jobs} - self.fingerprints
+            self.fingerprints |= new
+            return len(new)
+
+    result = replay_throughput(cassette, iterations=4, storage=Storage())
+
+    assert result['pages'] == 1
+    assert result['requests'] == 4
+    assert result['jobs'] == 12
+    # Same cards every iteration: stored once, deduplicated afterwards
+    assert result['inserted'] == 3
@@ -0,0 +1,80 @@
+"""
+Unit tests for fast JSON encoding, projection and response compression
+"""
+import gzip
+import json
+
+import pytest
+from flask import Flask
+
+from json_responses import (
+    dumps, enable_compression, json_page_response, json_response, parse_fields, stream_json_page
+)
+
+
+def test_dumps_is_compact_utf8():
+    assert json.loads(dumps({'title': 'Ingénieur', 'n': 1})) == {'title': 'Ingénieur', 'n': 1}
+    assert b' ' not in dumps({'a': [1, 2]})
+
+
+def test_parse_fields():
+    allowed = ('id', 'title', 'company')
+    assert parse_fields(None, allowed) == allowed
+    assert parse_fields('title, id,title', allowed) == ('title', 'id')
+    with pytest.raises(ValueError, match='salary'):
+        parse_fields('id,salary', allowed)
+
+
+@pytest.mark.parametrize('count', [0, 1, 7])
+def test_stream_json_page_matches_plain_encoding(count):
+    rows = [(i, f"Job {i}") for i in range(count)]
+    body = b''.join(stream_json_page({'success': True}, 'jobs', ('id', 'title'), iter(rows), batch_size=3))
+    assert json.loads(body) == {
+        'success': True,
+        'jobs': [{'id': i, 'title': f"Job {i}"} for i in range(count)],
+        'count': count
+    }
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    enable_compression(app, min_size=64)
+
+    @app.route('/page')
+    def page():
+        return json_page_response({}, 'jobs', ('id',), ((i,) for i in range(100)))
+
+    @app.route('/small')
+    def small():
+        return json_response({'ok': True})
+
+    @app.route('/tagged')
+    def tagged():
+        response = json_response({'padding': 'x' * 100})
+        response.set_etag('abc')
+        return response
+
+    return app.test_client()
+
+
+def test_streamed_response_is_gzipped(client):
+    response = client.get('/page', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert json.loads(gzip.decompress(response.data))['count'] == 100
+
+
+def test_identity_without_accept_encoding(client):
+    response = client.get('/page')
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_json()['count'] == 100
+
+
+def test_small_bodies_are_not_compressed(client):
+    assert 'Content-Encoding' not in client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers
+
+
+def test_compressed_etag_is_distinct(client):
+    response = client.get('/tagged', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['ETag'] == '"abc-gzip"'
@@ -0,0 +1,67 @@
+"""
+Unit tests for versioned memory-mapped snapshots
+"""
+import os
+
+from feature_store import FeatureStore
+from mmap_snapshot import SnapshotReader, SnapshotWriter, current_version
+from semantic_search import VectorIndex, VectorSnapshot
+from synthetic_corpus import CorpusGenerator
+
+
+def test_publish_swap_and_cleanup(tmp_path):
+    root = str(tmp_path / 'snap')
+    reader = SnapshotReader(root, check_interval=0)
+    assert reader.current() is None
+
+    with SnapshotWriter(root) as writer:
+        writer.add_array('salary', 'q', [3, -1, 7])
+        writer.add_strings('ids', ['a', 'b', 'é'])
+        writer.add_json('meta', {'rows': 3})
+    first = reader.current()
+    assert list(first.array('salary')) == [3, -1, 7] and first.json('meta') == {'rows': 3}
+    assert [first.strings('ids')[i] for i in range(3)] == ['a', 'b', 'é']
+    assert first.strings('ids').find('é') == 2 and first.strings('ids').find('c') is None
+
+    try:
+        with SnapshotWriter(root) as writer:
+            writer.add_array('salary', 'q', [1])
+            raise RuntimeError('ingest failed')
+    except RuntimeError:
+        pass
+    assert current_version(root) == first.version and reader.current() is first
+
+    for rows in (1, 2):
+        with SnapshotWriter(root, keep=2) as writer:
+            writer.add_array('salary', 'q', range(rows))
+    latest = reader.current()
+    assert list(latest.array('salary')) == [0, 1]
+    # The held version keeps working after it is superseded and removed
+    assert list(first.array('salary')) == [3, -1, 7]
+    versions = [name for name in os.listdir(root) if name.startswith('v')]
+    assert len(versions) == 2 and latest.version in versions and first.version not in versions
+
+
+def test_feature_and_vector_snapshots_match_live_reads(tmp_path):
+    jobs = list(CorpusGenerator(300, seed=2))
+    path = str(tmp_path / 'jobs.db')
+    store = FeatureStore(path)
+    store.put(jobs)
+    store.publish()
+    index = VectorIndex(str(tmp_path / 'vectors'))
+    index.add_jobs(jobs)
+    profile = {'title': 'Backend Engineer', 'skills': ['Python']}
+    expected = index.similar_to_job(jobs[5]['id'], 5), index.search_profile(profile, 3)
+    index.publish(str(tmp_path / 'vector-snap'))
+    index.add_jobs([dict(jobs[5], id='late')])
+
+    reader = FeatureStore(path)
+    assert len(reader.snapshot()) == 300
+    assert [reader.snapshot().get(job['id']) for job in jobs] == [store.features(job) for job in jobs]
+    assert reader.features_for([{'id': 'missing', 'title': 'Data Scientist'}])[0].role_family == 'data'
+
+    # The published version is unaffected by appends made after it
+    snapshot = VectorSnapshot(SnapshotReader(str(tmp_path / 'vector-snap')).current())
+    assert len(snapshot) == 300 and 'late' not in snapshot and 'late' in index
+    assert (snapshot.similar_to_job(jobs[5]['id'], 5), snapshot.search_profile(profile, 3)) == expected
+    index.close()
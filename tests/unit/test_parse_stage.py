@@ -0,0 +1,92 @@
+"""
+Unit tests for the San Jose scraper's process-pool parse stage
+"""
+import asyncio
+import logging
+
+import san_jose_job_scraper
+from event_stream import EventBus, ScrapeStats
+from san_jose_job_scraper import ParseStage, SanJoseJob, SanJoseJobScraper, measure_parse_pipeline
+
+CARDS = ''.join(
+    f'<div class="job-card"><a class="jobTitle">Data Engineer {i}</a>'
+    f'<span class="companyName">Acme {i}</span></div>'
+    for i in range(5)
+)
+PAGE = f"<html><body>{CARDS}</body></html>"
+
+
+def test_pool_parses_like_inline():
+    async def run(workers):
+        stage = ParseStage(workers)
+        await stage.start()
+        try:
+            return await stage.parse('parse_indeed_jobs', PAGE, 'data engineer')
+        finally:
+            await stage.close()
+
+    inline = asyncio.run(run(0))
+    pooled = asyncio.run(run(1))
+
+    assert [job.title for job in pooled] == [job.title for job in inline]
+    assert all(isinstance(job, SanJoseJob) for job in pooled)
+    assert {job.company for job in pooled} == {f"Acme {i}" for i in range(5)}
+
+
+def test_submit_blocks_when_queue_is_full():
+    async def run():
+        stage = ParseStage(1, queue_size=1)
+        await stage.start()
+        # Stop the consumer so queued pages stay queued
+        for consumer in stage._consumers:
+            consumer.cancel()
+        await stage.submit('parse_linkedin_jobs', PAGE)
+        try:
+            await asyncio.wait_for(stage.submit('parse_linkedin_jobs', PAGE), timeout=0.05)
+        except asyncio.TimeoutError:
+            return True
+        finally:
+            stage.executor.shutdown()
+        return False
+
+    assert asyncio.run(run())
+
+
+def test_parse_page_outside_a_run_is_inline():
+    scraper = SanJoseJobScraper()
+
+    jobs = asyncio.run(scraper.parse_page('parse_glassdoor_jobs', PAGE, 'designer'))
+
+    assert len(jobs) == 10
+
+
+def test_measure_reports_throughput_and_loop_lag():
+    result = asyncio.run(measure_parse_pipeline(PAGE, pages=10, parse_workers=1, fetchers=4, fetch_latency=0))
+
+    assert result['pages'] == 10
+    assert result['jobs'] == 50
+    assert result['pages_per_second'] > 0
+    assert set(result['loop_lag']) == {'samples', 'mean_ms', 'p99_ms', 'max_ms'}
+
+
+def test_parser_failures_are_logged_and_counted(monkeypatch, caplog):
+    bus = EventBus()
+    monkeypatch.setattr(san_jose_job_scraper, 'scrape_stats', ScrapeStats(bus))
+    subscription = bus.subscribe(['scrape'])
+
+    async def run(workers):
+        stage = ParseStage(workers)
+        await stage.start()
+        try:
+            jobs = await stage.parse('parse_missing_jobs', PAGE, url='https://jobs.test/page-1')
+        finally:
+            await stage.close()
+        return jobs, stage.errors
+
+    with caplog.at_level(logging.WARNING, logger='san_jose_job_scraper'):
+        assert asyncio.run(run(0)) == ([], 1)
+        assert asyncio.run(run(1)) == ([], 1)
+
+    assert sum('https://jobs.test/page-1' in record.getMessage() for record in caplog.records) == 2
+    events = [subscription.get(timeout=0)['data'] for _ in range(2)]
+    assert events[-1]['errors'] == {'parse_missing_jobs': 2}
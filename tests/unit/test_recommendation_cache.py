@@ -0,0 +1,68 @@
+"""
+Unit tests for the per-user recommendation cache
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from recommendation_cache import RecommendationCache, filters_key, profile_version
+from response_cache import CorpusVersion
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RecommendationCache(max_entries=4, ttl=60, versions=CorpusVersion(str(tmp_path / "versions.db")))
+
+
+def _ranker(calls, ranked=(('j1', 90.0), ('j2', 80.0))):
+    def rank():
+        calls.append(1)
+        return list(ranked)
+    return rank
+
+
+def test_pages_are_served_from_cache_until_ingest(cache):
+    calls = []
+    user = SimpleNamespace(preferred_title='Data Engineer', skills='["Spark"]')
+    for _ in range(3):
+        ranked = cache.ranked(1, profile_version(user), 'real_jobs', {'location': 'Remote'}, _ranker(calls))
+    assert ranked == [('j1', 90.0), ('j2', 80.0)] and len(calls) == 1 and cache.hits == 2
+
+    # Empty filter values are the same filter set
+    cache.ranked(1, profile_version(user), 'real_jobs', {'location': 'Remote', 'keywords': ''}, _ranker(calls))
+    assert len(calls) == 1 and filters_key({'a': 0}) != filters_key({})
+
+    cache.versions.bump('real_jobs')
+    cache.ranked(1, profile_version(user), 'real_jobs', {'location': 'Remote'}, _ranker(calls))
+    assert len(calls) == 2 and len(cache) == 1  # the entry of the old corpus version was dropped
+
+
+def test_profile_changes_and_updates_invalidate(cache):
+    calls = []
+    user = SimpleNamespace(preferred_title='Data Engineer', skills='["Spark"]')
+    cache.ranked(1, profile_version(user), 'real_jobs', {}, _ranker(calls))
+    cache.ranked(2, 'other-profile', 'real_jobs', {}, _ranker(calls))
+
+    user.skills = '["Spark", "Airflow"]'
+    cache.ranked(1, profile_version(user), 'real_jobs', {}, _ranker(calls))
+    assert len(calls) == 3 and len(cache) == 2
+
+    cache.invalidate_user(1)
+    cache.ranked(1, profile_version(user), 'real_jobs', {}, _ranker(calls))
+    cache.ranked(2, 'other-profile', 'real_jobs', {}, _ranker(calls))
+    assert len(calls) == 4
+
+
+def test_memory_is_bounded_by_lru_and_ttl(cache, monkeypatch):
+    calls = []
+    for user_id in range(6):
+        cache.ranked(user_id, 'p', 'real_jobs', {}, _ranker(calls))
+    assert len(cache) == 4
+    cache.ranked(0, 'p', 'real_jobs', {}, _ranker(calls))
+    assert len(calls) == 7
+
+    import recommendation_cache
+    now = recommendation_cache.time.time()
+    monkeypatch.setattr(recommendation_cache.time, 'time', lambda: now + 61)
+    cache.ranked(0, 'p', 'real_jobs', {}, _ranker(calls))
+    assert len(calls) == 8
@@ -0,0 +1,86 @@
+"""
+Unit tests for the versioned response cache
+"""
+import pytest
+from flask import Flask, jsonify, request
+
+from response_cache import CorpusVersion, LRUCache, ResponseCache, normalize_query
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(LRUCache(max_entries=8), CorpusVersion(str(tmp_path / "versions.db")))
+
+
+@pytest.fixture
+def client(cache):
+    app = Flask(__name__)
+    calls = []
+
+    @app.route('/api/jobs')
+    @cache.cached('jobs')
+    def jobs():
+        calls.append(dict(request.args))
+        return jsonify({'location': request.args.get('location'), 'calls': len(calls)})
+
+    @app.route('/api/broken')
+    @cache.cached('jobs')
+    def broken():
+        calls.append('broken')
+        return jsonify({'error': 'nope'}), 500
+
+    test_client = app.test_client()
+    test_client.calls = calls
+    return test_client
+
+
+def test_identical_queries_hit_cache(client):
+    first = client.get('/api/jobs?location=San+Jose&limit=10')
+    second = client.get('/api/jobs?limit=10&location=San+Jose&company=')
+
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert first.get_json() == second.get_json()
+    assert len(client.calls) == 1
+
+
+def test_conditional_get_returns_304(client):
+    etag = client.get('/api/jobs?location=Remote').headers['ETag']
+    response = client.get('/api/jobs?location=Remote', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+
+def test_corpus_bump_invalidates(client, cache):
+    etag = client.get('/api/jobs').headers['ETag']
+    cache.bump('jobs')
+
+    response = client.get('/api/jobs', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.get_json()['calls'] == 2
+
+
+def test_errors_are_not_cached(client):
+    client.get('/api/broken')
+    client.get('/api/broken')
+    assert client.calls == ['broken', 'broken']
+
+
+def test_lru_evicts_oldest_and_expires():
+    lru = LRUCache(max_entries=2)
+    lru.set('a', 1, ttl=60)
+    lru.set('b', 2, ttl=60)
+    lru.get('a')
+    lru.set('c', 3, ttl=60)
+    assert lru.get('b') is None
+    assert lru.get('a') == 1
+
+    lru.set('d', 4, ttl=-1)
+    assert lru.get('d') is None
+
+
+def test_normalize_query_ignores_order_and_empty_values():
+    assert normalize_query({'b': '2', 'a': ' 1 ', 'c': ''}) == (('a', ('1',)), ('b', ('2',)))
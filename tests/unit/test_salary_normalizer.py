@@ -0,0 +1,75 @@
+"""
+Unit tests for salary normalization
+"""
+import pytest
+
+from salary_normalizer import Salary, normalize_column, parse_salary, salary_range
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('$120k - $150k', Salary(120000, 150000, 'year', 'USD')),
+    ('$120,000 - $150,000 a year', Salary(120000, 150000, 'year', 'USD')),
+    ('120-150K', Salary(120000, 150000, 'year', 'USD')),
+    ('USD 100000 - 140000', Salary(100000, 140000, 'year', 'USD')),
+    ('$120k+', Salary(120000, None, 'year', 'USD')),
+    ('Up to $150k', Salary(None, 150000, 'year', 'USD')),
+    ('$55 - $70 an hour', Salary(114400, 145600, 'hour', 'USD')),
+    ('$60/hr', Salary(124800, 124800, 'hour', 'USD')),
+    ('$8,000/month', Salary(96000, 96000, 'month', 'USD')),
+    ('€60K–80K', Salary(60000, 80000, 'year', 'EUR')),
+    ('£45,000 per annum', Salary(45000, 45000, 'year', 'GBP')),
+    ('$1.2M', Salary(1200000, 1200000, 'year', 'USD')),
+    ('€80.000', Salary(80000, 80000, 'year', 'EUR')),
+    ('80.000 € - 95.000 €', Salary(80000, 95000, 'year', 'EUR')),
+    ('€1,5M', Salary(1500000, 1500000, 'year', 'EUR')),
+    ('3 years exp, $100k', Salary(100000, 100000, 'year', 'USD')),
+    ('401k match, $130k', Salary(130000, 130000, 'year', 'USD')),
+    ('100000 - 140000', Salary(100000, 140000, 'year', 'USD')),
+    ('5+ years of Python', None),
+    ('$85,000 - $95,000 a year, 3 weeks PTO', Salary(85000, 95000, 'year', 'USD')),
+    ('$150,000/yr, 5 day work week', Salary(150000, 150000, 'year', 'USD')),
+    ('$130k base, 4 day week', Salary(130000, 130000, 'year', 'USD')),
+    ('Hourly rate: $55', Salary(114400, 114400, 'hour', 'USD')),
+    ('Competitive', None),
+    ('401(k) matching', None),
+    (None, None),
+])
+def test_parse_salary(text, expected):
+    assert parse_salary(text) == expected
+
+
+def test_existing_parsers_share_the_normalizer():
+    from real_job_aggregator import RealJobAggregator
+
+    assert RealJobAggregator().parse_salary('$90k - $110k') == (90000, 110000) == salary_range('$90k - $110k')
+
+
+def test_normalize_column_parses_each_text_once():
+    parse_salary.cache_clear()
+    columns = normalize_column(['$120k+', None, '$120k+', '$50/hr'])
+
+    assert columns.min == [120000, None, 120000, 104000]
+    assert columns.max == [None, None, None, 104000]
+    assert columns.period == ['year', None, 'year', 'hour']
+    assert parse_salary.cache_info().misses == 3
+
+
+def test_job_database_filters_on_stored_salary(tmp_path, monkeypatch):
+    # The backend opens its app-wide databases in the cwd; keep them out of the repo
+    monkeypatch.chdir(tmp_path)
+    from jobright_clone_backend import Job, JobDatabase
+
+    db = JobDatabase(str(tmp_path / 'jobs.db'))
+    salaries = ['$90,000 - $110,000', '$60 - $80 an hour', '$150k+', 'Competitive', 'Up to $95k', '€150.000']
+    for i, salary in enumerate(salaries):
+        db.save_job(Job(id=f"j{i}", title='Engineer', company='Acme', location='Remote', salary=salary,
+                        description='', url=f"u{i}", apply_url=None, posted_date='', job_type='full-time',
+                        experience_level='mid', source='unit', scraped_at=f"2025-01-0{i + 1}"))
+
+    def ids(**filters):
+        return sorted(job.id for job in db.get_jobs(filters=filters))
+
+    assert ids(salary_min=140000) == ['j1', 'j2']
+    assert ids(salary_max=100000) == ['j0', 'j4']
+    assert ids(salary_min=100000, salary_max=130000) == ['j0', 'j1']
+    assert ids(salary_min=140000, salary_currency='eur') == ['j5']
@@ -0,0 +1,88 @@
+"""
+Unit tests for the local-embedding vector index
+"""
+import pytest
+
+import semantic_search
+from semantic_search import Embedder, VectorIndex, cosine, skill_similarity
+from synthetic_corpus import CorpusGenerator
+
+
+@pytest.fixture(scope='module')
+def jobs():
+    return list(CorpusGenerator(2000, seed=4))
+
+
+def test_embeddings_are_unit_length_and_deterministic():
+    job = {'title': 'Senior Data Engineer', 'skills': '["Spark", "Airflow"]', 'description': 'Build pipelines'}
+    a, b = Embedder().embed_job(job), Embedder().embed_job(dict(job))
+
+    assert cosine(a, b) == pytest.approx(1.0, abs=1e-5)
+    assert cosine(a, Embedder().embed_job({'title': 'Product Designer', 'skills': ['Figma']})) < 0.3
+    assert skill_similarity(['Python', 'AWS'], ['python', 'aws']) == pytest.approx(1.0, abs=1e-5)
+    assert skill_similarity(['Python'], ['Figma']) < 0.5
+
+
+def test_similar_to_job_persists_and_updates_incrementally(tmp_path, jobs):
+    path = str(tmp_path / 'vectors')
+    index = VectorIndex(path)
+    index.add_jobs(jobs[:1000])
+    duplicate = dict(jobs[0], id='dup')
+    index.add_jobs([duplicate])
+
+    hits = index.similar_to_job(jobs[0]['id'], k=5)
+    assert hits[0][0] == 'dup' and hits[0][1] == pytest.approx(1.0, abs=1e-3)
+    assert jobs[0]['id'] not in [job_id for job_id, _ in hits]
+    with pytest.raises(KeyError):
+        index.similar_to_job('missing')
+
+    # Another handle (e.g. another worker) sees appends from this one and vice versa
+    other = VectorIndex(path)
+    other.add_jobs(jobs[1000:1100])
+    assert len(other) == 1001 + 100
+    assert index.vector(jobs[1050]['id']) is not None
+    index.close()
+    other.close()
+
+
+def test_lsh_probe_recall(tmp_path, jobs, monkeypatch):
+    monkeypatch.setattr(semantic_search, 'EXACT_BELOW', 0)
+    index = VectorIndex(str(tmp_path / 'vectors'))
+    index.add_jobs(jobs)
+
+    recall = 0.0
+    for job in jobs[:40]:
+        vector = index.vector(job['id'])
+        kth = index.exact_search(vector, 11)[-1][1]
+        recall += sum(score >= kth - 1e-6 for _, score in index.search(vector, 10)) / 10
+    assert recall / 40 > 0.6
+    index.close()
+
+
+def test_job_database_similar_jobs(tmp_path, monkeypatch):
+    # The backend opens its app-wide databases in the cwd; keep them out of the repo
+    monkeypatch.chdir(tmp_path)
+    from jobright_clone_backend import Job, JobDatabase
+
+    db = JobDatabase(str(tmp_path / 'jobs.db'))
+    for i, (title, description) in enumerate([
+        ('Data Engineer', 'Spark and Airflow pipelines on AWS'),
+        ('Senior Data Engineer', 'Build Spark pipelines with Airflow'),
+        ('Product Designer', 'Figma prototypes and user research'),
+    ]):
+        db.save_job(Job(id=f"j{i}", title=title, company='Acme', location='Remote', salary=None,
+                        description=description, url=f"u{i}", apply_url=None, posted_date='',
+                        job_type='full-time', experience_level='mid', source='unit', scraped_at=''))
+
+    assert [job.id for job, _ in db.similar_jobs(job_id='j0', k=2)] == ['j1', 'j2']
+    db.publish_snapshots()
+    assert db.vector_snapshot() is not None and db.features.snapshot() is not None
+    assert [job.id for job, _ in db.similar_jobs(job_id='j0', k=2)] == ['j1', 'j2']
+    db.save_job(Job(id='j3', title='UX Designer', company='Acme', location='Remote', salary=None,
+                    description='Figma and user research', url='u3', apply_url=None, posted_date='',
+                    job_type='full-time', experience_level='mid', source='unit', scraped_at=''))
+    db.publish_snapshots()
+    hits = db.similar_jobs(profile={'title': 'Designer', 'skills': ['Figma']}, k=2)
+    assert {job.id for job, _ in hits} == {'j2', 'j3'}
+    with pytest.raises(ValueError):
+        db.similar_jobs(job_id='nope')
@@ -0,0 +1,113 @@
+"""
+Unit tests for read-only SQLite snapshots
+"""
+import sqlite3
+import threading
+
+import pytest
+
+from sqlite_snapshot import ReadSnapshot, publish
+
+
+def _primary(path):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("CREATE TABLE jobs (id TEXT PRIMARY KEY)")
+    conn.execute("INSERT INTO jobs VALUES ('a')")
+    conn.commit()
+    return conn
+
+
+def test_reads_see_published_versions_only(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    primary = _primary(path)
+    reads = ReadSnapshot(path, check_interval=0)
+
+    # Nothing published yet: reads go to the primary
+    assert reads.path() is None
+    assert reads.connect().execute("SELECT COUNT(*) FROM jobs").fetchone() == (1,)
+
+    publish(path)
+    held = reads.connect()
+    primary.execute("INSERT INTO jobs VALUES ('b')")
+    primary.commit()
+    assert held.execute("SELECT COUNT(*) FROM jobs").fetchone() == (1,)
+    with pytest.raises(sqlite3.OperationalError):
+        held.execute("INSERT INTO jobs VALUES ('c')")
+
+    # A writer holding its transaction open does not block snapshot reads or the next publish
+    primary.execute("INSERT INTO jobs VALUES ('c')")
+    publish(path)
+    publish(path)
+    assert reads.connect().execute("SELECT COUNT(*) FROM jobs").fetchone() == (2,)
+    # The superseded version is removed, but connections opened on it keep reading
+    assert held.execute("SELECT id FROM jobs").fetchall() == [('a',)]
+    primary.close()
+
+
+def test_job_database_snapshot_read_mode(tmp_path, monkeypatch):
+    # The backend opens its app-wide databases in the cwd; keep them out of the repo
+    monkeypatch.chdir(tmp_path)
+    from jobright_clone_backend import Job, JobDatabase
+
+    path = str(tmp_path / 'jobs.db')
+    db = JobDatabase(path, read_snapshots=True)
+
+    def save(job_id):
+        db.save_job(Job(id=job_id, title='Backend Engineer', company='Acme', location='San Jose, CA',
+                        salary=None, description='Python APIs', url=f'https://jobs.test/{job_id}', apply_url=None,
+                        posted_date='', job_type='full-time', experience_level='mid', source='test', scraped_at=job_id))
+
+    save('j1')
+    db.publish_snapshots()
+    save('j2')
+    assert [job.id for job in db.get_jobs(filters={'near': 'San Jose'})] == ['j1']
+    assert [job.id for job in db.get_jobs(fresh=True)] == ['j2', 'j1']
+    assert [row[0] for row in db.iter_job_rows(columns=('id',))] == ['j1']
+    db.publish_snapshots()
+    assert [job.id for job in db.get_jobs()] == ['j2', 'j1']
+
+    # Another web process's reads switch as soon as a write path republishes
+    other = JobDatabase(path, read_snapshots=True)
+    assert other.get_jobs(filters={'id': 'j1'})[0].application_status == 'not_applied'
+    job = db.get_jobs(filters={'id': 'j1'}, fresh=True)[0]
+    job.application_status = 'applied'
+    db.save_job(job)
+    db.publish_read_snapshot()
+    assert other.get_jobs(filters={'id': 'j1'})[0].application_status == 'applied'
+    assert JobDatabase(path, read_snapshots=False).read_snapshot is None
+
+
+def test_scheduled_publishes_are_debounced(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from jobright_clone_backend import Job, JobDatabase
+
+    path = str(tmp_path / 'jobs.db')
+    db = JobDatabase(path, read_snapshots=True, publish_interval=0.2)
+    publishes = []
+    monkeypatch.setattr(db, 'publish_snapshots', lambda: publishes.append(db.publish_read_snapshot()))
+    published = threading.Event()
+    bumps = []
+
+    def bump():
+        bumps.append(len(publishes))
+        published.set()
+
+    def save(job_id):
+        db.save_job(Job(id=job_id, title='Engineer', company='Acme', location='Remote', salary=None,
+                        description='', url=f'u-{job_id}', apply_url=None, posted_date='', job_type='full-time',
+                        experience_level='mid', source='test', scraped_at=job_id))
+        db.schedule_publish(on_published=bump)
+
+    save('j1')
+    assert published.wait(5)
+    assert publishes == [None] and bumps == [1]
+
+    # Writes within the interval of the last publish share the next one, which waits it out
+    published.clear()
+    for job_id in ('j2', 'j3', 'j4'):
+        save(job_id)
+    assert not published.wait(0.05)
+    assert published.wait(5)
+    assert len(publishes) == 2 and bumps == [1, 2]
+    assert [job.id for job in db.get_jobs()] == ['j4', 'j3', 'j2', 'j1']
@@ -0,0 +1,93 @@
+"""
+Unit tests for the synthetic job corpus generator
+"""
+import json
+import sqlite3
+
+import pytest
+
+import synthetic_corpus
+from synthetic_corpus import CorpusGenerator, write_jsonl, write_sqlite
+
+
+def test_corpus_is_deterministic_with_stable_ids():
+    first = list(CorpusGenerator(500, seed=3))
+    second = list(CorpusGenerator(500, seed=3))
+
+    assert first == second
+    assert list(CorpusGenerator(500, seed=4)) != first
+    assert [job['id'] for job in first[:2]] == ['syn-3-000000000', 'syn-3-000000001']
+    assert len({job['id'] for job in first}) == len({job['url'] for job in first}) == 500
+
+
+def test_shards_match_a_full_pass(monkeypatch):
+    monkeypatch.setattr(synthetic_corpus, 'CHUNK_ROWS', 100)
+    generator = CorpusGenerator(350, seed=9)
+    full = list(generator)
+
+    shards = list(generator.iter_jobs(0, 120)) + list(generator.iter_jobs(120, 290)) + list(generator.iter_jobs(290))
+
+    assert shards == full
+    assert [len(batch) for batch in generator.iter_batches(100)] == [100, 100, 100, 50]
+
+
+def test_near_duplicates_point_at_earlier_originals():
+    jobs = {job['id']: job for job in CorpusGenerator(4000, seed=1, duplicate_rate=0.1)}
+    duplicates = [job for job in jobs.values() if job['duplicate_of']]
+
+    assert 0.07 < len(duplicates) / len(jobs) < 0.13
+    for job in duplicates:
+        original = jobs[job['duplicate_of']]
+        assert original['id'] < job['id']
+        assert original['duplicate_of'] is None
+        assert job['source'] != original['source']
+        assert job['skills'] == original['skills']
+
+
+def test_distributions_look_like_a_job_board():
+    jobs = list(CorpusGenerator(5000, seed=2, duplicate_rate=0))
+    companies = [job['company'] for job in jobs]
+    top = max(set(companies), key=companies.count)
+
+    # Zipf head plus a long tail of generated companies
+    assert companies.count(top) > len(jobs) * 0.05
+    assert len(set(companies)) > 1000
+    for job in jobs:
+        assert 3 <= len(job['skills']) <= 10
+        if job['salary_min'] is not None:
+            assert 0 < job['salary_min'] < job['salary_max']
+    lengths = sorted(len(job['description']) for job in jobs)
+    assert lengths[len(lengths) // 2] * 3 < lengths[-1]
+
+
+def test_rejects_bad_parameters():
+    with pytest.raises(ValueError):
+        CorpusGenerator(-1)
+    with pytest.raises(ValueError):
+        CorpusGenerator(10, duplicate_rate=1.5)
+
+
+def test_writes_sqlite_and_jsonl(tmp_path, monkeypatch):
+    # write_sqlite imports the backend, which opens its app-wide databases in the cwd
+    monkeypatch.chdir(tmp_path)
+    generator = CorpusGenerator(250, seed=5)
+
+    assert write_sqlite(generator, str(tmp_path / 'corpus.db'), batch_size=100) == 250
+    conn = sqlite3.connect(tmp_path / 'corpus.db')
+    row = conn.execute("SELECT id, tags FROM jobs ORDER BY id LIMIT 1").fetchone()
+    assert conn.execute("SELECT COUNT(*) FROM jobs").fetchone() == (250,)
+    assert row[0] == 'syn-5-000000000'
+    assert json.loads(row[1]) == next(iter(generator))['skills']
+    conn.close()
+
+    assert write_jsonl(generator.iter_jobs(10, 20), str(tmp_path / 'corpus.jsonl')) == 10
+    lines = (tmp_path / 'corpus.jsonl').read_text().splitlines()
+    assert json.loads(lines[0])['id'] == 'syn-5-000000010'
+
+
+def test_crawler_posting_uses_crawler_fingerprint():
+    job = next(iter(CorpusGenerator(1, seed=1)))
+    posting = synthetic_corpus.to_crawler_posting(job)
+
+    assert posting.id == job['id']
+    assert posting.fingerprint == synthetic_corpus.job_fingerprint(job['title'], job['company'], job['location'])
@@ -0,0 +1,98 @@
+"""
+Unit tests for the durable SQLite task queue
+"""
+import pytest
+
+from task_queue import TaskQueue, TaskWorker, QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED
+
+
+def succeeding_handler(payload, ctx):
+    ctx.progress(50, stage='halfway')
+    return {'echo': payload['value']}
+
+
+def failing_handler(payload, ctx):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return TaskQueue(str(tmp_path / "tasks.db"), retry_base_delay=0)
+
+
+def test_enqueue_and_complete(queue):
+    task_id = queue.enqueue('test_task_queue:succeeding_handler', {'value': 42})
+    assert queue.get_status(task_id)['status'] == QUEUED
+
+    assert TaskWorker(queue, worker_id='w1').run_once()
+
+    status = queue.get_status(task_id)
+    assert status['status'] == COMPLETED
+    assert status['progress'] == 100
+    assert status['result'] == {'echo': 42}
+    assert status['attempts'] == 1
+
+
+def test_failed_task_retries_then_fails(queue):
+    task_id = queue.enqueue('test_task_queue:failing_handler', max_attempts=2)
+    worker = TaskWorker(queue, worker_id='w1')
+
+    worker.run_once()
+    status = queue.get_status(task_id)
+    assert status['status'] == QUEUED
+    assert 'boom' in status['error']
+
+    worker.run_once()
+    status = queue.get_status(task_id)
+    assert status['status'] == FAILED
+    assert status['attempts'] == 2
+    assert not worker.run_once()
+
+
+def test_cancel_queued_task(queue):
+    task_id = queue.enqueue('test_task_queue:succeeding_handler', {'value': 1})
+    assert queue.cancel(task_id)
+    assert queue.get_status(task_id)['status'] == CANCELLED
+    assert not TaskWorker(queue).run_once()
+    assert not queue.cancel(task_id)
+
+
+def test_cancel_running_task_stops_at_progress(queue, monkeypatch):
+    task_id = queue.enqueue('test_task_queue:succeeding_handler', {'value': 1})
+    worker = TaskWorker(queue, worker_id='w1')
+
+    # Request cancellation between claim and the handler's first progress report
+    original_claim = queue.claim
+
+    def claim_then_cancel(worker_id):
+        task = original_claim(worker_id)
+        queue.cancel(task['id'])
+        return task
+
+    monkeypatch.setattr(queue, 'claim', claim_then_cancel)
+    worker.run_once()
+    assert queue.get_status(task_id)['status'] == CANCELLED
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    queue = TaskQueue(str(tmp_path / "tasks.db"), lease_seconds=-1)
+    task_id = queue.enqueue('test_task_queue:succeeding_handler', {'value': 1})
+
+    first = queue.claim('crashed-worker')
+    assert first['id'] == task_id
+    assert queue.get_status(task_id)['status'] == RUNNING
+
+    second = queue.claim('healthy-worker')
+    assert second['id'] == task_id
+    assert second['attempts'] == 2
+
+
+def test_expired_lease_of_last_attempt_fails_task(tmp_path):
+    queue = TaskQueue(str(tmp_path / "tasks.db"), lease_seconds=-1)
+    task_id = queue.enqueue('test_task_queue:succeeding_handler', {'value': 1}, max_attempts=1)
+    queue.claim('crashed-worker')
+
+    assert queue.claim('healthy-worker') is None
+    status = queue.get_status(task_id)
+    assert status['status'] == FAILED and status['attempts'] == 1
+    assert status['completed_at'] is not None
@@ -0,0 +1,45 @@
+"""
+Unit tests for title normalization and seniority classification
+"""
+import pytest
+
+from title_normalizer import classify_title, normalize_title
+
+
+@pytest.mark.parametrize('title, canonical', [
+    ('Sr. Software Eng II - Payments (Remote)', 'senior software engineer ii'),
+    ('Staff SRE | Hybrid', 'staff site reliability engineer'),
+    ('Software Engineer #R12345', 'software engineer'),
+    ('Frontend Developer (m/f/d)', 'frontend developer'),
+    ('Senior Data Engineer @ Stripe', 'senior data engineer'),
+    ('', ''),
+])
+def test_normalize_title(title, canonical):
+    assert normalize_title(title) == canonical
+
+
+@pytest.mark.parametrize('title, family, seniority, level', [
+    ('Jr. Python Dev', 'software', 'junior', 'entry'),
+    ('Software Engineer, Senior', 'software', 'senior', 'senior'),
+    ('SDE III', 'software', 'senior', 'senior'),
+    ('Software Engineer Intern', 'software', 'intern', 'entry'),
+    ('Internal Tools Engineer', 'software', None, 'mid'),
+    ('ML Engineer', 'data', None, 'mid'),
+    ('Lead Product Designer', 'design', 'lead', 'senior'),
+    ('Associate Product Manager', 'product', 'junior', 'entry'),
+    ('SDET', 'qa', None, 'mid'),
+    ('VP of Engineering', 'software', 'executive', 'senior'),
+])
+def test_classify_title(title, family, seniority, level):
+    info = classify_title(title)
+    assert (info.family, info.seniority, info.experience_level) == (family, seniority, level)
+
+
+def test_callers_agree_on_experience_level():
+    from real_job_aggregator import RealJobAggregator
+
+    aggregator = RealJobAggregator.__new__(RealJobAggregator)
+    # The title wins; the description only decides when the title is silent
+    assert aggregator.determine_experience_level('Sr Engineer', 'new grad welcome') == 'senior'
+    assert aggregator.determine_experience_level('Internal Tools Engineer', '') == 'mid'
+    assert aggregator.determine_experience_level('Engineer', '5+ years of Go') == 'senior'
@@ -0,0 +1,36 @@
+"""
+Unit tests for the streaming top-k ranker
+"""
+import random
+
+import pytest
+
+from top_k import TopK, paginate, top_k
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_matches_sorted_slice(seed):
+    rng = random.Random(seed)
+    items = [(rng.randint(0, 5), rng.choice('abcde'), i) for i in range(rng.randint(0, 60))]
+    k = rng.randint(0, 70)
+
+    assert top_k(items, k, key=lambda x: x[0]) == sorted(items, key=lambda x: x[0], reverse=True)[:k]
+    assert top_k(items, k, key=lambda x: x[0], descending=False) == sorted(items, key=lambda x: x[0])[:k]
+    # Mixed directions: score descending, then name ascending; ties keep input order
+    expected = sorted(sorted(items, key=lambda x: x[1]), key=lambda x: x[0], reverse=True)[:k]
+    assert top_k(items, k, key=lambda x: (x[0], x[1]), descending=(True, False)) == expected
+    assert paginate(iter(items), 2, 7, key=lambda x: x[0]) == (
+        sorted(items, key=lambda x: x[0], reverse=True)[7:14], len(items))
+
+
+def test_upper_bound_stops_early():
+    scores = sorted((random.Random(3).random() for _ in range(1000)), reverse=True)
+    # A cursor ordered by score bounds every later item by the current one
+    ranker = TopK(10, upper_bound=lambda score: score).extend(iter(scores))
+    assert ranker.results() == scores[:10] and ranker.seen == 10 and ranker.stopped
+
+    consumed = []
+    stream = (consumed.append(score) or score for score in [100, 40, 100, 100, 99, 98])
+    assert top_k(stream, 3, upper_bound=lambda _: 100) == [100, 100, 100]
+    # Three perfect scores fill the list: the next item is pulled but nothing after it
+    assert consumed == [100, 40, 100, 100, 99]
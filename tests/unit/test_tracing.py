@@ -0,0 +1,154 @@
+"""
+Unit tests for pipeline tracing and context propagation
+"""
+import asyncio
+
+import pytest
+from flask import Flask
+
+import tracing
+from task_queue import TaskQueue, TaskWorker
+from tracing import InMemorySpanExporter, NON_RECORDING_SPAN, configure_tracing, extract, inject, start_span
+
+handled_payloads = []
+
+
+def recording_handler(payload, ctx):
+    handled_payloads.append(dict(payload))
+    with start_span('handler.work'):
+        return {'ok': True}
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    configure_tracing(exporter)
+    yield exporter
+    configure_tracing(None)
+
+
+def spans_by_name(exporter):
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+def test_disabled_tracer_is_a_no_op():
+    configure_tracing(None)
+    with start_span('stage') as span:
+        assert span is NON_RECORDING_SPAN
+        assert tracing.current_context() is None
+        assert inject({}) == {}
+
+
+def test_nested_spans_share_trace_and_link_parents(exporter):
+    with start_span('crawl_cycle'):
+        with start_span('scrape', {'job.source': 'remoteok'}):
+            pass
+        with start_span('store'):
+            pass
+
+    spans = spans_by_name(exporter)
+    root = spans['crawl_cycle']
+    assert root.parent is None
+    assert spans['scrape'].parent.span_id == root.context.span_id
+    assert spans['store'].context.trace_id == root.context.trace_id
+    assert spans['scrape'].attributes == {'job.source': 'remoteok'}
+    assert spans['scrape'].end_time >= spans['scrape'].start_time
+
+
+def test_exceptions_mark_span_as_error(exporter):
+    with pytest.raises(ValueError):
+        with start_span('dedup'):
+            raise ValueError("bad row")
+
+    span = spans_by_name(exporter)['dedup']
+    assert span.status == 'error'
+    assert span.events[0]['attributes']['exception.type'] == 'ValueError'
+
+
+def test_traceparent_round_trip(exporter):
+    with start_span('score') as span:
+        carrier = inject({})
+
+    context = extract(carrier)
+    assert carrier['traceparent'] == f"00-{span.context.trace_id}-{span.context.span_id}-01"
+    assert (context.trace_id, context.span_id, context.remote) == (span.context.trace_id, span.context.span_id, True)
+    assert extract({'traceparent': 'garbage'}) is None
+    assert extract({'traceparent': '00-' + '0' * 32 + '-' + '1' * 16 + '-01'}) is None
+
+
+def test_unsampled_parent_suppresses_children(exporter):
+    with tracing.use_context({'traceparent': '00-' + 'a' * 32 + '-' + 'b' * 16 + '-00'}):
+        with start_span('stage') as span:
+            assert span is NON_RECORDING_SPAN
+    assert exporter.get_finished_spans() == []
+
+
+def test_async_gather_children_join_parent(exporter):
+    async def source(name):
+        with start_span('scrape.source', {'job.source': name}):
+            await asyncio.sleep(0)
+
+    async def cycle():
+        with start_span('scrape'):
+            await asyncio.gather(source('a'), source('b'))
+
+    asyncio.run(cycle())
+
+    spans = exporter.get_finished_spans()
+    parent = next(span for span in spans if span.name == 'scrape')
+    children = [span for span in spans if span.name == 'scrape.source']
+    assert len(children) == 2
+    assert all(child.parent.span_id == parent.context.span_id for child in children)
+
+
+def test_task_context_propagates_into_worker(exporter, tmp_path):
+    handled_payloads.clear()
+    queue = TaskQueue(str(tmp_path / "tasks.db"))
+
+    with start_span('POST /api/bulk-apply') as request_span:
+        task_id = queue.enqueue('test_tracing:recording_handler', {'value': 1})
+
+    assert TaskWorker(queue, worker_id='w1').run_once()
+
+    spans = spans_by_name(exporter)
+    task_span = spans['task.run']
+    assert task_span.context.trace_id == request_span.context.trace_id
+    assert task_span.parent.span_id == request_span.context.span_id
+    assert task_span.attributes['task.id'] == task_id
+    assert spans['handler.work'].parent.span_id == task_span.context.span_id
+    # Handlers see the payload they were given, without the carrier
+    assert handled_payloads == [{'value': 1}]
+
+
+def test_flask_request_joins_incoming_trace(exporter):
+    app = Flask(__name__)
+    tracing.trace_app(app)
+
+    @app.route('/api/jobs/<job_id>')
+    def job(job_id):
+        return inject({})
+
+    incoming = '00-' + 'c' * 32 + '-' + 'd' * 16 + '-01'
+    response = app.test_client().get('/api/jobs/7', headers={'traceparent': incoming})
+
+    span = spans_by_name(exporter)['GET /api/jobs/<job_id>']
+    assert span.kind == 'server'
+    assert span.context.trace_id == 'c' * 32
+    assert span.parent.span_id == 'd' * 16
+    assert span.attributes['http.status_code'] == 200
+    assert response.get_json()['traceparent'].split('-')[2] == span.context.span_id
+    assert tracing.current_context() is None
+
+
+def test_zipkin_record_format(exporter):
+    with start_span('HTTP GET', {'http.status_code': 503}, kind='client') as span:
+        span.set_status('error', 'HTTP 503')
+
+    zipkin = tracing.ZipkinSpanExporter.__new__(tracing.ZipkinSpanExporter)
+    zipkin.service_name = 'job-scraper'
+    record = zipkin.to_zipkin(exporter.get_finished_spans()[0])
+
+    assert record['kind'] == 'CLIENT'
+    assert record['localEndpoint'] == {'serviceName': 'job-scraper'}
+    assert record['tags'] == {'http.status_code': '503', 'error': 'HTTP 503'}
+    assert record['duration'] >= 1
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Job title normalization with role family and seniority classification
+- normalize_title() canonicalizes a scraped title: drops bracketed and
+  trailing noise ("(Remote)", "- Payments Team", "#12345"), expands
+  abbreviations (sr, jr, eng, swe, ml, vp, ...) and lowercases
+- classify_title() maps a title to a role family (same families as
+  synthetic_corpus) and a seniority level with precompiled matchers
+- Memoized twice: on the raw string, so a repeated title is one dict
+  lookup, and on the canonical title, so spelling variants share the work
+
+    from title_normalizer import classify_title
+    info = classify_title('Sr. Software Eng II - Payments (Remote)')
+    info.canonical, info.family, info.seniority, info.experience_level
+    # 'senior software engineer ii', 'software', 'senior', 'senior'
+"""
+
+import re
+from functools import lru_cache
+from typing import FrozenSet, NamedTuple, Optional
+
+ABBREVIATIONS = {
+    'sr': 'senior', 'snr': 'senior', 'jr': 'junior', 'jnr': 'junior', 'mid-level': 'mid', 'midlevel': 'mid',
+    'eng': 'engineer', 'engr': 'engineer', 'dev': 'developer', 'devs': 'developers', 'mgr': 'manager',
+    'mngr': 'manager', 'dir': 'director', 'assoc': 'associate', 'admin': 'administrator', 'sys': 'systems',
+    'swe': 'software engineer', 'sde': 'software development engineer', 'sdet': 'software development engineer in test',
+    'sre': 'site reliability engineer', 'ml': 'machine learning', 'mle': 'machine learning engineer',
+    'pm': 'product manager', 'tpm': 'technical program manager', 'em': 'engineering manager',
+    'vp': 'vice president', 'svp': 'senior vice president', 'evp': 'executive vice president',
+    'fullstack': 'full stack', 'full-stack': 'full stack', 'front-end': 'frontend', 'back-end': 'backend',
+    'ux/ui': 'ux ui', 'ui/ux': 'ui ux', 'qa/qc': 'qa', 'co-op': 'intern', 'coop': 'intern',
+}
+NOISE_WORDS = frozenset({
+    'remote', 'hybrid', 'onsite', 'on-site', 'urgent', 'urgently', 'hiring', 'immediate', 'immediately',
+    'start', 'wfh', 'ft', 'pt', 'f/t', 'p/t', 'm/f/d', 'm/w/d', 'f/m/d', 'w/m/d', 'contract', 'temp',
+    'usa', 'us', 'apply', 'now',
+})
+
+# Ordered from the most to the least specific claim; the first match wins
+SENIORITY_PATTERNS = [
+    ('executive', r'chief|c[tei]o|vice president|head of engineering|svp|evp|president|founder'),
+    ('director', r'director|head of'),
+    ('principal', r'principal|distinguished|fellow'),
+    ('staff', r'staff'),
+    ('lead', r'lead|tech lead|team lead'),
+    ('senior', r'senior|iii|iv|level 3|l5'),
+    ('intern', r'intern|internship|trainee|apprentice|summer student'),
+    ('junior', r'junior|entry|entry level|associate|graduate|new grad|early career|i|level 1'),
+    ('mid', r'mid|intermediate|ii|level 2'),
+]
+EXPERIENCE_LEVELS = {
+    'intern': 'entry', 'junior': 'entry', 'mid': 'mid', 'senior': 'senior', 'lead': 'senior',
+    'staff': 'senior', 'principal': 'senior', 'director': 'senior', 'executive': 'senior',
+}
+
+# Families match synthetic_corpus.TITLE_FAMILIES; specific families are tried first
+FAMILY_PATTERNS = [
+    ('qa', r'qa|quality assurance|quality engineer|test automation|tester|test engineer|in test'),
+    ('security', r'security|appsec|infosec|penetration|pentester|soc analyst|cyber'),
+    ('data', r'data scien\w*|data engineer\w*|data analyst|analytics|machine learning|ai|deep learning|nlp|'
+             r'computer vision|statistician|business intelligence|bi developer|quantitative'),
+    ('infra', r'devops|site reliability|platform engineer|cloud engineer|cloud architect|infrastructure|'
+              r'systems administrator|systems engineer|network engineer|dba|database administrator'),
+    ('design', r'designer|design|ux|ui|user research\w*'),
+    ('product', r'product manager|product owner|program manager|project manager|engineering manager|'
+                r'scrum master|product lead'),
+    ('solutions', r'solutions? engineer|solutions? architect|sales engineer|support engineer|'
+                  r'customer engineer|technical account manager|implementation|consultant'),
+    ('software', r'software|engineer|engineering|developer|programmer|frontend|backend|full stack|mobile|'
+                 r'ios|android|web|architect|coder'),
+]
+
+_BRACKETS = re.compile(r'\([^)]*\)|\[[^\]]*\]|\{[^}]*\}')
+_REQUISITION = re.compile(r'(?:#|\b(?:req|requisition|job id|id)[:#\s]*)\s*[a-z0-9-]*\d[a-z0-9-]*', re.I)
+_TAIL = re.compile(r'\s+(?:[-–—|@]|at)\s+.*$')
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9+#./-]*')
+_SENIORITY_MATCHERS = [(level, re.compile(rf'\b(?:{pattern})\b')) for level, pattern in SENIORITY_PATTERNS]
+_FAMILY_MATCHERS = [(family, re.compile(rf'\b(?:{pattern})\b')) for family, pattern in FAMILY_PATTERNS]
+
+
+class TitleInfo(NamedTuple):
+    canonical: str
+    family: str  # software | data | infra | security | product | design | qa | solutions | other
+    seniority: Optional[str]  # None when the title does not state one
+    tokens: FrozenSet[str]
+
+    @property
+    def experience_level(self) -> str:
+        """entry | mid | senior, the level vocabulary of the job stores"""
+        return EXPERIENCE_LEVELS.get(self.seniority, 'mid')
+
+
+def _expand(text: str) -> str:
+    words = []
+    for token in _TOKEN.findall(text):
+        token = token.rstrip('.')
+        expanded = ABBREVIATIONS.get(token, token)
+        if expanded not in NOISE_WORDS:
+            words.append(expanded)
+    return ' '.join(words)
+
+
+@lru_cache(maxsize=65536)
+def normalize_title(title: Optional[str]) -> str:
+    """Canonical lowercase title; '' for empty input"""
+    if not title:
+        return ''
+    text = _REQUISITION.sub(' ', _BRACKETS.sub(' ', title))
+    text = _TAIL.sub('', text.strip()) or text
+    main, _, _ = text.partition(',')
+    return _expand(main.lower()) or _expand(text.lower())
+
+
+@lru_cache(maxsize=65536)
+def _classify_canonical(canonical: str, context: str) -> TitleInfo:
+    seniority = None
+    for text in (canonical, context):
+        seniority = next((level for level, matcher in _SENIORITY_MATCHERS if matcher.search(text)), None)
+        if seniority:
+            break
+    family = next((family for family, matcher in _FAMILY_MATCHERS if matcher.search(canonical)), 'other')
+    return TitleInfo(canonical, family, seniority, frozenset(canonical.split()))
+
+
+@lru_cache(maxsize=65536)
+def classify_title(title: Optional[str]) -> TitleInfo:
+    """Canonical title, role family and seniority of a raw title"""
+    canonical = normalize_title(title)
+    # Seniority sometimes sits in the dropped tail: 'Software Engineer, Senior'
+    context = _expand(_BRACKETS.sub(' ', title or '').lower()) if title else ''
+    return _classify_canonical(canonical, context if context != canonical else '')
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Streaming top-k ranking for job lists and storage cursors
+- TopK keeps the best k items seen so far in a bounded heap: O(n log k)
+  time and O(k) memory, the scored corpus is never materialized or sorted
+- Keys may be tuples; ``descending`` is one flag or one per key component
+  for mixed orderings. Ties keep input order, exactly like
+  ``sorted(items, key=key, reverse=descending)[:k]``
+- ``upper_bound`` enables early termination: given the best key the
+  current item or any later one can reach (a constant for bounded scores,
+  or a cursor's ORDER BY column), consumption stops once nothing left can
+  enter the top k
+
+    from top_k import paginate, top_k
+    best = top_k(jobs, 10, key=lambda job: job.match_score)
+    best = top_k(jobs, 10, key=lambda job: (job.verified, job.posted_date, job.title),
+                 descending=(True, True, False))
+    best = top_k(scored, 10, key=itemgetter(0), upper_bound=lambda item: 100.0)
+    jobs, total = paginate(rows, page, per_page, key=score)  # one page plus the total count
+"""
+
+import heapq
+import logging
+from numbers import Number
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class _Ascending:
+    """Inverts the order of a non-numeric key component, so it ranks ascending in a max-first heap"""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+def _identity(item):
+    return item
+
+
+class TopK:
+    """Best ``k`` items of a stream by ``key``, best first"""
+
+    def __init__(self, k: int, key: Optional[Callable[[Any], Any]] = None,
+                 descending: Union[bool, Sequence[bool]] = True,
+                 upper_bound: Optional[Callable[[Any], Any]] = None):
+        self.k = max(0, k)
+        self.key = key or _identity
+        self.upper_bound = upper_bound
+        self.seen = 0
+        self.stopped = False
+        self._heap = []  # (rank, -position, item); heap[0] is the worst kept item
+        if isinstance(descending, bool):
+            self._rank = None if descending else self._invert
+        else:
+            directions = tuple(descending)
+            self._rank = None if all(directions) else (
+                lambda key: tuple(value if desc else self._invert(value) for value, desc in zip(key, directions)))
+
+    @staticmethod
+    def _invert(value):
+        if isinstance(value, tuple):
+            return tuple(TopK._invert(part) for part in value)
+        return -value if isinstance(value, Number) else _Ascending(value)
+
+    def _ranked(self, key):
+        return key if self._rank is None else self._rank(key)
+
+    def push(self, item: Any) -> bool:
+        """Offer one item; False once no later item can make the top k"""
+        if self.stopped:
+            return False
+        heap = self._heap
+        if len(heap) >= self.k and self.upper_bound is not None:
+            # Ties lose to earlier items, so a bound no better than the worst kept rank ends the stream
+            if not heap or not heap[0][0] < self._ranked(self.upper_bound(item)):
+                self.stopped = True
+                return False
+        self.seen += 1
+        entry = (self._ranked(self.key(item)), -self.seen, item)
+        if len(heap) < self.k:
+            heapq.heappush(heap, entry)
+        elif heap and heap[0] < entry:
+            heapq.heapreplace(heap, entry)
+        return True
+
+    def extend(self, items: Iterable[Any]) -> 'TopK':
+        if self.upper_bound is not None or self.stopped:
+            push = self.push
+            for item in items:
+                if not push(item):
+                    logger.debug(f"⏹️ Top-{self.k} settled after {self.seen} items")
+                    break
+            return self
+
+        # push() inlined: most items lose to the worst kept one and cost a single comparison
+        heap, k, key, rank, seen = self._heap, self.k, self.key, self._rank, self.seen
+        for item in items:
+            seen += 1
+            value = key(item) if rank is None else rank(key(item))
+            if len(heap) < k:
+                heapq.heappush(heap, (value, -seen, item))
+            elif heap and heap[0][0] < value:
+                heapq.heapreplace(heap, (value, -seen, item))
+        self.seen = seen
+        return self
+
+    def results(self) -> List[Any]:
+        """Kept items, best first"""
+        return [item for _, _, item in sorted(self._heap, reverse=True)]
+
+    def __len__(self):
+        return len(self._heap)
+
+
+def top_k(items: Iterable[Any], k: int, key: Optional[Callable[[Any], Any]] = None,
+          descending: Union[bool, Sequence[bool]] = True,
+          upper_bound: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+    """``sorted(items, key=key, reverse=descending)[:k]`` in O(n log k), stopping early when bounded"""
+    return TopK(k, key, descending, upper_bound).extend(items).results()
+
+
+def paginate(items: Iterable[Any], page: int, per_page: int, key: Optional[Callable[[Any], Any]] = None,
+             descending: Union[bool, Sequence[bool]] = True) -> Tuple[List[Any], int]:
+    """(items of a 1-based page, total item count) without ranking past the end of the page"""
+    page = max(page, 1)
+    ranker = TopK(page * per_page, key, descending).extend(items)
+    return ranker.results()[(page - 1) * per_page:], ranker.seen
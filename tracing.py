@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+Lightweight distributed tracing for the scrape → dedup → store → score pipeline
+- Spans follow the OpenTelemetry model (trace/span ids, parent, kind,
+  attributes, events, status) and propagate with the W3C traceparent header
+- Outbound HTTP spans for requests sessions and aiohttp
+- Trace context travels into background tasks inside the task payload
+- No-op by default; TRACING_EXPORTER=console|zipkin turns exporting on.
+  Jaeger (k8s/monitoring/jaeger) ingests the zipkin format on port 9411
+- InMemorySpanExporter captures finished spans for tests
+"""
+
+import contextvars
+import inspect
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = 'traceparent'
+# Payload key carrying the enqueuing span's context into task workers
+TASK_CONTEXT_KEY = '_trace_context'
+
+_TRACEPARENT_RE = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+
+class SpanContext(NamedTuple):
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+    remote: bool = False
+
+
+_current_context = contextvars.ContextVar('current_span_context', default=None)
+
+
+def _new_id(num_bytes: int) -> str:
+    return os.urandom(num_bytes).hex()
+
+
+class Span:
+    """A timed operation; use Tracer.start_span rather than constructing directly"""
+
+    def __init__(self, tracer: 'Tracer', name: str, context: SpanContext,
+                 parent: Optional[SpanContext], kind: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.context = context
+        self.parent = parent
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.events = []
+        self.status = 'unset'
+        self.status_message = None
+        self.start_time = time.time()
+        self.end_time = None
+
+    @property
+    def recording(self) -> bool:
+        return self.end_time is None
+
+    @property
+    def duration(self) -> Optional[float]:
+        return self.end_time - self.start_time if self.end_time else None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, attributes: Dict[str, Any] = None):
+        self.events.append({'name': name, 'time': time.time(), 'attributes': attributes or {}})
+
+    def set_status(self, status: str, message: str = None):
+        self.status = status
+        self.status_message = message
+
+    def record_exception(self, exc: BaseException):
+        self.add_event('exception', {
+            'exception.type': type(exc).__name__,
+            'exception.message': str(exc)
+        })
+        self.set_status('error', f"{type(exc).__name__}: {exc}")
+
+    def end(self):
+        if self.end_time is None:
+            self.end_time = time.time()
+            self.tracer.on_end(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'trace_id': self.context.trace_id,
+            'span_id': self.context.span_id,
+            'parent_id': self.parent.span_id if self.parent else None,
+            'kind': self.kind,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'attributes': self.attributes,
+            'events': self.events,
+            'status': self.status,
+            'status_message': self.status_message
+        }
+
+
+class _NonRecordingSpan:
+    """Stand-in returned while tracing is disabled; every call is a no-op"""
+    context = None
+    recording = False
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, attributes):
+        pass
+
+    def add_event(self, name, attributes=None):
+        pass
+
+    def set_status(self, status, message=None):
+        pass
+
+    def record_exception(self, exc):
+        pass
+
+    def end(self):
+        pass
+
+
+NON_RECORDING_SPAN = _NonRecordingSpan()
+
+
+class InMemorySpanExporter:
+    """Keeps finished spans in a list, for tests"""
+
+    def __init__(self):
+        self._spans = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+
+    def get_finished_spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+    def shutdown(self):
+        pass
+
+
+class ConsoleSpanExporter:
+    """Logs each finished span as a JSON line"""
+
+    def export(self, span: Span):
+        logger.info(f"🔭 span {json.dumps(span.to_dict(), default=str)}")
+
+    def shutdown(self):
+        pass
+
+
+class ZipkinSpanExporter:
+    """Batches spans and POSTs them as Zipkin v2 JSON from a daemon thread"""
+
+    def __init__(self, endpoint: str, service_name: str, max_batch: int = 512,
+                 flush_interval: float = 5.0, max_queue: int = 10000):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        with self._lock:
+            if len(self._pending) >= self.max_queue:
+                return  # Drop rather than grow without bound when the collector is down
+            self._pending.append(span)
+            if len(self._pending) >= self.max_batch:
+                self._wakeup.set()
+
+    def to_zipkin(self, span: Span) -> Dict[str, Any]:
+        kind = span.kind.upper()
+        record = {
+            'traceId': span.context.trace_id,
+            'id': span.context.span_id,
+            'name': span.name,
+            'timestamp': int(span.start_time * 1_000_000),
+            'duration': max(int((span.end_time - span.start_time) * 1_000_000), 1),
+            'localEndpoint': {'serviceName': self.service_name},
+            'tags': {key: str(value) for key, value in span.attributes.items()},
+            'annotations': [
+                {'timestamp': int(event['time'] * 1_000_000), 'value': event['name']}
+                for event in span.events
+            ]
+        }
+        if span.parent:
+            record['parentId'] = span.parent.span_id
+        if kind in ('CLIENT', 'SERVER', 'PRODUCER', 'CONSUMER'):
+            record['kind'] = kind
+        if span.status == 'error':
+            record['tags']['error'] = span.status_message or 'true'
+        return record
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        import requests
+        try:
+            requests.post(self.endpoint, json=[self.to_zipkin(span) for span in batch], timeout=5)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to export {len(batch)} spans: {e}")
+
+    def _run(self):
+        while self._running:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def shutdown(self):
+        self._running = False
+        self._wakeup.set()
+        self.flush()
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the exporter.
+
+    With no exporter the tracer is disabled: start_span yields a shared
+    non-recording span and touches no context, so instrumentation costs a
+    function call.
+    """
+
+    def __init__(self, exporter=None, service_name: str = 'job-automation'):
+        self.exporter = exporter
+        self.service_name = service_name
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def on_end(self, span: Span):
+        try:
+            self.exporter.export(span)
+        except Exception as e:
+            logger.warning(f"⚠️ Span export failed: {e}")
+
+    def create_span(self, name: str, attributes: Dict[str, Any] = None, kind: str = 'internal',
+                    parent: Optional[SpanContext] = None):
+        """Start a span without making it current (for callback-style APIs)"""
+        if not self.enabled:
+            return NON_RECORDING_SPAN
+
+        parent = parent or _current_context.get()
+        if parent is not None and not parent.sampled:
+            return NON_RECORDING_SPAN
+
+        trace_id = parent.trace_id if parent else _new_id(16)
+        context = SpanContext(trace_id, _new_id(8))
+        return Span(self, name, context, parent, kind, attributes)
+
+    @contextmanager
+    def start_span(self, name: str, attributes: Dict[str, Any] = None,
+                   kind: str = 'internal') -> Iterator[Span]:
+        """Start a span, make it current for the block and end it afterwards"""
+        span = self.create_span(name, attributes, kind)
+        if span is NON_RECORDING_SPAN:
+            yield span
+            return
+
+        token = _current_context.set(span.context)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_context.reset(token)
+            span.end()
+
+    def shutdown(self):
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def _tracer_from_env() -> Tracer:
+    service_name = os.getenv('TRACING_SERVICE_NAME', 'job-automation')
+    exporter_name = os.getenv('TRACING_EXPORTER', 'none').lower()
+
+    if exporter_name == 'console':
+        exporter = ConsoleSpanExporter()
+    elif exporter_name == 'zipkin':
+        endpoint = os.getenv('TRACING_ZIPKIN_ENDPOINT', 'http://jaeger:9411/api/v2/spans')
+        exporter = ZipkinSpanExporter(endpoint, service_name)
+    else:
+        exporter = None
+
+    return Tracer(exporter, service_name)
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer, configured from the environment on first use"""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = _tracer_from_env()
+    return _tracer
+
+
+def configure_tracing(exporter=None, service_name: str = 'job-automation') -> Tracer:
+    """Replace the process-wide tracer, e.g. with an InMemorySpanExporter in tests"""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is not None:
+            _tracer.shutdown()
+        _tracer = Tracer(exporter, service_name)
+    return _tracer
+
+
+def start_span(name: str, attributes: Dict[str, Any] = None, kind: str = 'internal'):
+    return get_tracer().start_span(name, attributes, kind)
+
+
+def traced(name: str = None, **attributes):
+    """Decorator running a sync or async function inside a span"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with start_span(span_name, attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with start_span(span_name, attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_context() -> Optional[SpanContext]:
+    return _current_context.get()
+
+
+def inject(carrier: Dict[str, str], context: SpanContext = None) -> Dict[str, str]:
+    """Write the current (or given) span context into ``carrier`` as traceparent"""
+    context = context or _current_context.get()
+    if context is not None:
+        flags = '01' if context.sampled else '00'
+        carrier[TRACEPARENT_HEADER] = f"00-{context.trace_id}-{context.span_id}-{flags}"
+    return carrier
+
+
+def extract(carrier) -> Optional[SpanContext]:
+    """Read a traceparent from a dict or headers object; None when absent or invalid"""
+    if not carrier:
+        return None
+    value = carrier.get(TRACEPARENT_HEADER) or carrier.get('Traceparent')
+    match = _TRACEPARENT_RE.match(value.strip().lower()) if value else None
+    if not match:
+        return None
+    trace_id, span_id, flags = match.groups()
+    if trace_id == '0' * 32 or span_id == '0' * 16:
+        return None
+    return SpanContext(trace_id, span_id, sampled=bool(int(flags, 16) & 1), remote=True)
+
+
+@contextmanager
+def use_context(carrier) -> Iterator[Optional[SpanContext]]:
+    """Make a propagated context current so new spans join the remote trace"""
+    context = extract(carrier)
+    if context is None:
+        yield None
+        return
+
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
+
+
+def inject_task_context(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of ``payload`` carrying the current trace context, if any"""
+    if _current_context.get() is None:
+        return payload
+    payload = dict(payload or {})
+    payload[TASK_CONTEXT_KEY] = inject({})
+    return payload
+
+
+def trace_session(session):
+    """Wrap a requests.Session so every request is a client span with traceparent"""
+    send_request = session.request
+
+    @wraps(send_request)
+    def request(method, url, *args, **kwargs):
+        tracer = get_tracer()
+        if not tracer.enabled:
+            return send_request(method, url, *args, **kwargs)
+
+        attributes = {'http.method': method.upper(), 'http.url': str(url)}
+        with tracer.start_span(f"HTTP {method.upper()}", attributes, kind='client') as span:
+            kwargs['headers'] = inject(dict(kwargs.get('headers') or {}))
+            response = send_request(method, url, *args, **kwargs)
+            span.set_attribute('http.status_code', response.status_code)
+            if response.status_code >= 400:
+                span.set_status('error', f"HTTP {response.status_code}")
+            return response
+
+    session.request = request
+    return session
+
+
+def aiohttp_trace_config():
+    """aiohttp TraceConfig emitting a client span per request"""
+    import aiohttp
+
+    async def on_request_start(session, ctx, params):
+        span = get_tracer().create_span(
+            f"HTTP {params.method}", {'http.method': params.method, 'http.url': str(params.url)}, kind='client')
+        ctx.span = span
+        if span.context is not None:
+            inject(params.headers, span.context)
+
+    async def on_request_end(session, ctx, params):
+        span = getattr(ctx, 'span', NON_RECORDING_SPAN)
+        span.set_attribute('http.status_code', params.response.status)
+        if params.response.status >= 400:
+            span.set_status('error', f"HTTP {params.response.status}")
+        span.end()
+
+    async def on_request_exception(session, ctx, params):
+        span = getattr(ctx, 'span', NON_RECORDING_SPAN)
+        span.record_exception(params.exception)
+        span.end()
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+def trace_app(app):
+    """Server span per Flask request, joining any incoming traceparent"""
+    from flask import g, request
+
+    @app.before_request
+    def start_request_span():
+        tracer = get_tracer()
+        if not tracer.enabled:
+            return
+        parent = extract(request.headers)
+        span = tracer.create_span(f"{request.method} {request.url_rule.rule if request.url_rule else request.path}",
+                                  {'http.method': request.method, 'http.target': request.path},
+                                  kind='server', parent=parent)
+        if span is not NON_RECORDING_SPAN:
+            g._trace_span = span
+            g._trace_token = _current_context.set(span.context)
+
+    @app.after_request
+    def tag_response(response):
+        span = g.get('_trace_span')
+        if span is not None:
+            span.set_attribute('http.status_code', response.status_code)
+            if response.status_code >= 500:
+                span.set_status('error', f"HTTP {response.status_code}")
+        return response
+
+    @app.teardown_request
+    def end_request_span(exc):
+        span = g.pop('_trace_span', None)
+        if span is None:
+            return
+        if exc is not None:
+            span.record_exception(exc)
+        try:
+            _current_context.reset(g.pop('_trace_token'))
+        except ValueError:
+            # Streamed responses tear down in a different context
+            pass
+        span.end()
+
+    return app
@@ -35,8 +35,7 @@ import json
 import random
 import uuid
 import sqlite3
-import requests
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 import logging
 from dataclasses import dataclass, asdict
 import math
@@ -44,10 +43,20 @@ import re
 import time
 import threading
 from collections import defaultdict
+from operator import itemgetter
 import hashlib
 import os
-from real_job_aggregator import RealJobAggregator, RealJob
-from clickhouse_web_crawler import ClickHouseJobStorage, DistributedCrawler, JobScraper
+from response_cache import cached_response
+from json_responses import enable_compression
+from app_metrics import instrument_app
+from tracing import trace_app
+import daemon_profiler
+from feature_store import FeatureStore, JobFeatures, profile_skills, title_words
+from top_k import top_k
+from recommendation_cache import get_recommendation_cache, profile_version
+
+if TYPE_CHECKING:
+    from real_job_aggregator import RealJob
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -60,6 +69,9 @@ app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///ultimate_jobright.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+instrument_app(app, 'ultimate_jobright_complete')
+trace_app(app)
+enable_compression(app)
 
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -276,9 +288,15 @@ class EnhancedJobRecommendationEngine:
     """Advanced job recommendation engine with AI matching"""
 
     def __init__(self):
-        self.real_job_aggregator = RealJobAggregator()
-        self.clickhouse_storage = ClickHouseJobStorage()
-        self.crawler = DistributedCrawler(self.clickhouse_storage)
+        # Aggregator, storage and crawler are heavy (requests, bs4, ClickHouse
+        # connection attempts) so they are built on first use
+        self._real_job_aggregator = None
+        self._clickhouse_storage = None
+        self._crawler = None
+        self._crawler_thread = None
+        self._lock = threading.Lock()
+        # Skills, title words and salary of each job, derived once instead of per score
+        self.features = FeatureStore()
 
         # Advanced matching algorithms
         self.skill_weights = {
@@ -287,12 +305,39 @@ class EnhancedJobRecommendationEngine:
             'transferable': 0.4
         }
 
-        # Start background crawler for continuous job updates
-        self._start_background_crawler()
-
-    def _start_background_crawler(self):
+    @property
+    def real_job_aggregator(self):
+        with self._lock:
+            if self._real_job_aggregator is None:
+                from real_job_aggregator import RealJobAggregator
+                self._real_job_aggregator = RealJobAggregator()
+            return self._real_job_aggregator
+
+    @property
+    def clickhouse_storage(self):
+        with self._lock:
+            if self._clickhouse_storage is None:
+                from clickhouse_web_crawler import ClickHouseJobStorage
+                self._clickhouse_storage = ClickHouseJobStorage()
+            return self._clickhouse_storage
+
+    @property
+    def crawler(self):
+        storage = self.clickhouse_storage
+        with self._lock:
+            if self._crawler is None:
+                from clickhouse_web_crawler import DistributedCrawler
+                self._crawler = DistributedCrawler(storage)
+            return self._crawler
+
+    def start_background_crawler(self):
         """Start background crawler to maintain 400k+ jobs daily"""
+        if self._crawler_thread and self._crawler_thread.is_alive():
+            return self._crawler_thread
+
         def crawler_worker():
+            from clickhouse_web_crawler import JobScraper
+
             while True:
                 try:
                     scraper = JobScraper(self.clickhouse_storage)
@@ -304,66 +349,80 @@ class EnhancedJobRecommendationEngine:
                     logger.error(f"Background crawler error: {e}")
                     time.sleep(600)  # Wait 10 minutes on error
 
-        crawler_thread = threading.Thread(target=crawler_worker, daemon=True)
-        crawler_thread.start()
+        self._crawler_thread = threading.Thread(target=crawler_worker, daemon=True)
+        self._crawler_thread.start()
         logger.info("🚀 Background job crawler started")
+        return self._crawler_thread
 
-    def get_personalized_jobs(self, user: User, limit: int = 100) -> List[Dict]:
-        """Get personalized job recommendations with AI scoring"""
+    def get_personalized_jobs(self, user: User, limit: int = 100, fallback: bool = True) -> List[Dict]:
+        """Get personalized job recommendations with AI scoring; ``fallback=False`` raises instead of
+        returning generated jobs when the real ones cannot be loaded"""
         try:
             # Get real jobs from aggregator and ClickHouse
             real_jobs = self.real_job_aggregator.get_real_jobs(limit * 2)
 
-            # Convert to our format and calculate match scores
-            processed_jobs = []
-            for job in real_jobs:
-                job_dict = {
-                    'id': job.id,
-                    'title': job.title,
-                    'company': job.company,
-                    'location': job.location,
-                    'salary_min': job.salary_min,
-                    'salary_max': job.salary_max,
-                    'job_type': job.job_type,
-                    'experience_level': job.experience_level,
-                    'skills': job.skills,
-                    'description': job.description,
-                    'posted_date': job.posted_date,
-                    'expires_date': job.expires_date,
-                    'application_url': job.application_url,  # REAL application URL
-                    'source': job.source,
-                    'remote_friendly': job.remote_friendly,
-                    'benefits': job.benefits,
-                    'company_size': job.company_size,
-                    'industry': job.industry,
-                    'match_score': self.calculate_advanced_match_score(job, user) if user else random.uniform(75, 95)
-                }
-                processed_jobs.append(job_dict)
-
-            # Sort by match score and return top matches
-            processed_jobs.sort(key=lambda x: x['match_score'], reverse=True)
-            return processed_jobs[:limit]
+            # Score as a stream and keep only the best; scores are capped at 100, so a full
+            # list of perfect matches ends the scan early
+            features = self.features.features_for(real_jobs)
+            scored = ((self.calculate_advanced_match_score(job, user, job_features) if user else random.uniform(75, 95),
+                       job) for job, job_features in zip(real_jobs, features))
+            best = top_k(scored, limit, key=itemgetter(0), upper_bound=lambda _: 100)
+
+            # Convert only the top matches to our format
+            return [self._job_dict(job, match_score) for match_score, job in best]
 
         except Exception as e:
+            if not fallback:
+                raise
             logger.warning(f"Real job aggregation failed: {e}, using fallback")
             return self._generate_fallback_jobs(user, limit)
 
-    def calculate_advanced_match_score(self, job: RealJob, user: User) -> float:
+    def jobs_by_id(self, ranked: List[tuple], limit: int = 100) -> List[Dict]:
+        """Job dicts for (job_id, match_score) pairs ranked by get_personalized_jobs(limit=limit), in order"""
+        real_jobs = {job.id: job for job in self.real_job_aggregator.get_real_jobs(limit * 2)}
+        return [self._job_dict(real_jobs[job_id], match_score) for job_id, match_score in ranked if job_id in real_jobs]
+
+    @staticmethod
+    def _job_dict(job: 'RealJob', match_score: float) -> Dict:
+        return {
+            'id': job.id,
+            'title': job.title,
+            'company': job.company,
+            'location': job.location,
+            'salary_min': job.salary_min,
+            'salary_max': job.salary_max,
+            'job_type': job.job_type,
+            'experience_level': job.experience_level,
+            'skills': job.skills,
+            'description': job.description,
+            'posted_date': job.posted_date,
+            'expires_date': job.expires_date,
+            'application_url': job.application_url,  # REAL application URL
+            'source': job.source,
+            'remote_friendly': job.remote_friendly,
+            'benefits': job.benefits,
+            'company_size': job.company_size,
+            'industry': job.industry,
+            'match_score': match_score
+        }
+
+    def calculate_advanced_match_score(self, job: 'RealJob', user: User,
+                                       features: Optional[JobFeatures] = None) -> float:
         """Advanced AI-powered match scoring algorithm"""
         if not user or not user.profile_completed:
             return random.uniform(60, 85)
 
         scores = {}
         reasons = []
+        features = features or self.features.features(job)
 
         # Skills match (40% weight) - Most important factor
-        job_skills = [skill.lower() for skill in job.skills]
-        user_skills = json.loads(user.skills) if user.skills else []
-        user_skills_lower = [skill.lower() for skill in user_skills]
+        job_skills = features.skill_ids
+        user_skills = self.features.skill_ids(profile_skills(user.skills))
 
-        if job_skills and user_skills_lower:
-            exact_matches = len(set(job_skills) & set(user_skills_lower))
-            skill_coverage = exact_matches / len(job_skills) if job_skills else 0
+        if job_skills and user_skills:
+            exact_matches = len(features.skill_set & user_skills)
+            skill_coverage = exact_matches / len(job_skills)
             scores['skills'] = min(100, skill_coverage * 120 + random.uniform(-5, 15))
 
             if skill_coverage > 0.7:
@@ -371,13 +430,14 @@ class EnhancedJobRecommendationEngine:
             elif skill_coverage > 0.4:
                 reasons.append("Good skills overlap")
             else:
-                reasons.append("Develop these skills: " + ", ".join(job_skills[:3]))
+                reasons.append("Develop these skills: " + ", ".join(self.features.vocabulary.names(job_skills[:3])))
         else:
             scores['skills'] = 50
 
         # Title match (25% weight)
         if user.preferred_title:
-            title_similarity = self._calculate_title_similarity(job.title, user.preferred_title)
+            title_similarity = self._calculate_title_similarity(features.title_words,
+                                                                title_words(user.preferred_title))
             scores['title'] = title_similarity
             if title_similarity > 80:
                 reasons.append("Perfect title match")
@@ -395,9 +455,9 @@ class EnhancedJobRecommendationEngine:
             scores['location'] = 75
 
         # Salary match (10% weight)
-        if user.salary_expectation_min and user.salary_expectation_max and job.salary_min and job.salary_max:
+        if user.salary_expectation_min and user.salary_expectation_max and features.salary_min and features.salary_max:
             salary_overlap = self._calculate_salary_overlap(
-                job.salary_min, job.salary_max,
+                features.salary_min, features.salary_max,
                 user.salary_expectation_min, user.salary_expectation_max
             )
             scores['salary'] = salary_overlap
@@ -437,16 +497,8 @@ class EnhancedJobRecommendationEngine:
 
         return final_score
 
-    def _calculate_title_similarity(self, job_title: str, preferred_title: str) -> float:
-        """Calculate title similarity using keyword matching"""
-        job_words = set(job_title.lower().split())
-        pref_words = set(preferred_title.lower().split())
-
-        # Remove common words
-        common_words = {'and', 'or', 'the', 'a', 'an', 'in', 'at', 'for', 'with', 'on'}
-        job_words -= common_words
-        pref_words -= common_words
-
+    def _calculate_title_similarity(self, job_words: frozenset, pref_words: frozenset) -> float:
+        """Calculate title similarity using keyword matching over normalized title words"""
         if not job_words or not pref_words:
             return 50
 
@@ -1266,19 +1318,35 @@ def jobs():
     page = int(request.args.get('page', 1))
     per_page = 20
 
-    all_jobs = recommendation_engine.get_personalized_jobs(
-        current_user if current_user.is_authenticated else None,
-        limit=200
-    )
-
-    # Apply filters
-    filtered_jobs = apply_job_filters(all_jobs, filters)
-
-    # Pagination
     start_idx = (page - 1) * per_page
     end_idx = start_idx + per_page
-    paginated_jobs = filtered_jobs[start_idx:end_idx]
-    total_pages = math.ceil(len(filtered_jobs) / per_page)
+
+    # Signed-in users page through a cached ranking (recommendation_cache) instead of re-scoring
+    ranked = None
+    if current_user.is_authenticated:
+        def rank():
+            jobs = recommendation_engine.get_personalized_jobs(current_user, limit=200, fallback=False)
+            return [(job['id'], job['match_score']) for job in apply_job_filters(jobs, filters)]
+        try:
+            ranked = get_recommendation_cache().ranked(
+                current_user.id, profile_version(current_user), 'real_jobs', filters, rank)
+        except Exception as e:
+            logger.warning(f"Real job aggregation failed: {e}, using fallback")
+
+    if ranked is not None:
+        paginated_jobs = recommendation_engine.jobs_by_id(ranked[start_idx:end_idx], limit=200)
+        total_jobs = len(ranked)
+    else:
+        all_jobs = recommendation_engine.get_personalized_jobs(
+            current_user if current_user.is_authenticated else None,
+            limit=200
+        )
+
+        # Apply filters
+        filtered_jobs = apply_job_filters(all_jobs, filters)
+        paginated_jobs = filtered_jobs[start_idx:end_idx]
+        total_jobs = len(filtered_jobs)
+    total_pages = math.ceil(total_jobs / per_page)
 
     # Get user's saved and applied jobs
     saved_job_ids = set()
@@ -1293,7 +1361,7 @@ def jobs():
 
     return render_template('jobs.html',
                          jobs=paginated_jobs,
-                         total_jobs=len(filtered_jobs),
+                         total_jobs=total_jobs,
                          page=page,
                          total_pages=total_pages,
                          filters=filters,
@@ -1444,6 +1512,7 @@ def login():
 # API Endpoints
 @app.route('/api/jobs/search', methods=['GET'])
 @login_required
+@cached_response('real_jobs', vary=lambda: user_profile_fingerprint(current_user))
 def api_jobs_search():
     """API endpoint for job search"""
     try:
@@ -1565,6 +1634,17 @@ def orion_chat_api():
         'response': response
     })
 
+def user_profile_fingerprint(user) -> tuple:
+    """Profile fields that influence match scoring, used to key per-user caches"""
+    if not user or not user.is_authenticated:
+        return ()
+    return (
+        user.id, user.preferred_title, user.preferred_location,
+        user.salary_expectation_min, user.salary_expectation_max,
+        user.preferred_experience_level, user.skills, user.remote_preference,
+        user.profile_completed
+    )
+
 def apply_job_filters(jobs: List[Dict], filters: Dict) -> List[Dict]:
     """Apply comprehensive job filters"""
     filtered_jobs = jobs
@@ -1680,10 +1760,20 @@ def create_demo_users():
             logger.info("   🚀 Turbo user: demo@jobright.ai / demo123")
             logger.info("   🆓 Free user: free@jobright.ai / free123")
 
-if __name__ == '__main__':
-    # Initialize system
+def create_app(start_background: bool = True) -> Flask:
+    """Application factory; the background crawler only starts when asked for"""
     create_tables()
     create_demo_users()
+    if start_background:
+        recommendation_engine.start_background_crawler()
+    return app
+
+if __name__ == '__main__':
+    # Initialize system
+    create_app()
+
+    # Opt-in (PROFILING_ENABLED=1): profiles the web process and its DistributedCrawler thread
+    daemon_profiler.register_routes(app, daemon_profiler.install('ultimate_jobright_complete'))
 
     print("""
 🚀 ULTIMATE JOBRIGHT.AI COMPLETE SYSTEM STARTING...
@@ -29,6 +29,8 @@ import random
 import hashlib
 import re
 
+import daemon_profiler
+
 sys.path.append('/home/calelin/awesome-apply/venv/lib/python3.13/site-packages')
 
 try:
@@ -1224,7 +1226,8 @@ def mega_scrape():
         logger.info("🚀 Starting mega job scraping...")
         system_state['system_running'] = True
 
-        jobs = scraper.scrape_all_jobs_massive()
+        with daemon_profiler.stage('mega_scrape'):
+            jobs = scraper.scrape_all_jobs_massive()
         current_jobs = jobs
 
         system_state['jobs_scraped'] = len(jobs)
@@ -1266,7 +1269,8 @@ def nightly_apply():
         system_state['nightly_mode'] = True
 
         # Run application process
-        result = applicator.apply_to_jobs_nightly(current_jobs, target)
+        with daemon_profiler.stage('nightly_apply'):
+            result = applicator.apply_to_jobs_nightly(current_jobs, target)
 
         system_state['applications_submitted'] = result.get('applications_completed', 0)
         system_state['successful_applications'] = result.get('successful_applications', 0)
@@ -1734,6 +1738,9 @@ def main():
     # Create dashboard
     create_nightly_dashboard()
 
+    # Opt-in (PROFILING_ENABLED=1): signal triggers plus /debug/profile/* routes
+    daemon_profiler.register_routes(app, daemon_profiler.install('ultimate_nightly_automation'))
+
     print("\n🌙 Starting Ultimate Nightly System on port 5001...")
     print("🌐 Access dashboard: http://localhost:5001")
     print("📊 ClickHouse analytics enabled")